@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('charts', '0004_alter_chartprediction_actual_price_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stock',
+            name='exchange',
+            field=models.CharField(blank=True, max_length=50, verbose_name='거래소'),
+        ),
+        migrations.AddField(
+            model_name='stock',
+            name='provider_ids',
+            field=models.JSONField(blank=True, default=dict, verbose_name='프로바이더 ID'),
+        ),
+    ]
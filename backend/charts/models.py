@@ -37,6 +37,8 @@ class Stock(models.Model):
     symbol = models.CharField('심볼', max_length=20)
     name = models.CharField('이름', max_length=200)
     market = models.ForeignKey(Market, on_delete=models.CASCADE, verbose_name='시장')
+    exchange = models.CharField('거래소', max_length=50, blank=True)
+    provider_ids = models.JSONField('프로바이더 ID', default=dict, blank=True)
     description = models.TextField('설명', blank=True)
     logo_url = models.URLField('로고 URL', blank=True)
     is_active = models.BooleanField('활성 상태', default=True)
@@ -11,6 +11,7 @@ from typing import Dict, List, Optional, Tuple
 import logging
 import random
 from django.utils import timezone
+from market_data.ohlcv import OHLCVSeries
 from market_data.services import MarketDataService
 
 logger = logging.getLogger(__name__)
@@ -91,11 +92,11 @@ class StockPredictionEngine:
             except:
                 return self._fallback_prediction(symbol, prediction_days)
     
-    def _get_historical_data(self, symbol: str, market: str, days: int = 30) -> Optional[List[Dict]]:
-        """과거 데이터 조회"""
+    def _get_historical_data(self, symbol: str, market: str, days: int = 30) -> Optional[OHLCVSeries]:
+        """과거 데이터 조회 (컬럼형 OHLCV 시리즈)"""
         try:
             # 시장 데이터 서비스에서 과거 데이터 조회
-            historical = self.market_service.get_historical_data(
+            historical = self.market_service.get_historical_series(
                 symbol=symbol,
                 market=market,
                 period=f"{days}d"
@@ -105,14 +106,13 @@ class StockPredictionEngine:
             logger.warning(f"Could not fetch historical data for {symbol}: {e}")
             return None
     
-    def _run_multiple_algorithms(self, historical_data: List[Dict], current_price: Decimal, days: int) -> Dict:
+    def _run_multiple_algorithms(self, historical_data: OHLCVSeries, current_price: Decimal, days: int) -> Dict:
         """다중 예측 알고리즘 실행"""
         predictions = {}
         
         try:
             # 가격 데이터 추출
-            prices = [float(data.get('close', data.get('price', 0))) for data in historical_data]
-            prices = [p for p in prices if p > 0]  # 유효한 가격만 사용
+            prices = [p for p in historical_data.close if p > 0]  # 유효한 가격만 사용
             
             if len(prices) < 5:  # 최소 5일 데이터 필요
                 return {'basic': self._basic_trend_prediction(float(current_price), days)}
@@ -306,7 +306,7 @@ class StockPredictionEngine:
         # 정밀도 조정 (소수점 2자리)
         return Decimal(str(final_prediction)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
     
-    def _calculate_confidence(self, historical_data: List[Dict], predictions: Dict[str, float]) -> float:
+    def _calculate_confidence(self, historical_data: OHLCVSeries, predictions: Dict[str, float]) -> float:
         """예측 신뢰도 계산"""
         try:
             if not historical_data or not predictions:
@@ -333,14 +333,13 @@ class StockPredictionEngine:
         except:
             return 0.6
     
-    def _calculate_risk_level(self, historical_data: List[Dict]) -> str:
+    def _calculate_risk_level(self, historical_data: OHLCVSeries) -> str:
         """위험도 레벨 계산"""
         try:
             if not historical_data or len(historical_data) < 5:
                 return 'medium'
             
-            prices = [float(data.get('close', data.get('price', 0))) for data in historical_data]
-            prices = [p for p in prices if p > 0]
+            prices = [p for p in historical_data.close if p > 0]
             
             if len(prices) < 5:
                 return 'medium'
@@ -3,6 +3,7 @@ from .models import ChartPrediction, Event, Stock, Market
 from django.utils import timezone
 from datetime import datetime
 from decimal import Decimal, ROUND_HALF_UP
+from market_data.universe import stock_directory
 
 class ChartPredictionSerializer(serializers.ModelSerializer):
     """차트 예측 시리얼라이저"""
@@ -93,6 +94,10 @@ class ChartPredictionSerializer(serializers.ModelSerializer):
         if not data.get('stock') and not data.get('stock_symbol'):
             raise serializers.ValidationError("Either 'stock' or 'stock_symbol' must be provided")
         
+        # Resolve the symbol from the synced universe (master data is only written by sync_symbols)
+        if not data.get('stock') and stock_directory.stock_id(data['stock_symbol']) is None:
+            raise serializers.ValidationError({'stock_symbol': f"Unknown symbol: {data['stock_symbol']}"})
+        
         if not data.get('target_date'):
             raise serializers.ValidationError("target_date is required")
             
@@ -111,26 +116,7 @@ class ChartPredictionSerializer(serializers.ModelSerializer):
         confidence = validated_data.pop('confidence', 75)
         
         if stock_symbol and not validated_data.get('stock'):
-            # Get or create a default market for the stock
-            from .models import Market
-            market, created = Market.objects.get_or_create(
-                code='us_stock',
-                defaults={
-                    'name': 'US Stock Market',
-                    'market_type': 'us_stock',
-                    'timezone': 'America/New_York'
-                }
-            )
-            
-            # Get or create stock
-            stock, created = Stock.objects.get_or_create(
-                symbol=stock_symbol,
-                defaults={
-                    'name': stock_symbol,  # Use symbol as name if not found
-                    'market': market
-                }
-            )
-            validated_data['stock'] = stock
+            validated_data['stock_id'] = stock_directory.stock_id(stock_symbol)
         
         # Set prediction date to now
         validated_data['prediction_date'] = timezone.now()
@@ -3,10 +3,12 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from .models import ChartPrediction, Event, Stock, Market
+from .models import ChartPrediction, Event
 from market_data.models import MarketData
 from .serializers import ChartPredictionSerializer, EventSerializer
 from market_data.serializers import MarketDataSerializer
+from market_data.hot_symbols import PREDICTION_SYMBOLS
+from market_data.universe import stock_directory
 from .prediction_engine import StockPredictionEngine
 from django.db.models import Avg
 import random
@@ -39,24 +41,12 @@ def create_ai_prediction_api(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Stock 객체 찾기 또는 생성
-        try:
-            stock = Stock.objects.get(symbol=symbol)
-        except Stock.DoesNotExist:
-            # 시장 객체 찾기 또는 생성
-            market, created = Market.objects.get_or_create(
-                code=market_type,
-                defaults={
-                    'name': f'{market_type.upper()} Market',
-                    'market_type': market_type
-                }
-            )
-            
-            # 새로운 Stock 객체 생성
-            stock = Stock.objects.create(
-                symbol=symbol,
-                name=f'{symbol} Stock',
-                market=market
+        # 종목 조회 (종목 마스터는 sync_symbols가 관리 - 요청 경로에서는 생성하지 않음)
+        stock_id = stock_directory.stock_id(symbol, market_type)
+        if stock_id is None:
+            return Response(
+                {'error': f'지원하지 않는 종목입니다: {symbol}'}, 
+                status=status.HTTP_404_NOT_FOUND
             )
         
         # AI 예측 엔진 초기화 및 예측 수행
@@ -70,7 +60,7 @@ def create_ai_prediction_api(request):
         # 예측 결과 저장 (익명 사용자도 허용)
         chart_prediction = ChartPrediction.objects.create(
             user=request.user if request.user.is_authenticated else None,
-            stock=stock,
+            stock_id=stock_id,
             current_price=Decimal(str(prediction_result['current_price'])),
             predicted_price=Decimal(str(prediction_result['predicted_price'])),
             prediction_date=datetime.now(),
@@ -116,38 +106,7 @@ def available_symbols_api(request):
     """
     예측 가능한 심볼 목록 반환 (독립적인 API 뷰)
     """
-    symbols = {
-        'crypto': [
-            {'symbol': 'BTC', 'name': 'Bitcoin', 'market': 'crypto'},
-            {'symbol': 'ETH', 'name': 'Ethereum', 'market': 'crypto'},
-            {'symbol': 'ADA', 'name': 'Cardano', 'market': 'crypto'},
-            {'symbol': 'DOT', 'name': 'Polkadot', 'market': 'crypto'},
-            {'symbol': 'MATIC', 'name': 'Polygon', 'market': 'crypto'},
-            {'symbol': 'SOL', 'name': 'Solana', 'market': 'crypto'},
-            {'symbol': 'AVAX', 'name': 'Avalanche', 'market': 'crypto'},
-            {'symbol': 'LINK', 'name': 'Chainlink', 'market': 'crypto'},
-        ],
-        'us_stock': [
-            {'symbol': 'AAPL', 'name': 'Apple Inc.', 'market': 'us_stock'},
-            {'symbol': 'GOOGL', 'name': 'Alphabet Inc.', 'market': 'us_stock'},
-            {'symbol': 'MSFT', 'name': 'Microsoft Corporation', 'market': 'us_stock'},
-            {'symbol': 'AMZN', 'name': 'Amazon.com Inc.', 'market': 'us_stock'},
-            {'symbol': 'TSLA', 'name': 'Tesla Inc.', 'market': 'us_stock'},
-            {'symbol': 'META', 'name': 'Meta Platforms Inc.', 'market': 'us_stock'},
-            {'symbol': 'NVDA', 'name': 'NVIDIA Corporation', 'market': 'us_stock'},
-            {'symbol': 'JPM', 'name': 'JPMorgan Chase & Co.', 'market': 'us_stock'},
-        ],
-        'kr_stock': [
-            {'symbol': '005930', 'name': '삼성전자', 'market': 'kr_stock'},
-            {'symbol': '000660', 'name': 'SK하이닉스', 'market': 'kr_stock'},
-            {'symbol': '035420', 'name': 'NAVER', 'market': 'kr_stock'},
-            {'symbol': '005380', 'name': '현대차', 'market': 'kr_stock'},
-            {'symbol': '207940', 'name': '삼성바이오로직스', 'market': 'kr_stock'},
-            {'symbol': '006400', 'name': '삼성SDI', 'market': 'kr_stock'},
-        ]
-    }
-    
-    return Response(symbols, status=status.HTTP_200_OK)
+    return Response(PREDICTION_SYMBOLS, status=status.HTTP_200_OK)
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
@@ -389,23 +348,13 @@ class MarketViewSet(viewsets.ReadOnlyModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # 시장과 종목 정보 조회 또는 생성
-            market, created = Market.objects.get_or_create(
-                market_type=market_type,
-                defaults={
-                    'name': market_type.replace('_', ' ').title(),
-                    'code': market_type.upper()
-                }
-            )
-            
-            stock, created = Stock.objects.get_or_create(
-                symbol=symbol,
-                market=market,
-                defaults={
-                    'name': symbol,  # 기본값, 나중에 API로 실제 이름 조회 가능
-                    'description': f'{symbol} stock/crypto'
-                }
-            )
+            # 종목 조회 (종목 마스터는 sync_symbols가 관리 - 요청 경로에서는 생성하지 않음)
+            stock_id = stock_directory.stock_id(symbol, market_type)
+            if stock_id is None:
+                return Response(
+                    {'error': f'지원하지 않는 종목입니다: {symbol}'}, 
+                    status=status.HTTP_404_NOT_FOUND
+                )
             
             # AI 예측 엔진 실행
             prediction_engine = StockPredictionEngine()
@@ -418,7 +367,7 @@ class MarketViewSet(viewsets.ReadOnlyModelViewSet):
             # 예측 결과 저장 (익명 사용자도 허용)
             chart_prediction = ChartPrediction.objects.create(
                 user=request.user if request.user.is_authenticated else None,
-                stock=stock,
+                stock_id=stock_id,
                 current_price=Decimal(str(prediction_result['current_price'])),
                 predicted_price=Decimal(str(prediction_result['predicted_price'])),
                 prediction_date=datetime.now(),
@@ -0,0 +1,12 @@
+"""
+Gunicorn settings (loaded automatically from backend/ as the working directory)
+"""
+
+import os
+
+# /api/market-data/stream/ SSE 연결은 요청 하나가 최대 MARKET_DATA_STREAM_MAX_SECONDS 동안 유지되므로
+# 요청마다 프로세스를 점유하는 sync 워커 대신 스레드 워커 사용.
+# 스트림 연결 상한은 settings.GUNICORN_THREADS(같은 환경 변수)의 절반이므로 threads를 바꾸면 함께 늘어남
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 32))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
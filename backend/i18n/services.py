@@ -1,3 +1,4 @@
+import hashlib
 import logging
 import requests
 from django.conf import settings
@@ -25,6 +26,10 @@ class TranslationService:
         'ar': 'ar'
     }
     
+    @staticmethod
+    def _text_digest(text: str) -> str:
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
     @classmethod
     def translate_text(cls, text: str, source_language: str = 'auto', target_language: str = 'ko') -> str:
         """
@@ -39,7 +44,8 @@ class TranslationService:
             번역된 텍스트
         """
         # 캐시 키 생성
-        cache_key = f"translation:{hash(text)}:{source_language}:{target_language}"
+        # hash()는 프로세스마다 달라 공유 캐시에서 적중하지 않으므로 고정 다이제스트 사용
+        cache_key = f"translation:{cls._text_digest(text)}:{source_language}:{target_language}"
         cached_result = cache.get(cache_key)
         
         if cached_result:
@@ -334,7 +340,7 @@ class LanguageDetectionService:
             감지된 언어 코드
         """
         # 캐시 확인
-        cache_key = f"language_detection:{hash(text)}"
+        cache_key = f"language_detection:{TranslationService._text_digest(text)}"
         cached_result = cache.get(cache_key)
         
         if cached_result:
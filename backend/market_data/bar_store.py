@@ -0,0 +1,228 @@
+"""
+Persistent OHLCV Bar Store for Market Data
+Historical bars are kept in marketdata.PriceData so a chart load reads the stored range
+with one query, finds the missing head, holes or tail from those bars and only fetches
+that delta from providers
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .ohlcv import OHLCVSeries
+from .universe import stock_directory
+
+logger = logging.getLogger(__name__)
+
+# 프로바이더 코드 -> MarketDataSource 기본값 (행이 없을 때 자동 생성)
+SOURCE_DEFAULTS = {
+    'alpha_vantage': ('Alpha Vantage', 'https://www.alphavantage.co'),
+    'twelve_data': ('Twelve Data', 'https://api.twelvedata.com'),
+    'finnhub': ('Finnhub', 'https://finnhub.io'),
+    'polygon': ('Polygon.io', 'https://api.polygon.io'),
+    'yahoo': ('Yahoo Finance', 'https://query1.finance.yahoo.com'),
+    'tiingo': ('Tiingo', 'https://api.tiingo.com'),
+    'marketstack': ('Marketstack', 'https://api.marketstack.com'),
+    'coingecko': ('CoinGecko', 'https://api.coingecko.com'),
+}
+
+# PriceData 가격 필드(max_digits=15, decimal_places=8)가 담을 수 있는 최대값
+_MAX_PRICE = Decimal('9999999.99999999')
+_QUANT = Decimal('0.00000001')
+
+# 차트 기간 문자열 -> 일수
+PERIOD_DAYS = {
+    '1day': 1, '1d': 1,
+    '1week': 7, '7day': 7, '7d': 7, '1wk': 7,
+    '1month': 30, '30': 30, '30d': 30, '1mo': 30,
+    '3month': 90, '3months': 90, '90': 90, '90d': 90, '3mo': 90,
+    '6months': 180, '180': 180, '180d': 180, '6mo': 180,
+    '1year': 365, '1Y': 365, '365': 365, '365d': 365, '1y': 365,
+    '2years': 730, '730': 730, '2y': 730,
+}
+
+
+def period_start(period: str, now: Optional[datetime] = None, default_days: int = 30) -> datetime:
+    """기간 문자열의 시작 시각 (UTC 자정 기준, 알 수 없는 기간은 default_days)"""
+    now = now or datetime.now(dt_timezone.utc)
+    days = PERIOD_DAYS.get(period)
+    if days is None and period and period.rstrip('d').isdigit():
+        days = int(period.rstrip('d'))
+    start = now - timedelta(days=days or default_days)
+    return start.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _to_price(value: Any) -> Optional[Decimal]:
+    try:
+        price = Decimal(str(value)).quantize(_QUANT)
+    except (InvalidOperation, TypeError, ValueError):
+        return None
+    if price < 0 or price > _MAX_PRICE:
+        return None
+    return price
+
+
+class BarStore:
+    """marketdata.PriceData 기반 OHLCV 저장소"""
+
+    def __init__(self, sync_interval: float = 300, head_tolerance_days: int = 4, hole_days: int = 5):
+        self.sync_interval = sync_interval          # 같은 시리즈의 꼬리(최신 봉) 재조회 최소 간격
+        self.head_tolerance_days = head_tolerance_days  # 주말/휴일로 첫 봉이 늦게 시작해도 허용하는 일수
+        self.hole_days = hole_days                  # 이보다 긴 봉 사이 간격은 구멍으로 간주 (주식 기준)
+        self._lock = threading.Lock()
+        self._source_ids: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # 종목 / 소스
+    # ------------------------------------------------------------------
+    def stock_for(self, symbol: str, market: str) -> Optional[int]:
+        """심볼/시장에 해당하는 charts.Stock id (sync_symbols로 등록된 활성 종목만, 없으면 None)"""
+        return stock_directory.stock_id(symbol, market)
+
+    def source_for(self, code: str) -> Optional[int]:
+        """프로바이더 코드에 해당하는 MarketDataSource id (없으면 생성)"""
+        source_id = self._source_ids.get(code)
+        if source_id is not None:
+            return source_id
+        try:
+            from marketdata.models import MarketDataSource
+            name, base_url = SOURCE_DEFAULTS.get(code, (code, 'https://example.com'))
+            source, _ = MarketDataSource.objects.get_or_create(
+                code=code, defaults={'name': name, 'base_url': base_url}
+            )
+        except Exception as e:
+            logger.error(f"Bar store source lookup failed for {code}: {e}")
+            return None
+        with self._lock:
+            self._source_ids[code] = source.id
+        return source.id
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def read(self, stock_id: int, interval: str, start: datetime, end: Optional[datetime] = None) -> OHLCVSeries:
+        """저장된 봉을 시간 오름차순 OHLCVSeries로 반환"""
+        from marketdata.models import PriceData
+        queryset = PriceData.objects.filter(stock_id=stock_id, interval=interval, timestamp__gte=start)
+        if end is not None:
+            queryset = queryset.filter(timestamp__lte=end)
+        rows = queryset.order_by('timestamp', 'created_at').values_list(
+            'timestamp', 'open_price', 'high_price', 'low_price', 'close_price', 'volume'
+        )
+
+        # 같은 시각에 소스가 여러 개면 가장 최근에 저장된 행 사용
+        bars: Dict[int, tuple] = {}
+        for timestamp, open_price, high_price, low_price, close_price, volume in rows:
+            bars[int(timestamp.timestamp())] = (
+                float(open_price), float(high_price), float(low_price), float(close_price), volume
+            )
+        series = OHLCVSeries()
+        for timestamp, bar in bars.items():
+            series.append(timestamp, *bar)
+        return series
+
+    @staticmethod
+    def _sync_key(stock_id: int, interval: str) -> str:
+        return f"barstore_synced_{stock_id}_{interval}"
+
+    def mark_synced(self, stock_id: int, interval: str) -> None:
+        cache.set(self._sync_key(stock_id, interval), True, timeout=self.sync_interval)
+
+    def missing_range(self, stored: OHLCVSeries, stock_id: int, interval: str, start: datetime, end: datetime,
+                      crypto: bool = False) -> Optional[Tuple[datetime, datetime]]:
+        """
+        요청 구간 중 프로바이더에서 받아와야 하는 가장 작은 연속 구간 (없으면 None)
+
+        stored는 read()로 이미 읽은 같은 구간의 봉 - 앞부분(첫 봉 이전), 중간 구멍, 꼬리(최신 봉 이후)를
+        추가 쿼리 없이 그 타임스탬프로 확인한다. 꼬리는 마지막 봉을 포함해 다시 받아 진행 중인 봉도
+        갱신하되, sync_interval에 한 번만 확인한다. 일봉 기준 (주식은 주말/휴일 허용, 암호화폐는 매일 봉이 있어야 함).
+        """
+        if not stored:
+            return start, end
+        timestamps = stored.timestamps
+        first = datetime.fromtimestamp(timestamps[0], tz=dt_timezone.utc)
+        last = datetime.fromtimestamp(timestamps[-1], tz=dt_timezone.utc)
+
+        head_tolerance = timedelta(days=1 if crypto else self.head_tolerance_days)
+        hole = (timedelta(days=2 if crypto else self.hole_days)).total_seconds()
+        gap_starts = []
+
+        if first > start + head_tolerance:
+            gap_starts.append(start)
+
+        # 중간 구멍: 봉 사이 간격이 hole보다 긴 첫 곳
+        for index in range(1, len(timestamps)):
+            if timestamps[index] - timestamps[index - 1] > hole:
+                gap_starts.append(datetime.fromtimestamp(timestamps[index - 1], tz=dt_timezone.utc))
+                break
+
+        if not cache.get(self._sync_key(stock_id, interval)):
+            today = end.astimezone(dt_timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+            expected_last = today
+            if not crypto:
+                # 주말에는 직전 금요일 봉이 마지막 봉
+                while expected_last.weekday() >= 5:
+                    expected_last -= timedelta(days=1)
+            # 완료된 마지막 세션까지 있으면 꼬리 조회 불필요, 오늘 봉(진행 중)이면 갱신
+            if last < expected_last or last >= today:
+                gap_starts.append(last)
+
+        if not gap_starts:
+            return None
+        return min(gap_starts), end
+
+    # ------------------------------------------------------------------
+    # 저장
+    # ------------------------------------------------------------------
+    def upsert(self, stock_id: int, interval: str, source_code: str, rows: List[Dict[str, Any]]) -> int:
+        """프로바이더 행을 PriceData에 bulk upsert. 저장한 봉 수 반환"""
+        from marketdata.models import PriceData
+        source_id = self.source_for(source_code)
+        if source_id is None:
+            return 0
+
+        series = OHLCVSeries.from_rows(rows)
+        daily = interval in ('1d', '1w', '1M')
+        bars: Dict[int, PriceData] = {}
+        for index in range(len(series)):
+            timestamp = series.timestamps[index]
+            if daily:
+                timestamp -= timestamp % 86400
+            prices = [_to_price(column[index]) for column in (series.open, series.high, series.low, series.close)]
+            if any(price is None for price in prices):
+                continue
+            # 같은 봉이 여러 번 오면 마지막 행 사용 (ON CONFLICT 한 문장 내 중복 방지)
+            bars[timestamp] = PriceData(
+                stock_id=stock_id, interval=interval, source_id=source_id,
+                timestamp=datetime.fromtimestamp(timestamp, tz=dt_timezone.utc),
+                open_price=prices[0], high_price=prices[1], low_price=prices[2], close_price=prices[3],
+                volume=series.volume[index],
+            )
+
+        if not bars:
+            return 0
+        PriceData.objects.bulk_create(
+            list(bars.values()),
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['stock', 'timestamp', 'interval', 'source'],
+            update_fields=['open_price', 'high_price', 'low_price', 'close_price', 'volume'],
+        )
+        return len(bars)
+
+    def reset(self) -> None:
+        """프로세스 내 종목/소스 id 캐시 비우기"""
+        with self._lock:
+            self._source_ids.clear()
+        stock_directory.invalidate()
+
+
+# 전역 인스턴스 - MarketDataService 인스턴스 간 공유
+bar_store = BarStore(
+    sync_interval=getattr(settings, 'MARKET_DATA_BAR_STORE_SYNC_INTERVAL', 300),
+)
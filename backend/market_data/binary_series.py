@@ -0,0 +1,86 @@
+"""
+Binary Typed-Array Transport for OHLCV Series
+A 32-byte header followed by the series' columns as contiguous little-endian buffers
+(int64 timestamps/volume, float64 prices), written straight from the array-backed
+series so the browser can wrap them as typed-array views without parsing JSON
+
+Layout (little-endian):
+    header  '<4sBBBBIiqq' = magic b'OHLC', version, flags, column count, price precision,
+            bar count, age, cursor (last timestamp), since (-1 if full series)
+    columns t:int64, o:float64, h:float64, l:float64, c:float64, v:int64 (each count * 8 bytes)
+
+Every column starts on an 8-byte boundary, so `new Float64Array(buffer, offset, count)` works
+"""
+
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Optional, Tuple
+
+from .ohlcv import COLUMNS, OHLCVSeries
+
+MEDIA_TYPE = 'application/octet-stream'
+MAGIC = b'OHLC'
+VERSION = 1
+HEADER = struct.Struct('<4sBBBBIiqq')
+
+# 헤더 flags 비트
+FLAG_STALE = 0x01
+FLAG_DAILY = 0x02
+
+_BIG_ENDIAN = sys.byteorder == 'big'
+
+
+def _column_bytes(column: array) -> bytes:
+    if _BIG_ENDIAN:
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def encode_series(series: OHLCVSeries, since: Optional[int] = None, precision: int = 0) -> bytes:
+    """
+    시리즈를 헤더 + 컬럼 버퍼로 인코딩 (행 단위 파이썬 객체 생성 없음 - 컬럼마다 memcpy 1회)
+
+    since를 주면 해당 봉부터의 델타만 담는다. cursor와 daily 표시는 항상 전체 시리즈 기준.
+    """
+    window = series.since(since) if since is not None else series
+    flags = (FLAG_STALE if series.stale else 0) | (FLAG_DAILY if series.time_format == '%Y-%m-%d' else 0)
+    header = HEADER.pack(
+        MAGIC, VERSION, flags, len(COLUMNS), precision, len(window), int(series.age),
+        series.timestamps[-1] if len(series) else 0, -1 if since is None else since,
+    )
+    return b''.join([header] + [_column_bytes(getattr(window, name)) for name, _ in COLUMNS])
+
+
+def decode_series(blob: bytes) -> Tuple[Dict[str, Any], OHLCVSeries]:
+    """encode_series의 역변환 (테스트/벤치마크 및 파이썬 클라이언트용)"""
+    magic, version, flags, columns, precision, length, age, cursor, since = HEADER.unpack_from(blob)
+    if magic != MAGIC or version != VERSION or columns != len(COLUMNS):
+        raise ValueError(f"Unsupported OHLCV binary payload (magic={magic!r}, version={version})")
+
+    series = OHLCVSeries()
+    offset = HEADER.size
+    view = memoryview(blob)
+    for name, typecode in COLUMNS:
+        column = array(typecode)
+        size = length * column.itemsize
+        column.frombytes(view[offset:offset + size])
+        if _BIG_ENDIAN:
+            column.byteswap()
+        offset += size
+        setattr(series, name, column)
+    series.stale = bool(flags & FLAG_STALE)
+    series.age = age
+
+    header = {
+        'version': version,
+        'stale': series.stale,
+        'daily': bool(flags & FLAG_DAILY),
+        'precision': precision,
+        'length': length,
+        'age': age,
+        'cursor': cursor,
+        'since': None if since < 0 else since,
+    }
+    return header, series
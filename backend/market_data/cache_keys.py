@@ -0,0 +1,71 @@
+"""
+Versioned Cache Keys for Market Data
+Every symbol-scoped key carries the symbol's cache generation, so purging one symbol
+is a single counter bump in the shared cache; old keys simply stop being read and
+expire on their own TTL
+"""
+
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+GENERATION_PREFIX = 'cachegen:'
+
+
+def _generation_key(symbol: str) -> str:
+    return f"{GENERATION_PREFIX}{symbol.upper()}"
+
+
+def generation_ttl() -> int:
+    """
+    세대 키 TTL (초) - 임의의 요청 심볼마다 만료 없는 키가 쌓이지 않도록 유한하게 둠
+
+    퍼지 후 세대 키가 만료돼 0으로 돌아가도 이전 세대 데이터가 되살아나지 않도록 데이터 캐시의
+    최대 TTL(MARKET_DATA_SWR_MAX_HARD_TTL)보다 짧아지지 않게 한다.
+    """
+    return max(getattr(settings, 'MARKET_DATA_CACHE_GENERATION_TTL', 86400),
+               getattr(settings, 'MARKET_DATA_SWR_MAX_HARD_TTL', 21600))
+
+
+def symbol_generation(symbol: str) -> int:
+    """
+    심볼의 현재 캐시 세대 (한 번도 퍼지하지 않았으면 0)
+
+    세대 키는 L1에도 올라가므로 다른 워커의 퍼지는 최대 L1_TIMEOUT 뒤에 반영된다.
+    """
+    key = _generation_key(symbol)
+    generation = cache.get(key)
+    if generation is None:
+        # 0을 저장해 두어야 다음 조회부터 L1에서 응답 (동시 퍼지를 덮어쓰지 않도록 add)
+        cache.add(key, 0, timeout=generation_ttl())
+        return 0
+    return generation
+
+
+def symbol_key(namespace: str, symbol: str, *parts: Any) -> str:
+    """
+    세대가 붙은 심볼 캐시 키
+
+    symbol_key('historical_us_stock_', 'AAPL', '1year', '1d') -> 'historical_us_stock_AAPL_1year_1d:g0'
+    (namespace 접두사가 TieredCache의 지표/L1 네임스페이스를 결정)
+    """
+    suffix = ''.join(f"_{part}" for part in parts)
+    return f"{namespace}{symbol}{suffix}:g{symbol_generation(symbol)}"
+
+
+def purge_symbol(symbol: str) -> int:
+    """심볼의 모든 네임스페이스 캐시 무효화 (세대 증가). 새 세대 반환"""
+    key = _generation_key(symbol)
+    ttl = generation_ttl()
+    # 없는 키에 incr하면 ValueError이므로 먼저 add (이미 있으면 무시됨)
+    cache.add(key, 0, timeout=ttl)
+    try:
+        generation = cache.incr(key)
+    except ValueError:
+        # add와 incr 사이에 만료/삭제된 경우
+        cache.set(key, 1, timeout=ttl)
+        return 1
+    # incr은 만료 시각을 바꾸지 않으므로 마지막 퍼지부터 다시 TTL을 셈 (이전 세대 데이터가 먼저 만료되도록)
+    cache.touch(key, timeout=ttl)
+    return generation
@@ -0,0 +1,134 @@
+"""
+Single-flight Request Coalescing for Market Data Cache Misses
+Concurrent misses for the same cache key share one upstream fetch:
+in-process callers wait on the leader's future, other workers wait on a short cache lease
+"""
+
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Optional
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .deadline import record_cut, remaining
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """캐시 키 단위 single-flight 요청 병합"""
+
+    def __init__(self, lease_timeout: float = 15, wait_timeout: float = 3.0, poll_interval: float = 0.05):
+        self.lease_timeout = lease_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._counters = {
+            'leader_fetches': 0,     # 실제 업스트림 조회를 수행한 횟수
+            'local_coalesced': 0,    # 같은 프로세스의 진행 중 조회에 합류한 횟수
+            'remote_coalesced': 0,   # 다른 워커가 채운 캐시 값을 받은 횟수
+            'stale_served': 0,       # 다른 워커 조회 중 이전 값을 즉시 반환한 횟수
+            'lease_timeouts': 0,     # 대기 후에도 값이 없어 직접 조회한 횟수
+        }
+
+    def _incr(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    @staticmethod
+    def lease_key(key: str) -> str:
+        return f"lease:{key}"
+
+    def do(self, key: str, fetch: Callable[[], Any], read: Optional[Callable[[], Any]] = None,
+           stale_value: Any = None) -> Any:
+        """
+        key에 대한 조회를 병합 실행
+
+        Args:
+            key: 병합 기준 키 (보통 캐시 키)
+            fetch: 업스트림 조회 함수 (결과를 캐시에 저장하는 것까지 담당)
+            read: 다른 워커가 채운 값을 읽는 함수 (없으면 cache.get(key))
+            stale_value: 다른 워커가 조회 중일 때 기다리지 않고 돌려줄 이전 값
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not is_leader:
+            self._incr('local_coalesced')
+            try:
+                # 리더가 데드라인 없는 백그라운드 갱신이어도 이 요청의 데드라인까지만 기다림
+                return future.result(timeout=remaining())
+            except FutureTimeout:
+                record_cut('coalesced_wait')
+                return (read or (lambda: cache.get(key)))()
+
+        try:
+            result = self._fetch_with_lease(key, fetch, read or (lambda: cache.get(key)), stale_value)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _fetch_with_lease(self, key: str, fetch: Callable[[], Any], read: Callable[[], Any],
+                          stale_value: Any) -> Any:
+        """워커 간 리스(cache.add)를 잡은 경우에만 업스트림 조회"""
+        lease_key = self.lease_key(key)
+        if cache.add(lease_key, 1, timeout=self.lease_timeout):
+            self._incr('leader_fetches')
+            try:
+                return fetch()
+            finally:
+                cache.delete(lease_key)
+
+        # 다른 워커가 조회 중 - 이전 값이 있으면 바로 반환
+        if stale_value is not None:
+            self._incr('stale_served')
+            return stale_value
+
+        # 다른 워커가 값을 채울 때까지 잠시 대기 (요청 데드라인이 더 짧으면 그만큼만)
+        left = remaining()
+        deadline = time.monotonic() + (self.wait_timeout if left is None else min(self.wait_timeout, left))
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            value = read()
+            if value:
+                self._incr('remote_coalesced')
+                return value
+            if not cache.get(lease_key):
+                # 리더가 값을 남기지 못하고 끝남 (조회 실패 등)
+                break
+
+        self._incr('lease_timeouts')
+        logger.info(f"Single-flight wait ended without a value for {key}, fetching directly")
+        return fetch()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['inflight'] = len(self._inflight)
+        return stats
+
+    def reset(self) -> None:
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+
+# 전역 인스턴스 - MarketDataService 인스턴스 간 공유
+single_flight = SingleFlight(
+    lease_timeout=getattr(settings, 'MARKET_DATA_COALESCE_LEASE_TIMEOUT', 15),
+    wait_timeout=getattr(settings, 'MARKET_DATA_COALESCE_WAIT_TIMEOUT', 3.0),
+)
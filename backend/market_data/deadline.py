@@ -0,0 +1,203 @@
+"""
+End-to-end Request Deadlines for Market Data
+A view sets one deadline per request (quotes 2 s, history 5 s by default) and every
+provider call made on its behalf - directly, through the fallback chain, the hedged
+quote race or a fan-out worker - gets only the remaining time as its timeout. Once
+the budget is spent the chain stops instead of trying the next provider, and the
+unfinished fetch is handed to the background refresher
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Dict, Iterator, Optional
+import logging
+
+import requests
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# 이보다 남은 시간이 적으면 요청을 보내지 않음 (연결만 맺다 끝나는 호출 방지)
+MIN_CALL_TIMEOUT = 0.05
+
+# 요청 종류 -> (설정 이름, 기본 예산 초). 목록에 없는 종류는 DEFAULT_BUDGET
+REQUEST_BUDGETS = {
+    'quote': ('MARKET_DATA_QUOTE_REQUEST_DEADLINE', 2.0),
+    'history': ('MARKET_DATA_HISTORY_REQUEST_DEADLINE', 5.0),
+    'dashboard': ('MARKET_DATA_FANOUT_DEADLINE', 3.0),
+}
+DEFAULT_BUDGET = ('MARKET_DATA_REQUEST_DEADLINE', 5.0)
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """요청 데드라인이 지나 프로바이더 호출을 보내지 않음"""
+
+    def __init__(self, label: str = ''):
+        super().__init__(f"request deadline exceeded{f' ({label})' if label else ''}")
+        self.label = label
+
+
+class Deadline:
+    """요청 하나의 종료 시각 (monotonic). 팬아웃 스레드와 공유되므로 cuts는 락으로 갱신"""
+
+    __slots__ = ('label', 'budget', 'expires_at', 'cuts', '_lock')
+
+    def __init__(self, budget: float, label: str = ''):
+        self.label = label
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+        self.cuts = 0
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= MIN_CALL_TIMEOUT
+
+    def note_cut(self) -> None:
+        with self._lock:
+            self.cuts += 1
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar('market_data_deadline', default=None)
+
+
+class DeadlineStats:
+    """데드라인이 체인을 끊은 횟수 등 카운터 (성능 지표 API 노출용)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters = {
+                'requests': 0, 'cut_requests': 0, 'clamped_timeouts': 0, 'retries_skipped': 0,
+                'retry_after_deferred': 0, 'background_handoffs': 0,
+            }
+            self._cuts: Dict[str, int] = {}
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def record_cut(self, where: str) -> None:
+        with self._lock:
+            self._cuts[where] = self._cuts.get(where, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['cuts'] = dict(self._cuts)
+        stats['cut_rate'] = round(stats['cut_requests'] / stats['requests'], 4) if stats['requests'] else 0.0
+        return stats
+
+
+deadline_stats = DeadlineStats()
+
+
+def budget_for(kind: str) -> Optional[float]:
+    """요청 종류별 예산(초). 0 이하로 설정하면 None (데드라인 없음)"""
+    name, default = REQUEST_BUDGETS.get(kind, DEFAULT_BUDGET)
+    budget = float(getattr(settings, name, default) or 0)
+    return budget if budget > 0 else None
+
+
+def current() -> Optional[Deadline]:
+    return _current.get()
+
+
+def remaining() -> Optional[float]:
+    """현재 데드라인까지 남은 시간(초). 데드라인이 없으면 None"""
+    scope = _current.get()
+    return scope.remaining() if scope else None
+
+
+def expired() -> bool:
+    scope = _current.get()
+    return scope is not None and scope.expired()
+
+
+@contextmanager
+def request_deadline(budget: Optional[float], label: str = '') -> Iterator[Optional[Deadline]]:
+    """
+    블록 안의 모든 프로바이더 호출이 지킬 데드라인 설정
+
+    이미 더 이른 데드라인이 있으면 그것을 그대로 쓰고(중첩 시 짧은 쪽 우선), budget이 None이면 아무것도 하지 않는다.
+    """
+    outer = _current.get()
+    if budget is None or (outer is not None and outer.remaining() <= budget):
+        yield outer
+        return
+
+    scope = Deadline(budget, label)
+    token = _current.set(scope)
+    deadline_stats.incr('requests')
+    try:
+        yield scope
+    finally:
+        _current.reset(token)
+        if scope.cuts:
+            deadline_stats.incr('cut_requests')
+            logger.info(f"⏱️ Deadline {budget}s cut {label or 'request'} short {scope.cuts} time(s)")
+
+
+def with_deadline(kind: str):
+    """뷰 데코레이터 - 요청 종류별 예산으로 request_deadline 설정"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            with request_deadline(budget_for(kind), label=f"{kind}:{view.__name__}"):
+                return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def clamp_timeout(timeout: Optional[float], label: str = '') -> Optional[float]:
+    """
+    호출 타임아웃을 남은 시간으로 제한. 남은 시간이 없으면 DeadlineExceeded (요청을 보내지 않음)
+    """
+    scope = _current.get()
+    if scope is None:
+        return timeout
+    left = scope.remaining()
+    if left <= MIN_CALL_TIMEOUT:
+        record_cut('http')
+        raise DeadlineExceeded(label or scope.label)
+    if timeout is None or left < timeout:
+        deadline_stats.incr('clamped_timeouts')
+        return left
+    return timeout
+
+
+def can_retry(wait: float = 0.0) -> bool:
+    """wait초 쉬고 다시 시도해도 남은 시간이 있는지 (데드라인이 없으면 항상 True)"""
+    scope = _current.get()
+    if scope is None:
+        return True
+    if scope.remaining() > wait + MIN_CALL_TIMEOUT:
+        return True
+    deadline_stats.incr('retries_skipped')
+    return False
+
+
+def record_cut(where: str) -> None:
+    """데드라인 때문에 남은 프로바이더/호출을 건너뛴 것을 기록"""
+    scope = _current.get()
+    if scope is not None:
+        scope.note_cut()
+    deadline_stats.record_cut(where)
+
+
+def bind(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    현재 컨텍스트(데드라인 포함)를 붙인 호출 함수 - 스레드 풀 작업에 데드라인 전파용
+
+    ThreadPoolExecutor는 contextvars를 복사하지 않으므로 submit 전에 감싼다. 호출마다 새 사본이 필요.
+    """
+    context = copy_context()
+    return functools.partial(context.run, func)
@@ -0,0 +1,174 @@
+"""
+Chart-width Downsampling for Market Data
+Long series are reduced to at most `max_points` before they leave the server:
+Largest-Triangle-Three-Buckets keeps the visual shape of a close-price line, and
+equal-count bucket aggregation keeps candle extremes (first open, max high, min low,
+last close, summed volume). Both work on the column arrays with C builtins per
+bucket, like resample, and results are cached by series fingerprint
+"""
+
+from array import array
+from typing import Any, Dict, List, Optional, Sequence
+import logging
+
+from django.core.cache import cache
+
+from .ohlcv import OHLCVSeries
+
+logger = logging.getLogger(__name__)
+
+METHODS = ('ohlc', 'lttb')
+
+# 다운샘플 결과 캐시 키 (historical_ 네임스페이스 -> L1에도 올라감)
+CACHE_PREFIX = 'historical_ds:'
+CACHE_TIMEOUT = 300
+
+# LTTB는 양 끝점 + 버킷당 1점이므로 최소 3점
+MIN_POINTS = 3
+
+
+def _bucket_edges(length: int, buckets: int) -> List[int]:
+    """length개를 buckets개의 거의 같은 크기 구간으로 나누는 경계 인덱스 (buckets + 1개)"""
+    return [length * i // buckets for i in range(buckets + 1)]
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """
+    Largest-Triangle-Three-Buckets로 고른 인덱스 (첫/마지막 점은 항상 포함)
+
+    각 버킷에서 (직전 선택점, 현재 후보, 다음 버킷 평균점) 삼각형 넓이가 가장 큰 점을 고른다.
+    넓이는 후보 좌표의 1차식 |a*y + b*x + c|이므로 계수를 버킷마다 한 번만 계산.
+    """
+    length = len(xs)
+    if threshold >= length or threshold < MIN_POINTS:
+        return list(range(length))
+
+    # 가운데 점(1 ~ length-2)을 threshold-2개 버킷으로 분할
+    edges = [edge + 1 for edge in _bucket_edges(length - 2, threshold - 2)]
+    edges.append(length)  # 마지막 버킷의 '다음 버킷' = 마지막 점
+    selected = [0]
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end, next_end = edges[bucket], edges[bucket + 1], edges[bucket + 2]
+        span = next_end - end
+        avg_x = sum(xs[end:next_end]) / span
+        avg_y = sum(ys[end:next_end]) / span
+
+        px, py = xs[previous], ys[previous]
+        a = px - avg_x
+        b = avg_y - py
+        c = -a * py - b * px
+        areas = [abs(a * y + b * x + c) for x, y in zip(xs[start:end], ys[start:end])]
+        previous = start + areas.index(max(areas))
+        selected.append(previous)
+    selected.append(length - 1)
+    return selected
+
+
+def _take(series: OHLCVSeries, indices: List[int]) -> OHLCVSeries:
+    result = OHLCVSeries()
+    result.timestamps = array('q', map(series.timestamps.__getitem__, indices))
+    result.open = array('d', map(series.open.__getitem__, indices))
+    result.high = array('d', map(series.high.__getitem__, indices))
+    result.low = array('d', map(series.low.__getitem__, indices))
+    result.close = array('d', map(series.close.__getitem__, indices))
+    result.volume = array('q', map(series.volume.__getitem__, indices))
+    return result
+
+
+def lttb(series: OHLCVSeries, max_points: int) -> OHLCVSeries:
+    """종가 기준 LTTB (선택된 봉은 원본 그대로 유지)"""
+    return _take(series, lttb_indices(series.timestamps, series.close, max_points))
+
+
+def ohlc_buckets(series: OHLCVSeries, max_points: int) -> OHLCVSeries:
+    """
+    같은 개수 봉 구간별 OHLC 집계 (시가=첫 봉, 고가/저가=최대/최소, 종가=마지막 봉, 거래량=합계)
+
+    시각은 구간 첫 봉 시각 - resample과 같은 규칙
+    """
+    edges = _bucket_edges(len(series), max_points)
+    starts, ends = edges[:-1], edges[1:]
+    slices = list(map(slice, starts, ends))
+    result = OHLCVSeries()
+    result.timestamps = array('q', map(series.timestamps.__getitem__, starts))
+    result.open = array('d', map(series.open.__getitem__, starts))
+    result.high = array('d', map(max, map(series.high.__getitem__, slices)))
+    result.low = array('d', map(min, map(series.low.__getitem__, slices)))
+    result.close = array('d', map(series.close.__getitem__, [end - 1 for end in ends]))
+    result.volume = array('q', map(sum, map(series.volume.__getitem__, slices)))
+    return result
+
+
+def downsample(series: OHLCVSeries, max_points: int, method: str = 'ohlc') -> OHLCVSeries:
+    """
+    max_points 이하로 줄인 시리즈 (이미 작으면 그대로). (내용 다이제스트, max_points, method)별 캐시
+
+    stale/age 표시는 캐시하지 않고 원본 값을 다시 붙인다.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unsupported downsample method: {method}")
+    if len(series) <= max_points:
+        return series
+
+    cache_key = f"{CACHE_PREFIX}{series.fingerprint()}:{max_points}:{method}"
+    result = cache.get(cache_key)
+    if result is None:
+        result = lttb(series, max_points) if method == 'lttb' else ohlc_buckets(series, max_points)
+        cache.set(cache_key, result, CACHE_TIMEOUT)
+    if series.stale:
+        result = result.with_staleness(series.age)
+    return result
+
+
+def _row_price(row: Dict[str, Any]) -> float:
+    try:
+        return float(row.get('close', row.get('price')) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def downsample_rows(rows: List[Dict[str, Any]], max_points: int, method: str = 'ohlc') -> List[Dict[str, Any]]:
+    """
+    프로바이더 원본 행(list of dict)을 그대로의 행 형태로 다운샘플
+
+    lttb는 원본 행을 고르고 (x는 행 순서), ohlc는 구간 첫 행을 복사해 가격/거래량 필드를 집계값으로 교체.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unsupported downsample method: {method}")
+    if len(rows) <= max_points:
+        return rows
+
+    if method == 'lttb':
+        indices = lttb_indices(range(len(rows)), [_row_price(row) for row in rows], max_points)
+        return [rows[index] for index in indices]
+
+    edges = _bucket_edges(len(rows), max_points)
+    aggregated = []
+    for start, end in zip(edges, edges[1:]):
+        bucket = rows[start:end]
+        row = dict(bucket[0])
+        try:
+            row['high'] = max(float(item['high']) for item in bucket)
+            row['low'] = min(float(item['low']) for item in bucket)
+            row['close'] = bucket[-1]['close']
+            row['volume'] = sum(item.get('volume') or 0 for item in bucket)
+        except (KeyError, TypeError, ValueError) as e:
+            # OHLC 필드가 없는 행은 구간 마지막 행으로 대체
+            logger.debug(f"Row bucket aggregation fell back to last row: {e}")
+            row = dict(bucket[-1])
+        for alias in ('price', 'value'):
+            if alias in row and 'close' in row:
+                row[alias] = row['close']
+        aggregated.append(row)
+    return aggregated
+
+
+def parse_max_points(value: Optional[str]) -> Optional[int]:
+    """?max_points 값 파싱. 없으면 None, 잘못된 값이면 ValueError"""
+    if value in (None, ''):
+        return None
+    max_points = int(value)
+    if max_points < MIN_POINTS:
+        raise ValueError(f"max_points must be >= {MIN_POINTS}")
+    return max_points
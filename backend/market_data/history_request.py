@@ -0,0 +1,68 @@
+"""
+Canonical History Requests for Market Data
+Chart, prediction and warming callers spell the same range differently ('1month',
+'30d', '30', '1mo'; '1day' vs '1d'), so history requests are normalized to
+(symbol, market, days, interval) before any cache key is built; a longer cached
+range of the same series answers shorter requests by slicing
+"""
+
+from datetime import datetime
+from typing import Iterable, NamedTuple, Optional
+
+from .bar_store import PERIOD_DAYS, period_start
+from .cache_keys import symbol_key
+from .resample import normalize_interval
+
+DEFAULT_DAYS = 30
+
+# 캐시 키에 쓰는 표준 기간 사다리 (상위 구간 탐색 순서)
+PERIOD_LADDER = tuple(sorted(set(PERIOD_DAYS.values())))
+
+
+def period_days(period: Optional[str], default: int = DEFAULT_DAYS) -> int:
+    """기간 문자열 -> 일수 ('1month', '30d', '30', '1mo' -> 30). 알 수 없으면 default"""
+    if not period:
+        return default
+    days = PERIOD_DAYS.get(period)
+    if days is None and period.rstrip('d').isdigit():
+        days = int(period.rstrip('d'))
+    return days or default
+
+
+class HistoryRequest(NamedTuple):
+    """정규화된 과거 데이터 요청 - 같은 구간/간격이면 표기와 관계없이 같은 캐시 키"""
+
+    symbol: str
+    market: str
+    days: int
+    interval: str
+
+    @classmethod
+    def from_params(cls, symbol: str, period: Optional[str], interval: Optional[str],
+                    market: str = 'us_stock') -> 'HistoryRequest':
+        interval = interval or '1d'
+        return cls(symbol.strip().upper(), market, period_days(period), normalize_interval(interval) or interval)
+
+    @property
+    def period(self) -> str:
+        """프로바이더/봉 저장소에 넘기는 표준 기간 문자열 (period_start가 해석 가능한 'Nd')"""
+        return f"{self.days}d"
+
+    def start(self, now: Optional[datetime] = None) -> datetime:
+        """요청 구간 시작 (UTC 자정 기준). 끝은 항상 현재"""
+        return period_start(self.period, now)
+
+    def cache_key(self) -> str:
+        return symbol_key(f"historical_{self.market}_", self.symbol, self.period, self.interval)
+
+    def with_days(self, days: int) -> 'HistoryRequest':
+        return self._replace(days=days)
+
+    def with_interval(self, interval: str) -> 'HistoryRequest':
+        return self._replace(interval=interval)
+
+    def supersets(self, include_self: bool = False) -> Iterable['HistoryRequest']:
+        """이 요청 구간을 포함하는 더 긴 표준 기간 요청들 (짧은 것부터)"""
+        for days in PERIOD_LADDER:
+            if days > self.days or (include_self and days == self.days):
+                yield self.with_days(days)
@@ -0,0 +1,80 @@
+"""
+Hot Symbol Sets for Market Data
+Symbol lists that user-facing endpoints serve on every page load; shared by the views
+and the cache warmer so both agree on what must stay warm
+"""
+
+from typing import Dict, List
+
+from django.conf import settings
+
+# 인기 주식 (get_popular_stocks)
+POPULAR_STOCKS = ['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA', 'NVDA', 'META', 'NFLX']
+
+# 상위 암호화폐 (get_top_cryptos)
+TOP_CRYPTOS = ['BTC', 'ETH', 'BNB', 'XRP', 'ADA', 'SOL', 'DOT', 'AVAX']
+
+# 시장 지정 없이 들어와도 암호화폐로 취급하는 심볼 (과거 데이터/시세 스트림)
+CRYPTO_SYMBOLS = frozenset([
+    'BTC', 'ETH', 'ADA', 'BNB', 'DOT', 'MATIC', 'SOL', 'LTC', 'XRP', 'DOGE', 'AVAX', 'LINK', 'UNI', 'ATOM',
+])
+
+# 기본 관심 종목 (get_watchlist)
+WATCHLIST_SYMBOLS = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA']
+
+# 예측 가능한 심볼 (charts available_symbols_api)
+PREDICTION_SYMBOLS = {
+    'crypto': [
+        {'symbol': 'BTC', 'name': 'Bitcoin', 'market': 'crypto'},
+        {'symbol': 'ETH', 'name': 'Ethereum', 'market': 'crypto'},
+        {'symbol': 'ADA', 'name': 'Cardano', 'market': 'crypto'},
+        {'symbol': 'DOT', 'name': 'Polkadot', 'market': 'crypto'},
+        {'symbol': 'MATIC', 'name': 'Polygon', 'market': 'crypto'},
+        {'symbol': 'SOL', 'name': 'Solana', 'market': 'crypto'},
+        {'symbol': 'AVAX', 'name': 'Avalanche', 'market': 'crypto'},
+        {'symbol': 'LINK', 'name': 'Chainlink', 'market': 'crypto'},
+    ],
+    'us_stock': [
+        {'symbol': 'AAPL', 'name': 'Apple Inc.', 'market': 'us_stock'},
+        {'symbol': 'GOOGL', 'name': 'Alphabet Inc.', 'market': 'us_stock'},
+        {'symbol': 'MSFT', 'name': 'Microsoft Corporation', 'market': 'us_stock'},
+        {'symbol': 'AMZN', 'name': 'Amazon.com Inc.', 'market': 'us_stock'},
+        {'symbol': 'TSLA', 'name': 'Tesla Inc.', 'market': 'us_stock'},
+        {'symbol': 'META', 'name': 'Meta Platforms Inc.', 'market': 'us_stock'},
+        {'symbol': 'NVDA', 'name': 'NVIDIA Corporation', 'market': 'us_stock'},
+        {'symbol': 'NFLX', 'name': 'Netflix Inc.', 'market': 'us_stock'},
+        {'symbol': 'JPM', 'name': 'JPMorgan Chase & Co.', 'market': 'us_stock'},
+        {'symbol': 'V', 'name': 'Visa Inc.', 'market': 'us_stock'},
+    ],
+    'kr_stock': [
+        {'symbol': '005930', 'name': '삼성전자', 'market': 'kr_stock'},
+        {'symbol': '000660', 'name': 'SK하이닉스', 'market': 'kr_stock'},
+        {'symbol': '035420', 'name': 'NAVER', 'market': 'kr_stock'},
+        {'symbol': '005380', 'name': '현대차', 'market': 'kr_stock'},
+        {'symbol': '207940', 'name': '삼성바이오로직스', 'market': 'kr_stock'},
+        {'symbol': '006400', 'name': '삼성SDI', 'market': 'kr_stock'},
+        {'symbol': '051910', 'name': 'LG화학', 'market': 'kr_stock'},
+        {'symbol': '012330', 'name': '현대모비스', 'market': 'kr_stock'},
+    ]
+}
+
+
+def _unique(*symbol_lists) -> List[str]:
+    return list(dict.fromkeys(symbol for symbols in symbol_lists for symbol in symbols))
+
+
+def get_warm_symbols() -> Dict[str, List[str]]:
+    """
+    캐시 워머가 유지할 시장별 심볼 목록
+
+    MARKET_DATA_WARM_STOCKS / MARKET_DATA_WARM_CRYPTOS 설정이 있으면 그 목록을,
+    없으면 뷰에서 쓰는 인기/상위/관심/예측 심볼의 합집합을 사용한다.
+    kr_stock은 현재 프로바이더 체인이 지원하지 않아 제외한다.
+    """
+    stocks = getattr(settings, 'MARKET_DATA_WARM_STOCKS', None) or _unique(
+        POPULAR_STOCKS, WATCHLIST_SYMBOLS, [item['symbol'] for item in PREDICTION_SYMBOLS['us_stock']]
+    )
+    cryptos = getattr(settings, 'MARKET_DATA_WARM_CRYPTOS', None) or _unique(
+        TOP_CRYPTOS, [item['symbol'] for item in PREDICTION_SYMBOLS['crypto']]
+    )
+    return {'us_stock': list(stocks), 'crypto': list(cryptos)}
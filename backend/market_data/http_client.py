@@ -0,0 +1,208 @@
+"""
+Pooled HTTP Client Layer for Market Data Providers
+Keeps one long-lived keep-alive session per upstream host so that TCP/TLS setup
+is paid once per connection instead of once per request
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.cache import cache
+
+from .deadline import clamp_timeout, deadline_stats
+from .rate_limiter import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# 업스트림 호스트 -> 프로바이더 코드 (MarketDataSource.code와 동일)
+PROVIDER_HOSTS = {
+    'finnhub.io': 'finnhub',
+    'www.alphavantage.co': 'alpha_vantage',
+    'api.twelvedata.com': 'twelve_data',
+    'api.tiingo.com': 'tiingo',
+    'api.marketstack.com': 'marketstack',
+    'api.coingecko.com': 'coingecko',
+    'query1.finance.yahoo.com': 'yahoo',
+    'api.polygon.io': 'polygon',
+}
+
+# Retry-After 상한/기본값 (초) - 프로바이더 비활성화 기간으로 사용
+MAX_RETRY_AFTER = 300
+DEFAULT_RETRY_AFTER = 60
+
+
+def retry_after_seconds(response: requests.Response, default: float = DEFAULT_RETRY_AFTER) -> float:
+    """429 응답의 대기 시간 (Retry-After 초/HTTP 날짜 > X-RateLimit-Reset epoch > default), 최대 5분"""
+    retry_after = response.headers.get('Retry-After')
+    wait = None
+    if retry_after:
+        try:
+            wait = float(retry_after)
+        except ValueError:
+            try:
+                wait = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                wait = None
+    reset_time = response.headers.get('X-RateLimit-Reset')
+    if wait is None and reset_time:
+        try:
+            wait = int(reset_time) - time.time()
+        except ValueError:
+            wait = None
+    if wait is None:
+        wait = default
+    return max(1.0, min(float(wait), MAX_RETRY_AFTER))
+
+
+def defer_provider(provider: str, seconds: float) -> None:
+    """
+    429를 받은 프로바이더를 seconds 동안 폴백 체인에서 제외 (rate_limit_{provider} 키)
+
+    웹 워커가 Retry-After만큼 잠들지 않도록 대기 대신 비활성화로 기록하고, 이후 조회는
+    stale 값 + 백그라운드 갱신이 이어받는다. 이미 더 긴 비활성화가 있으면 유지.
+    """
+    if cache.add(f"rate_limit_{provider}", True, timeout=int(seconds)):
+        deadline_stats.incr('retry_after_deferred')
+        logger.warning(f"⏳ {provider} returned 429, deferring it for {int(seconds)}s instead of waiting")
+
+
+class ProviderBudgetExhausted(requests.exceptions.RequestException):
+    """프로바이더 요청 예산이 없어 요청을 보내지 않음"""
+
+    def __init__(self, provider: str):
+        super().__init__(f"{provider} request budget exhausted")
+        self.provider = provider
+
+
+class ProviderClientRegistry:
+    """업스트림 호스트별 keep-alive 세션 레지스트리"""
+
+    DEFAULT_HEADERS = {
+        'Accept': 'application/json',
+        'Accept-Encoding': 'gzip, deflate',  # 응답 압축 해제는 requests가 자동 처리
+        'Connection': 'keep-alive',
+        'User-Agent': 'StockChart-MarketData/1.0',
+    }
+
+    def __init__(self, pool_size: int = 10, pool_block: bool = False,
+                 host_timeouts: Optional[Dict[str, float]] = None, default_timeout: float = 10,
+                 rate_limiter=None):
+        self.pool_size = pool_size
+        self.pool_block = pool_block
+        self.host_timeouts = dict(host_timeouts or {})
+        self.default_timeout = default_timeout
+        self.rate_limiter = rate_limiter  # None이면 요청 예산 확인 안 함
+        self._sessions: Dict[str, requests.Session] = {}
+        self._request_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        # 재시도는 _make_enhanced_request/폴백 체인이 담당하므로 어댑터 재시도는 끔
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            pool_block=self.pool_block,
+            max_retries=0,
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update(self.DEFAULT_HEADERS)
+        return session
+
+    def session_for(self, url: str) -> requests.Session:
+        """URL의 호스트에 해당하는 세션 반환 (최초 요청 시 생성)"""
+        host = self._host_key(url)
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = self._create_session()
+                    self._sessions[host] = session
+                    logger.info(f"Created pooled session for {host} (pool_size={self.pool_size})")
+        return session
+
+    def timeout_for(self, url: str, timeout: Optional[float] = None) -> float:
+        """호스트별 설정 타임아웃 > 호출부 타임아웃 > 기본 타임아웃 순으로 결정"""
+        hostname = urlsplit(url).hostname or ''
+        if hostname in self.host_timeouts:
+            return self.host_timeouts[hostname]
+        return timeout if timeout is not None else self.default_timeout
+
+    @staticmethod
+    def provider_for(url: str) -> Optional[str]:
+        return PROVIDER_HOSTS.get(urlsplit(url).hostname or '')
+
+    def get(self, url: str, params: dict = None, headers: dict = None,
+            timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """
+        풀링된 세션으로 GET 요청
+
+        요청 데드라인이 있으면 타임아웃을 남은 시간으로 줄이고, 남은 시간이 없으면 토큰을 쓰기 전에
+        DeadlineExceeded. 프로바이더 예산이 없으면 요청 없이 ProviderBudgetExhausted.
+        429 응답의 Retry-After는 여기서 기다리지 않고 프로바이더 비활성화 기간으로 기록한다.
+        """
+        timeout = clamp_timeout(self.timeout_for(url, timeout), label=urlsplit(url).hostname or '')
+        provider = self.provider_for(url)
+        if self.rate_limiter is not None and provider and not self.rate_limiter.try_acquire(provider):
+            raise ProviderBudgetExhausted(provider)
+        host = self._host_key(url)
+        with self._lock:
+            self._request_counts[host] = self._request_counts.get(host, 0) + 1
+        response = self.session_for(url).get(
+            url,
+            params=params,
+            headers=headers,
+            timeout=timeout,
+            **kwargs
+        )
+        if response.status_code == 429 and provider:
+            defer_provider(provider, retry_after_seconds(response))
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'pool_size': self.pool_size,
+                'hosts': dict(self._request_counts),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+# 전역 인스턴스 - 지연 초기화
+_provider_clients = None
+_provider_clients_lock = threading.Lock()
+
+
+def get_provider_clients() -> ProviderClientRegistry:
+    """ProviderClientRegistry 인스턴스를 지연 초기화로 반환"""
+    global _provider_clients
+    if _provider_clients is None:
+        with _provider_clients_lock:
+            if _provider_clients is None:
+                _provider_clients = ProviderClientRegistry(
+                    pool_size=getattr(settings, 'MARKET_DATA_HTTP_POOL_SIZE', 10),
+                    pool_block=getattr(settings, 'MARKET_DATA_HTTP_POOL_BLOCK', False),
+                    host_timeouts=getattr(settings, 'MARKET_DATA_HTTP_TIMEOUTS', {}),
+                    default_timeout=getattr(settings, 'MARKET_DATA_HTTP_DEFAULT_TIMEOUT', 10),
+                    rate_limiter=get_rate_limiter(),
+                )
+    return _provider_clients
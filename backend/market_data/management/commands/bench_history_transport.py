@@ -0,0 +1,70 @@
+import gzip
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from market_data.binary_series import decode_series, encode_series
+from market_data.ohlcv import OHLCVSeries
+
+
+def _minute_series(bars):
+    """합성 1분봉 시리즈 (2024-01-02 14:30 UTC부터)"""
+    start = 1704205800
+    closes = [100 + (i % 500) * 0.01 for i in range(bars)]
+    return OHLCVSeries(
+        [start + i * 60 for i in range(bars)], closes, [c + 0.05 for c in closes],
+        [c - 0.05 for c in closes], closes, [1000 + i % 97 for i in range(bars)],
+    )
+
+
+def _dumps(payload):
+    return json.dumps(payload, separators=(',', ':')).encode()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark history transport encodings (JSON rows, JSON columns, binary typed arrays)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='5000,50000,500000', help='Comma-separated bar counts')
+        parser.add_argument('--runs', type=int, default=5, help='Timed runs per measurement')
+
+    def handle(self, *args, **options):
+        runs = options['runs']
+        for bars in (int(size) for size in options['sizes'].split(',') if size.strip()):
+            series = _minute_series(bars)
+            self.stdout.write(f'--- {bars} bars ---')
+
+            # 이전/기본 방식: 행 dict 생성 후 JSON 직렬화
+            rows = _dumps({'data': series.to_rows()})
+            self._report('json rows', rows, lambda: _dumps({'data': series.to_rows()}),
+                         lambda: json.loads(rows), runs)
+            columns = _dumps({'format': 'columns', 'data': series.to_columns()})
+            self._report('json columns', columns, lambda: _dumps({'data': series.to_columns()}),
+                         lambda: json.loads(columns), runs)
+            blob = encode_series(series)
+            # 디코딩은 브라우저의 typed-array 뷰 생성에 해당 (memoryview cast, 복사 없음)
+            self._report('binary', blob, lambda: encode_series(series),
+                         lambda: memoryview(blob)[32 + bars * 8:32 + bars * 8 * 5].cast('d'), runs)
+            self._report('binary (copy decode)', blob, lambda: encode_series(series),
+                         lambda: decode_series(blob), runs)
+
+    def _report(self, label, body, encode, decode, runs):
+        encode_ms = statistics.median(self._measure(encode, runs))
+        decode_ms = statistics.median(self._measure(decode, runs))
+        gzipped = len(gzip.compress(body, compresslevel=6))
+        self.stdout.write(
+            f'{label:>22}: {len(body) / 1024:>9.1f}KB (gzip {gzipped / 1024:>8.1f}KB) '
+            f'encode p50={encode_ms:.2f}ms decode p50={decode_ms:.2f}ms'
+        )
+
+    @staticmethod
+    def _measure(call, runs):
+        call()  # 워밍업
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            call()
+            samples.append((time.perf_counter() - start) * 1000)
+        return samples
@@ -0,0 +1,90 @@
+import json
+import ssl
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+import urllib3
+from django.core.management.base import BaseCommand
+
+from market_data.http_client import ProviderClientRegistry
+
+
+class _StubQuoteHandler(BaseHTTPRequestHandler):
+    """Finnhub /quote 형태의 고정 응답을 돌려주는 로컬 스텁 서버"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive 지원
+    disable_nagle_algorithm = True  # 헤더/본문 분리 전송 시 delayed-ACK 지연 방지
+    body = json.dumps({'c': 175.5, 'd': 2.3, 'dp': 1.33, 'h': 176.0, 'l': 172.1, 'o': 173.2, 'pc': 173.2}).encode()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark cold-connection vs pooled keep-alive latency against a local stub provider'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per mode')
+        parser.add_argument('--certfile', help='TLS certificate for the stub server (enables HTTPS)')
+        parser.add_argument('--keyfile', help='TLS private key for the stub server')
+
+    def handle(self, *args, **options):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _StubQuoteHandler)
+        scheme = 'http'
+        if options.get('certfile'):
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(options['certfile'], options.get('keyfile'))
+            server.socket = context.wrap_socket(server.socket, server_side=True)
+            scheme = 'https'
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"{scheme}://127.0.0.1:{server.server_address[1]}/api/v1/quote"
+        params = {'symbol': 'AAPL', 'token': 'bench'}
+        count = options['requests']
+
+        try:
+            cold = self._measure(lambda: requests.get(url, params=params, timeout=5, verify=False), count)
+
+            registry = ProviderClientRegistry(pool_size=4)
+            registry.get(url, params=params, verify=False)  # 커넥션 워밍업
+            pooled = self._measure(lambda: registry.get(url, params=params, timeout=5, verify=False), count)
+            registry.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.stdout.write(f'Stub provider: {url} ({count} requests per mode)')
+        self._report('cold connection', cold)
+        self._report('pooled keep-alive', pooled)
+        speedup = statistics.median(cold) / statistics.median(pooled)
+        self.stdout.write(self.style.SUCCESS(f'p50 speedup: {speedup:.1f}x'))
+
+    @staticmethod
+    def _measure(call, count):
+        samples = []
+        for _ in range(count):
+            start = time.perf_counter()
+            response = call()
+            response.raise_for_status()
+            samples.append((time.perf_counter() - start) * 1000)
+        return samples
+
+    def _report(self, label, samples):
+        ordered = sorted(samples)
+        p95 = ordered[int(0.95 * (len(ordered) - 1))]
+        self.stdout.write(
+            f'{label:>18}: p50={statistics.median(ordered):.3f}ms '
+            f'p95={p95:.3f}ms mean={statistics.mean(ordered):.3f}ms'
+        )
@@ -0,0 +1,76 @@
+import pickle
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+
+from market_data.ohlcv import OHLCVSeries
+from market_data.resample import resample
+
+
+def _weekday_series(years):
+    """합성 일봉 시리즈 (주말 제외, 2015-01-01부터)"""
+    first_day = 16436  # 2015-01-01 epoch 일수
+    days = [day for day in range(first_day, first_day + int(years * 365.25)) if (day + 3) % 7 < 5]
+    closes = [100 + (day % 50) * 0.5 for day in days]
+    return OHLCVSeries(
+        [day * 86400 for day in days], closes, [c + 1 for c in closes],
+        [c - 1 for c in closes], closes, [1000 + day % 97 for day in days],
+    )
+
+
+class Command(BaseCommand):
+    help = 'Benchmark resampling of array-backed daily bars to 1w/1M/1Q/1Y against the legacy dict aggregation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=float, default=10, help='Years of daily bars to resample')
+        parser.add_argument('--runs', type=int, default=200, help='Timed runs per interval')
+
+    def handle(self, *args, **options):
+        series = _weekday_series(options['years'])
+        runs = options['runs']
+        self.stdout.write(f'{len(series)} daily bars ({options["years"]:g} years), {runs} runs per interval')
+
+        for interval in ('1w', '1M', '1Q', '1Y'):
+            buckets = len(resample(series, interval))
+            samples = self._measure(lambda: resample(series, interval), runs)
+            self._report(f'resample {interval} ({buckets} bars)', samples)
+
+        # 이전 방식: list of dict + 행마다 strptime 후 dict 그룹핑
+        rows = series.to_rows()
+        legacy = self._measure(lambda: self._legacy_weekly(rows), max(1, runs // 20))
+        self._report('legacy dict 1w', legacy)
+
+        blob = pickle.dumps(series)
+        self._report('series pickle round trip', self._measure(lambda: pickle.loads(pickle.dumps(series)), runs))
+        self._report('rows pickle round trip', self._measure(lambda: pickle.loads(pickle.dumps(rows)), max(1, runs // 20)))
+        self.stdout.write(f'pickled size: series={len(blob)}B rows={len(pickle.dumps(rows))}B')
+
+    @staticmethod
+    def _legacy_weekly(rows):
+        groups = {}
+        for row in rows:
+            parsed = datetime.strptime(row['timestamp'], '%Y-%m-%d')
+            week_start = parsed - timedelta(days=parsed.weekday())
+            groups.setdefault(week_start.strftime('%Y-%W'), []).append(row)
+        return [
+            {'open': group[0]['open'], 'high': max(r['high'] for r in group), 'low': min(r['low'] for r in group),
+             'close': group[-1]['close'], 'volume': sum(r['volume'] for r in group)}
+            for _, group in sorted(groups.items())
+        ]
+
+    @staticmethod
+    def _measure(call, runs):
+        call()  # 워밍업
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            call()
+            samples.append((time.perf_counter() - start) * 1000)
+        return samples
+
+    def _report(self, label, samples):
+        ordered = sorted(samples)
+        p95 = ordered[int(0.95 * (len(ordered) - 1))]
+        self.stdout.write(f'{label:>28}: p50={statistics.median(ordered):.3f}ms p95={p95:.3f}ms')
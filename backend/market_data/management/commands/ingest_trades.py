@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from market_data.hot_symbols import get_warm_symbols
+from market_data.tick_ingest import FinnhubTradeFeed, ReplayFeed, build_symbol_map, ingestor_from_settings
+
+
+def _split(value):
+    return [s.strip().upper() for s in value.split(',') if s.strip()]
+
+
+class Command(BaseCommand):
+    help = 'Ingest live trades from the Finnhub websocket into quotes and 1m/5m/1h candles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stocks', help='Comma-separated US stock symbols (default: hot symbol set)')
+        parser.add_argument('--cryptos', help='Comma-separated crypto symbols (default: hot symbol set)')
+        parser.add_argument('--replay', help='Replay recorded Finnhub messages (JSON Lines) instead of the websocket')
+
+    def handle(self, *args, **options):
+        symbols = get_warm_symbols()
+        stocks = _split(options['stocks']) if options.get('stocks') is not None else symbols['us_stock']
+        cryptos = _split(options['cryptos']) if options.get('cryptos') is not None else symbols['crypto']
+        symbol_map = build_symbol_map(stocks, cryptos)
+        if not symbol_map:
+            raise CommandError('No symbols to ingest')
+
+        if options.get('replay'):
+            feed = ReplayFeed.from_file(options['replay'])
+        else:
+            api_key = getattr(settings, 'FINNHUB_API_KEY', '')
+            if not api_key:
+                raise CommandError('FINNHUB_API_KEY is not configured')
+            feed = FinnhubTradeFeed(api_key, list(symbol_map))
+
+        ingestor = ingestor_from_settings(feed, symbol_map)
+        self.stdout.write(f"📡 Ingesting trades for {len(stocks)} stocks, {len(cryptos)} cryptos")
+        try:
+            ingestor.run()
+        except KeyboardInterrupt:
+            feed.stop()
+        self.stdout.write(f"Stats: {ingestor.stats()}")
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from market_data.cache_keys import purge_symbol
+
+
+class Command(BaseCommand):
+    help = 'Invalidate every cached quote/history entry for the given symbols (bumps their cache generation)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('symbols', nargs='+', help='Symbols to purge, e.g. AAPL BTC')
+
+    def handle(self, *args, **options):
+        symbols = [s.strip().upper() for s in options['symbols'] if s.strip()]
+        if not symbols:
+            raise CommandError('At least one symbol is required')
+        for symbol in symbols:
+            generation = purge_symbol(symbol)
+            self.stdout.write(f"🧹 {symbol}: cache generation -> {generation}")
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from market_data.services import MarketDataService
+from market_data.universe import (
+    EXCHANGE_MARKETS, builtin_listings, coingecko_listings, finnhub_listings, load_fixture, sync_listings,
+)
+
+
+class Command(BaseCommand):
+    help = 'Sync the charts.Stock/Market symbol universe from provider listings or a CSV/JSON fixture'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', help='CSV (symbol,name[,market,exchange,coingecko_id]) or JSON listing fixture')
+        parser.add_argument('--market', default='us_stock', help='Market for fixture rows without a market column')
+        parser.add_argument('--exchanges', default='',
+                            help=f"Comma-separated Finnhub exchanges to pull ({', '.join(EXCHANGE_MARKETS)})")
+        parser.add_argument('--crypto-pages', type=int, default=0,
+                            help='CoinGecko /coins/markets pages of 250 coins to pull (by market cap)')
+        parser.add_argument('--batch-size', type=int, default=500, help='bulk_create/bulk_update batch size')
+        parser.add_argument('--prune', action='store_true',
+                            help='Deactivate symbols of the synced markets that are missing from the listings')
+        parser.add_argument('--dry-run', action='store_true', help='Report the diff without writing')
+
+    def handle(self, *args, **options):
+        # 원본을 하나도 지정하지 않으면 내장 예측 심볼만 동기화
+        listings = []
+        if options['file']:
+            try:
+                listings.extend(load_fixture(options['file'], options['market']))
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not read {options['file']}: {e}")
+
+        exchanges = [code.strip().upper() for code in options['exchanges'].split(',') if code.strip()]
+        if exchanges or options['crypto_pages']:
+            service = MarketDataService()
+            for exchange in exchanges:
+                if exchange not in EXCHANGE_MARKETS:
+                    raise CommandError(f"Unsupported exchange: {exchange}")
+                if not service.finnhub_key:
+                    raise CommandError('FINNHUB_API_KEY is required to pull exchange listings')
+                pulled = finnhub_listings(service, exchange)
+                self.stdout.write(f"📥 finnhub {exchange}: {len(pulled)} listings")
+                listings.extend(pulled)
+            if options['crypto_pages']:
+                pulled = coingecko_listings(service, options['crypto_pages'])
+                self.stdout.write(f"📥 coingecko: {len(pulled)} listings")
+                listings.extend(pulled)
+
+        if not listings:
+            listings = builtin_listings()
+            self.stdout.write(f"📥 builtin: {len(listings)} listings")
+
+        counts = sync_listings(listings, batch_size=options['batch_size'], prune=options['prune'],
+                               dry_run=options['dry_run'])
+        prefix = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(prefix + ' '.join(f"{name}={count}" for name, count in counts.items()))
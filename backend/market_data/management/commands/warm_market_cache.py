@@ -0,0 +1,77 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from market_data.hot_symbols import get_warm_symbols
+from market_data.services import get_market_service
+from market_data.warming import CacheWarmer
+
+
+def _split(value):
+    return [s.strip().upper() for s in value.split(',') if s.strip()]
+
+
+class Command(BaseCommand):
+    help = 'Keep quotes, 1d/1w/1M history and indices for hot symbols warm, refreshing just before expiry'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run a single warming pass and exit')
+        parser.add_argument('--tick', type=float, default=5.0, help='Seconds between warming passes')
+        parser.add_argument('--lead', type=float, default=30.0,
+                            help='Refresh entries this many seconds before their soft TTL expires')
+        parser.add_argument('--jitter', type=float, default=10.0,
+                            help='Random extra lead (seconds) per entry to spread refreshes')
+        parser.add_argument('--stocks', help='Comma-separated US stock symbols (default: hot symbol set)')
+        parser.add_argument('--cryptos', help='Comma-separated crypto symbols (default: hot symbol set)')
+        parser.add_argument('--period', default='1month', help='History period to keep warm')
+        parser.add_argument('--intervals', default='1d,1w,1M', help='History intervals to keep warm')
+        parser.add_argument('--no-indices', action='store_true', help='Do not warm market indices')
+        parser.add_argument('--report-every', type=float, default=60.0, help='Seconds between stats reports')
+
+    def handle(self, *args, **options):
+        symbols = get_warm_symbols()
+        if options.get('stocks') is not None:
+            symbols['us_stock'] = _split(options['stocks'])
+        if options.get('cryptos') is not None:
+            symbols['crypto'] = _split(options['cryptos'])
+
+        warmer = CacheWarmer(
+            get_market_service(),
+            symbols,
+            period=options['period'],
+            intervals=[i.strip() for i in options['intervals'].split(',') if i.strip()],
+            include_indices=not options['no_indices'],
+            lead=options['lead'],
+            jitter=options['jitter'],
+        )
+        self.stdout.write(
+            f"🔥 Warming {len(warmer.targets)} cache entries "
+            f"({len(symbols['us_stock'])} stocks, {len(symbols['crypto'])} cryptos)"
+        )
+
+        if options['once']:
+            result = warmer.run_once()
+            self.stdout.write(f"Pass: checked={result['checked']} cold={result['cold']} refreshed={result['refreshed']}")
+            self._report(warmer)
+            return
+
+        last_report = time.monotonic()
+        try:
+            while True:
+                started = time.monotonic()
+                warmer.run_once()
+                if time.monotonic() - last_report >= options['report_every']:
+                    self._report(warmer)
+                    last_report = time.monotonic()
+                time.sleep(max(0.0, options['tick'] - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping cache warmer')
+            self._report(warmer)
+
+    def _report(self, warmer):
+        stats = warmer.stats()
+        self.stdout.write(self.style.SUCCESS(
+            f"📊 warm hit ratio={stats['warm_hit_ratio']:.1%} cold ratio={stats['cold_ratio']:.1%} "
+            f"(checks={stats['checks']} refreshed={stats['refreshed']} failed={stats['failed']} "
+            f"rate_limited={stats['rate_limited']})"
+        ))
@@ -0,0 +1,64 @@
+"""
+Response Compression for Market Data
+Large JSON bodies (chart history, quote lists) are compressed with brotli when the
+client accepts it and the optional brotli package is installed, otherwise gzip;
+streaming responses (SSE quote stream, files) are passed through untouched
+"""
+
+import re
+import logging
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성 - 없으면 gzip만 사용
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+_ACCEPTS_BR = re.compile(r'\bbr\b')
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Accept-Encoding 협상 압축 (br 우선, gzip 대체)
+
+    MARKET_DATA_COMPRESS_MIN_BYTES 미만 응답과 스트리밍 응답은 압축하지 않는다.
+    (SSE는 청크 단위 압축 시 버퍼링/지연이 생기고, 작은 응답은 압축 이득보다 CPU 비용이 큼)
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if len(response.content) < getattr(settings, 'MARKET_DATA_COMPRESS_MIN_BYTES', 1024):
+            return response
+
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is not None and _ACCEPTS_BR.search(accept_encoding):
+            return self._brotli(response)
+        return super().process_response(request, response)
+
+    def _brotli(self, response):
+        patch_vary_headers(response, ('Accept-Encoding',))
+        try:
+            compressed = brotli.compress(
+                response.content,
+                quality=getattr(settings, 'MARKET_DATA_BROTLI_QUALITY', 5),
+            )
+        except Exception as e:
+            logger.error(f"Brotli compression failed: {e}")
+            return response
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        # 압축 표현은 바이트가 달라지므로 강한 ETag는 약한 ETag로 (GZipMiddleware와 동일)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
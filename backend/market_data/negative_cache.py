@@ -0,0 +1,234 @@
+"""
+Negative Caching and Provider Capabilities for Market Data Symbols
+A typo or a ticker no provider serves used to walk every provider's timeout path on
+every request. A static capability map drops providers that cannot serve the
+symbol's market (e.g. KRX tickers), empty answers are remembered per
+(provider, symbol, data type) for a short TTL, and a symbol that no capable provider
+knows is memoized in-process so repeat requests skip the chain entirely
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache_keys import symbol_key
+from .hot_symbols import CRYPTO_SYMBOLS
+from .universe import stock_directory
+
+logger = logging.getLogger(__name__)
+
+# 프로바이더 -> 서비스하는 시장 (호출 함수가 심볼을 변환 없이 넘기는 현재 기준). 목록에 없는 프로바이더는 제한 없음
+PROVIDER_MARKETS = {
+    'finnhub': frozenset({'us_stock', 'crypto', 'forex'}),
+    'alpha_vantage': frozenset({'us_stock', 'crypto', 'forex'}),
+    'twelve_data': frozenset({'us_stock', 'crypto', 'forex'}),
+    'tiingo': frozenset({'us_stock', 'crypto'}),
+    'marketstack': frozenset({'us_stock', 'crypto'}),
+    'polygon': frozenset({'us_stock', 'crypto', 'forex'}),
+    'coingecko': frozenset({'crypto'}),
+    'yahoo': frozenset({'us_stock', 'kr_stock', 'index'}),
+}
+
+# 프로바이더에 보낼 수 있는 심볼 형식 (영숫자로 시작, 티커 구분자만 허용)
+VALID_SYMBOL = re.compile(r'^[A-Z0-9^][A-Z0-9.\-/=:^]{0,19}$')
+KR_TICKER = re.compile(r'^\d{6}(\.(KS|KQ))?$')
+
+
+def symbol_market(symbol: str, market: Optional[str] = 'us_stock') -> Optional[str]:
+    """
+    심볼 모양으로 판단한 시장 ('005930' -> kr_stock, '^GSPC' -> index). 형식이 잘못된 심볼은 None
+
+    market='crypto'면 모양과 관계없이 crypto.
+    """
+    symbol = symbol.strip().upper()
+    if not VALID_SYMBOL.match(symbol):
+        return None
+    if market == 'crypto':
+        return 'crypto'
+    if KR_TICKER.match(symbol):
+        return 'kr_stock'
+    if symbol.startswith('^'):
+        return 'index'
+    return market or 'us_stock'
+
+
+def provider_serves(provider: str, market: Optional[str]) -> bool:
+    if market is None:
+        return False
+    markets = PROVIDER_MARKETS.get(provider)
+    return markets is None or market in markets
+
+
+class NegativeCache:
+    """
+    (프로바이더, 심볼, 데이터 종류)별 빈 응답 기억 + 미지 심볼 메모
+
+    프로바이더별 미스는 공유 캐시에 provider_ttl초 동안 저장해 체인에서 그 프로바이더를 건너뛴다.
+    종목 마스터/인기 목록에 있는 심볼은 모든 프로바이더가 미스로 기록돼 있어도 체인을 비우지 않는다
+    (장애 중 기록된 미스가 정상 심볼을 막지 않도록). 그 밖의 심볼은 서비스 가능한 프로바이더가
+    모두 모른다고 답하면 symbol_ttl초 동안 미지 심볼로 기억하고, 프로세스 메모로 먼저 확인한다.
+    """
+
+    def __init__(self, provider_ttl: Optional[int] = None, symbol_ttl: Optional[int] = None,
+                 max_local_entries: int = 4096):
+        self._provider_ttl = provider_ttl
+        self._symbol_ttl = symbol_ttl
+        self.max_local_entries = max_local_entries
+        self._lock = threading.Lock()
+        self._local: 'OrderedDict[Tuple[str, str], float]' = OrderedDict()  # (심볼, 종류) -> 만료 시각
+        self._counters = {'capability_skips': 0, 'provider_skips': 0, 'misses_recorded': 0,
+                          'unknown_marked': 0, 'unknown_hits': 0}
+
+    @property
+    def provider_ttl(self) -> int:
+        if self._provider_ttl is not None:
+            return self._provider_ttl
+        return getattr(settings, 'MARKET_DATA_NEGATIVE_CACHE_TTL', 300)
+
+    @property
+    def symbol_ttl(self) -> int:
+        if self._symbol_ttl is not None:
+            return self._symbol_ttl
+        return getattr(settings, 'MARKET_DATA_UNKNOWN_SYMBOL_TTL', 600)
+
+    def _incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    @staticmethod
+    def _normalize(symbol: str) -> str:
+        return symbol.strip().upper()
+
+    @staticmethod
+    def provider_key(provider: str, symbol: str, kind: str) -> str:
+        # 세대 붙은 키 - purge_symbol로 심볼의 미스 기록도 함께 지워짐
+        return symbol_key(f"neg_{kind}_{provider}_", symbol)
+
+    @staticmethod
+    def unknown_key(symbol: str, kind: str) -> str:
+        return symbol_key(f"neg_{kind}_", symbol)
+
+    @staticmethod
+    def is_known(symbol: str) -> bool:
+        """종목 마스터(동기화된 Stock)나 암호화폐 목록에 있는 심볼"""
+        return symbol in CRYPTO_SYMBOLS or stock_directory.stock_id(symbol, None) is not None
+
+    # ------------------------------------------------------------------
+    # 미지 심볼
+    # ------------------------------------------------------------------
+    def _local_hit(self, symbol: str, kind: str) -> bool:
+        with self._lock:
+            expires_at = self._local.get((symbol, kind))
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del self._local[(symbol, kind)]
+                return False
+            return True
+
+    def _remember_local(self, symbol: str, kind: str, ttl: float) -> None:
+        with self._lock:
+            self._local[(symbol, kind)] = time.monotonic() + ttl
+            self._local.move_to_end((symbol, kind))
+            while len(self._local) > self.max_local_entries:
+                self._local.popitem(last=False)
+
+    def is_unknown(self, symbol: str, kind: str, local_only: bool = False) -> bool:
+        """
+        어느 프로바이더도 모르는 심볼로 기억돼 있는지
+
+        local_only=True면 프로세스 메모만 확인 (정상 심볼 요청에 캐시 왕복을 더하지 않는 요청 경로용).
+        """
+        symbol = self._normalize(symbol)
+        if self._local_hit(symbol, kind):
+            self._incr('unknown_hits')
+            return True
+        if local_only or not VALID_SYMBOL.match(symbol):
+            # 형식이 잘못된 심볼은 캐시 키로 쓰지 않고 프로세스 메모에만 기록
+            return False
+        if cache.get(self.unknown_key(symbol, kind)):
+            # 다른 워커가 기록한 미지 심볼 - 이후 요청은 프로세스 메모에서 응답
+            self._remember_local(symbol, kind, self.symbol_ttl)
+            self._incr('unknown_hits')
+            return True
+        return False
+
+    def mark_unknown(self, symbol: str, kind: str) -> bool:
+        symbol = self._normalize(symbol)
+        if self.is_known(symbol):
+            return False
+        if VALID_SYMBOL.match(symbol):
+            cache.set(self.unknown_key(symbol, kind), True, timeout=self.symbol_ttl)
+        self._remember_local(symbol, kind, self.symbol_ttl)
+        self._incr('unknown_marked')
+        logger.info(f"🚫 {symbol} is not served by any provider for {kind}, skipping it for {self.symbol_ttl}s")
+        return True
+
+    # ------------------------------------------------------------------
+    # 프로바이더별 미스
+    # ------------------------------------------------------------------
+    def filter(self, kind: str, symbol: str, market: Optional[str], chain: List[tuple]) -> List[tuple]:
+        """
+        (api_name, ...) 체인에서 심볼 시장을 서비스하지 않거나 최근 이 심볼에 빈 응답을 준 프로바이더 제외
+        """
+        symbol = self._normalize(symbol)
+        target = symbol_market(symbol, market)
+        capable = [entry for entry in chain if provider_serves(entry[0], target)]
+        if len(capable) < len(chain):
+            self._incr('capability_skips', len(chain) - len(capable))
+        if not capable:
+            return []
+
+        keys = {self.provider_key(entry[0], symbol, kind): entry for entry in capable}
+        missed = cache.get_many(list(keys))
+        allowed = [entry for key, entry in keys.items() if key not in missed]
+        if not allowed and self.is_known(symbol):
+            # 알려진 심볼은 미스 기록이 전부여도 다시 시도 (일시 장애로 남은 기록일 수 있음)
+            return capable
+        if missed:
+            self._incr('provider_skips', len(capable) - len(allowed))
+        return allowed
+
+    def record_miss(self, provider: str, symbol: str, kind: str) -> None:
+        """프로바이더가 이 심볼에 빈 응답을 줌 (타임아웃/데드라인 절단은 호출부에서 제외)"""
+        cache.set(self.provider_key(provider, self._normalize(symbol), kind), True, timeout=self.provider_ttl)
+        self._incr('misses_recorded')
+
+    def conclude(self, kind: str, symbol: str, market: Optional[str], providers: Iterable[str]) -> bool:
+        """
+        체인이 실패한 뒤 호출 - 심볼 시장을 서비스하는 프로바이더가 없거나 모두 미스로 기록돼 있으면 미지 심볼로 기억
+
+        데드라인/레이트 리밋으로 호출하지 못한 프로바이더는 미스 기록이 없으므로 결론을 내리지 않는다.
+        """
+        symbol = self._normalize(symbol)
+        target = symbol_market(symbol, market)
+        capable = [provider for provider in dict.fromkeys(providers) if provider_serves(provider, target)]
+        if capable:
+            keys = [self.provider_key(provider, symbol, kind) for provider in capable]
+            if len(cache.get_many(keys)) < len(keys):
+                return False
+        return self.mark_unknown(symbol, kind)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['local_unknown'] = len(self._local)
+        stats['provider_ttl'] = self.provider_ttl
+        stats['symbol_ttl'] = self.symbol_ttl
+        return stats
+
+    def reset(self) -> None:
+        with self._lock:
+            self._local.clear()
+            for name in self._counters:
+                self._counters[name] = 0
+
+
+# 전역 인스턴스 - 프로세스 단위 메모 (프로바이더별 미스는 공유 캐시)
+negative_cache = NegativeCache()
@@ -0,0 +1,206 @@
+"""
+Columnar OHLCV Series for Market Data
+Historical bars are held as parallel typed arrays (epoch seconds, open/high/low/close,
+volume) instead of lists of dicts, so cached series are compact, pickle as one bytes
+blob and are converted to the legacy JSON row shape only at the view boundary
+"""
+
+import hashlib
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .timestamps import parse_timestamps
+
+# 컬럼 순서와 array 타입코드 (int64 / float64)
+COLUMNS = (('timestamps', 'q'), ('open', 'd'), ('high', 'd'), ('low', 'd'), ('close', 'd'), ('volume', 'q'))
+
+_DAY = 86400
+
+
+def _restore(length: int, blob: bytes) -> 'OHLCVSeries':
+    """pickle 복원: 컬럼별 bytes를 이어 붙인 blob을 다시 배열로 분할"""
+    series = OHLCVSeries()
+    view = memoryview(blob)
+    offset = 0
+    for name, typecode in COLUMNS:
+        column = array(typecode)
+        size = length * column.itemsize
+        column.frombytes(view[offset:offset + size])
+        offset += size
+        setattr(series, name, column)
+    return series
+
+
+class OHLCVSeries:
+    """시간 오름차순 OHLCV 봉 시리즈 (병렬 typed array)"""
+
+    __slots__ = ('timestamps', 'open', 'high', 'low', 'close', 'volume', 'stale', 'age')
+
+    def __init__(self, timestamps: Iterable[int] = (), opens: Iterable[float] = (), highs: Iterable[float] = (),
+                 lows: Iterable[float] = (), closes: Iterable[float] = (), volumes: Iterable[int] = ()):
+        self.timestamps = array('q', timestamps)
+        self.open = array('d', opens)
+        self.high = array('d', highs)
+        self.low = array('d', lows)
+        self.close = array('d', closes)
+        self.volume = array('q', volumes)
+        self.stale = False
+        self.age = 0
+
+    # ------------------------------------------------------------------
+    # 생성
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_rows(cls, rows: Optional[Iterable[Dict[str, Any]]]) -> 'OHLCVSeries':
+        """
+        프로바이더 행(list of dict)을 시리즈로 변환. 정렬하고 같은 시각은 마지막 행 사용
+
+        timestamp 형식은 첫 행에서 한 번만 감지해 컬럼 전체를 epoch 초로 변환
+        """
+        rows = [row for row in rows or () if row]
+        if not rows:
+            return cls()
+        epochs = parse_timestamps([row.get('timestamp') or row.get('date') or row.get('datetime') for row in rows])
+
+        bars = {}
+        for timestamp, row in zip(epochs, rows):
+            close = row.get('close', row.get('price'))
+            if timestamp is None or close is None:
+                continue
+            try:
+                close = float(close)
+                bars[timestamp] = (
+                    float(row.get('open') or close), float(row.get('high') or close),
+                    float(row.get('low') or close), close, int(float(row.get('volume') or 0)),
+                )
+            except (TypeError, ValueError):
+                continue
+
+        series = cls()
+        for timestamp in sorted(bars):
+            open_price, high, low, close, volume = bars[timestamp]
+            series.append(timestamp, open_price, high, low, close, volume)
+        return series
+
+    def append(self, timestamp: int, open_price: float, high: float, low: float, close: float, volume: int) -> None:
+        self.timestamps.append(timestamp)
+        self.open.append(open_price)
+        self.high.append(high)
+        self.low.append(low)
+        self.close.append(close)
+        self.volume.append(volume)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __bool__(self) -> bool:
+        return len(self.timestamps) > 0
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, OHLCVSeries):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name, _ in COLUMNS)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"<OHLCVSeries {len(self)} bars>"
+
+    def __getitem__(self, index):
+        """정수 인덱스는 봉 하나(dict), 슬라이스는 새 시리즈"""
+        if isinstance(index, slice):
+            sliced = OHLCVSeries()
+            for name, _ in COLUMNS:
+                setattr(sliced, name, getattr(self, name)[index])
+            return sliced
+        return {
+            'timestamp': self.timestamps[index],
+            'open': self.open[index],
+            'high': self.high[index],
+            'low': self.low[index],
+            'close': self.close[index],
+            'volume': self.volume[index],
+        }
+
+    def between(self, start: Optional[int] = None, end: Optional[int] = None) -> 'OHLCVSeries':
+        """start <= timestamp <= end 구간 (epoch 초, 이진 탐색)"""
+        lo = 0 if start is None else bisect_left(self.timestamps, start)
+        hi = len(self) if end is None else bisect_right(self.timestamps, end)
+        return self[lo:hi]
+
+    def since(self, timestamp: int) -> 'OHLCVSeries':
+        """timestamp 이후 봉 (timestamp 봉 자체 포함 - 클라이언트의 마지막(진행 중) 봉을 교체)"""
+        return self.between(timestamp, None)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).itemsize * len(self) for name, _ in COLUMNS)
+
+    def fingerprint(self) -> str:
+        """봉 데이터 내용 다이제스트 (같은 시리즈면 같은 값 - ETag용)"""
+        digest = hashlib.blake2b(digest_size=12)
+        for name, _ in COLUMNS:
+            digest.update(getattr(self, name).tobytes())
+        return digest.hexdigest()
+
+    # ------------------------------------------------------------------
+    # 캐시 / 응답 변환
+    # ------------------------------------------------------------------
+    def __reduce__(self):
+        # 컬럼 6개를 bytes 하나로 직렬화 (stale 표시는 캐시에 저장하지 않음)
+        return _restore, (len(self), b''.join(getattr(self, name).tobytes() for name, _ in COLUMNS))
+
+    def with_staleness(self, age: float) -> 'OHLCVSeries':
+        """stale/age 표시를 붙인 사본 (캐시 원본은 그대로)"""
+        marked = self[:]
+        marked.stale = True
+        marked.age = int(age)
+        return marked
+
+    @property
+    def time_format(self) -> str:
+        """응답 timestamp 형식. 모든 봉이 자정이면 날짜만 표시"""
+        daily = all(timestamp % _DAY == 0 for timestamp in self.timestamps)
+        return '%Y-%m-%d' if daily else '%Y-%m-%d %H:%M:%S'
+
+    def to_rows(self, time_format: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        기존 JSON 응답 형태(list of dict)로 한 번에 변환
+
+        시리즈 일부(델타)를 변환할 때는 전체 시리즈의 time_format을 넘겨 형식을 맞춘다.
+        """
+        time_format = time_format or self.time_format
+        return [
+            {
+                'timestamp': time.strftime(time_format, time.gmtime(timestamp)),
+                'open': open_price,
+                'high': high,
+                'low': low,
+                'close': close,
+                'volume': volume,
+            }
+            for timestamp, open_price, high, low, close, volume in zip(
+                self.timestamps, self.open, self.high, self.low, self.close, self.volume
+            )
+        ]
+
+    def to_columns(self, price_format: Optional[Callable[[Iterable[float]], List[float]]] = None) -> Dict[str, List]:
+        """
+        컬럼 배열 응답 형태 {t, o, h, l, c, v} (t는 epoch 초)
+
+        행마다 키를 반복하지 않아 JSON이 훨씬 작고, price_format은 가격 컬럼마다 한 번씩 적용
+        """
+        price_format = price_format or list
+        return {
+            't': self.timestamps.tolist(),
+            'o': price_format(self.open),
+            'h': price_format(self.high),
+            'l': price_format(self.low),
+            'c': price_format(self.close),
+            'v': self.volume.tolist(),
+        }
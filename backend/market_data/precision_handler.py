@@ -4,7 +4,7 @@ Ensures accurate price representation with proper decimal places
 """
 
 from decimal import Decimal, ROUND_HALF_UP, getcontext
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, Iterable, List
 import logging
 
 logger = logging.getLogger(__name__)
@@ -112,7 +112,25 @@ class PrecisionHandler:
             return int(float(volume))
         except:
             return 0
-    
+
+    @classmethod
+    def format_price_column(cls, prices: Iterable[float],
+                            symbol: str = '', market: str = 'us_stock') -> List[float]:
+        """
+        가격 컬럼 전체를 한 번에 포맷팅 (format_price와 같은 반올림, 정밀도 조회는 1회)
+        """
+        prices = list(prices)
+        precision = cls._get_precision(symbol, market)
+        quantize_value = Decimal('0.' + '0' * precision) if precision > 0 else Decimal('1')
+        try:
+            return [
+                float(Decimal(repr(price)).quantize(quantize_value, rounding=ROUND_HALF_UP))
+                for price in prices
+            ]
+        except Exception as e:
+            logger.error(f"Price column formatting error: {e}")
+            return [float(price) for price in prices]
+
     @classmethod
     def _get_precision(cls, symbol: str, market: str) -> int:
         """
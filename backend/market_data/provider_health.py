@@ -0,0 +1,252 @@
+"""
+Provider Health Tracking and Circuit Breaking for Market Data Fallback Chains
+Keeps rolling success rate, latency percentiles, error classes and hedged-race wins per
+provider and endpoint type (the one latency window behind hedge delays and chain order),
+trips a closed/open/half-open circuit breaker on repeated failures and orders fallback
+chains so the fastest healthy provider is tried first
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+_STATE_RANK = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+def classify_error(error: Optional[BaseException]) -> str:
+    """예외를 오류 종류로 분류 (예외 없이 빈 응답이면 'empty')"""
+    if error is None:
+        return 'empty'
+    text = f"{type(error).__name__} {error}".lower()
+    if '429' in text or 'rate limit' in text:
+        return 'rate_limited'
+    if 'timeout' in text or 'timed out' in text:
+        return 'timeout'
+    if 'connection' in text:
+        return 'connection'
+    if '401' in text or '403' in text or 'unauthorized' in text or 'api key' in text:
+        return 'auth'
+    if any(code in text for code in ('500', '502', '503', '504')):
+        return 'server'
+    return 'other'
+
+
+class _EndpointHealth:
+    """프로바이더 x 엔드포인트 한 쌍의 최근 결과와 서킷 상태"""
+
+    __slots__ = ('samples', 'errors', 'last_error', 'last_error_at', 'consecutive_failures',
+                 'state', 'opened_at', 'cooldown', 'trial_in_flight', 'wins')
+
+    def __init__(self, window: int):
+        self.samples = deque(maxlen=window)  # (success, latency)
+        self.errors: Dict[str, int] = {}
+        self.last_error = None
+        self.last_error_at = None
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.cooldown = 0.0
+        self.trial_in_flight = False
+        self.wins = 0
+
+
+class ProviderHealthTracker:
+    """프로바이더/엔드포인트별 상태 점수와 서킷 브레이커 (프로세스 단위)"""
+
+    def __init__(self, window: int = 100, min_samples: int = 5, failure_rate_threshold: float = 0.5,
+                 consecutive_failure_threshold: int = 5, cooldown: float = 30, max_cooldown: float = 300,
+                 default_latency: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.min_samples = min_samples
+        self.failure_rate_threshold = failure_rate_threshold
+        self.consecutive_failure_threshold = consecutive_failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.default_latency = default_latency  # 샘플이 없는 프로바이더의 가정 지연시간 (초)
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._health: Dict[tuple, _EndpointHealth] = {}
+
+    def _get(self, provider: str, endpoint: str) -> _EndpointHealth:
+        key = (provider, endpoint)
+        health = self._health.get(key)
+        if health is None:
+            health = _EndpointHealth(self.window)
+            self._health[key] = health
+        return health
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+    def record(self, provider: str, endpoint: str, latency: float, success: bool,
+               error: Optional[BaseException] = None) -> None:
+        """
+        프로바이더 호출 1회의 결과 기록 및 서킷 상태 갱신
+
+        예외 없는 빈 응답(모르는 심볼 등)은 프로바이더가 정상 응답한 것이므로 'empty' 건수만 세고
+        서킷 실패로 집계하지 않는다 (오타 조회 몇 번으로 서킷이 열리지 않도록).
+        """
+        with self._lock:
+            health = self._get(provider, endpoint)
+            health.trial_in_flight = False
+            if not success and error is None:
+                health.errors['empty'] = health.errors.get('empty', 0) + 1
+                success = True
+            health.samples.append((success, latency))
+
+            if success:
+                health.consecutive_failures = 0
+                if health.state != CLOSED:
+                    logger.info(f"Circuit closed for {provider}/{endpoint}")
+                health.state = CLOSED
+                health.cooldown = 0.0
+                return
+
+            error_class = classify_error(error)
+            health.errors[error_class] = health.errors.get(error_class, 0) + 1
+            health.last_error = error_class
+            health.last_error_at = time.time()
+            health.consecutive_failures += 1
+
+            if health.state == HALF_OPEN or (health.state == CLOSED and self._should_trip(health)):
+                # 이미 열린 서킷에 늦게 도착한 실패는 대기 시간을 늘리지 않음
+                self._trip(provider, endpoint, health)
+
+    def record_win(self, provider: str, endpoint: str) -> None:
+        """헤지 레이스에서 최초 유효 응답을 반환한 프로바이더 기록"""
+        with self._lock:
+            self._get(provider, endpoint).wins += 1
+
+    def release(self, provider: str, endpoint: str) -> None:
+        """
+        결과를 기록하지 않는 호출(데드라인 절단, 요청 예산 없음)이 끝났을 때 half-open 시험 호출 자리 반납
+
+        allow()가 잡아 둔 시험 호출은 record()만 풀어 주므로, 기록을 건너뛰면 반드시 호출해야
+        서킷이 half_open에 멈추지 않고 다음 요청이 다시 시험 호출을 할 수 있다.
+        """
+        with self._lock:
+            health = self._health.get((provider, endpoint))
+            if health is not None:
+                health.trial_in_flight = False
+
+    def _should_trip(self, health: _EndpointHealth) -> bool:
+        if health.consecutive_failures >= self.consecutive_failure_threshold:
+            return True
+        if len(health.samples) < self.min_samples:
+            return False
+        recent = list(health.samples)[-self.min_samples * 2:]
+        failures = sum(1 for success, _ in recent if not success)
+        return failures / len(recent) >= self.failure_rate_threshold and health.consecutive_failures >= 2
+
+    def _trip(self, provider: str, endpoint: str, health: _EndpointHealth) -> None:
+        # 반복해서 열리면 대기 시간을 두 배씩 (최대 max_cooldown)
+        health.cooldown = min(self.max_cooldown, health.cooldown * 2 if health.cooldown else self.base_cooldown)
+        health.state = OPEN
+        health.opened_at = self.clock()
+        logger.warning(f"Circuit opened for {provider}/{endpoint} for {health.cooldown:.0f}s "
+                       f"(last error: {health.last_error})")
+
+    # ------------------------------------------------------------------
+    # 선택 / 정렬
+    # ------------------------------------------------------------------
+    def allow(self, provider: str, endpoint: str) -> bool:
+        """호출 허용 여부. 열린 서킷은 대기 시간이 지나면 시험 호출 1회만 허용(half-open)"""
+        with self._lock:
+            health = self._health.get((provider, endpoint))
+            if health is None or health.state == CLOSED:
+                return True
+            if health.state == OPEN:
+                if self.clock() - health.opened_at < health.cooldown:
+                    return False
+                health.state = HALF_OPEN
+                health.trial_in_flight = False
+            if health.trial_in_flight:
+                return False
+            health.trial_in_flight = True
+            return True
+
+    def _score(self, health: Optional[_EndpointHealth]) -> float:
+        """기대 지연시간 = p50 / 성공률 (낮을수록 좋음)"""
+        if health is None or not health.samples:
+            return self.default_latency
+        samples = list(health.samples)
+        successes = sum(1 for success, _ in samples if success)
+        success_rate = (successes + 1) / (len(samples) + 2)  # 라플라스 보정
+        latencies = sorted(latency for _, latency in samples)
+        return latencies[len(latencies) // 2] / success_rate
+
+    def order(self, endpoint: str, providers: Sequence[str]) -> List[str]:
+        """닫힌 서킷 우선, 그다음 기대 지연시간 순 (동점이면 기존 순서 유지)"""
+        with self._lock:
+            ranked = []
+            for index, provider in enumerate(providers):
+                health = self._health.get((provider, endpoint))
+                state = health.state if health else CLOSED
+                ranked.append((_STATE_RANK[state], self._score(health), index, provider))
+        return [provider for *_, provider in sorted(ranked)]
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _percentile(latencies: List[float], pct: float) -> Optional[float]:
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, max(0, int(round(pct / 100.0 * (len(latencies) - 1)))))
+        return latencies[index]
+
+    def percentile(self, provider: str, endpoint: str, pct: float) -> Optional[float]:
+        """최근 샘플 기준 지연시간 백분위수 (초, 헤지 지연 계산용). 샘플이 없으면 None"""
+        with self._lock:
+            health = self._health.get((provider, endpoint))
+            latencies = sorted(latency for _, latency in health.samples) if health else []
+        return self._percentile(latencies, pct)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """{provider: {endpoint: 상태}} 모니터링용 스냅샷 (밀리초 단위)"""
+        now = self.clock()
+        result: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for (provider, endpoint), health in sorted(self._health.items()):
+                samples = list(health.samples)
+                latencies = sorted(latency for _, latency in samples)
+                successes = sum(1 for success, _ in samples if success)
+                p50 = self._percentile(latencies, 50)
+                p95 = self._percentile(latencies, 95)
+                retry_in = health.cooldown - (now - health.opened_at) if health.state == OPEN else 0
+                result.setdefault(provider, {})[endpoint] = {
+                    'samples': len(samples),
+                    'success_rate': round(successes / len(samples), 4) if samples else None,
+                    'p50_ms': round(p50 * 1000, 2) if p50 is not None else None,
+                    'p95_ms': round(p95 * 1000, 2) if p95 is not None else None,
+                    'score': round(self._score(health), 4),
+                    'circuit': health.state,
+                    'retry_in_s': round(max(0.0, retry_in), 1),
+                    'consecutive_failures': health.consecutive_failures,
+                    'wins': health.wins,
+                    'last_error': health.last_error,
+                    'errors': dict(health.errors),
+                }
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._health.clear()
+
+
+# 전역 인스턴스 - MarketDataService 인스턴스 간 공유
+provider_health = ProviderHealthTracker(
+    consecutive_failure_threshold=getattr(settings, 'MARKET_DATA_CIRCUIT_FAILURE_THRESHOLD', 5),
+    cooldown=getattr(settings, 'MARKET_DATA_CIRCUIT_COOLDOWN', 30),
+    max_cooldown=getattr(settings, 'MARKET_DATA_CIRCUIT_MAX_COOLDOWN', 300),
+)
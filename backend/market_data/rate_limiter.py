@@ -0,0 +1,183 @@
+"""
+Cross-worker Rate Limiter for Market Data Providers
+Each provider gets a request budget per burst window, kept as one atomic counter in the
+shared cache backend and sized from marketdata.MarketDataSource.rate_limit_per_minute, so
+every worker draws from one budget with a single incr and a provider without budget is
+skipped instead of being called into a 429
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# MarketDataSource 행이 없을 때 사용할 분당 요청 제한 (무료 플랜 기준)
+DEFAULT_PROVIDER_RATE_LIMITS = {
+    'finnhub': 60,
+    'alpha_vantage': 5,
+    'twelve_data': 8,
+    'tiingo': 50,
+    'marketstack': 5,
+    'coingecko': 30,
+    'yahoo': 60,
+    'polygon': 5,
+}
+
+
+class ProviderLimit:
+    """프로바이더 한 곳의 요청 제한 설정"""
+
+    __slots__ = ('rate_per_minute', 'capacity', 'is_active', 'priority')
+
+    def __init__(self, rate_per_minute: float, capacity: float, is_active: bool = True, priority: int = 1):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = capacity
+        self.is_active = is_active
+        self.priority = priority
+
+
+class TokenBucketLimiter:
+    """
+    캐시 백엔드에 상태를 둔 프로바이더별 요청 예산
+
+    burst_seconds 길이의 창마다 capacity(분당 제한 x burst_seconds / 60)개 토큰을 쓸 수 있고, 창별
+    카운터 키(ratelimit_{provider}_{창 번호})를 incr로 원자적으로 올려 비교한다. 워커 간 잠금이 없어
+    트래픽이 몰려도 예산이 남은 프로바이더가 소진된 것처럼 보이지 않고, 요청당 공유 캐시 왕복은 1회.
+    """
+
+    def __init__(self, default_limits: Optional[Dict[str, float]] = None, burst_seconds: float = 15,
+                 config_ttl: float = 60, clock: Callable[[], float] = time.time):
+        self.default_limits = dict(DEFAULT_PROVIDER_RATE_LIMITS if default_limits is None else default_limits)
+        self.burst_seconds = burst_seconds
+        self.config_ttl = config_ttl
+        self.clock = clock
+        self._limits: Optional[Dict[str, ProviderLimit]] = None
+        self._limits_loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._denied: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # 설정
+    # ------------------------------------------------------------------
+    def _make_limit(self, rate_per_minute: float, is_active: bool = True, priority: int = 1) -> ProviderLimit:
+        # 창 하나(burst_seconds) 동안 쓸 수 있는 토큰 (최소 1)
+        capacity = max(1.0, rate_per_minute * self.burst_seconds / 60.0)
+        return ProviderLimit(rate_per_minute, capacity, is_active, priority)
+
+    def _load_limits(self) -> Dict[str, ProviderLimit]:
+        limits = {name: self._make_limit(rate) for name, rate in self.default_limits.items()}
+        try:
+            from marketdata.models import MarketDataSource
+            for source in MarketDataSource.objects.all().only('code', 'rate_limit_per_minute', 'is_active', 'priority'):
+                limits[source.code] = self._make_limit(source.rate_limit_per_minute, source.is_active, source.priority)
+        except Exception as e:
+            # 마이그레이션 전 등 테이블이 없으면 기본값 사용
+            logger.warning(f"Could not load MarketDataSource rate limits, using defaults: {e}")
+        return limits
+
+    def limits(self) -> Dict[str, ProviderLimit]:
+        """프로바이더별 제한 (config_ttl 동안 프로세스 내 캐시)"""
+        now = time.monotonic()
+        if self._limits is None or now - self._limits_loaded_at > self.config_ttl:
+            limits = self._load_limits()
+            with self._lock:
+                self._limits = limits
+                self._limits_loaded_at = now
+        return self._limits
+
+    def reload(self) -> None:
+        with self._lock:
+            self._limits = None
+
+    # ------------------------------------------------------------------
+    # 창별 카운터
+    # ------------------------------------------------------------------
+    def window_key(self, provider: str, now: float) -> str:
+        return f"ratelimit_{provider}_{int(now // self.burst_seconds)}"
+
+    def _used(self, provider: str, now: float) -> int:
+        return cache.get(self.window_key(provider, now)) or 0
+
+    def has_budget(self, provider: str, tokens: float = 1) -> bool:
+        """토큰을 소비하지 않고 남은 예산 확인"""
+        limit = self.limits().get(provider)
+        if limit is None:
+            return True
+        if not limit.is_active:
+            return False
+        try:
+            return self._used(provider, self.clock()) + tokens <= limit.capacity
+        except Exception as e:
+            logger.warning(f"Rate limiter state unavailable for {provider}, assuming budget: {e}")
+            return True
+
+    def try_acquire(self, provider: str, tokens: int = 1) -> bool:
+        """토큰 소비 시도. 이번 창의 예산이 없으면 False (공유 캐시 오류는 예산 없음으로 보지 않음)"""
+        limit = self.limits().get(provider)
+        if limit is None:
+            return True
+        if not limit.is_active:
+            return self._deny(provider)
+
+        key = self.window_key(provider, self.clock())
+        try:
+            try:
+                used = cache.incr(key, tokens)
+            except ValueError:
+                # 창의 첫 요청 - 동시에 만든 워커가 있으면 add가 실패하므로 다시 incr
+                if cache.add(key, tokens, timeout=int(self.burst_seconds) + 60):
+                    used = tokens
+                else:
+                    used = cache.incr(key, tokens)
+        except Exception as e:
+            # 카운터를 못 읽었다고 예산이 남은 프로바이더를 건너뛰지 않음
+            logger.warning(f"Rate limiter counter unavailable for {provider}, allowing the call: {e}")
+            return True
+        if used > limit.capacity:
+            return self._deny(provider)
+        return True
+
+    def _deny(self, provider: str) -> bool:
+        with self._lock:
+            self._denied[provider] = self._denied.get(provider, 0) + 1
+        return False
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        now = self.clock()
+        with self._lock:
+            denied = dict(self._denied)
+        return {
+            provider: {
+                'rate_per_minute': limit.rate_per_minute,
+                'capacity': round(limit.capacity, 2),
+                'available': round(max(0.0, limit.capacity - self._used(provider, now)), 2) if limit.is_active else 0,
+                'is_active': limit.is_active,
+                'priority': limit.priority,
+                'denied': denied.get(provider, 0),
+            }
+            for provider, limit in self.limits().items()
+        }
+
+
+# 전역 인스턴스 - 지연 초기화
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucketLimiter:
+    """TokenBucketLimiter 인스턴스를 지연 초기화로 반환"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = TokenBucketLimiter(
+                    default_limits=getattr(settings, 'MARKET_DATA_PROVIDER_RATE_LIMITS', None),
+                    burst_seconds=getattr(settings, 'MARKET_DATA_RATE_LIMIT_BURST_SECONDS', 15),
+                    config_ttl=getattr(settings, 'MARKET_DATA_RATE_LIMIT_CONFIG_TTL', 60),
+                )
+    return _rate_limiter
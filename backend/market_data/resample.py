@@ -0,0 +1,164 @@
+"""
+Calendar-correct OHLCV Resampling for Market Data
+Bucket boundaries (fixed width, ISO week, month, quarter, year in the market timezone)
+are generated once and located in the sorted timestamp column with binary search, then
+each column is reduced per bucket with C builtins; no timestamp is parsed per row
+"""
+
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from functools import partial
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+from .ohlcv import OHLCVSeries
+from .timestamps import civil_from_days, days_from_civil
+
+_DAY = 86400
+
+# 시장별 봉 구간 기준 시간대 (일봉 이상 입력은 날짜 기준이라 시간대와 무관)
+MARKET_TIMEZONES = {
+    'us_stock': 'America/New_York',
+    'kr_stock': 'Asia/Seoul',
+    'jp_stock': 'Asia/Tokyo',
+    'in_stock': 'Asia/Kolkata',
+    'uk_stock': 'Europe/London',
+    'crypto': 'UTC',
+}
+
+# 간격 별칭 -> 표준 간격
+INTERVAL_ALIASES = {
+    '1min': '1min', '1m': '1min',
+    '5min': '5min', '5m': '5min',
+    '15min': '15min', '15m': '15min',
+    '30min': '30min', '30m': '30min',
+    '1h': '1h', '1hour': '1h', '60min': '1h', '1H': '1h',
+    '4h': '4h', '4hour': '4h', '4H': '4h',
+    '1d': '1d', '1day': '1d', 'D': '1d', '1D': '1d',
+    '1w': '1w', '1wk': '1w', '1week': '1w', 'Week': '1w', 'W': '1w', '1W': '1w',
+    '1M': '1M', '1mo': '1M', '1month': '1M', 'Month': '1M',
+    '1Q': '1Q', '3M': '1Q', '3mo': '1Q', 'quarter': '1Q',
+    '1Y': '1Y', '1y': '1Y', '12M': '1Y', '1year': '1Y',
+}
+
+# 고정 폭 간격 (초)
+FIXED_WIDTHS = {'1min': 60, '5min': 300, '15min': 900, '30min': 1800, '1h': 3600, '4h': 4 * 3600, '1d': _DAY}
+
+# 달력 간격 (개월 수)
+CALENDAR_MONTHS = {'1M': 1, '1Q': 3, '1Y': 12}
+
+DAILY_OR_COARSER = ('1d', '1w', '1M', '1Q', '1Y')
+
+
+def normalize_interval(interval: str) -> Optional[str]:
+    """간격 별칭을 표준 간격으로 (지원하지 않으면 None)"""
+    return INTERVAL_ALIASES.get(interval)
+
+
+def is_daily_or_coarser(interval: str) -> bool:
+    return normalize_interval(interval) in DAILY_OR_COARSER
+
+
+class _LocalClock:
+    """UTC epoch <-> 시장 현지 시각 변환 (시 단위 오프셋 메모이제이션)"""
+
+    def __init__(self, tz_name: Optional[str]):
+        self.tz = None if tz_name in (None, 'UTC') else ZoneInfo(tz_name)
+        self._offsets: Dict[int, int] = {}
+
+    def offset(self, ts: int) -> int:
+        if self.tz is None:
+            return 0
+        hour = ts // 3600
+        offset = self._offsets.get(hour)
+        if offset is None:
+            offset = int(datetime.fromtimestamp(hour * 3600, self.tz).utcoffset().total_seconds())
+            self._offsets[hour] = offset
+        return offset
+
+    def to_utc(self, local: int, hint: int) -> int:
+        """현지 시각(epoch 형태) -> UTC epoch. hint는 근처 UTC 시각 (DST 전환 주변 보정용)"""
+        utc = local - self.offset(hint)
+        return local - self.offset(utc)
+
+
+def _boundaries(interval: str, first: int, last: int, clock: _LocalClock) -> List[int]:
+    """first~last 구간을 덮는 봉 구간 시작 시각 목록 (UTC epoch, 오름차순)"""
+    local_first = first + clock.offset(first)
+    local_last = last + clock.offset(last)
+    width = FIXED_WIDTHS.get(interval)
+
+    if width is not None:
+        local_starts = range(local_first - local_first % width, local_last + 1, width)
+    elif interval == '1w':
+        day = local_first // _DAY
+        local_starts = range((day - (day + 3) % 7) * _DAY, local_last + 1, 7 * _DAY)  # 월요일 시작 (epoch 0일은 목요일)
+    else:
+        months = CALENDAR_MONTHS[interval]
+        year, month = civil_from_days(local_first // _DAY)
+        month -= (month - 1) % months
+        local_starts = []
+        start = days_from_civil(year, month, 1) * _DAY
+        while start <= local_last:
+            local_starts.append(start)
+            month += months
+            year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+            start = days_from_civil(year, month, 1) * _DAY
+
+    if clock.tz is None:
+        return list(local_starts)
+
+    # 현지 시각 경계를 UTC로 변환 (DST로 겹치는 경계는 제거)
+    boundaries: List[int] = []
+    for local in local_starts:
+        utc = clock.to_utc(local, local)
+        if not boundaries or utc > boundaries[-1]:
+            boundaries.append(utc)
+    boundaries[0] = min(boundaries[0], first)
+    return boundaries
+
+
+def resample(series: OHLCVSeries, interval: str, tz_name: Optional[str] = None) -> OHLCVSeries:
+    """
+    OHLCV 시리즈를 더 큰 간격으로 리샘플링
+    (시가=첫 봉, 고가/저가=최대/최소, 종가=마지막 봉, 거래량=합계, 시각=구간 시작)
+
+    tz_name은 분/시간봉 입력에만 의미가 있다. 일봉 입력은 날짜 자체가 기준이므로 None(UTC)으로 호출.
+    """
+    target = normalize_interval(interval)
+    if target is None:
+        raise ValueError(f"Unsupported interval: {interval}")
+
+    result = OHLCVSeries()
+    length = len(series)
+    if not length:
+        return result
+
+    # 구간 경계마다 이진 탐색으로 시작 인덱스를 구하고, 빈 구간은 건너뜀
+    timestamps = series.timestamps
+    boundaries = _boundaries(target, timestamps[0], timestamps[-1], _LocalClock(tz_name))
+    if len(boundaries) > 64:
+        timestamps = timestamps.tolist()  # 탐색 횟수가 많으면 list가 array보다 빠름
+    edges = list(map(partial(bisect_left, timestamps), boundaries))
+    edges.append(length)
+    labels, starts, ends = [], [], []
+    for label, start, end in zip(boundaries, edges, edges[1:]):
+        if end > start:
+            labels.append(label)
+            starts.append(start)
+            ends.append(end)
+
+    # 컬럼별로 C 내장 함수(max/min/sum)를 구간 슬라이스에 일괄 적용
+    slices = list(map(slice, starts, ends))
+    result.timestamps = array('q', labels)
+    result.open = array('d', map(series.open.__getitem__, starts))
+    result.high = array('d', map(max, map(series.high.__getitem__, slices)))
+    result.low = array('d', map(min, map(series.low.__getitem__, slices)))
+    result.close = array('d', map(series.close.__getitem__, [end - 1 for end in ends]))
+    result.volume = array('q', map(sum, map(series.volume.__getitem__, slices)))
+    return result
+
+
+def market_timezone(market: str) -> str:
+    return MARKET_TIMEZONES.get(market, 'UTC')
@@ -4,25 +4,136 @@ Utilizes Alpha Vantage, Twelve Data, Finnhub, and Polygon APIs for comprehensive
 """
 
 import os
+import hashlib
 import requests
 import json
 from decimal import Decimal
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from django.conf import settings
 from django.core.cache import cache
 from django.utils import timezone
 import logging
 import time
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from .precision_handler import PrecisionHandler
+from .provider_health import provider_health
+from .http_client import get_provider_clients, ProviderBudgetExhausted, retry_after_seconds
+from .deadline import (
+    bind as bind_deadline, can_retry, deadline_stats, expired as deadline_expired,
+    record_cut, remaining as deadline_remaining,
+)
+from .rate_limiter import get_rate_limiter
+from .coalescing import single_flight
+from .swr_cache import swr_cache
+from .cache_keys import symbol_key
+from .history_request import HistoryRequest
+from .negative_cache import negative_cache
+from .symbol_index import SymbolEntry, get_symbol_index
+from .hot_symbols import CRYPTO_SYMBOLS, POPULAR_STOCKS, TOP_CRYPTOS, WATCHLIST_SYMBOLS
+from .tick_ingest import STREAMED_INTERVALS, is_streamed, live_candle
+from .tiered_cache import cache_stats
+from .universe import stock_directory
+from .bar_store import bar_store, period_start
+from .ohlcv import OHLCVSeries
+from .resample import is_daily_or_coarser, market_timezone, normalize_interval, resample
 
 logger = logging.getLogger(__name__)
 
 
+# 프로바이더 병렬 호출용 스레드 풀 - 프로세스 단위로 공유
+_provider_executor = None
+_provider_executor_lock = threading.Lock()
+
+
+def get_provider_executor() -> ThreadPoolExecutor:
+    """프로바이더 호출용 ThreadPoolExecutor를 지연 초기화로 반환"""
+    global _provider_executor
+    if _provider_executor is None:
+        with _provider_executor_lock:
+            if _provider_executor is None:
+                _provider_executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'MARKET_DATA_PROVIDER_WORKERS', 16),
+                    thread_name_prefix='market-data-provider'
+                )
+    return _provider_executor
+
+
+# 섹션 팬아웃용 스레드 풀 - 섹션 안에서 다시 프로바이더 풀을 쓰므로 같은 풀을 공유하면 교착될 수 있어 분리
+_fanout_executor = None
+_fanout_executor_lock = threading.Lock()
+
+
+def get_fanout_executor() -> ThreadPoolExecutor:
+    """대시보드/지수 팬아웃용 ThreadPoolExecutor를 지연 초기화로 반환"""
+    global _fanout_executor
+    if _fanout_executor is None:
+        with _fanout_executor_lock:
+            if _fanout_executor is None:
+                _fanout_executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'MARKET_DATA_FANOUT_WORKERS', 8),
+                    thread_name_prefix='market-data-fanout'
+                )
+    return _fanout_executor
+
+
+# 대시보드 섹션 (요청 순서 = 응답 순서)
+DASHBOARD_SECTIONS = ('indices', 'stocks', 'cryptos', 'watchlist', 'news')
+
+
+def _raise_if_provider_failure(error: Exception) -> None:
+    """
+    프로바이더 호출 함수의 except 블록용 - 타임아웃/연결 오류/4xx·5xx 응답/요청 예산 없음/데드라인 초과는 다시 던짐
+
+    폴백 체인이 이를 프로바이더 실패로 기록하고 심볼 미스로 남기지 않도록 한다. 모르는 심볼에 대한
+    400/404 응답과 본문 파싱 오류만 호출 함수가 빈 응답(None)으로 처리한다.
+    """
+    if isinstance(error, requests.exceptions.HTTPError):
+        if getattr(error.response, 'status_code', None) in (400, 404):
+            return
+        raise error
+    if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError, ProviderBudgetExhausted)):
+        raise error
+
+
 class MarketDataService:
     """통합 마켓 데이터 서비스 - 4개 API 통합"""
     
+    # CoinGecko ID 매핑 - support both symbol and full name
+    COINGECKO_ID_MAPPING = {
+        'BTC': 'bitcoin',
+        'bitcoin': 'bitcoin',
+        'ETH': 'ethereum', 
+        'ethereum': 'ethereum',
+        'ADA': 'cardano',
+        'cardano': 'cardano',
+        'BNB': 'binancecoin',
+        'binancecoin': 'binancecoin',
+        'DOT': 'polkadot',
+        'polkadot': 'polkadot',
+        'MATIC': 'matic-network',
+        'matic': 'matic-network',
+        'matic-network': 'matic-network',
+        'SOL': 'solana',
+        'solana': 'solana',
+        'LTC': 'litecoin',
+        'litecoin': 'litecoin',
+        'XRP': 'ripple',
+        'ripple': 'ripple',
+        'DOGE': 'dogecoin',
+        'dogecoin': 'dogecoin',
+        'AVAX': 'avalanche-2',
+        'avalanche-2': 'avalanche-2',
+        'LINK': 'chainlink',
+        'chainlink': 'chainlink',
+        'UNI': 'uniswap',
+        'uniswap': 'uniswap',
+        'ATOM': 'cosmos',
+        'cosmos': 'cosmos'
+    }
+    
     def __init__(self):
         # API 키 로딩 시 예외 처리
         try:
@@ -69,59 +180,27 @@ class MarketDataService:
         self.polygon_base = "https://api.polygon.io"
         self.tiingo_base = "https://api.tiingo.com/tiingo"
         self.marketstack_base = "https://api.marketstack.com/v1"
+        
+        # 호스트별 keep-alive 세션 풀 (모든 프로바이더 호출이 공유)
+        self.http = get_provider_clients()
+        
+        # 헤지(hedged) 시세 조회 설정 - 느린 프로바이더가 워커를 붙잡지 않도록 병렬 레이스
+        self.hedged_quotes = getattr(settings, 'MARKET_DATA_HEDGED_QUOTES', True)
+        self.hedge_delay = getattr(settings, 'MARKET_DATA_HEDGE_DELAY', None)  # None이면 프로바이더 p95 사용
+        self.hedge_min_delay = getattr(settings, 'MARKET_DATA_HEDGE_MIN_DELAY', 0.2)
+        self.hedge_max_delay = getattr(settings, 'MARKET_DATA_HEDGE_MAX_DELAY', 2.0)
+        self.quote_deadline = getattr(settings, 'MARKET_DATA_QUOTE_DEADLINE', 8.0)
+        # 섹션 팬아웃 전체 데드라인 (이 시간 안에 끝난 섹션만 응답에 포함)
+        self.fanout_deadline = getattr(settings, 'MARKET_DATA_FANOUT_DEADLINE', 3.0)
     
-    def _aggregate_daily_data(self, daily_data: List[Dict], target_interval: str) -> List[Dict]:
-        """Convert daily OHLC data to weekly or monthly intervals - OPTIMIZED"""
-        if not daily_data or target_interval == '1d' or target_interval == '1day':
+    def _aggregate_daily_data(self, daily_data: OHLCVSeries, target_interval: str) -> OHLCVSeries:
+        """Resample daily OHLC series to weekly/monthly/quarterly/yearly intervals"""
+        if not daily_data or normalize_interval(target_interval) in (None, '1d'):
             return daily_data
         
         try:
-            # 🚀 OPTIMIZATION: Pre-sort data once and use efficient grouping
-            sorted_data = sorted(daily_data, key=lambda x: x['timestamp'])
-            aggregated = []
-            
-            if target_interval in ['1w', '1wk', '1week']:
-                # 🚀 FAST Weekly aggregation using date grouping
-                week_groups = {}
-                for item in sorted_data:
-                    item_date = self._parse_timestamp(item['timestamp'])
-                    if not item_date:
-                        continue
-                    
-                    # Get Monday of the week (ISO week start)
-                    week_start = item_date - timedelta(days=item_date.weekday())
-                    week_key = week_start.strftime('%Y-%W')
-                    
-                    if week_key not in week_groups:
-                        week_groups[week_key] = []
-                    week_groups[week_key].append(item)
-                
-                # Process each week group
-                for week_key in sorted(week_groups.keys()):
-                    week_ohlc = self._calculate_ohlc_fast(week_groups[week_key])
-                    if week_ohlc:
-                        aggregated.append(week_ohlc)
-            
-            elif target_interval in ['1M', '1mo', '1month']:
-                # 🚀 FAST Monthly aggregation using date grouping
-                month_groups = {}
-                for item in sorted_data:
-                    item_date = self._parse_timestamp(item['timestamp'])
-                    if not item_date:
-                        continue
-                    
-                    month_key = item_date.strftime('%Y-%m')
-                    
-                    if month_key not in month_groups:
-                        month_groups[month_key] = []
-                    month_groups[month_key].append(item)
-                
-                # Process each month group
-                for month_key in sorted(month_groups.keys()):
-                    month_ohlc = self._calculate_ohlc_fast(month_groups[month_key])
-                    if month_ohlc:
-                        aggregated.append(month_ohlc)
-            
+            # 일봉은 날짜 기준 봉이므로 시장 시간대 변환 없이 UTC 날짜로 구간 계산
+            aggregated = resample(daily_data, target_interval)
             logger.info(f"⚡ FAST aggregation: {len(daily_data)} daily → {len(aggregated)} {target_interval} records")
             return aggregated
             
@@ -129,67 +208,6 @@ class MarketDataService:
             logger.error(f"Fast aggregation error for {target_interval}: {e}")
             return daily_data  # Return original data if aggregation fails
     
-    def _calculate_ohlc_fast(self, period_data: List[Dict]) -> Optional[Dict]:
-        """OPTIMIZED OHLC calculation for faster processing"""
-        if not period_data:
-            return None
-        
-        try:
-            # 🚀 OPTIMIZATION: Use list comprehensions for speed
-            opens = [item['open'] for item in period_data]
-            highs = [item['high'] for item in period_data]
-            lows = [item['low'] for item in period_data]
-            closes = [item['close'] for item in period_data]
-            volumes = [item.get('volume', 0) for item in period_data]
-            
-            # Use first and last for open/close, min/max for high/low
-            return {
-                'timestamp': period_data[-1]['timestamp'],  # Last timestamp
-                'open': opens[0],          # First open
-                'high': max(highs),        # Highest high
-                'low': min(lows),          # Lowest low  
-                'close': closes[-1],       # Last close
-                'volume': sum(volumes)     # Total volume
-            }
-        except Exception as e:
-            logger.error(f"Fast OHLC calculation error: {e}")
-            return None
-    
-    def _parse_timestamp(self, timestamp_str: str) -> Optional[datetime]:
-        """Parse various timestamp formats to datetime object"""
-        if not timestamp_str:
-            return None
-        
-        try:
-            # Try common formats
-            formats = [
-                '%Y-%m-%d',                    # 2024-01-15
-                '%Y-%m-%d %H:%M:%S',          # 2024-01-15 16:00:00
-                '%Y-%m-%dT%H:%M:%S',          # 2024-01-15T16:00:00
-                '%Y-%m-%dT%H:%M:%SZ',         # 2024-01-15T16:00:00Z
-                '%Y-%m-%dT%H:%M:%S.%fZ',      # 2024-01-15T16:00:00.000Z
-                '%d/%m/%Y',                    # 15/01/2024
-                '%m/%d/%Y',                    # 01/15/2024
-            ]
-            
-            for fmt in formats:
-                try:
-                    return datetime.strptime(timestamp_str, fmt)
-                except ValueError:
-                    continue
-            
-            # If none of the formats work, try ISO parsing
-            if 'T' in timestamp_str:
-                timestamp_str = timestamp_str.replace('Z', '+00:00')
-                return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            
-            logger.warning(f"Unable to parse timestamp: {timestamp_str}")
-            return None
-            
-        except Exception as e:
-            logger.error(f"Timestamp parsing error: {e}")
-            return None
-    
     def _calculate_ohlc(self, period_data: List[Dict]) -> Optional[Dict]:
         """Calculate OHLC values for a period from daily data"""
         if not period_data:
@@ -223,7 +241,13 @@ class MarketDataService:
     def _make_enhanced_request(self, url: str, params: dict = None, headers: dict = None, 
                               timeout: int = 10, max_retries: int = 3, 
                               backoff_factor: float = 0.5) -> Optional[requests.Response]:
-        """Enhanced request method with intelligent retry logic and timeout handling"""
+        """
+        Enhanced request method with intelligent retry logic and timeout handling
+        
+        요청 데드라인 안에서는 매 시도의 타임아웃이 남은 시간으로 줄어들고(HTTP 레이어), 백오프 후에도
+        남은 시간이 있을 때만 재시도한다. 429는 기다리지 않는다 - HTTP 레이어가 Retry-After 동안
+        프로바이더를 비활성화하므로 None을 반환하고 이후 조회는 백그라운드 갱신에 맡긴다.
+        """
         params = params or {}
         headers = headers or {}
         
@@ -233,7 +257,7 @@ class MarketDataService:
                 current_timeout = timeout + (attempt * 2)
                 
                 start_time = time.time()
-                response = requests.get(
+                response = self.http.get(
                     url, 
                     params=params, 
                     headers=headers, 
@@ -245,52 +269,59 @@ class MarketDataService:
                 if response_time > 5:
                     logger.warning(f"Slow API response: {url} took {response_time:.2f}s")
                 
-                # Check for rate limiting
+                # Check for rate limiting - 웹 워커에서 Retry-After만큼 잠들지 않음
                 if response.status_code == 429:
-                    wait_time = self._get_rate_limit_wait_time(response, attempt)
-                    logger.warning(f"Rate limit hit for {url}, waiting {wait_time}s")
-                    time.sleep(wait_time)
-                    continue
+                    logger.warning(f"Rate limit hit for {url}, deferring retry for "
+                                   f"{self._get_rate_limit_wait_time(response, attempt):.0f}s to background refresh")
+                    return None
                 
                 # Check for successful response
                 if response.status_code == 200:
                     return response
                 elif response.status_code >= 500:
                     # Server error - retry with backoff
-                    if attempt < max_retries - 1:
-                        wait_time = backoff_factor * (2 ** attempt) + random.uniform(0, 1)
+                    wait_time = backoff_factor * (2 ** attempt) + random.uniform(0, 1)
+                    if attempt < max_retries - 1 and can_retry(wait_time):
                         logger.warning(f"Server error {response.status_code} for {url}, retrying in {wait_time:.2f}s")
                         time.sleep(wait_time)
                         continue
+                    return None
                 else:
                     # Client error - don't retry
                     logger.error(f"Client error {response.status_code} for {url}")
                     return response
                     
+            except ProviderBudgetExhausted as e:
+                # 요청 예산이 없으면 재시도해도 의미 없음
+                logger.info(f"Skipping request to {url}: {e}")
+                return None
+                
             except requests.exceptions.Timeout:
-                if attempt < max_retries - 1:
-                    wait_time = backoff_factor * (2 ** attempt)
+                # 데드라인 초과(DeadlineExceeded)도 Timeout - 남은 시간이 없으면 재시도하지 않음
+                wait_time = backoff_factor * (2 ** attempt)
+                if attempt < max_retries - 1 and can_retry(wait_time):
                     logger.warning(f"Timeout for {url} (attempt {attempt + 1}), retrying in {wait_time:.2f}s")
                     time.sleep(wait_time)
                     continue
                 else:
-                    logger.error(f"Final timeout for {url} after {max_retries} attempts")
+                    logger.error(f"Final timeout for {url} after {attempt + 1} attempts")
                     raise
                     
             except requests.exceptions.ConnectionError:
-                if attempt < max_retries - 1:
-                    wait_time = backoff_factor * (2 ** attempt) + random.uniform(0, 2)
+                wait_time = backoff_factor * (2 ** attempt) + random.uniform(0, 2)
+                if attempt < max_retries - 1 and can_retry(wait_time):
                     logger.warning(f"Connection error for {url} (attempt {attempt + 1}), retrying in {wait_time:.2f}s")
                     time.sleep(wait_time)
                     continue
                 else:
-                    logger.error(f"Final connection error for {url} after {max_retries} attempts")
+                    logger.error(f"Final connection error for {url} after {attempt + 1} attempts")
                     raise
                     
             except Exception as e:
                 logger.error(f"Unexpected error for {url}: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(backoff_factor * (2 ** attempt))
+                wait_time = backoff_factor * (2 ** attempt)
+                if attempt < max_retries - 1 and can_retry(wait_time):
+                    time.sleep(wait_time)
                     continue
                 else:
                     raise
@@ -298,27 +329,8 @@ class MarketDataService:
         return None
     
     def _get_rate_limit_wait_time(self, response: requests.Response, attempt: int) -> float:
-        """Calculate appropriate wait time for rate limiting"""
-        # Check for Retry-After header
-        retry_after = response.headers.get('Retry-After')
-        if retry_after:
-            try:
-                return float(retry_after)
-            except ValueError:
-                pass
-        
-        # Check for X-RateLimit-Reset header (Unix timestamp)
-        reset_time = response.headers.get('X-RateLimit-Reset')
-        if reset_time:
-            try:
-                reset_timestamp = int(reset_time)
-                wait_time = reset_timestamp - int(time.time())
-                return max(1, min(wait_time, 300))  # Cap at 5 minutes
-            except ValueError:
-                pass
-        
-        # Fallback to exponential backoff
-        return min(60, 2 ** attempt + random.uniform(0, 5))
+        """Calculate appropriate wait time for rate limiting (Retry-After > X-RateLimit-Reset > 지수 백오프)"""
+        return retry_after_seconds(response, default=min(60, 2 ** attempt + random.uniform(0, 5)))
     
     def _handle_api_error(self, api_name: str, error: Exception, symbol: str = None) -> None:
         """Enhanced error handling with API-specific logic"""
@@ -349,19 +361,166 @@ class MarketDataService:
             logger.error(f"{api_name} API error for {symbol}: {error}")
     
     def _is_api_available(self, api_name: str) -> bool:
-        """Check if API is currently available (not rate limited)"""
+        """Check if API is currently available (not rate limited and has request budget left)"""
         rate_limit_key = f"rate_limit_{api_name}"
-        return not cache.get(rate_limit_key)
+        if cache.get(rate_limit_key):
+            return False
+        # 이번 창의 요청 예산이 없으면 429를 받으러 가지 않고 건너뜀 (토큰 소비는 HTTP 레이어에서)
+        return get_rate_limiter().has_budget(api_name)
         self.marketstack_base = "https://api.marketstack.com/v1"
     
-    def get_real_time_quote(self, symbol: str, market: str = 'us_stock') -> Optional[Dict[str, Any]]:
-        """실시간 시세 조회 - 개선된 폴백 시스템과 레이트 리미팅 처리"""
-        cache_key = f"realtime_{market}_{symbol}"
-        cached_data = cache.get(cache_key)
+    def _provider_ready(self, api_name: str, endpoint: str) -> bool:
+        """레이트 리밋/요청 예산/서킷 브레이커를 모두 통과한 프로바이더인지 확인"""
+        return self._is_api_available(api_name) and provider_health.allow(api_name, endpoint)
+    
+    def _order_providers(self, endpoint: str, providers: List[tuple]) -> List[tuple]:
+        """
+        폴백 체인 정렬 - (api_name, ...) 튜플 목록을 받아 같은 형태로 반환
         
-        if cached_data:
-            return cached_data
+        MarketDataSource.priority로 기본 순서를 정하고, 적응형 정렬이 켜져 있으면
+        서킷이 닫힌 프로바이더 중 기대 지연시간(p50 / 성공률)이 낮은 순으로 재정렬한다.
+        """
+        limits = get_rate_limiter().limits()
+        base = sorted(providers, key=lambda entry: limits[entry[0]].priority if entry[0] in limits else 1)
+        if not getattr(settings, 'MARKET_DATA_ADAPTIVE_PROVIDER_ORDER', True):
+            return base
+        by_name = {entry[0]: entry for entry in base}
+        return [by_name[name] for name in provider_health.order(endpoint, [entry[0] for entry in base])]
+    
+    def fan_out(self, tasks: Dict[str, Callable[[], Any]], deadline: Optional[float] = None,
+                executor: Optional[ThreadPoolExecutor] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        이름별 조회 함수를 팬아웃 풀에서 동시에 실행하고 deadline초 안에 끝난 결과만 모아 반환
+        
+        전체 소요 시간은 가장 느린 작업(최대 deadline)으로 제한된다. 시간 안에 끝나지 않은 작업은
+        기다리지 않고 timeout으로 표시하며(이미 실행 중인 조회는 끝까지 돌아 캐시를 채움),
+        한 작업의 실패는 다른 작업에 영향을 주지 않는다. 작업이 프로바이더를 직접 한 번만 호출하면
+        executor=get_provider_executor()로 프로바이더 풀에서 실행 (팬아웃 풀 안에서 팬아웃 풀을 기다리지 않도록).
+        
+        Returns:
+            {name: {'data', 'status' ('ok' | 'empty' | 'error' | 'timeout'), 'elapsed_ms', 'stale'[, 'age']}}
+        """
+        deadline = self.fanout_deadline if deadline is None else deadline
+        left = deadline_remaining()
+        if left is not None:
+            # 요청 데드라인보다 오래 기다리지 않음
+            deadline = min(deadline, left)
+        
+        def timed(name: str, func: Callable[[], Any]) -> tuple:
+            start = time.monotonic()
+            try:
+                return func(), None, time.monotonic() - start
+            except Exception as e:
+                logger.error(f"Fan-out task {name} failed: {e}")
+                return None, e, time.monotonic() - start
+        
+        executor = executor or get_fanout_executor()
+        # 작업 스레드도 같은 요청 데드라인을 지키도록 컨텍스트를 넘김
+        futures = {name: executor.submit(bind_deadline(timed), name, func) for name, func in tasks.items()}
+        done, _ = wait(list(futures.values()), timeout=deadline)
+        
+        results = {}
+        for name, future in futures.items():
+            if future not in done:
+                future.cancel()
+                logger.warning(f"Fan-out task {name} missed the {deadline}s deadline")
+                results[name] = {'data': None, 'status': 'timeout', 'elapsed_ms': int(deadline * 1000), 'stale': False}
+                continue
+            data, error, elapsed = future.result()
+            status = 'error' if error else ('ok' if data else 'empty')
+            results[name] = {'data': data, 'status': status, 'elapsed_ms': int(elapsed * 1000),
+                             **self._section_freshness(data)}
+        return results
+    
+    @staticmethod
+    def _section_freshness(data: Any) -> Dict[str, Any]:
+        """섹션 데이터의 stale/age (시세 목록은 가장 오래된 stale 시세 기준)"""
+        if getattr(data, 'stale', False):
+            return {'stale': True, 'age': data.age}
+        if isinstance(data, dict) and data.get('stale'):
+            return {'stale': True, 'age': data.get('age', 0)}
+        if isinstance(data, list):
+            ages = [item.get('age', 0) for item in data if isinstance(item, dict) and item.get('stale')]
+            if ages:
+                return {'stale': True, 'age': max(ages)}
+        return {'stale': False}
+    
+    def get_dashboard(self, sections: Optional[List[str]] = None, stocks: Optional[List[str]] = None,
+                      cryptos: Optional[List[str]] = None, news_limit: int = 5,
+                      deadline: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        홈 화면 섹션(지수/인기 주식/상위 암호화폐/관심 종목/뉴스)을 동시에 조회
         
+        응답 지연은 섹션 합계가 아니라 가장 느린 섹션(최대 deadline) 수준. 섹션별 결과 형식은 fan_out 참고
+        """
+        tasks = {
+            'indices': self.get_market_indices,
+            'stocks': lambda: list(self.get_real_time_quotes(stocks or POPULAR_STOCKS, 'us_stock').values()),
+            'cryptos': lambda: list(self.get_real_time_quotes(cryptos or TOP_CRYPTOS, 'crypto').values()),
+            'watchlist': lambda: list(self.get_real_time_quotes(WATCHLIST_SYMBOLS, 'us_stock').values()),
+            'news': lambda: self.get_market_news(limit=news_limit),
+        }
+        names = [name for name in DASHBOARD_SECTIONS if not sections or name in sections]
+        return self.fan_out({name: tasks[name] for name in names}, deadline)
+    
+    def _run_provider_chain(self, endpoint: str, chain: List[tuple], label: str = '',
+                            symbol: Optional[str] = None, market: Optional[str] = None) -> tuple:
+        """
+        (api_name, 호출 함수) 체인을 상태 순으로 실행해 첫 번째 유효 결과 반환
+        
+        요청 데드라인이 지나면 남은 프로바이더를 시도하지 않고 멈춘다 (데드라인 절단으로 기록).
+        symbol을 주면 그 시장을 서비스하지 않거나 최근 이 심볼에 빈 응답을 준 프로바이더는 건너뛰고,
+        새로 빈 응답을 준 프로바이더를 (프로바이더, 심볼, endpoint) 미스로 기록한다.
+        
+        Returns:
+            (api_name, data) - 모두 실패하면 (None, None)
+        """
+        if symbol:
+            chain = negative_cache.filter(endpoint, symbol, market, chain)
+        for api_name, api_func in self._order_providers(endpoint, chain):
+            if deadline_expired():
+                record_cut(f"chain:{endpoint}")
+                logger.warning(f"⏱️ Request deadline reached, stopping {endpoint} chain {label} before {api_name}")
+                break
+            if not self._provider_ready(api_name, endpoint):
+                logger.info(f"Skipping {api_name} for {endpoint} {label} (rate limited, no budget or circuit open)")
+                continue
+            start_time = time.monotonic()
+            data, error = None, None
+            try:
+                data = api_func()
+            except Exception as e:
+                error = e
+                logger.warning(f"{api_name} failed for {endpoint} {label}: {e}")
+            finally:
+                cut = not data and self._call_was_cut(error)
+                if cut:
+                    # 데드라인/예산 때문에 잘린 호출은 상태에 반영하지 않되 half-open 시험 호출 자리는 반납
+                    provider_health.release(api_name, endpoint)
+                else:
+                    provider_health.record(api_name, endpoint, time.monotonic() - start_time, bool(data), error)
+            if data:
+                return api_name, data
+            if symbol and error is None and not cut:
+                negative_cache.record_miss(api_name, symbol, endpoint)
+        return None, None
+    
+    @staticmethod
+    def _call_was_cut(error: Optional[BaseException]) -> bool:
+        """요청 데드라인이 지났거나 예산이 없어 프로바이더 답을 받지 못한 호출인지 (상태/미스 기록 제외 대상)"""
+        return deadline_expired() or isinstance(error, ProviderBudgetExhausted)
+    
+    def get_real_time_quote(self, symbol: str, market: str = 'us_stock') -> Optional[Dict[str, Any]]:
+        """실시간 시세 조회 - 헤지 레이스 기반 폴백 시스템과 레이트 리미팅 처리"""
+        if negative_cache.is_unknown(symbol, 'quote', local_only=True):
+            # 어느 프로바이더도 모르는 심볼 - 캐시/체인을 거치지 않고 바로 응답
+            return self._sample_quote(symbol, market)
+        cache_key = symbol_key(f"realtime_{market}_", symbol)
+        # soft TTL 경과 시 stale 값 즉시 반환 + 백그라운드 갱신, 미스는 single-flight로 병합
+        return swr_cache.get_or_fetch(cache_key, lambda: self._fetch_real_time_quote(symbol, market, cache_key))
+    
+    def _fetch_real_time_quote(self, symbol: str, market: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """캐시 미스 시 프로바이더 체인에서 시세 조회 후 캐시에 저장"""
         # API 우선순위 및 레이트 리미팅 고려
         apis_to_try = [
             ('finnhub', self._get_finnhub_quote, 60),      # 1분 캐시
@@ -371,31 +530,19 @@ class MarketDataService:
             ('twelve_data', self._get_twelve_data_quote, 900)  # 15분 캐시 (가장 제한적)
         ]
         
-        for api_name, api_func, cache_timeout in apis_to_try:
-            # API별 레이트 리미팅 체크
-            rate_limit_key = f"rate_limit_{api_name}"
-            if cache.get(rate_limit_key):
-                logger.info(f"Skipping {api_name} due to rate limiting")
-                continue
-                
-            try:
-                logger.info(f"Trying {api_name} for quote {symbol}")
-                data = api_func(symbol)
-                if data:
-                    data['source'] = api_name
-                    # Apply precision formatting
-                    data = PrecisionHandler.format_market_data(data, symbol, market)
-                    cache.set(cache_key, data, timeout=cache_timeout)
-                    logger.info(f"Successfully got quote from {api_name}")
-                    return data
-            except Exception as e:
-                if "429" in str(e) or "rate limit" in str(e).lower():
-                    # 레이트 리미팅 감지 시 해당 API를 일정 시간 비활성화
-                    cache.set(rate_limit_key, True, timeout=300)  # 5분 비활성화
-                    logger.warning(f"{api_name} rate limited, disabling for 5 minutes")
-                else:
-                    logger.warning(f"{api_name} failed for {symbol}: {e}")
-                continue
+        if negative_cache.is_unknown(symbol, 'quote'):
+            return self._sample_quote(symbol, market)
+        # 심볼 시장을 서비스하지 않거나 최근 이 심볼에 빈 응답을 준 프로바이더 제외
+        candidates = negative_cache.filter('quote', symbol, market, apis_to_try)
+        winner = self._race_quote_providers(symbol, self._order_providers('quote', candidates)) if candidates else None
+        if winner:
+            api_name, data, cache_timeout = winner
+            data['source'] = api_name
+            # Apply precision formatting
+            data = PrecisionHandler.format_market_data(data, symbol, market)
+            swr_cache.set(cache_key, data, soft_ttl=cache_timeout)
+            logger.info(f"Successfully got quote from {api_name}")
+            return data
         
         # 모든 API 실패 시 CoinGecko 시도 (일부 주식도 지원)
         logger.warning(f"All APIs failed for quote {symbol}, trying CoinGecko as fallback")
@@ -403,15 +550,233 @@ class MarketDataService:
         if coingecko_data:
             # Apply precision formatting
             coingecko_data = PrecisionHandler.format_market_data(coingecko_data, symbol, market)
-            cache.set(cache_key, coingecko_data, timeout=300)  # 5분 캐시
+            swr_cache.set(cache_key, coingecko_data, soft_ttl=300)  # 5분 캐시
             return coingecko_data
         
-        # CoinGecko도 실패 시 샘플 데이터 반환
+        # CoinGecko도 실패 시 샘플 데이터 반환 (모든 프로바이더가 모르는 심볼이면 다음부터 체인 생략)
         logger.warning(f"CoinGecko also failed for {symbol}, returning sample data")
+        negative_cache.conclude('quote', symbol, market, [entry[0] for entry in apis_to_try])
+        return self._sample_quote(symbol, market)
+    
+    def _sample_quote(self, symbol: str, market: str) -> Dict[str, Any]:
+        """정밀도를 적용한 샘플 시세 (모든 프로바이더 실패/미지 심볼)"""
         sample_data = self._get_sample_stock_data(symbol)
         # Apply precision formatting to sample data
         return PrecisionHandler.format_market_data(sample_data, symbol, market)
     
+    def get_real_time_quotes(self, symbols: List[str], market: str = 'us_stock') -> Dict[str, Dict[str, Any]]:
+        """
+        다중 심볼 실시간 시세 일괄 조회
+        
+        캐시된 심볼은 한 번에 반환하고, 캐시 미스 심볼은 프로바이더의 다중 심볼 요청
+        (Twelve Data/Marketstack 콤마 구분 심볼, CoinGecko simple/price?ids=a,b,c)으로
+        묶어서 조회한다. 그래도 남은 심볼만 단건 폴백 체인으로 조회한다.
+        
+        Returns:
+            {symbol: quote} - 요청 순서 유지, 조회 실패 심볼은 제외
+        """
+        symbols = list(dict.fromkeys(s.strip() for s in symbols if s and s.strip()))
+        if not symbols:
+            return {}
+        
+        is_crypto = market == 'crypto'
+        if is_crypto:
+            key_for = lambda symbol: symbol_key("crypto_", symbol, "USD")
+        else:
+            key_for = lambda symbol: symbol_key(f"realtime_{market}_", symbol)
+        
+        cached = swr_cache.get_many([key_for(symbol) for symbol in symbols])
+        results = {}
+        for symbol in symbols:
+            lookup = cached.get(key_for(symbol))
+            if not lookup:
+                continue
+            if lookup.stale:
+                # stale 값은 표시를 붙여 바로 반환하고 단건 경로로 백그라운드 갱신
+                swr_cache.refresh_in_background(
+                    key_for(symbol), self._batch_refresh_func(symbol, market), stale_value=lookup.value
+                )
+                results[symbol] = swr_cache.mark_stale(lookup.value, lookup.age)
+            else:
+                results[symbol] = lookup.value
+        misses = [symbol for symbol in symbols if symbol not in results]
+        
+        if misses:
+            logger.info(f"Batch quotes: {len(results)} cached, fetching {len(misses)} ({', '.join(misses)})")
+            
+            if is_crypto:
+                batch_providers = [('coingecko', lambda batch: self._get_coingecko_crypto_batch(batch, 'USD'), 300)]
+            else:
+                batch_providers = [
+                    ('twelve_data', self._get_twelve_data_quotes_batch, 900),
+                    ('marketstack', self._get_marketstack_quotes_batch, 600),
+                ]
+            
+            for api_name, batch_func, cache_timeout in batch_providers:
+                if not misses:
+                    break
+                if not self._is_api_available(api_name):
+                    continue
+                
+                fetched = batch_func(misses)
+                to_cache = {}
+                for symbol, data in fetched.items():
+                    data['source'] = api_name
+                    if not is_crypto:
+                        data = PrecisionHandler.format_market_data(data, symbol, market)
+                    results[symbol] = data
+                    to_cache[key_for(symbol)] = data
+                if to_cache:
+                    swr_cache.set_many(to_cache, soft_ttl=cache_timeout)
+                misses = [symbol for symbol in misses if symbol not in results]
+            
+            # 배치 요청으로도 못 구한 심볼은 기존 단건 폴백 체인 사용
+            for symbol in misses:
+                data = self.get_crypto_data(symbol, 'USD') if is_crypto else self.get_real_time_quote(symbol, market)
+                if data:
+                    results[symbol] = data
+        
+        return {symbol: results[symbol] for symbol in symbols if symbol in results}
+    
+    def _batch_refresh_func(self, symbol: str, market: str):
+        """get_real_time_quotes의 stale 항목 갱신 함수"""
+        if market == 'crypto':
+            return lambda: self._fetch_crypto_data(symbol, 'USD', symbol_key("crypto_", symbol, "USD"))
+        cache_key = symbol_key(f"realtime_{market}_", symbol)
+        return lambda: self._fetch_real_time_quote(symbol, market, cache_key)
+    
+    def _race_quote_providers(self, symbol: str, apis_to_try: List[tuple]) -> Optional[tuple]:
+        """
+        프로바이더 헤지 레이스
+        
+        최우선 프로바이더를 먼저 호출하고, 헤지 지연(기본: 해당 프로바이더 p95) 안에
+        응답이 없거나 실패하면 다음 프로바이더를 병렬로 추가 호출한다.
+        가장 먼저 도착한 유효 응답을 채택하고 나머지는 취소/무시한다.
+        전체 소요 시간은 quote_deadline과 요청 데드라인 중 짧은 쪽으로 제한된다.
+        
+        Returns:
+            (api_name, data, cache_timeout) 또는 None
+        """
+        executor = get_provider_executor()
+        queue = list(apis_to_try)
+        pending = {}
+        started_at = time.monotonic()
+        left = deadline_remaining()
+        request_bound = left is not None and left < self.quote_deadline
+        deadline = started_at + (left if request_bound else self.quote_deadline)
+        next_launch = started_at
+        
+        try:
+            while True:
+                now = time.monotonic()
+                if now >= deadline:
+                    if request_bound:
+                        record_cut('quote_race')
+                    logger.warning(f"Quote deadline ({deadline - started_at:.2f}s) exceeded for {symbol}")
+                    return None
+                
+                # 헤지 시점이 되었거나 진행 중인 호출이 없으면 다음 프로바이더 시작
+                if queue and (not pending or now >= next_launch):
+                    api_name, api_func, cache_timeout = queue.pop(0)
+                    if not self._provider_ready(api_name, 'quote'):
+                        logger.info(f"Skipping {api_name} (rate limited, no budget or circuit open)")
+                        continue
+                    logger.info(f"Trying {api_name} for quote {symbol}")
+                    future = executor.submit(bind_deadline(self._timed_quote_call), api_name, api_func, symbol)
+                    pending[future] = (api_name, cache_timeout)
+                    next_launch = now + self._get_hedge_delay(api_name)
+                    continue
+                
+                if not pending:
+                    return None
+                
+                timeout = deadline - now
+                if queue:
+                    timeout = min(timeout, max(0.0, next_launch - now))
+                done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    api_name, cache_timeout = pending.pop(future)
+                    data, error = future.result()
+                    if data and self._is_valid_quote(data):
+                        provider_health.record_win(api_name, 'quote')
+                        logger.info(f"{api_name} won quote race for {symbol} "
+                                    f"in {time.monotonic() - started_at:.2f}s")
+                        return api_name, data, cache_timeout
+                    
+                    if error and ("429" in str(error) or "rate limit" in str(error).lower()):
+                        # 레이트 리미팅 감지 시 해당 API를 일정 시간 비활성화
+                        cache.set(f"rate_limit_{api_name}", True, timeout=300)  # 5분 비활성화
+                        logger.warning(f"{api_name} rate limited, disabling for 5 minutes")
+                    elif error:
+                        logger.warning(f"{api_name} failed for {symbol}: {error}")
+                    
+                    # 실패한 경우 헤지 지연을 기다리지 않고 바로 다음 프로바이더로
+                    next_launch = time.monotonic()
+        finally:
+            # 아직 시작되지 않은 호출은 취소, 진행 중인 호출 결과는 무시
+            for future in pending:
+                future.cancel()
+    
+    def _timed_quote_call(self, api_name: str, api_func, symbol: str) -> tuple:
+        """프로바이더 호출 + 지연시간 기록. 예외를 던지지 않고 (data, error) 반환"""
+        start_time = time.monotonic()
+        data, error = None, None
+        try:
+            data = api_func(symbol)
+        except Exception as e:
+            error = e
+        latency = time.monotonic() - start_time
+        success = bool(data) and self._is_valid_quote(data)
+        if not success and self._call_was_cut(error):
+            # 데드라인/예산 때문에 잘린 호출은 지연시간/상태 통계에 넣지 않음 (시험 호출 자리만 반납)
+            provider_health.release(api_name, 'quote')
+        else:
+            provider_health.record(api_name, 'quote', latency, success, error)
+            if not success and error is None:
+                # 빈 응답/가격 0 (Finnhub는 모르는 심볼에 c=0) - 이 심볼에는 한동안 호출하지 않음
+                negative_cache.record_miss(api_name, symbol, 'quote')
+        return data, error
+    
+    def _get_hedge_delay(self, api_name: str) -> float:
+        """다음 프로바이더를 병렬로 시작하기까지 기다릴 시간 (초)"""
+        if not self.hedged_quotes:
+            # 헤지 비활성화 시 실패할 때만 다음 프로바이더로 넘어감 (순차 모드)
+            return self.quote_deadline
+        if self.hedge_delay is not None:
+            return float(self.hedge_delay)
+        
+        p95 = provider_health.percentile(api_name, 'quote', 95)
+        if p95 is None:
+            return self.hedge_max_delay
+        return min(self.hedge_max_delay, max(self.hedge_min_delay, p95))
+    
+    @staticmethod
+    def _is_valid_quote(data: Dict[str, Any]) -> bool:
+        """가격이 0보다 큰 응답만 유효한 시세로 인정"""
+        price = data.get('price', data.get('current_price'))
+        try:
+            return price is not None and float(price) > 0
+        except (TypeError, ValueError):
+            return False
+    
+    def get_provider_stats(self) -> Dict[str, Any]:
+        """헤지 지연 튜닝용 프로바이더별 지연시간/승리 횟수"""
+        return {
+            'hedged_quotes': self.hedged_quotes,
+            'hedge_delay': self.hedge_delay if self.hedge_delay is not None else 'p95',
+            'hedge_min_delay': self.hedge_min_delay,
+            'hedge_max_delay': self.hedge_max_delay,
+            'quote_deadline': self.quote_deadline,
+            'health': provider_health.snapshot(),
+            'coalescing': single_flight.stats(),
+            'swr': swr_cache.stats(),
+            'rate_limits': get_rate_limiter().stats(),
+            'cache': cache_stats(),
+            'deadlines': deadline_stats.snapshot(),
+            'negative_cache': negative_cache.stats(),
+        }
+    
     def _get_sample_stock_data(self, symbol: str) -> Dict[str, Any]:
         """샘플 주식 데이터 제공"""
         sample_stock_data = {
@@ -466,7 +831,7 @@ class MarketDataService:
                 'token': self.finnhub_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -484,36 +849,81 @@ class MarketDataService:
             }
             
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"Finnhub 시세 조회 오류 {symbol}: {e}")
             return None
     
     def get_historical_data(self, symbol: str, period: str = '1month', 
                           interval: str = '1day', market: str = 'us_stock') -> Optional[List[Dict]]:
-        """과거 데이터 조회 - 여러 API 사용 with optimized caching"""
-        cache_key = f"historical_{market}_{symbol}_{period}_{interval}"
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            logger.info(f"✅ Cache hit for {symbol} {interval}")
-            return cached_data
-        
+        """과거 데이터 조회 - 기존 JSON 행 형태 (뷰 응답용)"""
+        series = self.get_historical_series(symbol, period, interval, market)
+        if not series:
+            return None
+        rows = series.to_rows()
+        return swr_cache.mark_stale(rows, series.age) if series.stale else rows
+    
+    def get_historical_series(self, symbol: str, period: str = '1month',
+                              interval: str = '1day', market: str = 'us_stock') -> Optional[OHLCVSeries]:
+        """
+        과거 데이터 조회 - 여러 API 사용 with optimized caching (컬럼형 시리즈)
+
+        period/interval 표기는 HistoryRequest로 정규화 ('1month'/'30d'/'1mo', '1day'/'1d'는 같은 캐시 항목)
+        """
+        request = HistoryRequest.from_params(symbol, period, interval, market)
+        kind = 'crypto_historical' if request.symbol in CRYPTO_SYMBOLS or market == 'crypto' else 'historical'
+        if negative_cache.is_unknown(request.symbol, kind, local_only=True):
+            return None
+        cache_key = request.cache_key()
+        # soft TTL 경과 시 stale 값 즉시 반환 + 백그라운드 갱신, 미스는 single-flight로 병합
+        series = swr_cache.get_or_fetch(
+            cache_key,
+            lambda: self._fetch_historical_data(request.symbol, request.period, request.interval, market, cache_key)
+        )
+        if isinstance(series, list):
+            # 배포 전에 list of dict로 저장된 캐시 항목
+            stale, age = getattr(series, 'stale', False), getattr(series, 'age', 0)
+            series = OHLCVSeries.from_rows(series)
+            if stale:
+                series = series.with_staleness(age)
+        return series
+    
+    def _fetch_historical_data(self, symbol: str, period: str, interval: str, market: str,
+                               cache_key: str, use_cached_daily: bool = True) -> Optional[OHLCVSeries]:
+        """
+        캐시 미스 시 일봉 캐시 집계 또는 프로바이더 체인에서 과거 데이터 조회
+
+        use_cached_daily=False면 신선한 일봉 캐시가 있어도 업스트림에서 다시 조회 (캐시 워머용)
+        """
+        request = HistoryRequest.from_params(symbol, period, interval, market)
         try:
+            # 분/시간봉: 같은 간격의 더 긴 구간이 신선하게 캐시돼 있으면 잘라서 응답 (프로바이더 호출 없음)
+            if use_cached_daily and not is_daily_or_coarser(interval):
+                cached = self._cached_superset(request)
+                if cached:
+                    sliced, remaining = cached
+                    logger.info(f"✂️ Sliced {len(sliced)} {interval} bars for {symbol} from a longer cached range")
+                    swr_cache.set(cache_key, sliced, soft_ttl=remaining)
+                    return sliced
+            
             # Check if we have daily data cached - this is the optimization key
-            daily_cache_key = f"historical_{market}_{symbol}_{period}_1d"
-            daily_data = cache.get(daily_cache_key)
+            # (같은 기간 또는 더 긴 기간의 신선한 일봉을 요청 구간으로 잘라 사용)
+            daily_cache_key = request.with_interval('1d').cache_key()
+            cached_daily = self._cached_superset(request.with_interval('1d'), include_self=True) if use_cached_daily else None
+            daily_data, daily_remaining = cached_daily or (None, 0)
             
-            # If we have daily data cached, quickly aggregate to requested interval
-            if daily_data and interval != '1d':
+            # If we have daily data cached, quickly aggregate to requested interval (처음 요청 시 집계 후 캐시)
+            if daily_data and interval != '1d' and is_daily_or_coarser(interval):
                 logger.info(f"⚡ INSTANT: Fast aggregation from cached daily data for {symbol} {interval}")
                 start_agg_time = time.time()
                 aggregated_data = self._aggregate_daily_data(daily_data, interval)
                 agg_duration = time.time() - start_agg_time
                 logger.info(f"⚡ Aggregation completed in {agg_duration:.3f}s")
-                cache.set(cache_key, aggregated_data, timeout=300)  # 5min cache
+                swr_cache.set(cache_key, aggregated_data, soft_ttl=300)  # 5min cache
                 return aggregated_data
             
             # If requesting daily data and we have it cached, return immediately
-            if daily_data and interval == '1d':
+            if daily_data and normalize_interval(interval) == '1d':
+                swr_cache.set(cache_key, daily_data, soft_ttl=daily_remaining)
                 return daily_data
             
             # Need to fetch new data
@@ -521,95 +931,100 @@ class MarketDataService:
             raw_data = None
             
             # Check if this is a cryptocurrency symbol
-            crypto_symbols = ['BTC', 'ETH', 'ADA', 'BNB', 'DOT', 'MATIC', 'SOL', 'LTC', 'XRP', 'DOGE', 'AVAX', 'LINK', 'UNI', 'ATOM',
-                            'btc', 'eth', 'ada', 'bnb', 'dot', 'matic', 'sol', 'ltc', 'xrp', 'doge', 'avax', 'link', 'uni', 'atom']
+            is_crypto = symbol.upper() in CRYPTO_SYMBOLS or market == 'crypto'
+            
+            # 체결 웹소켓으로 수집 중인 심볼의 분/시간봉은 저장된 봉 + 진행 중인 봉으로 응답 (API 호출 없음)
+            if normalize_interval(interval) in STREAMED_INTERVALS and is_streamed(symbol):
+                streamed = self._get_streamed_bars(symbol, period, interval, 'crypto' if is_crypto else market)
+                if streamed:
+                    logger.info(f"📶 Served {len(streamed)} streamed {interval} bars for {symbol}")
+                    swr_cache.set(cache_key, streamed, soft_ttl=5)  # 진행 중인 봉이 계속 바뀌므로 짧게
+                    return streamed
+            
+            # 일/주/월봉은 DB 봉 저장소에서 읽고 빠진 구간만 프로바이더에서 조회
+            handled = False
+            if is_daily_or_coarser(interval):
+                handled, raw_data = self._get_stored_daily_bars(
+                    symbol, period, market, is_crypto, refresh_tail=not use_cached_daily
+                )
+            
+            if handled:
+                logger.info(f"🗄️ Bar store served {len(raw_data or [])} daily bars for {symbol}")
             
-            if symbol in crypto_symbols or market == 'crypto':
+            elif is_crypto:
                 # Use multiple APIs for cryptocurrency data, not just CoinGecko
                 logger.info(f"Detected crypto symbol {symbol}, trying crypto-compatible APIs")
                 
                 # Convert period to days for CoinGecko
-                period_days = '30'  # default
-                if '1month' in period or '30' in period:
-                    period_days = '30'
-                elif '7day' in period or '1week' in period:
-                    period_days = '7'
-                elif '1year' in period or '365' in period:
-                    period_days = '365'
-                elif '90' in period or '3month' in period:
-                    period_days = '90'
+                period_days = str(request.days)
                 
-                # Try Twelve Data first for crypto (supports BTC/USD format)
+                # Twelve Data(BTC/USD 형식) -> Alpha Vantage -> CoinGecko, 프로바이더 상태에 따라 재정렬
+                chain = []
                 if symbol.upper() in ['BTC', 'ETH', 'ADA', 'BNB', 'DOT', 'MATIC', 'SOL', 'LTC', 'XRP', 'DOGE', 'AVAX', 'LINK']:
                     crypto_symbol = f"{symbol.upper()}/USD"
-                    raw_data = self._get_twelve_data_historical(crypto_symbol, period, '1d')  # Get daily first
+                    chain.append(('twelve_data', lambda: self._get_twelve_data_historical(crypto_symbol, period, '1d')))
+                chain.append(('alpha_vantage', lambda: self._get_alpha_vantage_crypto_historical(symbol.upper(), period)))
+                chain.append(('coingecko', lambda: self.get_coingecko_historical_data(symbol, period_days)))
                 
-                # Try Alpha Vantage for crypto if Twelve Data failed
+                _, raw_data = self._run_provider_chain('crypto_historical', chain, symbol, symbol=symbol, market='crypto')
                 if not raw_data:
-                    raw_data = self._get_alpha_vantage_crypto_historical(symbol.upper(), period)
-                
-                # Try CoinGecko as fallback
-                if not raw_data:
-                    raw_data = self.get_coingecko_historical_data(symbol, period_days)
+                    negative_cache.conclude('crypto_historical', symbol, 'crypto', [entry[0] for entry in chain])
             
             else:
                 # 🚀 IMMEDIATE RESPONSE: Try native intervals first (no aggregation needed)
-                logger.info(f"🚀 Attempting native {interval} data for {symbol}")
-                
-                # Try Alpha Vantage native intervals first (fastest)
-                raw_data = self._get_alpha_vantage_historical(symbol, period, interval)
-                if raw_data:
-                    logger.info(f"✅ Got native {interval} data from Alpha Vantage for {symbol}")
-                    cache.set(cache_key, raw_data, timeout=120)  # 2min cache for real-time
-                    return raw_data
+                # 4시간봉은 Alpha Vantage에 없으므로 1시간봉을 받아 시장 시간대 기준으로 리샘플링
+                native_interval = '1h' if normalize_interval(interval) == '4h' else interval
+                logger.info(f"🚀 Attempting native {native_interval} data for {symbol}")
                 
-                # Try Twelve Data native intervals
-                raw_data = self._get_twelve_data_historical(symbol, period, interval)
+                native_chain = [
+                    ('alpha_vantage', lambda: self._get_alpha_vantage_historical(symbol, period, native_interval)),
+                    ('twelve_data', lambda: self._get_twelve_data_historical(symbol, period, native_interval)),
+                ]
+                api_name, raw_data = self._run_provider_chain('historical', native_chain, symbol, symbol=symbol, market=market)
+                raw_data = OHLCVSeries.from_rows(raw_data) if raw_data else None
+                if raw_data and native_interval != interval:
+                    raw_data = resample(raw_data, interval, market_timezone(market))
                 if raw_data:
-                    logger.info(f"✅ Got native {interval} data from Twelve Data for {symbol}")
-                    cache.set(cache_key, raw_data, timeout=120)  # 2min cache for real-time
+                    logger.info(f"✅ Got native {interval} data from {api_name} for {symbol}")
+                    swr_cache.set(cache_key, raw_data, soft_ttl=120)  # 2min cache for real-time
                     return raw_data
                 
                 # 🚀 FALLBACK: If no native data, get daily and aggregate quickly
                 logger.info(f"⚡ Falling back to fast aggregation for {symbol} {interval}")
                 
-                # For stock symbols, use traditional APIs
-                # 1순위: Alpha Vantage
-                raw_data = self._get_alpha_vantage_historical(symbol, period, '1d')  # Always get daily data first
+                # For stock symbols, use traditional APIs (always daily data first)
+                daily_chain = []
+                if interval != '1d':
+                    # 1d 요청이면 위 네이티브 단계에서 이미 시도함
+                    daily_chain.append(('alpha_vantage', lambda: self._get_alpha_vantage_historical(symbol, period, '1d')))
+                    daily_chain.append(('twelve_data', lambda: self._get_twelve_data_historical(symbol, period, '1d')))
+                daily_chain.append(('tiingo', lambda: self._get_tiingo_historical(symbol, period)))
+                daily_chain.append(('marketstack', lambda: self._get_marketstack_historical(symbol, period)))
                 
-                # 2순위: Twelve Data
+                _, raw_data = self._run_provider_chain('historical', daily_chain, symbol, symbol=symbol, market=market)
                 if not raw_data:
-                    raw_data = self._get_twelve_data_historical(symbol, period, '1d')  # Always get daily data first
-                
-                # 3순위: Tiingo
-                if not raw_data:
-                    raw_data = self._get_tiingo_historical(symbol, period)
-                
-                # 4순위: Marketstack
-                if not raw_data:
-                    raw_data = self._get_marketstack_historical(symbol, period)
+                    negative_cache.conclude('historical', symbol, market,
+                                            [entry[0] for entry in native_chain + daily_chain])
+            
+            if isinstance(raw_data, list):
+                raw_data = OHLCVSeries.from_rows(raw_data)
             
             if raw_data:
                 # 🚀 OPTIMIZATION: Cache daily data with shorter timeout for real-time feel
-                cache.set(daily_cache_key, raw_data, timeout=300)  # 5min cache daily data
-                
-                # Pre-compute and cache all common intervals to make future requests instant
-                intervals_to_cache = ['1d', '1w', '1M']
-                for cache_interval in intervals_to_cache:
-                    if cache_interval == '1d':
-                        cache.set(f"historical_{market}_{symbol}_{period}_{cache_interval}", raw_data, timeout=300)
-                    else:
-                        aggregated = self._aggregate_daily_data(raw_data, cache_interval)
-                        cache.set(f"historical_{market}_{symbol}_{period}_{cache_interval}", aggregated, timeout=300)
+                swr_cache.set(daily_cache_key, raw_data, soft_ttl=300)  # 5min cache daily data
                 
-                # Return the requested interval
-                if interval == '1d':
+                # 다른 간격(주/월/분기/연봉)은 미리 계산하지 않고 첫 요청 시 일봉 캐시에서 집계
+                if normalize_interval(interval) == '1d':
+                    if cache_key != daily_cache_key:
+                        swr_cache.set(cache_key, raw_data, soft_ttl=300)
                     logger.info(f"✅ Returning daily data for {symbol}")
                     return raw_data
-                else:
-                    aggregated_data = self._aggregate_daily_data(raw_data, interval)
-                    logger.info(f"✅ Returning {interval} data for {symbol}")
-                    return aggregated_data
+                
+                aggregated_data = self._aggregate_daily_data(raw_data, interval)
+                # 병합 대기 중인 다른 워커가 읽을 수 있도록 요청 키에도 저장
+                swr_cache.set(cache_key, aggregated_data, soft_ttl=300)
+                logger.info(f"✅ Returning {interval} data for {symbol}")
+                return aggregated_data
             
             return None
             
@@ -617,78 +1032,144 @@ class MarketDataService:
             logger.error(f"과거 데이터 조회 오류 {symbol}: {e}")
             return None
     
-    def get_crypto_data(self, symbol: str, vs_currency: str = 'USD') -> Optional[Dict[str, Any]]:
-        """암호화폐 데이터 조회 - 다중 API 폴백 시스템"""
-        cache_key = f"crypto_{symbol}_{vs_currency}"
-        cached_data = cache.get(cache_key)
+    def _cached_superset(self, request: HistoryRequest, include_self: bool = False) -> Optional[Tuple[OHLCVSeries, int]]:
+        """
+        요청 구간을 포함하는 가장 짧은 신선한 캐시 시리즈를 요청 구간으로 잘라 (시리즈, 남은 soft TTL) 반환
+
+        예: 신선한 1년 일봉 캐시가 있으면 1개월/3개월 일봉 요청은 프로바이더 호출 없이 슬라이스로 응답
+        """
+        candidates = [candidate.cache_key() for candidate in request.supersets(include_self)]
+        lookups = swr_cache.get_many(candidates)
+        for key in candidates:
+            lookup = lookups.get(key)
+            # stale 시리즈를 잘라 저장하면 갱신 전까지 신선한 값처럼 보이므로 신선한 것만 사용
+            if lookup is None or lookup.stale or lookup.remaining < 1:
+                continue
+            series = lookup.value
+            if isinstance(series, list):
+                series = OHLCVSeries.from_rows(series)
+            sliced = series.between(int(request.start().timestamp()), None) if series else None
+            if sliced:
+                return sliced, int(lookup.remaining)
+        return None
+    
+    def _get_streamed_bars(self, symbol: str, period: str, interval: str, market: str) -> Optional[OHLCVSeries]:
+        """인제스트 워커가 저장한 분/시간봉에 진행 중인 봉을 붙여 반환 (요청 간격이 다르면 리샘플링)"""
+        target = normalize_interval(interval)
+        stored = STREAMED_INTERVALS[target]
+        try:
+            now = timezone.now()
+            stock_id = bar_store.stock_for(symbol, market)
+            if stock_id is None:
+                return None
+            series = bar_store.read(stock_id, stored, period_start(period, now, default_days=1), now)
+            candle = live_candle(symbol, stored)
+            if candle and (not series or candle['timestamp'] > series.timestamps[-1]):
+                series.append(candle['timestamp'], candle['open'], candle['high'], candle['low'],
+                              candle['close'], candle['volume'])
+            if series and normalize_interval(stored) != target:
+                series = resample(series, target, market_timezone(market))
+            return series or None
+        except Exception as e:
+            logger.error(f"Streamed bars unavailable for {symbol} {interval}: {e}")
+            return None
+    
+    def _get_stored_daily_bars(self, symbol: str, period: str, market: str, is_crypto: bool,
+                               refresh_tail: bool = False) -> tuple:
+        """
+        marketdata.PriceData에 저장된 일봉으로 기간 데이터 구성
+
+        저장된 구간을 DB에서 한 번 읽어 빠진 앞부분/구멍/꼬리를 찾고, 그 부분만 프로바이더에서 받아
+        upsert한 경우에만 다시 읽는다 (빠진 곳이 없으면 쿼리 1회).
+        refresh_tail=True면 동기화 주기와 관계없이 마지막 저장 봉부터 다시 조회 (캐시 워머용).
+        반환: (handled, OHLCVSeries) - DB를 사용할 수 없으면 handled=False로 기존 체인 사용
+        """
+        if not getattr(settings, 'MARKET_DATA_BAR_STORE', True):
+            return False, None
         
-        if cached_data:
-            return cached_data
+        try:
+            now = timezone.now()
+            start = period_start(period, now)
+            stock_id = bar_store.stock_for(symbol, 'crypto' if is_crypto else market)
+            if stock_id is None:
+                return False, None
+            
+            stored = bar_store.read(stock_id, '1d', start, now)
+            gap = bar_store.missing_range(stored, stock_id, '1d', start, now, crypto=is_crypto)
+            if gap is None and refresh_tail:
+                gap = (datetime.fromtimestamp(stored.timestamps[-1], tz=dt_timezone.utc), now)
+            
+            if gap is not None:
+                since = gap[0]
+                logger.info(f"📡 Bar store gap for {symbol}: fetching daily bars since {since:%Y-%m-%d}")
+                if is_crypto:
+                    # CoinGecko는 31일 이상 요청해야 일봉(daily)으로 응답
+                    days = str(max(31, (now - since).days + 1))
+                    chain = []
+                    if symbol.upper() in ['BTC', 'ETH', 'ADA', 'BNB', 'DOT', 'MATIC', 'SOL', 'LTC', 'XRP', 'DOGE', 'AVAX', 'LINK']:
+                        crypto_symbol = f"{symbol.upper()}/USD"
+                        chain.append(('twelve_data', lambda: self._get_twelve_data_historical(crypto_symbol, period, '1d', since)))
+                    chain.append(('alpha_vantage', lambda: self._get_alpha_vantage_crypto_historical(symbol.upper(), period, since)))
+                    chain.append(('coingecko', lambda: self.get_coingecko_historical_data(symbol, days)))
+                    api_name, rows = self._run_provider_chain('crypto_historical', chain, symbol, symbol=symbol, market='crypto')
+                else:
+                    chain = [
+                        ('alpha_vantage', lambda: self._get_alpha_vantage_historical(symbol, period, '1d', since)),
+                        ('twelve_data', lambda: self._get_twelve_data_historical(symbol, period, '1d', since)),
+                        ('tiingo', lambda: self._get_tiingo_historical(symbol, period, since)),
+                        ('marketstack', lambda: self._get_marketstack_historical(symbol, period, since)),
+                    ]
+                    api_name, rows = self._run_provider_chain('historical', chain, symbol, symbol=symbol, market=market)
+                
+                if rows:
+                    saved = bar_store.upsert(stock_id, '1d', api_name, rows)
+                    bar_store.mark_synced(stock_id, '1d')
+                    logger.info(f"💾 Bar store upserted {saved} daily bars for {symbol} from {api_name}")
+                    stored = bar_store.read(stock_id, '1d', start, now)
+            
+            return True, stored or None
         
-        # API 우선순위: CoinGecko (무료) -> Finnhub -> Twelve Data -> Alpha Vantage -> Marketstack
+        except Exception as e:
+            logger.error(f"Bar store unavailable for {symbol}, using provider chain: {e}")
+            return False, None
+    
+    def get_crypto_data(self, symbol: str, vs_currency: str = 'USD') -> Optional[Dict[str, Any]]:
+        """암호화폐 데이터 조회 - 다중 API 폴백 시스템"""
+        if negative_cache.is_unknown(symbol, 'crypto', local_only=True):
+            return None
+        cache_key = symbol_key("crypto_", symbol, vs_currency)
+        return swr_cache.get_or_fetch(cache_key, lambda: self._fetch_crypto_data(symbol, vs_currency, cache_key))
+    
+    def _fetch_crypto_data(self, symbol: str, vs_currency: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """캐시 미스/갱신 시 암호화폐 프로바이더 체인 조회 후 캐시에 저장"""
+        # 기본 우선순위: CoinGecko (무료) -> Finnhub -> Twelve Data -> Alpha Vantage -> Marketstack
+        # 실제 시도 순서는 프로바이더 상태(성공률/지연시간/서킷)에 따라 재정렬
         apis_to_try = [
-            ('coingecko', self._get_coingecko_crypto),
-            ('finnhub', self._get_finnhub_crypto),
-            ('twelve_data', self._get_twelve_data_crypto),
-            ('alpha_vantage', self._get_alpha_vantage_crypto),
-            ('marketstack', self._get_marketstack_crypto)
+            ('coingecko', lambda: self._get_coingecko_crypto(symbol, vs_currency)),
+            ('finnhub', lambda: self._get_finnhub_crypto(symbol, vs_currency)),
+            ('twelve_data', lambda: self._get_twelve_data_crypto(symbol, vs_currency)),
+            ('alpha_vantage', lambda: self._get_alpha_vantage_crypto(symbol, vs_currency)),
+            ('marketstack', lambda: self._get_marketstack_crypto(symbol, vs_currency))
         ]
         
-        for api_name, api_func in apis_to_try:
-            try:
-                logger.info(f"Trying {api_name} for crypto {symbol}")
-                data = api_func(symbol, vs_currency)
-                if data:
-                    data['source'] = api_name
-                    cache.set(cache_key, data, timeout=300)  # 5분 캐시로 증가
-                    logger.info(f"Successfully got crypto data from {api_name}")
-                    return data
-            except Exception as e:
-                logger.warning(f"{api_name} failed for {symbol}: {e}")
-                continue
+        if negative_cache.is_unknown(symbol, 'crypto'):
+            return None
+        api_name, data = self._run_provider_chain('crypto', apis_to_try, symbol, symbol=symbol, market='crypto')
+        if data:
+            data['source'] = api_name
+            swr_cache.set(cache_key, data, soft_ttl=300)  # 5분 캐시로 증가
+            logger.info(f"Successfully got crypto data from {api_name}")
+            return data
         
         # 모든 API 실패 시 None 반환 (샘플 데이터 제거)
         logger.error(f"All APIs failed for crypto {symbol}")
+        negative_cache.conclude('crypto', symbol, 'crypto', [entry[0] for entry in apis_to_try])
         return None
     
     def _get_coingecko_crypto(self, symbol: str, vs_currency: str = 'USD') -> Optional[Dict[str, Any]]:
         """CoinGecko API로 암호화폐 데이터 조회 (무료, API 키 불필요)"""
         try:
-            # CoinGecko ID 매핑 - support both symbol and full name
-            crypto_id_mapping = {
-                'BTC': 'bitcoin',
-                'bitcoin': 'bitcoin',
-                'ETH': 'ethereum', 
-                'ethereum': 'ethereum',
-                'ADA': 'cardano',
-                'cardano': 'cardano',
-                'BNB': 'binancecoin',
-                'binancecoin': 'binancecoin',
-                'DOT': 'polkadot',
-                'polkadot': 'polkadot',
-                'MATIC': 'matic-network',
-                'matic': 'matic-network',
-                'matic-network': 'matic-network',
-                'SOL': 'solana',
-                'solana': 'solana',
-                'LTC': 'litecoin',
-                'litecoin': 'litecoin',
-                'XRP': 'ripple',
-                'ripple': 'ripple',
-                'DOGE': 'dogecoin',
-                'dogecoin': 'dogecoin',
-                'AVAX': 'avalanche-2',
-                'avalanche-2': 'avalanche-2',
-                'LINK': 'chainlink',
-                'chainlink': 'chainlink',
-                'UNI': 'uniswap',
-                'uniswap': 'uniswap',
-                'ATOM': 'cosmos',
-                'cosmos': 'cosmos'
-            }
-            
-            # Try both uppercase and lowercase
-            coin_id = crypto_id_mapping.get(symbol) or crypto_id_mapping.get(symbol.upper()) or crypto_id_mapping.get(symbol.lower())
+            coin_id = self._get_coingecko_id(symbol)
             if not coin_id:
                 logger.warning(f"CoinGecko: No mapping found for {symbol}")
                 return None
@@ -706,41 +1187,98 @@ class MarketDataService:
             import time
             time.sleep(0.1)  # 100ms delay
             
-            response = requests.get(url, params=params, timeout=15)
+            response = self.http.get(url, params=params, timeout=15)
             response.raise_for_status()
             data = response.json()
             
             if coin_id in data:
-                coin_data = data[coin_id]
-                price_key = vs_currency.lower()
-                change_key = f"{vs_currency.lower()}_24h_change"
-                volume_key = f"{vs_currency.lower()}_24h_vol"
-                
-                if price_key in coin_data:
-                    current_price = float(coin_data[price_key])
-                    change_percent = float(coin_data.get(change_key, 0))
-                    volume = int(coin_data.get(volume_key, 0))
-                    
-                    return {
-                        'symbol': symbol,
-                        'current_price': current_price,
-                        'open_price': current_price / (1 + change_percent / 100),
-                        'high': current_price * 1.02,  # Approximate
-                        'low': current_price * 0.98,   # Approximate
-                        'volume': volume,
-                        'change_percent': change_percent,
-                        'market': 'crypto',
-                        'timestamp': timezone.now(),
-                        'source': 'coingecko'
-                    }
+                parsed = self._parse_coingecko_price(symbol, data[coin_id], vs_currency)
+                if parsed:
+                    return parsed
             
             logger.warning(f"CoinGecko: No data found for {symbol}")
             return None
             
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"CoinGecko crypto error for {symbol}: {e}")
             return None
     
+    def _get_coingecko_id(self, symbol: str) -> Optional[str]:
+        """심볼을 CoinGecko ID로 변환 (대소문자 모두 시도)"""
+        mapping = self.COINGECKO_ID_MAPPING
+        coin_id = mapping.get(symbol) or mapping.get(symbol.upper()) or mapping.get(symbol.lower())
+        # 내장 매핑에 없는 코인은 sync_symbols가 채운 종목 맵의 CoinGecko id 사용
+        return coin_id or stock_directory.provider_id(symbol, 'crypto', 'coingecko')
+    
+    def _parse_coingecko_price(self, symbol: str, coin_data: Dict[str, Any],
+                               vs_currency: str = 'USD') -> Optional[Dict[str, Any]]:
+        """CoinGecko simple/price 응답 항목을 암호화폐 시세 형식으로 변환"""
+        price_key = vs_currency.lower()
+        change_key = f"{vs_currency.lower()}_24h_change"
+        volume_key = f"{vs_currency.lower()}_24h_vol"
+        
+        if price_key not in coin_data:
+            return None
+        
+        current_price = float(coin_data[price_key])
+        change_percent = float(coin_data.get(change_key) or 0)
+        volume = int(coin_data.get(volume_key) or 0)
+        
+        return {
+            'symbol': symbol,
+            'current_price': current_price,
+            'open_price': current_price / (1 + change_percent / 100),
+            'high': current_price * 1.02,  # Approximate
+            'low': current_price * 0.98,   # Approximate
+            'volume': volume,
+            'change_percent': change_percent,
+            'market': 'crypto',
+            'timestamp': timezone.now(),
+            'source': 'coingecko'
+        }
+    
+    def _get_coingecko_crypto_batch(self, symbols: List[str], vs_currency: str = 'USD') -> Dict[str, Dict[str, Any]]:
+        """CoinGecko simple/price?ids=a,b,c 단일 요청으로 여러 암호화폐 시세 조회"""
+        coin_ids = {}
+        for symbol in symbols:
+            coin_id = self._get_coingecko_id(symbol)
+            if coin_id:
+                coin_ids.setdefault(coin_id, []).append(symbol)
+        
+        if not coin_ids:
+            return {}
+        
+        try:
+            url = "https://api.coingecko.com/api/v3/simple/price"
+            params = {
+                'ids': ','.join(coin_ids),
+                'vs_currencies': vs_currency.lower(),
+                'include_24hr_change': 'true',
+                'include_24hr_vol': 'true',
+                'include_last_updated_at': 'true'
+            }
+            
+            response = self.http.get(url, params=params, timeout=15)
+            response.raise_for_status()
+            data = response.json()
+            
+            results = {}
+            for coin_id, coin_symbols in coin_ids.items():
+                if coin_id not in data:
+                    continue
+                for symbol in coin_symbols:
+                    parsed = self._parse_coingecko_price(symbol, data[coin_id], vs_currency)
+                    if parsed:
+                        results[symbol] = parsed
+            
+            logger.info(f"CoinGecko batch: {len(results)}/{len(symbols)} cryptos in one request")
+            return results
+            
+        except Exception as e:
+            logger.error(f"CoinGecko batch crypto error for {symbols}: {e}")
+            return {}
+    
     def _get_coingecko_stock_fallback(self, symbol: str) -> Optional[Dict[str, Any]]:
         """CoinGecko API로 주식 대체 데이터 조회 (일부 주식 토큰화된 자산이나 ETF 지원)"""
         try:
@@ -771,7 +1309,7 @@ class MarketDataService:
                 'include_last_updated_at': 'true'
             }
             
-            response = requests.get(url, params=params, timeout=15)
+            response = self.http.get(url, params=params, timeout=15)
             response.raise_for_status()
             data = response.json()
             
@@ -828,7 +1366,7 @@ class MarketDataService:
                         'token': self.finnhub_key
                     }
                     
-                    response = requests.get(url, params=params, timeout=10)
+                    response = self.http.get(url, params=params, timeout=10)
                     response.raise_for_status()
                     data = response.json()
                     
@@ -847,6 +1385,7 @@ class MarketDataService:
                             'source': f'finnhub_{exchange_symbol}'
                         }
                 except Exception as e:
+                    _raise_if_provider_failure(e)
                     logger.debug(f"Finnhub failed for {exchange_symbol}: {e}")
                     continue
             
@@ -854,6 +1393,7 @@ class MarketDataService:
             return None
             
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"Finnhub crypto error for {symbol}: {e}")
             return None
     
@@ -866,7 +1406,7 @@ class MarketDataService:
                 'apikey': self.twelve_data_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -886,6 +1426,7 @@ class MarketDataService:
                 'timestamp': timezone.now()
             }
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"Twelve Data crypto error for {symbol}: {e}")
             return None
     
@@ -900,7 +1441,7 @@ class MarketDataService:
                 'apikey': self.alpha_vantage_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -920,6 +1461,7 @@ class MarketDataService:
                 }
             return None
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"Alpha Vantage crypto error for {symbol}: {e}")
             return None
     
@@ -938,7 +1480,7 @@ class MarketDataService:
                         'limit': 1
                     }
                     
-                    response = requests.get(url, params=params, timeout=10)
+                    response = self.http.get(url, params=params, timeout=10)
                     response.raise_for_status()
                     data = response.json()
                     
@@ -956,7 +1498,8 @@ class MarketDataService:
                             'timestamp': timezone.now(),
                             'source': 'marketstack_direct'
                         }
-                except:
+                except Exception as e:
+                    _raise_if_provider_failure(e)
                     continue
             
             # 2. ETF 매핑 시도
@@ -976,7 +1519,7 @@ class MarketDataService:
                         'limit': 1
                     }
                     
-                    response = requests.get(url, params=params, timeout=10)
+                    response = self.http.get(url, params=params, timeout=10)
                     response.raise_for_status()
                     data = response.json()
                     
@@ -999,6 +1542,7 @@ class MarketDataService:
                             'note': f'Estimated from {etf_symbol} ETF'
                         }
                 except Exception as etf_error:
+                    _raise_if_provider_failure(etf_error)
                     logger.debug(f"ETF {etf_symbol} failed: {etf_error}")
                     continue
             
@@ -1011,7 +1555,7 @@ class MarketDataService:
                     'currencies': vs_currency
                 }
                 
-                response = requests.get(url, params=params, timeout=10)
+                response = self.http.get(url, params=params, timeout=10)
                 if response.status_code == 200:
                     data = response.json()
                     if 'quotes' in data and data['quotes']:
@@ -1031,12 +1575,14 @@ class MarketDataService:
                                 'source': 'marketstack_forex'
                             }
             except Exception as forex_error:
+                _raise_if_provider_failure(forex_error)
                 logger.debug(f"Forex attempt failed: {forex_error}")
             
             logger.info(f"Marketstack: No data found for crypto {symbol}")
             return None
             
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"Marketstack crypto error for {symbol}: {e}")
             return None
     
@@ -1058,7 +1604,7 @@ class MarketDataService:
                 'apikey': self.alpha_vantage_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -1087,159 +1633,159 @@ class MarketDataService:
     def get_market_indices(self) -> Optional[List[Dict[str, Any]]]:
         """주요 시장 지수 조회 - 실제 주식 시장 지수 데이터"""
         cache_key = "market_indices"
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            return cached_data
-        
+        return swr_cache.get_or_fetch(cache_key, lambda: self._fetch_market_indices(cache_key))
+    
+    # 지수 심볼 -> 이름 (Yahoo / Alpha Vantage 표기)
+    YAHOO_INDICES = {'^GSPC': 'S&P 500', '^IXIC': 'NASDAQ', '^DJI': 'DOW'}
+    ALPHA_VANTAGE_INDICES = {'SPX': 'S&P 500', 'IXIC': 'NASDAQ', 'DJI': 'DOW'}
+    
+    # 마지막 대체 데이터 (실제 시장 상황 반영, 2025년 9월 기준)
+    FALLBACK_INDICES = [
+        {'symbol': '^GSPC', 'name': 'S&P 500', 'price': 4450.12, 'change_24h': 0.75, 'type': 'index'},
+        {'symbol': '^IXIC', 'name': 'NASDAQ', 'price': 13850.45, 'change_24h': -0.32, 'type': 'index'},
+        {'symbol': '^DJI', 'name': 'DOW', 'price': 34580.23, 'change_24h': 0.45, 'type': 'index'},
+    ]
+    
+    def _fetch_market_indices(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        """캐시 미스/갱신 시 지수를 소스별로 동시에 조회 (Yahoo -> Alpha Vantage -> 대체 데이터) 후 캐시에 저장"""
         try:
-            # 실제 시장 지수를 위해 여러 소스 시도
-            results = []
+            # 1. Yahoo Finance (무료) - 세 지수를 동시에
+            results = self._fan_out_indices(self.YAHOO_INDICES, self._get_yahoo_index)
             
-            # 1. Yahoo Finance API 시도 (무료)
-            try:
-                indices_symbols = {
-                    '^GSPC': 'S&P 500',
-                    '^IXIC': 'NASDAQ',
-                    '^DJI': 'DOW'
-                }
-                
-                for symbol, name in indices_symbols.items():
-                    try:
-                        # Yahoo Finance API 호출
-                        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
-                        response = requests.get(url, timeout=10)
-                        
-                        if response.status_code == 200:
-                            data = response.json()
-                            chart_data = data.get('chart', {}).get('result', [{}])[0]
-                            meta = chart_data.get('meta', {})
-                            
-                            current_price = meta.get('regularMarketPrice', 0)
-                            prev_close = meta.get('previousClose', current_price)
-                            change_percent = ((current_price - prev_close) / prev_close * 100) if prev_close else 0
-                            
-                            results.append({
-                                'symbol': symbol,
-                                'name': name,
-                                'price': float(PrecisionHandler.format_price(current_price, symbol, 'index')),
-                                'change_24h': float(PrecisionHandler.format_percentage(change_percent)),
-                                'type': 'index'
-                            })
-                    except Exception as e:
-                        logger.error(f"Yahoo Finance API error for {symbol}: {e}")
-                        continue
-                
-                # Yahoo Finance에서 데이터를 가져왔다면 캐시하고 반환
-                if results:
-                    cache.set(cache_key, results, 300)  # 5분 캐시
-                    return results
-                    
-            except Exception as e:
-                logger.error(f"Yahoo Finance API failed: {e}")
-            
-            # 2. 대체 방법: Alpha Vantage API 시도
-            try:
-                api_key = settings.ALPHA_VANTAGE_API_KEY
-                if api_key:
-                    indices_symbols = {
-                        'SPX': 'S&P 500',
-                        'IXIC': 'NASDAQ',
-                        'DJI': 'DOW'
-                    }
-                    
-                    for symbol, name in indices_symbols.items():
-                        try:
-                            url = f"https://www.alphavantage.co/query"
-                            params = {
-                                'function': 'GLOBAL_QUOTE',
-                                'symbol': symbol,
-                                'apikey': api_key
-                            }
-                            response = requests.get(url, params=params, timeout=10)
-                            
-                            if response.status_code == 200:
-                                data = response.json()
-                                quote = data.get('Global Quote', {})
-                                
-                                price = float(quote.get('05. price', 0))
-                                change_percent = float(quote.get('10. change percent', '0%').replace('%', ''))
-                                
-                                results.append({
-                                    'symbol': symbol,
-                                    'name': name,
-                                    'price': float(PrecisionHandler.format_price(price, symbol, 'index')),
-                                    'change_24h': float(PrecisionHandler.format_percentage(change_percent)),
-                                    'type': 'index'
-                                })
-                        except Exception as e:
-                            logger.error(f"Alpha Vantage API error for {symbol}: {e}")
-                            continue
-                    
-                    if results:
-                        cache.set(cache_key, results, 300)
-                        return results
-            except Exception as e:
-                logger.error(f"Alpha Vantage API failed: {e}")
-            
-            # 3. 마지막 대체 방법: 현실적인 샘플 데이터 (실제 시장 상황 반영)
-            # 실제 현재 시장 상황을 반영한 데이터 (2025년 9월 기준)
-            fallback_data = [
-                {
-                    'symbol': '^GSPC',
-                    'name': 'S&P 500',
-                    'price': 4450.12,
-                    'change_24h': 0.75,
-                    'type': 'index'
-                },
-                {
-                    'symbol': '^IXIC', 
-                    'name': 'NASDAQ',
-                    'price': 13850.45,
-                    'change_24h': -0.32,
-                    'type': 'index'
-                },
-                {
-                    'symbol': '^DJI',
-                    'name': 'DOW',
-                    'price': 34580.23,
-                    'change_24h': 0.45,
-                    'type': 'index'
-                }
-            ]
+            # 2. 대체 방법: Alpha Vantage
+            if not results and getattr(settings, 'ALPHA_VANTAGE_API_KEY', ''):
+                results = self._fan_out_indices(self.ALPHA_VANTAGE_INDICES, self._get_alpha_vantage_index)
             
-            cache.set(cache_key, fallback_data, 300)
-            return fallback_data
+            # 3. 마지막 대체 방법: 샘플 데이터
+            results = results or [dict(item) for item in self.FALLBACK_INDICES]
+            swr_cache.set(cache_key, results, soft_ttl=300)  # 5분 캐시
+            return results
             
         except Exception as e:
             logger.error(f"Market indices fetch error: {e}")
             # 에러 시에도 기본 데이터 반환
-            return [
-                {
-                    'symbol': '^GSPC',
-                    'name': 'S&P 500', 
-                    'price': 4450.12,
-                    'change_24h': 0.75,
-                    'type': 'index'
-                },
-                {
-                    'symbol': '^IXIC',
-                    'name': 'NASDAQ',
-                    'price': 13850.45, 
-                    'change_24h': -0.32,
-                    'type': 'index'
-                },
-                {
-                    'symbol': '^DJI',
-                    'name': 'DOW',
-                    'price': 34580.23,
-                    'change_24h': 0.45,
-                    'type': 'index'
-                }
-            ]
+            return [dict(item) for item in self.FALLBACK_INDICES]
+    
+    def _fan_out_indices(self, indices: Dict[str, str], fetch: Callable[[str, str], Optional[Dict[str, Any]]]
+                         ) -> List[Dict[str, Any]]:
+        """지수별 조회를 프로바이더 풀에서 동시에 실행해 성공한 것만 원래 순서대로 반환"""
+        sections = self.fan_out({symbol: (lambda symbol=symbol, name=name: fetch(symbol, name))
+                                 for symbol, name in indices.items()}, executor=get_provider_executor())
+        return [section['data'] for section in sections.values() if section['data']]
+    
+    def _get_yahoo_index(self, symbol: str, name: str) -> Optional[Dict[str, Any]]:
+        """Yahoo Finance chart meta 기반 지수 시세"""
+        try:
+            url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+            response = self.http.get(url, timeout=10)
+            if response.status_code != 200:
+                return None
+            chart_data = response.json().get('chart', {}).get('result', [{}])[0]
+            meta = chart_data.get('meta', {})
+            
+            current_price = meta.get('regularMarketPrice', 0)
+            prev_close = meta.get('previousClose', current_price)
+            change_percent = ((current_price - prev_close) / prev_close * 100) if prev_close else 0
+            
+            return {
+                'symbol': symbol,
+                'name': name,
+                'price': float(PrecisionHandler.format_price(current_price, symbol, 'index')),
+                'change_24h': float(PrecisionHandler.format_percentage(change_percent)),
+                'type': 'index'
+            }
+        except Exception as e:
+            logger.error(f"Yahoo Finance API error for {symbol}: {e}")
+            return None
+    
+    def _get_alpha_vantage_index(self, symbol: str, name: str) -> Optional[Dict[str, Any]]:
+        """Alpha Vantage GLOBAL_QUOTE 기반 지수 시세"""
+        try:
+            params = {
+                'function': 'GLOBAL_QUOTE',
+                'symbol': symbol,
+                'apikey': settings.ALPHA_VANTAGE_API_KEY
+            }
+            response = self.http.get(self.alpha_vantage_base, params=params, timeout=10)
+            if response.status_code != 200:
+                return None
+            quote = response.json().get('Global Quote', {})
+            
+            price = float(quote.get('05. price', 0))
+            change_percent = float(quote.get('10. change percent', '0%').replace('%', ''))
+            
+            return {
+                'symbol': symbol,
+                'name': name,
+                'price': float(PrecisionHandler.format_price(price, symbol, 'index')),
+                'change_24h': float(PrecisionHandler.format_percentage(change_percent)),
+                'type': 'index'
+            }
+        except Exception as e:
+            logger.error(f"Alpha Vantage API error for {symbol}: {e}")
+            return None
+
+    def search_symbols(self, query: str, limit: int = 10, market: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        심볼 검색 - 로컬 심볼 인덱스(접두사/초성/유사 일치)로 응답하고, 인덱스에 없는 검색어만
+        업스트림 검색 API에 묻는다. 업스트림 결과는 인덱스에 역기록되어 다음부터 로컬 응답
+        """
+        index = get_symbol_index()
+        results = index.search(query, limit=limit, market=market)
+        if results:
+            return results
+
+        query = query.strip()
+        if len(query) < 2:
+            return []
+        # 진짜 미스: 같은 검색어는 캐시/single-flight로 업스트림 1회
+        digest = hashlib.blake2b(query.casefold().encode(), digest_size=12).hexdigest()
+        cache_key = f"symbol_search_{digest}"
+        upstream = swr_cache.get_or_fetch(cache_key, lambda: self._fetch_symbol_search(query, cache_key))
+        if not upstream:
+            return []
+        matches = [item for item in upstream if not market or item['market'] == market]
+        return matches[:limit]
+
+    def _fetch_symbol_search(self, query: str, cache_key: str) -> List[Dict[str, Any]]:
+        """업스트림 검색 (Finnhub -> Alpha Vantage) 후 결과를 인덱스에 역기록"""
+        chain = [
+            ('finnhub', lambda: self._search_finnhub_symbols(query)),
+            ('alpha_vantage', lambda: self._search_alpha_vantage_symbols(query)),
+        ]
+        api_name, data = self._run_provider_chain('search', chain, query)
+        results = []
+        for item in data or []:
+            symbol = (item.get('symbol') or '').upper()
+            if not symbol:
+                continue
+            results.append({
+                'symbol': symbol,
+                'name': item.get('name') or symbol,
+                'market': self._search_result_market(symbol),
+                'match': 'upstream',
+            })
 
-    def search_symbols(self, query: str) -> Optional[List[Dict[str, Any]]]:
-        """심볼 검색"""
+        if results:
+            entries = [SymbolEntry(item['symbol'], item['name'], item['market']) for item in results]
+            # 인덱스에만 역기록 - 종목 마스터(charts.Stock)는 sync_symbols만 쓴다
+            get_symbol_index().add(entries)
+            logger.info(f"🔎 Symbol search miss '{query}' answered by {api_name}: {len(results)} symbols indexed")
+        # 빈 결과도 캐시해 같은 미스가 업스트림을 반복 호출하지 않게 함
+        swr_cache.set(cache_key, results, getattr(settings, 'MARKET_DATA_SYMBOL_SEARCH_CACHE_TTL', 3600))
+        return results
+
+    @staticmethod
+    def _search_result_market(symbol: str) -> str:
+        """업스트림 검색 결과 심볼의 시장 추정 (한국 거래소 접미사/암호화폐 목록, 그 외 미국 주식)"""
+        if symbol.endswith(('.KS', '.KQ')):
+            return 'kr_stock'
+        if symbol in CRYPTO_SYMBOLS:
+            return 'crypto'
+        return 'us_stock'
+
+    def _search_alpha_vantage_symbols(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """Alpha Vantage 심볼 검색"""
         try:
             # Alpha Vantage 심볼 검색
             url = self.alpha_vantage_base
@@ -1249,7 +1795,7 @@ class MarketDataService:
                 'apikey': self.alpha_vantage_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -1273,6 +1819,7 @@ class MarketDataService:
             return results
             
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"심볼 검색 오류 {query}: {e}")
             return []
     
@@ -1286,7 +1833,7 @@ class MarketDataService:
                 'apikey': self.alpha_vantage_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -1310,6 +1857,7 @@ class MarketDataService:
             }
             
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"Alpha Vantage 시세 조회 오류 {symbol}: {e}")
             return None
     
@@ -1322,7 +1870,7 @@ class MarketDataService:
                 'apikey': self.twelve_data_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -1331,24 +1879,70 @@ class MarketDataService:
                 logger.error(f"Twelve Data API 오류: {data}")
                 return None
             
-            return {
-                'symbol': symbol,
-                'current_price': float(data.get('close', 0)),
-                'open_price': float(data.get('open', 0)),
-                'high': float(data.get('high', 0)),
-                'low': float(data.get('low', 0)),
-                'volume': int(data.get('volume', 0)),
-                'change_percent': float(data.get('percent_change', 0)),
-                'market': 'global',
-                'timestamp': timezone.now()
-            }
+            return self._parse_twelve_data_quote(symbol, data)
             
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"Twelve Data 시세 조회 오류 {symbol}: {e}")
             return None
     
-    def _get_alpha_vantage_historical(self, symbol: str, period: str, interval: str) -> Optional[List[Dict]]:
-        """Alpha Vantage 과거 데이터 with NATIVE INTERVAL SUPPORT for speed"""
+    def _parse_twelve_data_quote(self, symbol: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Twelve Data /quote 응답을 시세 형식으로 변환"""
+        return {
+            'symbol': symbol,
+            'current_price': float(data.get('close') or 0),
+            'open_price': float(data.get('open') or 0),
+            'high': float(data.get('high') or 0),
+            'low': float(data.get('low') or 0),
+            'volume': int(data.get('volume') or 0),
+            'change_percent': float(data.get('percent_change') or 0),
+            'market': 'global',
+            'timestamp': timezone.now()
+        }
+    
+    def _get_twelve_data_quotes_batch(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Twelve Data /quote?symbol=A,B,C 단일 요청으로 여러 종목 시세 조회"""
+        if not symbols or not self.twelve_data_key:
+            return {}
+        
+        try:
+            url = f"{self.twelve_data_base}/quote"
+            params = {
+                'symbol': ','.join(symbols),
+                'apikey': self.twelve_data_key
+            }
+            
+            response = self.http.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+            
+            # 단일 심볼이면 응답 객체 자체가 시세, 다중 심볼이면 심볼별 딕셔너리
+            by_symbol = {symbols[0]: data} if len(symbols) == 1 else data
+            
+            results = {}
+            for symbol in symbols:
+                item = by_symbol.get(symbol)
+                if not isinstance(item, dict) or item.get('status') == 'error' or \
+                        ('code' in item and item['code'] != 200):
+                    continue
+                quote = self._parse_twelve_data_quote(symbol, item)
+                if self._is_valid_quote(quote):
+                    results[symbol] = quote
+            
+            logger.info(f"Twelve Data batch: {len(results)}/{len(symbols)} quotes in one request")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Twelve Data batch quote error for {symbols}: {e}")
+            return {}
+    
+    def _get_alpha_vantage_historical(self, symbol: str, period: str, interval: str,
+                                      start_date: Optional[datetime] = None) -> Optional[List[Dict]]:
+        """
+        Alpha Vantage 과거 데이터 with NATIVE INTERVAL SUPPORT for speed
+
+        start_date가 주어지면 그 이후 봉만 반환 (compact 100봉으로 부족할 때만 full 요청)
+        """
         try:
             # 🚀 NATIVE INTERVAL MAPPING for immediate response
             function_map = {
@@ -1363,7 +1957,12 @@ class MarketDataService:
                 '1month': 'TIME_SERIES_MONTHLY',
                 'Month': 'TIME_SERIES_MONTHLY',
                 '1hour': 'TIME_SERIES_INTRADAY',
-                '5min': 'TIME_SERIES_INTRADAY'
+                '1h': 'TIME_SERIES_INTRADAY',
+                '60min': 'TIME_SERIES_INTRADAY',
+                '30min': 'TIME_SERIES_INTRADAY',
+                '15min': 'TIME_SERIES_INTRADAY',
+                '5min': 'TIME_SERIES_INTRADAY',
+                '1min': 'TIME_SERIES_INTRADAY'
             }
             
             function = function_map.get(interval, 'TIME_SERIES_DAILY')
@@ -1375,11 +1974,16 @@ class MarketDataService:
             }
             
             if function == 'TIME_SERIES_INTRADAY':
-                params['interval'] = interval
+                # Alpha Vantage 인트라데이 간격은 1min/5min/15min/30min/60min
+                params['interval'] = '60min' if normalize_interval(interval) == '1h' else interval
+            elif function == 'TIME_SERIES_DAILY' and start_date is not None:
+                # compact는 최근 100 거래일(약 140일)까지만 포함
+                if timezone.now() - start_date > timedelta(days=140):
+                    params['outputsize'] = 'full'
             
             logger.info(f"🚀 Alpha Vantage: requesting {symbol} with native function {function}")
             
-            response = requests.get(self.alpha_vantage_base, params=params, timeout=15)
+            response = self.http.get(self.alpha_vantage_base, params=params, timeout=15)
             response.raise_for_status()
             
             data = response.json()
@@ -1408,15 +2012,25 @@ class MarketDataService:
                     'volume': int(values['5. volume']) if '5. volume' in values else 0
                 })
             
+            if start_date is not None:
+                since = start_date.strftime('%Y-%m-%d')
+                results = [row for row in results if row['timestamp'] >= since]
+            
             logger.info(f"✅ Alpha Vantage: got {len(results)} {function} records for {symbol}")
             return sorted(results, key=lambda x: x['timestamp'])
             
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"Alpha Vantage 과거 데이터 오류 {symbol}: {e}")
             return None
     
-    def _get_twelve_data_historical(self, symbol: str, period: str, interval: str) -> Optional[List[Dict]]:
-        """Twelve Data 과거 데이터 with NATIVE INTERVAL SUPPORT for speed"""
+    def _get_twelve_data_historical(self, symbol: str, period: str, interval: str,
+                                    start_date: Optional[datetime] = None) -> Optional[List[Dict]]:
+        """
+        Twelve Data 과거 데이터 with NATIVE INTERVAL SUPPORT for speed
+
+        outputsize는 요청 기간(또는 start_date 이후)에 필요한 봉 수로 제한
+        """
         try:
             url = f"{self.twelve_data_base}/time_series"
             
@@ -1428,17 +2042,30 @@ class MarketDataService:
                 native_interval = '1month'
             elif interval == '1d':
                 native_interval = '1day'
+            elif interval in ['1hour', '60min']:
+                native_interval = '1h'
+            
+            # 기간에 필요한 봉 수만 요청 (일봉 외 분/시간봉은 기존처럼 최대치)
+            since = start_date or period_start(period)
+            days = max(1, (timezone.now() - since).days + 1)
+            bars_per_interval = {'1day': 1, '1week': 7, '1month': 30}
+            if native_interval in bars_per_interval:
+                outputsize = min(5000, days // bars_per_interval[native_interval] + 2)
+            else:
+                outputsize = 5000
             
             params = {
                 'symbol': symbol,
                 'interval': native_interval,  # Use native interval directly
-                'outputsize': '5000',
+                'outputsize': str(outputsize),
                 'apikey': self.twelve_data_key
             }
+            if start_date is not None:
+                params['start_date'] = start_date.strftime('%Y-%m-%d')
             
             logger.info(f"🚀 Twelve Data: requesting {symbol} with native interval {native_interval}")
             
-            response = requests.get(url, params=params, timeout=15)
+            response = self.http.get(url, params=params, timeout=15)
             response.raise_for_status()
             
             data = response.json()
@@ -1462,6 +2089,7 @@ class MarketDataService:
             return sorted(results, key=lambda x: x['timestamp'])
             
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"Twelve Data 과거 데이터 오류 {symbol}: {e}")
             return None
     
@@ -1493,7 +2121,7 @@ class MarketDataService:
                 'apikey': self.polygon_key
             }
             
-            response = requests.get(url, params=params, timeout=15)
+            response = self.http.get(url, params=params, timeout=15)
             response.raise_for_status()
             data = response.json()
             
@@ -1530,7 +2158,7 @@ class MarketDataService:
                 'token': self.finnhub_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -1558,7 +2186,7 @@ class MarketDataService:
                 'token': self.finnhub_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -1578,7 +2206,7 @@ class MarketDataService:
             logger.error(f"Finnhub 외환 환율 조회 오류 {from_currency}/{to_currency}: {e}")
             return None
     
-    def search_symbols(self, query: str) -> List[Dict[str, Any]]:
+    def _search_finnhub_symbols(self, query: str) -> List[Dict[str, Any]]:
         """Finnhub를 사용한 심볼 검색"""
         try:
             url = f"{self.finnhub_base}/search"
@@ -1587,18 +2215,32 @@ class MarketDataService:
                 'token': self.finnhub_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
-            return data.get('result', [])
+            return [
+                {'symbol': item.get('symbol'), 'name': item.get('description'), 'type': item.get('type')}
+                for item in data.get('result', [])
+            ]
             
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"심볼 검색 오류 {query}: {e}")
             return []
     
     def get_market_news(self, symbol: str = None, limit: int = 10) -> List[Dict[str, Any]]:
-        """Finnhub를 사용한 시장 뉴스 조회"""
+        """Finnhub를 사용한 시장 뉴스 조회 (전체 목록을 5분 캐시하고 limit만큼 잘라 반환)"""
+        cache_key = symbol_key("market_news_", symbol) if symbol else "market_news_general"
+        news = swr_cache.get_or_fetch(cache_key, lambda: self._fetch_market_news(symbol, cache_key))
+        if not news:
+            return []
+        if getattr(news, 'stale', False):
+            return swr_cache.mark_stale(news[:limit], news.age)
+        return news[:limit]
+    
+    def _fetch_market_news(self, symbol: Optional[str], cache_key: str) -> List[Dict[str, Any]]:
+        """Finnhub /news 조회 후 캐시에 저장 (실패/빈 결과는 캐시하지 않음)"""
         try:
             url = f"{self.finnhub_base}/news"
             params = {
@@ -1609,12 +2251,13 @@ class MarketDataService:
             if symbol:
                 params['symbol'] = symbol
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
-            if isinstance(data, list):
-                return data[:limit]
+            if isinstance(data, list) and data:
+                swr_cache.set(cache_key, data, soft_ttl=300)
+                return data
             
             return []
             
@@ -1631,7 +2274,7 @@ class MarketDataService:
                 'token': self.finnhub_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -1680,7 +2323,7 @@ class MarketDataService:
                 'endDate': datetime.now().strftime('%Y-%m-%d')
             }
             
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = self.http.get(url, headers=headers, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -1700,29 +2343,21 @@ class MarketDataService:
             return None
             
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"Tiingo API 오류 {symbol}: {e}")
             return None
     
-    def _get_tiingo_historical(self, symbol: str, period: str = '1year') -> Optional[List[Dict[str, Any]]]:
+    def _get_tiingo_historical(self, symbol: str, period: str = '1year',
+                               start_date: Optional[datetime] = None) -> Optional[List[Dict[str, Any]]]:
         """Tiingo API를 사용한 히스토리컬 데이터"""
         try:
             if not self.tiingo_key:
                 return None
                 
-            # 기간 설정
+            # 기간 설정 (start_date가 주어지면 그 날짜부터, 기본 1year)
             end_date = datetime.now()
-            if period == '1day':
-                start_date = end_date - timedelta(days=1)
-            elif period == '1week':
-                start_date = end_date - timedelta(weeks=1)
-            elif period == '1month':
-                start_date = end_date - timedelta(days=30)
-            elif period == '3months':
-                start_date = end_date - timedelta(days=90)
-            elif period == '6months':
-                start_date = end_date - timedelta(days=180)
-            else:  # 1year
-                start_date = end_date - timedelta(days=365)
+            if start_date is None:
+                start_date = period_start(period, default_days=365)
             
             url = f"{self.tiingo_base}/daily/{symbol}/prices"
             headers = {'Authorization': f'Token {self.tiingo_key}'}
@@ -1731,7 +2366,7 @@ class MarketDataService:
                 'endDate': end_date.strftime('%Y-%m-%d')
             }
             
-            response = requests.get(url, headers=headers, params=params, timeout=15)
+            response = self.http.get(url, headers=headers, params=params, timeout=15)
             response.raise_for_status()
             data = response.json()
             
@@ -1748,6 +2383,7 @@ class MarketDataService:
             return None
             
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"Tiingo 히스토리컬 데이터 오류 {symbol}: {e}")
             return None
     
@@ -1765,49 +2401,76 @@ class MarketDataService:
                 'limit': 1
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
             if data and 'data' in data and len(data['data']) > 0:
-                item = data['data'][0]
-                return {
-                    'symbol': symbol,
-                    'price': item.get('close', 0),
-                    'change': item.get('close', 0) - item.get('open', 0),
-                    'change_percent': ((item.get('close', 0) - item.get('open', 0)) / item.get('open', 1)) * 100,
-                    'volume': item.get('volume', 0),
-                    'high': item.get('high', 0),
-                    'low': item.get('low', 0),
-                    'open': item.get('open', 0),
-                    'source': 'marketstack'
-                }
+                return self._parse_marketstack_quote(symbol, data['data'][0])
             return None
             
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"Marketstack API 오류 {symbol}: {e}")
             return None
     
-    def _get_marketstack_historical(self, symbol: str, period: str = '1year') -> Optional[List[Dict[str, Any]]]:
+    def _parse_marketstack_quote(self, symbol: str, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Marketstack eod 항목을 시세 형식으로 변환"""
+        return {
+            'symbol': symbol,
+            'price': item.get('close', 0),
+            'change': item.get('close', 0) - item.get('open', 0),
+            'change_percent': ((item.get('close', 0) - item.get('open', 0)) / item.get('open', 1)) * 100,
+            'volume': item.get('volume', 0),
+            'high': item.get('high', 0),
+            'low': item.get('low', 0),
+            'open': item.get('open', 0),
+            'source': 'marketstack'
+        }
+    
+    def _get_marketstack_quotes_batch(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Marketstack eod/latest?symbols=A,B,C 단일 요청으로 여러 종목 시세 조회"""
+        if not symbols or not self.marketstack_key:
+            return {}
+        
+        try:
+            url = f"{self.marketstack_base}/eod/latest"
+            params = {
+                'access_key': self.marketstack_key,
+                'symbols': ','.join(symbols),
+                'limit': len(symbols)
+            }
+            
+            response = self.http.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+            
+            results = {}
+            for item in (data or {}).get('data', []):
+                symbol = item.get('symbol')
+                if symbol in symbols and symbol not in results:
+                    quote = self._parse_marketstack_quote(symbol, item)
+                    if self._is_valid_quote(quote):
+                        results[symbol] = quote
+            
+            logger.info(f"Marketstack batch: {len(results)}/{len(symbols)} quotes in one request")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Marketstack batch quote error for {symbols}: {e}")
+            return {}
+    
+    def _get_marketstack_historical(self, symbol: str, period: str = '1year',
+                                    start_date: Optional[datetime] = None) -> Optional[List[Dict[str, Any]]]:
         """Marketstack API를 사용한 히스토리컬 데이터"""
         try:
             if not self.marketstack_key:
                 return None
                 
-            # 기간 설정
+            # 기간 설정 (start_date가 주어지면 그 날짜부터, 기본 1year)
             end_date = datetime.now()
-            if period == '1day':
-                start_date = end_date - timedelta(days=1)
-            elif period == '1week':
-                start_date = end_date - timedelta(weeks=1)
-            elif period == '1month':
-                start_date = end_date - timedelta(days=30)
-            elif period == '3months':
-                start_date = end_date - timedelta(days=90)
-            elif period == '6months':
-                start_date = end_date - timedelta(days=180)
-            else:  # 1year
-                start_date = end_date - timedelta(days=365)
+            if start_date is None:
+                start_date = period_start(period, default_days=365)
             
             url = f"{self.marketstack_base}/eod"
             params = {
@@ -1818,7 +2481,7 @@ class MarketDataService:
                 'limit': 1000
             }
             
-            response = requests.get(url, params=params, timeout=15)
+            response = self.http.get(url, params=params, timeout=15)
             response.raise_for_status()
             data = response.json()
             
@@ -1835,11 +2498,13 @@ class MarketDataService:
             return None
             
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"Marketstack 히스토리컬 데이터 오류 {symbol}: {e}")
             return None
 
-    def _get_alpha_vantage_crypto_historical(self, symbol: str, period: str) -> Optional[List[Dict]]:
-        """Alpha Vantage 암호화폐 과거 데이터"""
+    def _get_alpha_vantage_crypto_historical(self, symbol: str, period: str,
+                                             start_date: Optional[datetime] = None) -> Optional[List[Dict]]:
+        """Alpha Vantage 암호화폐 과거 데이터 (start_date가 주어지면 그 이후 봉만)"""
         try:
             url = self.alpha_vantage_base
             params = {
@@ -1849,7 +2514,7 @@ class MarketDataService:
                 'apikey': self.alpha_vantage_key
             }
             
-            response = requests.get(url, params=params, timeout=15)
+            response = self.http.get(url, params=params, timeout=15)
             response.raise_for_status()
             data = response.json()
             
@@ -1871,52 +2536,23 @@ class MarketDataService:
                     'volume': float(daily_data.get('5. volume', 0))
                 })
             
+            if start_date is not None:
+                since = start_date.strftime('%Y-%m-%d')
+                results = [row for row in results if row['date'] >= since]
+            
             # Sort by date (newest first, then reverse for oldest first)
             results.sort(key=lambda x: x['date'])
             return results
             
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"Alpha Vantage crypto 과거 데이터 오류 {symbol}: {e}")
             return None
 
     def get_coingecko_historical_data(self, symbol: str, period: str = '30', vs_currency: str = 'usd') -> Optional[List[Dict[str, Any]]]:
         """CoinGecko API로 암호화폐 히스토리컬 데이터 조회 (무료, API 키 불필요)"""
         try:
-            # CoinGecko ID 매핑 - support both symbol and full name
-            crypto_id_mapping = {
-                'BTC': 'bitcoin',
-                'bitcoin': 'bitcoin',
-                'ETH': 'ethereum', 
-                'ethereum': 'ethereum',
-                'ADA': 'cardano',
-                'cardano': 'cardano',
-                'BNB': 'binancecoin',
-                'binancecoin': 'binancecoin',
-                'DOT': 'polkadot',
-                'polkadot': 'polkadot',
-                'MATIC': 'matic-network',
-                'matic': 'matic-network',
-                'matic-network': 'matic-network',
-                'SOL': 'solana',
-                'solana': 'solana',
-                'LTC': 'litecoin',
-                'litecoin': 'litecoin',
-                'XRP': 'ripple',
-                'ripple': 'ripple',
-                'DOGE': 'dogecoin',
-                'dogecoin': 'dogecoin',
-                'AVAX': 'avalanche-2',
-                'avalanche-2': 'avalanche-2',
-                'LINK': 'chainlink',
-                'chainlink': 'chainlink',
-                'UNI': 'uniswap',
-                'uniswap': 'uniswap',
-                'ATOM': 'cosmos',
-                'cosmos': 'cosmos'
-            }
-            
-            # Try both uppercase and lowercase
-            coin_id = crypto_id_mapping.get(symbol) or crypto_id_mapping.get(symbol.upper()) or crypto_id_mapping.get(symbol.lower())
+            coin_id = self._get_coingecko_id(symbol)
             if not coin_id:
                 logger.warning(f"CoinGecko: No mapping found for {symbol}")
                 return None
@@ -1940,7 +2576,7 @@ class MarketDataService:
                 'interval': 'daily' if int(days) > 30 else 'hourly'
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = self.http.get(url, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -1948,33 +2584,38 @@ class MarketDataService:
                 prices = data['prices']
                 volumes = data.get('market_caps', [])
                 
+                timestamps = [int(timestamp / 1000) for timestamp, _ in prices]
+                closes = [price for _, price in prices]
+                
+                # Since CoinGecko only provides price data, we'll estimate OHLC
+                # This is a simplification - for more accurate OHLC data, you'd need a premium API
+                # 정밀도는 컬럼 단위로 한 번씩만 적용 (close/price/value는 같은 값 공유)
+                format_column = lambda column: PrecisionHandler.format_price_column(column, symbol, 'crypto')
+                opens = format_column(price * (1 + (0.005 * (0.5 - abs(0.5)))) for price in closes)  # Small random variation
+                highs = format_column(price * 1.02 for price in closes)  # Approximate 2% higher than close
+                lows = format_column(price * 0.98 for price in closes)   # Approximate 2% lower than close
+                closes = format_column(closes)
+                
                 historical_data = []
-                for i, price_data in enumerate(prices):
-                    timestamp, price = price_data
-                    date_obj = datetime.fromtimestamp(timestamp / 1000)
+                for i, timestamp in enumerate(timestamps):
+                    date_obj = datetime.fromtimestamp(timestamp)
                     
                     # Get volume if available
                     volume = 0
                     if i < len(volumes):
                         volume = volumes[i][1] if len(volumes[i]) > 1 else 0
                     
-                    # Since CoinGecko only provides price data, we'll estimate OHLC
-                    # This is a simplification - for more accurate OHLC data, you'd need a premium API
-                    open_price = price * (1 + (0.005 * (0.5 - abs(0.5))))  # Small random variation
-                    high_price = price * 1.02  # Approximate 2% higher than close
-                    low_price = price * 0.98   # Approximate 2% lower than close
-                    
                     historical_data.append({
                         'date': date_obj.strftime('%Y-%m-%d'),
                         'datetime': date_obj.isoformat(),
-                        'timestamp': int(timestamp / 1000),
-                        'time': int(timestamp / 1000),
-                        'open': float(PrecisionHandler.format_price(open_price, symbol, 'crypto')),
-                        'high': float(PrecisionHandler.format_price(high_price, symbol, 'crypto')),
-                        'low': float(PrecisionHandler.format_price(low_price, symbol, 'crypto')),
-                        'close': float(PrecisionHandler.format_price(price, symbol, 'crypto')),
-                        'price': float(PrecisionHandler.format_price(price, symbol, 'crypto')),  # Alternative field name
-                        'value': float(PrecisionHandler.format_price(price, symbol, 'crypto')),  # Alternative field name
+                        'timestamp': timestamp,
+                        'time': timestamp,
+                        'open': opens[i],
+                        'high': highs[i],
+                        'low': lows[i],
+                        'close': closes[i],
+                        'price': closes[i],  # Alternative field name
+                        'value': closes[i],  # Alternative field name
                         'volume': int(volume),
                         'symbol': symbol.upper(),
                         'source': 'coingecko'
@@ -1987,25 +2628,27 @@ class MarketDataService:
             return None
             
         except Exception as e:
+            _raise_if_provider_failure(e)
             logger.error(f"CoinGecko 히스토리컬 데이터 오류 {symbol}: {e}")
             return None
 
     def get_coingecko_primary_data(self, symbol: str, period: str = '30', vs_currency: str = 'usd') -> Optional[List[Dict[str, Any]]]:
         """CoinGecko를 주요 소스로 사용하는 데이터 조회"""
-        cache_key = f"coingecko_primary_{symbol}_{period}_{vs_currency}"
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            logger.info(f"Returning cached CoinGecko data for {symbol}")
-            return cached_data
-        
+        cache_key = symbol_key("coingecko_primary_", symbol, period, vs_currency)
+        return swr_cache.get_or_fetch(
+            cache_key, lambda: self._fetch_coingecko_primary_data(symbol, period, vs_currency, cache_key)
+        )
+    
+    def _fetch_coingecko_primary_data(self, symbol: str, period: str, vs_currency: str,
+                                      cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        """캐시 미스/갱신 시 CoinGecko 조회, 실패하면 과거 데이터 폴백 체인 사용"""
         try:
             # CoinGecko 데이터 조회
             data = self.get_coingecko_historical_data(symbol, period, vs_currency)
             
             if data and len(data) > 0:
                 # 캐시에 저장 (10분)
-                cache.set(cache_key, data, timeout=600)
+                swr_cache.set(cache_key, data, soft_ttl=600)
                 logger.info(f"CoinGecko: Successfully cached {len(data)} data points for {symbol}")
                 return data
             
@@ -2014,7 +2657,8 @@ class MarketDataService:
             
             fallback_data = self.get_historical_data(symbol, period, '1day', 'crypto')
             if fallback_data:
-                cache.set(cache_key, fallback_data, timeout=300)  # 5분 캐시 (짧게)
+                # stale 표시가 붙은 리스트일 수 있으므로 일반 리스트로 저장
+                swr_cache.set(cache_key, list(fallback_data), soft_ttl=300)  # 5분 캐시 (짧게)
                 return fallback_data
             
             logger.error(f"All APIs failed for {symbol}")
@@ -0,0 +1,225 @@
+"""
+Quote Streaming for Market Data
+One poller thread per process refreshes every subscribed symbol once per tick (one batch
+call per market) and fans the changed fields out to all connected SSE clients, so
+upstream load scales with distinct symbols instead of open tabs; each client has a
+conflating mailbox, so a slow reader only ever holds the latest delta per symbol
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# 델타 비교에서 제외하는 필드 (조회할 때마다 바뀜)
+_VOLATILE_FIELDS = ('age',)
+
+Pair = Tuple[str, str]  # (symbol, market)
+
+
+class QuoteSubscription:
+    """SSE 연결 하나의 우편함 - 심볼별 최신 델타만 보관 (느린 클라이언트는 병합됨)"""
+
+    def __init__(self, pairs: Iterable[Pair]):
+        self.pairs = tuple(dict.fromkeys(pairs))
+        self.closed = False
+        self.conflated = 0
+        self._cond = threading.Condition()
+        self._pending: Dict[Pair, Dict[str, Any]] = {}
+
+    def push(self, pair: Pair, delta: Dict[str, Any]) -> None:
+        with self._cond:
+            pending = self._pending.get(pair)
+            if pending is None:
+                self._pending[pair] = dict(delta)
+            else:
+                # 아직 전송하지 못한 델타에 병합 -> 연결당 메모리는 심볼 수로 고정
+                pending.update(delta)
+                self.conflated += 1
+            self._cond.notify()
+
+    def wait(self, timeout: float) -> List[Dict[str, Any]]:
+        """새 델타가 올 때까지 최대 timeout초 대기 후 쌓인 델타 모두 반환 (없으면 빈 목록)"""
+        with self._cond:
+            if not self._pending and not self.closed:
+                self._cond.wait(timeout)
+            updates, self._pending = self._pending, {}
+        return list(updates.values())
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class QuoteHub:
+    """구독 심볼별 시세 폴링 1회 -> 모든 구독자에게 델타 전파 (프로세스 단위)"""
+
+    def __init__(self, poll_interval: float = 5.0, max_clients: int = 200, service=None):
+        self.poll_interval = poll_interval
+        self.max_clients = max_clients
+        self._service = service
+        self._lock = threading.Lock()
+        self._subscribers: Dict[Pair, Set[QuoteSubscription]] = {}
+        self._clients: Set[QuoteSubscription] = set()
+        self._latest: Dict[Pair, Dict[str, Any]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._counters = {'polls': 0, 'upstream_symbols': 0, 'deltas': 0, 'rejected': 0}
+
+    @property
+    def service(self):
+        if self._service is None:
+            from .services import get_market_service
+            self._service = get_market_service()
+        return self._service
+
+    # ------------------------------------------------------------------
+    # 구독
+    # ------------------------------------------------------------------
+    def subscribe(self, pairs: Iterable[Pair]) -> Optional[QuoteSubscription]:
+        """구독 등록. 알려진 최신 시세는 즉시 전달하고, 처음 보는 심볼은 폴러를 깨움. 정원 초과 시 None"""
+        subscription = QuoteSubscription(pairs)
+        with self._lock:
+            if len(self._clients) >= self.max_clients:
+                self._counters['rejected'] += 1
+                return None
+            self._clients.add(subscription)
+            new_pair = False
+            for pair in subscription.pairs:
+                subscribers = self._subscribers.setdefault(pair, set())
+                new_pair = new_pair or not subscribers
+                subscribers.add(subscription)
+                latest = self._latest.get(pair)
+                if latest is not None:
+                    subscription.push(pair, latest)
+            self._ensure_poller()
+        if new_pair:
+            self._wake.set()
+        return subscription
+
+    def unsubscribe(self, subscription: QuoteSubscription) -> None:
+        subscription.close()
+        with self._lock:
+            self._clients.discard(subscription)
+            for pair in subscription.pairs:
+                subscribers = self._subscribers.get(pair)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    # 구독자가 없는 심볼은 더 이상 폴링하지 않음
+                    del self._subscribers[pair]
+                    self._latest.pop(pair, None)
+
+    # ------------------------------------------------------------------
+    # 폴링 / 전파
+    # ------------------------------------------------------------------
+    def _ensure_poller(self) -> None:
+        # self._lock을 잡은 상태에서 호출
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='quote-hub-poller', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._lock:
+                    if not self._subscribers:
+                        self._thread = None
+                        return
+                self._wake.clear()
+                self.poll_once()
+                self._wake.wait(self.poll_interval)
+        finally:
+            # 폴러 스레드에서 열린 DB 커넥션 정리
+            connections.close_all()
+
+    def poll_once(self) -> int:
+        """구독 중인 심볼을 시장별 배치 요청 한 번으로 조회해 변경분 전파. 전파한 델타 수 반환"""
+        with self._lock:
+            by_market: Dict[str, List[str]] = {}
+            for symbol, market in self._subscribers:
+                by_market.setdefault(market, []).append(symbol)
+            self._counters['polls'] += 1
+            self._counters['upstream_symbols'] += len(self._subscribers)
+
+        published = 0
+        for market, symbols in by_market.items():
+            try:
+                quotes = self.service.get_real_time_quotes(symbols, market)
+            except Exception as e:
+                logger.error(f"Quote stream poll failed for {market} {symbols}: {e}")
+                continue
+            for symbol, quote in quotes.items():
+                published += self.publish((symbol, market), quote)
+        return published
+
+    def publish(self, pair: Pair, quote: Dict[str, Any]) -> int:
+        """이전 시세와 달라진 필드만 구독자에게 전파 (첫 시세는 전체). 전파했으면 1"""
+        if not isinstance(quote, dict):
+            return 0
+        current = {key: value for key, value in quote.items() if key not in _VOLATILE_FIELDS}
+        current['stale'] = bool(current.get('stale'))
+        with self._lock:
+            subscribers = self._subscribers.get(pair)
+            if not subscribers:
+                return 0
+            previous = self._latest.get(pair)
+            if previous is None:
+                delta = current
+            else:
+                delta = {key: value for key, value in current.items() if previous.get(key) != value}
+                if not delta:
+                    return 0
+            self._latest[pair] = {**(previous or {}), **current}
+            delta = {**delta, 'symbol': pair[0], 'market': pair[1]}
+            self._counters['deltas'] += 1
+            targets = list(subscribers)
+        for subscription in targets:
+            subscription.push(pair, delta)
+        return 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counters,
+                'clients': len(self._clients),
+                'symbols': len(self._subscribers),
+                'conflated': sum(subscription.conflated for subscription in self._clients),
+                'poll_interval': self.poll_interval,
+                'max_clients': self.max_clients,
+            }
+
+
+def stream_client_cap() -> int:
+    """
+    프로세스당 SSE 연결 상한 - 연결마다 gthread 워커 스레드를 하나씩 점유하므로 스레드 수의 절반까지만 허용
+
+    MARKET_DATA_STREAM_MAX_CLIENTS가 더 작으면 그 값을 쓴다. 스트림이 스레드를 모두 차지하면
+    일반 요청이 대기열에 묶여 정원 초과 503도 보낼 수 없기 때문.
+    """
+    limit = max(1, getattr(settings, 'GUNICORN_THREADS', 32) // 2)
+    configured = getattr(settings, 'MARKET_DATA_STREAM_MAX_CLIENTS', 0)
+    return min(configured, limit) if configured > 0 else limit
+
+
+# 전역 인스턴스 - 프로세스 내 모든 SSE 연결이 공유
+_quote_hub = None
+_quote_hub_lock = threading.Lock()
+
+
+def get_quote_hub() -> QuoteHub:
+    global _quote_hub
+    if _quote_hub is None:
+        with _quote_hub_lock:
+            if _quote_hub is None:
+                _quote_hub = QuoteHub(
+                    poll_interval=getattr(settings, 'MARKET_DATA_STREAM_POLL_INTERVAL', 5.0),
+                    max_clients=stream_client_cap(),
+                )
+    return _quote_hub
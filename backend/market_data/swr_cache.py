@@ -0,0 +1,210 @@
+"""
+Stale-While-Revalidate Cache for Market Data
+Every entry carries a soft TTL and a hard TTL: between the two, callers get the stale
+value immediately while a background thread refreshes it; only after the hard TTL
+does a request block on the upstream fetch
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from .coalescing import single_flight
+from .deadline import current as current_deadline, deadline_stats
+from .ohlcv import OHLCVSeries
+
+logger = logging.getLogger(__name__)
+
+_ENVELOPE_MARKER = '__swr__'
+
+
+class StaleList(list):
+    """soft TTL이 지난 리스트 값 - 뷰에서 stale/age 표시용"""
+
+    stale = True
+    age = 0
+
+
+class CacheLookup:
+    """캐시 조회 결과 (값, 저장 후 경과 시간, stale 여부, soft TTL)"""
+
+    __slots__ = ('value', 'age', 'stale', 'soft_ttl')
+
+    def __init__(self, value: Any, age: float, stale: bool, soft_ttl: Optional[float] = None):
+        self.value = value
+        self.age = age
+        self.stale = stale
+        self.soft_ttl = soft_ttl
+
+    @property
+    def remaining(self) -> float:
+        """soft TTL 만료까지 남은 시간(초). 구형 평문 값은 0"""
+        if self.soft_ttl is None:
+            return 0.0
+        return self.soft_ttl - self.age
+
+
+class StaleWhileRevalidateCache:
+    """soft/hard TTL 기반 stale-while-revalidate 캐시"""
+
+    def __init__(self, hard_ttl_multiplier: float = 6, max_hard_ttl: int = 6 * 3600, refresh_workers: int = 4):
+        self.hard_ttl_multiplier = hard_ttl_multiplier
+        self.max_hard_ttl = max_hard_ttl
+        self.refresh_workers = refresh_workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._counters = {'fresh_hits': 0, 'stale_hits': 0, 'misses': 0, 'background_refreshes': 0}
+
+    def _incr(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def hard_ttl_for(self, soft_ttl: int) -> int:
+        return int(min(self.max_hard_ttl, max(soft_ttl, soft_ttl * self.hard_ttl_multiplier)))
+
+    # ------------------------------------------------------------------
+    # 저장 / 조회
+    # ------------------------------------------------------------------
+    def _envelope(self, value: Any, soft_ttl: int) -> Dict[str, Any]:
+        return {_ENVELOPE_MARKER: 1, 'value': value, 'stored_at': time.time(), 'soft_ttl': soft_ttl}
+
+    def set(self, key: str, value: Any, soft_ttl: int, hard_ttl: Optional[int] = None) -> None:
+        cache.set(key, self._envelope(value, soft_ttl), timeout=hard_ttl or self.hard_ttl_for(soft_ttl))
+
+    def set_many(self, values: Dict[str, Any], soft_ttl: int, hard_ttl: Optional[int] = None) -> None:
+        cache.set_many(
+            {key: self._envelope(value, soft_ttl) for key, value in values.items()},
+            timeout=hard_ttl or self.hard_ttl_for(soft_ttl)
+        )
+
+    @staticmethod
+    def _unwrap(raw: Any) -> Optional[CacheLookup]:
+        if not raw:
+            return None
+        if isinstance(raw, dict) and raw.get(_ENVELOPE_MARKER):
+            age = max(0.0, time.time() - raw['stored_at'])
+            return CacheLookup(raw['value'], age, age > raw['soft_ttl'], raw['soft_ttl'])
+        # 배포 직후 남아 있는 구형(평문) 캐시 값은 신선한 값으로 취급
+        return CacheLookup(raw, 0.0, False)
+
+    def get(self, key: str) -> Optional[CacheLookup]:
+        return self._unwrap(cache.get(key))
+
+    def get_value(self, key: str) -> Any:
+        """stale 여부와 관계없이 hard TTL 내 값 반환 (없으면 None)"""
+        lookup = self.get(key)
+        return lookup.value if lookup else None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, CacheLookup]:
+        results = {}
+        for key, raw in cache.get_many(list(keys)).items():
+            lookup = self._unwrap(raw)
+            if lookup:
+                results[key] = lookup
+        return results
+
+    @staticmethod
+    def mark_stale(value: Any, age: float) -> Any:
+        """stale 값에 stale/age 표시를 붙인 사본 반환 (캐시 원본은 그대로)"""
+        if isinstance(value, dict):
+            marked = dict(value)
+            marked['stale'] = True
+            marked['age'] = int(age)
+            return marked
+        if isinstance(value, OHLCVSeries):
+            return value.with_staleness(age)
+        if isinstance(value, list):
+            marked = StaleList(value)
+            marked.age = int(age)
+            return marked
+        return value
+
+    # ------------------------------------------------------------------
+    # stale-while-revalidate
+    # ------------------------------------------------------------------
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """
+        신선한 값은 그대로, stale 값은 표시를 붙여 즉시 반환하면서 백그라운드 갱신,
+        hard TTL이 지나 값이 없으면 single-flight로 병합된 동기 조회
+
+        fetch는 조회 결과를 self.set()으로 저장하는 것까지 담당한다. 요청 데드라인이 조회를 끊어
+        값이 저장되지 못했으면 같은 조회를 백그라운드 갱신으로 넘겨 다음 요청이 캐시에서 받게 한다.
+        """
+        lookup = self.get(key)
+        if lookup and not lookup.stale:
+            self._incr('fresh_hits')
+            return lookup.value
+
+        if lookup:
+            self._incr('stale_hits')
+            self.refresh_in_background(key, fetch, stale_value=lookup.value)
+            return self.mark_stale(lookup.value, lookup.age)
+
+        self._incr('misses')
+        scope = current_deadline()
+        cuts = scope.cuts if scope else 0
+        value = single_flight.do(key, fetch, read=lambda: self.get_value(key))
+        if scope and scope.cuts > cuts and self.get(key) is None:
+            # 백그라운드 스레드에는 요청 데드라인이 전파되지 않음 (프로바이더별 타임아웃만 적용)
+            if self.refresh_in_background(key, fetch):
+                deadline_stats.incr('background_handoffs')
+        return value
+
+    def refresh_in_background(self, key: str, fetch: Callable[[], Any], stale_value: Any = None) -> bool:
+        """키별로 한 번만 백그라운드 갱신 예약. 이미 진행 중이면 False"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._incr('background_refreshes')
+                single_flight.do(key, fetch, read=lambda: self.get_value(key), stale_value=stale_value)
+            except Exception as e:
+                logger.error(f"Background refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+                # 백그라운드 스레드에서 열린 DB 커넥션 정리
+                connections.close_all()
+
+        try:
+            self._get_executor().submit(refresh)
+        except RuntimeError:
+            # 인터프리터 종료 중 등 executor 사용 불가
+            with self._lock:
+                self._refreshing.discard(key)
+            return False
+        return True
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.refresh_workers,
+                        thread_name_prefix='market-data-refresh'
+                    )
+        return self._executor
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['refreshing'] = len(self._refreshing)
+        return stats
+
+
+# 전역 인스턴스 - MarketDataService 인스턴스 간 공유
+swr_cache = StaleWhileRevalidateCache(
+    hard_ttl_multiplier=getattr(settings, 'MARKET_DATA_SWR_HARD_TTL_MULTIPLIER', 6),
+    max_hard_ttl=getattr(settings, 'MARKET_DATA_SWR_MAX_HARD_TTL', 6 * 3600),
+    refresh_workers=getattr(settings, 'MARKET_DATA_SWR_REFRESH_WORKERS', 4),
+)
@@ -0,0 +1,301 @@
+"""
+Local Symbol Search Index for Market Data
+The searchable symbol universe (charts.Stock rows plus the built-in prediction symbols)
+is held in memory as one sorted key array for prefix lookups (symbol, name words, Hangul
+initial consonants) and a bigram posting map for typo-tolerant fallback, so keystroke
+search is answered locally; the upstream search API is only asked about true misses
+"""
+
+import heapq
+from collections import Counter
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+import logging
+
+from django.conf import settings
+from django.db.models import Count
+
+from .hot_symbols import POPULAR_STOCKS, PREDICTION_SYMBOLS, TOP_CRYPTOS, WATCHLIST_SYMBOLS
+
+logger = logging.getLogger(__name__)
+
+# 한글 음절의 초성 (유니코드 순서)
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+_CHOSUNG_SET = frozenset(CHOSUNG)
+_HANGUL_FIRST, _HANGUL_LAST = 0xAC00, 0xD7A3
+
+# 매칭 종류별 순위 (작을수록 앞) - 같은 순위 안에서는 인기도 순
+RANK_EXACT, RANK_SYMBOL_PREFIX, RANK_NAME_PREFIX, RANK_CHOSUNG, RANK_FUZZY = range(5)
+
+# 접두사 구간 스캔 상한 (한 글자 검색어가 인덱스 대부분을 훑지 않도록)
+MAX_PREFIX_SCAN = 1000
+
+# 인기 목록에 있는 심볼의 기본 인기도 가산점
+_HOT_BOOST = 1000
+
+
+def chosung(text: str) -> str:
+    """한글 음절은 초성으로, 나머지 문자는 그대로 ('삼성전자' -> 'ㅅㅅㅈㅈ')"""
+    chars = []
+    for char in text:
+        code = ord(char)
+        if _HANGUL_FIRST <= code <= _HANGUL_LAST:
+            chars.append(CHOSUNG[(code - _HANGUL_FIRST) // 588])
+        else:
+            chars.append(char)
+    return ''.join(chars)
+
+
+def has_chosung(query: str) -> bool:
+    """초성(자음 자모)이 섞인 검색어인지 ('ㅅㅅ', '삼ㅅ')"""
+    return any(char in _CHOSUNG_SET for char in query)
+
+
+def _chosung_matches(query: str, text: str) -> bool:
+    """query가 text의 앞부분과 맞는지 - 자모는 초성과, 완성 음절/기타 문자는 그대로 비교"""
+    if len(query) > len(text):
+        return False
+    for q, t in zip(query, text):
+        if q == t:
+            continue
+        if q in _CHOSUNG_SET and chosung(t) == q:
+            continue
+        return False
+    return True
+
+
+def _bigrams(text: str) -> Set[str]:
+    padded = f"^{text}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(text.casefold().split())
+
+
+class SymbolEntry(NamedTuple):
+    symbol: str
+    name: str
+    market: str
+    popularity: int = 0
+
+    def as_result(self, match: str) -> Dict[str, Any]:
+        return {'symbol': self.symbol, 'name': self.name, 'market': self.market, 'match': match}
+
+
+class SymbolIndex:
+    """
+    메모리 심볼 검색 인덱스
+
+    키 배열: (정규화 키, 종류, 항목 id)를 정렬해 보관 -> 접두사 검색은 이진 탐색 + 연속 구간 스캔
+    (종류: 's' 심볼, 'n' 이름/이름 단어, 'c' 한글 초성). 접두사 결과가 없으면 bigram 유사도 검색.
+    """
+
+    def __init__(self, entries: Iterable[SymbolEntry] = ()):
+        self._lock = threading.Lock()
+        self._entries: List[SymbolEntry] = []
+        self._ids: Dict[Tuple[str, str], int] = {}
+        self._symbols: Dict[str, List[int]] = {}
+        self._keys: List[Tuple[str, str, int]] = []
+        self._grams: Dict[str, Set[int]] = {}
+        self.loaded_at = time.time()
+        for entry in entries:
+            self._add(entry, bulk=True)
+        self._keys.sort()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # 구축
+    # ------------------------------------------------------------------
+    def _index_keys(self, entry: SymbolEntry) -> Iterable[Tuple[str, str]]:
+        yield _normalize(entry.symbol), 's'
+        name = _normalize(entry.name)
+        if name and name != _normalize(entry.symbol):
+            yield name, 'n'
+            words = name.split(' ')
+            for position in range(1, len(words)):
+                yield ' '.join(words[position:]), 'n'
+        initials = chosung(name)
+        if initials != name:
+            yield initials, 'c'
+
+    def _add(self, entry: SymbolEntry, bulk: bool = False) -> None:
+        # self._lock을 잡은 상태에서(또는 생성 중에) 호출
+        key = (entry.symbol.upper(), entry.market)
+        entry_id = self._ids.get(key)
+        if entry_id is not None:
+            # 이미 있는 심볼은 이름/인기도만 갱신 (이전 이름 키는 남아도 결과는 같은 항목)
+            previous = self._entries[entry_id]
+            self._entries[entry_id] = entry._replace(popularity=max(entry.popularity, previous.popularity))
+            if entry.name == previous.name:
+                return
+        else:
+            entry_id = len(self._entries)
+            self._entries.append(entry)
+            self._ids[key] = entry_id
+            self._symbols.setdefault(key[0], []).append(entry_id)
+
+        for text, kind in self._index_keys(entry):
+            item = (text, kind, entry_id)
+            if bulk:
+                self._keys.append(item)
+            else:
+                insort(self._keys, item)
+        for gram in _bigrams(_normalize(entry.symbol)) | _bigrams(_normalize(entry.name)):
+            self._grams.setdefault(gram, set()).add(entry_id)
+
+    def add(self, entries: Iterable[SymbolEntry]) -> int:
+        """검색 결과 등을 인덱스에 추가 (업스트림 검색 결과 역기록). 추가/갱신한 수"""
+        count = 0
+        with self._lock:
+            for entry in entries:
+                self._add(entry)
+                count += 1
+        return count
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+    def _prefix_range(self, prefix: str) -> Tuple[int, int]:
+        lo = bisect_left(self._keys, (prefix,))
+        hi = bisect_left(self._keys, (prefix + '\uffff',), lo)
+        return lo, hi
+
+    def search(self, query: str, limit: int = 10, market: Optional[str] = None) -> List[Dict[str, Any]]:
+        """순위(정확 > 심볼 접두사 > 이름 접두사 > 초성 > 유사) 후 인기도 순으로 최대 limit개"""
+        text = _normalize(query)
+        if not text:
+            return []
+
+        best: Dict[int, Tuple[int, str]] = {}
+
+        def consider(entry_id: int, rank: int, match: str) -> None:
+            if market and self._entries[entry_id].market != market:
+                return
+            current = best.get(entry_id)
+            if current is None or rank < current[0]:
+                best[entry_id] = (rank, match)
+
+        with self._lock:
+            if has_chosung(text):
+                # 초성 검색: 검색어를 초성으로 바꿔 범위를 찾고 완성 음절은 위치별로 다시 확인
+                lo, hi = self._prefix_range(chosung(text))
+                for key, kind, entry_id in self._keys[lo:hi]:
+                    if kind == 'c' and _chosung_matches(text, _normalize(self._entries[entry_id].name)):
+                        consider(entry_id, RANK_CHOSUNG, 'chosung')
+            else:
+                lo, hi = self._prefix_range(text)
+                # 정확 일치는 스캔 상한과 무관하게 항상 포함
+                for entry_id in self._symbols.get(text.upper(), ()):
+                    consider(entry_id, RANK_EXACT, 'symbol')
+                for key, kind, entry_id in self._keys[lo:min(hi, lo + MAX_PREFIX_SCAN)]:
+                    if kind == 's':
+                        consider(entry_id, RANK_EXACT if key == text else RANK_SYMBOL_PREFIX, 'symbol')
+                    elif kind == 'n':
+                        consider(entry_id, RANK_NAME_PREFIX, 'name')
+                    elif kind == 'c':
+                        consider(entry_id, RANK_CHOSUNG, 'chosung')
+
+            if not best and len(text) >= 2:
+                for entry_id in self._fuzzy(text):
+                    consider(entry_id, RANK_FUZZY, 'fuzzy')
+
+            top = heapq.nsmallest(
+                limit, best.items(),
+                key=lambda item: (item[1][0], -self._entries[item[0]].popularity, self._entries[item[0]].symbol),
+            )
+            return [self._entries[entry_id].as_result(match) for entry_id, (_, match) in top]
+
+    def _fuzzy(self, text: str, threshold: float = 0.4) -> List[int]:
+        """bigram 다이스 계수가 threshold 이상인 항목 (오타/중간 일치 허용)"""
+        grams = _bigrams(text)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._grams.get(gram, ()))
+        # 다이스 계수 >= threshold 이려면 공유 bigram 수가 최소 threshold * (|grams| + 2) / 2 (상대 bigram >= 2개)
+        required = threshold * (len(grams) + 2) / 2
+        matches = []
+        for entry_id, count in shared.items():
+            if count < required:
+                continue
+            entry = self._entries[entry_id]
+            for candidate in (entry.symbol, entry.name):
+                other = _bigrams(_normalize(candidate))
+                if 2 * len(grams & other) / (len(grams) + len(other)) >= threshold:
+                    matches.append(entry_id)
+                    break
+        return matches
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'keys': len(self._keys),
+                'bigrams': len(self._grams),
+                'age': int(time.time() - self.loaded_at),
+            }
+
+
+def _hot_popularity() -> Dict[str, int]:
+    """인기/상위/관심 목록 순서 기반 기본 인기도 (앞쪽일수록 높음)"""
+    scores: Dict[str, int] = {}
+    for symbols in (POPULAR_STOCKS, TOP_CRYPTOS, WATCHLIST_SYMBOLS):
+        for position, symbol in enumerate(symbols):
+            scores[symbol] = max(scores.get(symbol, 0), _HOT_BOOST - position)
+    return scores
+
+
+def load_entries() -> List[SymbolEntry]:
+    """charts.Stock 활성 종목 + 내장 예측 심볼 (인기도 = 예측 수 + 인기 목록 가산점)"""
+    hot = _hot_popularity()
+    entries: Dict[Tuple[str, str], SymbolEntry] = {}
+    for market, items in PREDICTION_SYMBOLS.items():
+        for item in items:
+            entries[(item['symbol'], market)] = SymbolEntry(item['symbol'], item['name'], market,
+                                                            hot.get(item['symbol'], 0))
+    try:
+        from charts.models import Stock
+        rows = (Stock.objects.filter(is_active=True)
+                .annotate(predictions=Count('chartprediction'))
+                .values_list('symbol', 'name', 'market__code', 'predictions'))
+        for symbol, name, market, predictions in rows:
+            key = (symbol.upper(), market)
+            builtin = entries.get(key)
+            # 예전 요청 경로가 자동 생성한 종목은 이름이 심볼과 같으므로 내장 이름을 유지
+            if builtin and (not name or name.upper() == key[0]):
+                name = builtin.name
+            entries[key] = SymbolEntry(key[0], name or key[0], market, hot.get(key[0], 0) + predictions)
+    except Exception as e:
+        logger.error(f"Symbol index could not read charts.Stock, using built-in symbols only: {e}")
+    return list(entries.values())
+
+
+# 전역 인덱스 - 프로세스 단위. sync_symbols로 추가된 종목은 TTL마다 DB에서 다시 읽어 반영
+_symbol_index: Optional[SymbolIndex] = None
+_symbol_index_lock = threading.Lock()
+
+
+def get_symbol_index() -> SymbolIndex:
+    global _symbol_index
+    ttl = getattr(settings, 'MARKET_DATA_SYMBOL_INDEX_TTL', 600)
+    index = _symbol_index
+    if index is None or time.time() - index.loaded_at > ttl:
+        with _symbol_index_lock:
+            if _symbol_index is None or time.time() - _symbol_index.loaded_at > ttl:
+                started = time.perf_counter()
+                _symbol_index = SymbolIndex(load_entries())
+                logger.info(f"🔎 Symbol index loaded: {len(_symbol_index)} symbols in "
+                            f"{(time.perf_counter() - started) * 1000:.1f}ms")
+            index = _symbol_index
+    return index
+
+
+def reset_symbol_index() -> None:
+    """다음 조회 시 DB에서 다시 구축 (종목 동기화 후 / 테스트용)"""
+    global _symbol_index
+    with _symbol_index_lock:
+        _symbol_index = None
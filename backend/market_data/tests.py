@@ -1,3 +1,1274 @@
-from django.test import TestCase
+import json
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest.mock import MagicMock, patch
 
-# Create your tests here.
+import requests
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from charts.models import ChartPrediction, Stock
+from marketdata.models import MarketDataSource, PriceData
+from market_data import timestamps
+from market_data.bar_store import bar_store
+from market_data.binary_series import HEADER, decode_series, encode_series
+from market_data.cache_keys import generation_ttl, purge_symbol, symbol_key
+from market_data.coalescing import SingleFlight
+from market_data.deadline import DeadlineExceeded, deadline_stats, remaining, request_deadline
+from market_data.downsample import downsample, downsample_rows
+from market_data.history_request import HistoryRequest
+from market_data.http_client import ProviderBudgetExhausted, ProviderClientRegistry
+from market_data.middleware import CompressionMiddleware
+from market_data.negative_cache import negative_cache, symbol_market
+from market_data.ohlcv import OHLCVSeries
+from market_data.provider_health import ProviderHealthTracker, provider_health
+from market_data.rate_limiter import TokenBucketLimiter
+from market_data.resample import resample
+from market_data.services import MarketDataService
+from market_data.streaming import QuoteHub, stream_client_cap
+from market_data.swr_cache import StaleWhileRevalidateCache, swr_cache
+from market_data.symbol_index import SymbolEntry, SymbolIndex, chosung, reset_symbol_index
+from market_data.tick_ingest import (
+    CandleAggregator, ReplayFeed, Tick, TickIngestor, build_symbol_map, parse_finnhub_message,
+)
+from market_data.tiered_cache import TieredCache
+from market_data.universe import builtin_listings, canonical_symbol, load_fixture, stock_directory, sync_listings
+from market_data.warming import CacheWarmer
+
+
+def _slow_quote(delay, price=100.0):
+    def fetch(symbol):
+        time.sleep(delay)
+        return {'symbol': symbol, 'price': price}
+    return fetch
+
+
+class HedgedQuoteTests(TestCase):
+    """헤지 레이스 기반 실시간 시세 조회 검증."""
+
+    def setUp(self):
+        cache.clear()
+        provider_health.reset()
+        self.service = MarketDataService()
+        self.service.hedge_delay = 0.05
+        self.service.quote_deadline = 2.0
+
+    def test_hedged_provider_wins_when_primary_is_slow(self):
+        """1순위가 느리면 헤지 지연 후 시작한 2순위 응답을 채택."""
+        apis = [
+            ('finnhub', _slow_quote(1.0, price=1.0), 60),
+            ('alpha_vantage', _slow_quote(0.0, price=2.0), 300),
+        ]
+
+        started = time.monotonic()
+        api_name, data, cache_timeout = self.service._race_quote_providers('AAPL', apis)
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(api_name, 'alpha_vantage')
+        self.assertEqual(data['price'], 2.0)
+        self.assertEqual(cache_timeout, 300)
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(provider_health.snapshot()['alpha_vantage']['quote']['wins'], 1)
+
+    def test_invalid_answer_launches_next_provider_immediately(self):
+        """가격이 0인 응답은 무효 처리하고 헤지 지연 없이 다음 프로바이더 호출."""
+        self.service.hedge_delay = 5.0
+        apis = [
+            ('finnhub', _slow_quote(0.0, price=0), 60),
+            ('tiingo', _slow_quote(0.0, price=3.0), 180),
+        ]
+
+        api_name, data, _ = self.service._race_quote_providers('AAPL', apis)
+
+        self.assertEqual(api_name, 'tiingo')
+        self.assertEqual(provider_health.snapshot()['finnhub']['quote']['errors'], {'empty': 1})
+
+    def test_hedge_delay_reads_p95_from_provider_health(self):
+        """헤지 지연은 서킷/체인 정렬과 같은 provider_health 지연시간 창의 p95를 사용."""
+        self.service.hedged_quotes, self.service.hedge_delay = True, None
+        self.service.hedge_min_delay, self.service.hedge_max_delay = 0.01, 1.0
+        for latency in (0.1, 0.2, 0.3, 0.4, 0.5):
+            provider_health.record('finnhub', 'quote', latency, True)
+
+        self.assertEqual(provider_health.percentile('finnhub', 'quote', 95), 0.5)
+        self.assertEqual(self.service._get_hedge_delay('finnhub'), 0.5)
+        self.assertEqual(self.service._get_hedge_delay('tiingo'), 1.0)  # 샘플이 없으면 최대 지연
+
+    def test_race_is_bounded_by_quote_deadline(self):
+        """모든 프로바이더가 지연되어도 전체 소요 시간은 데드라인으로 제한."""
+        self.service.quote_deadline = 0.2
+        apis = [(name, _slow_quote(1.0), 60) for name in ('finnhub', 'alpha_vantage', 'tiingo')]
+
+        started = time.monotonic()
+        result = self.service._race_quote_providers('AAPL', apis)
+
+        self.assertIsNone(result)
+        self.assertLess(time.monotonic() - started, 0.5)
+
+
+class ProviderClientRegistryTests(TestCase):
+    """호스트별 keep-alive 세션 레지스트리 검증."""
+
+    def test_one_session_per_host(self):
+        """같은 호스트는 세션을 공유하고 다른 호스트는 별도 세션 사용."""
+        registry = ProviderClientRegistry()
+
+        quote = registry.session_for('https://finnhub.io/api/v1/quote')
+        news = registry.session_for('https://finnhub.io/api/v1/news')
+        other = registry.session_for('https://api.twelvedata.com/quote')
+
+        self.assertIs(quote, news)
+        self.assertIsNot(quote, other)
+        self.assertIn('gzip', quote.headers['Accept-Encoding'])
+
+    def test_host_timeout_overrides_call_site_timeout(self):
+        """설정된 호스트 타임아웃이 호출부 타임아웃보다 우선."""
+        registry = ProviderClientRegistry(host_timeouts={'finnhub.io': 3}, default_timeout=7)
+
+        self.assertEqual(registry.timeout_for('https://finnhub.io/api/v1/quote', 10), 3)
+        self.assertEqual(registry.timeout_for('https://api.twelvedata.com/quote', 15), 15)
+        self.assertEqual(registry.timeout_for('https://api.twelvedata.com/quote'), 7)
+
+
+class BatchQuoteTests(APITestCase):
+    """다중 심볼 시세 일괄 조회 검증."""
+
+    def setUp(self):
+        cache.clear()
+        self.service = MarketDataService()
+
+    def test_cached_symbols_served_and_misses_grouped_into_one_request(self):
+        """캐시된 심볼은 그대로, 미스 심볼은 배치 요청 한 번으로 조회."""
+        cache.set(symbol_key('realtime_us_stock_', 'AAPL'), {'symbol': 'AAPL', 'price': 175.5}, 60)
+        fetched = {
+            'MSFT': {'symbol': 'MSFT', 'current_price': 378.9},
+            'TSLA': {'symbol': 'TSLA', 'current_price': 248.5},
+        }
+
+        with patch.object(self.service, '_get_twelve_data_quotes_batch', return_value=fetched) as batch, \
+                patch.object(self.service, 'get_real_time_quote') as single:
+            quotes = self.service.get_real_time_quotes(['AAPL', 'MSFT', 'TSLA'], 'us_stock')
+
+        batch.assert_called_once_with(['MSFT', 'TSLA'])
+        single.assert_not_called()
+        self.assertEqual(list(quotes), ['AAPL', 'MSFT', 'TSLA'])
+        self.assertEqual(quotes['MSFT']['source'], 'twelve_data')
+        self.assertIsNotNone(cache.get(symbol_key('realtime_us_stock_', 'TSLA')))
+
+    def test_crypto_batch_uses_coingecko_ids(self):
+        """암호화폐는 CoinGecko simple/price 다중 ids 요청 하나로 조회."""
+        payload = {
+            'bitcoin': {'usd': 43000.0, 'usd_24h_change': 1.5, 'usd_24h_vol': 1000},
+            'ethereum': {'usd': 2600.0, 'usd_24h_change': -0.5, 'usd_24h_vol': 500},
+        }
+        response = type('Resp', (), {'json': lambda self: payload, 'raise_for_status': lambda self: None})()
+
+        with patch.object(self.service.http, 'get', return_value=response) as http_get:
+            quotes = self.service.get_real_time_quotes(['BTC', 'ETH'], 'crypto')
+
+        http_get.assert_called_once()
+        self.assertEqual(http_get.call_args.kwargs['params']['ids'], 'bitcoin,ethereum')
+        self.assertEqual(quotes['ETH']['current_price'], 2600.0)
+        self.assertIsNotNone(cache.get(symbol_key('crypto_', 'BTC', 'USD')))
+
+    def test_endpoint_requires_symbols(self):
+        response = self.client.get(reverse('market_data:batch_quotes'))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SingleFlightTests(TestCase):
+    """캐시 미스 요청 병합 검증."""
+
+    def setUp(self):
+        cache.clear()
+        self.flight = SingleFlight(wait_timeout=1.0, poll_interval=0.01)
+
+    def test_concurrent_callers_share_one_fetch(self):
+        """같은 프로세스의 동시 미스는 리더의 조회 결과를 공유."""
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return {'price': 1.0}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.flight.do('realtime_us_stock_AAPL', fetch)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'price': 1.0}] * 5)
+        self.assertEqual(self.flight.stats()['local_coalesced'], 4)
+
+    def test_waits_for_value_from_lease_holder(self):
+        """다른 워커가 리스를 잡고 있으면 캐시에 값이 채워질 때까지 대기."""
+        key = 'historical_us_stock_AAPL_1month_1d'
+        cache.add(SingleFlight.lease_key(key), 1, 15)
+        threading.Timer(0.05, lambda: cache.set(key, [{'close': 1.0}], 60)).start()
+
+        result = self.flight.do(key, fetch=lambda: self.fail('should not fetch'))
+
+        self.assertEqual(result, [{'close': 1.0}])
+        self.assertEqual(self.flight.stats()['remote_coalesced'], 1)
+
+    def test_stale_value_returned_while_other_worker_refreshes(self):
+        key = 'realtime_us_stock_MSFT'
+        cache.add(SingleFlight.lease_key(key), 1, 15)
+
+        result = self.flight.do(key, fetch=lambda: self.fail('should not fetch'), stale_value={'price': 2.0})
+
+        self.assertEqual(result, {'price': 2.0})
+
+
+class StaleWhileRevalidateTests(TestCase):
+    """soft/hard TTL 기반 stale-while-revalidate 캐시 검증."""
+
+    def setUp(self):
+        cache.clear()
+        self.swr = StaleWhileRevalidateCache(hard_ttl_multiplier=10)
+
+    def _store_aged(self, key, value, soft_ttl, age):
+        self.swr.set(key, value, soft_ttl=soft_ttl)
+        envelope = cache.get(key)
+        envelope['stored_at'] -= age
+        cache.set(key, envelope, 600)
+
+    def test_stale_value_returned_immediately_and_refreshed_in_background(self):
+        """soft TTL이 지나면 stale 표시와 함께 즉시 반환하고 백그라운드에서 갱신."""
+        key = 'realtime_us_stock_AAPL'
+        self._store_aged(key, {'symbol': 'AAPL', 'price': 1.0}, soft_ttl=60, age=90)
+        refreshed = threading.Event()
+
+        def fetch():
+            self.swr.set(key, {'symbol': 'AAPL', 'price': 2.0}, soft_ttl=60)
+            refreshed.set()
+            return {'symbol': 'AAPL', 'price': 2.0}
+
+        result = self.swr.get_or_fetch(key, fetch)
+
+        self.assertEqual(result['price'], 1.0)
+        self.assertTrue(result['stale'])
+        self.assertGreaterEqual(result['age'], 90)
+        self.assertTrue(refreshed.wait(2))
+        self.assertEqual(self.swr.get_or_fetch(key, lambda: self.fail('should not fetch')),
+                         {'symbol': 'AAPL', 'price': 2.0})
+
+    def test_stale_list_carries_marker(self):
+        """리스트 값은 stale/age 속성이 있는 사본으로 반환하고 캐시 원본은 유지."""
+        key = 'historical_us_stock_AAPL_1month_1d'
+        self._store_aged(key, [{'close': 1.0}], soft_ttl=300, age=400)
+
+        result = self.swr.get_or_fetch(key, lambda: None)
+
+        self.assertEqual(result, [{'close': 1.0}])
+        self.assertTrue(result.stale)
+        self.assertIs(type(cache.get(key)['value']), list)
+
+    def test_miss_blocks_on_fetch_and_legacy_entries_are_fresh(self):
+        """hard TTL 이후(값 없음)는 동기 조회, 구형 평문 캐시 값은 그대로 사용."""
+        self.assertEqual(self.swr.get_or_fetch('market_indices', lambda: [{'symbol': '^GSPC'}]), [{'symbol': '^GSPC'}])
+
+        cache.set('crypto_BTC_USD', {'symbol': 'BTC', 'price': 43000.0}, 300)
+        self.assertEqual(self.swr.get_or_fetch('crypto_BTC_USD', lambda: self.fail('should not fetch')),
+                         {'symbol': 'BTC', 'price': 43000.0})
+
+
+class CacheWarmerTests(TestCase):
+    """핫 심볼 캐시 워머 검증."""
+
+    def setUp(self):
+        cache.clear()
+        self.service = MarketDataService()
+
+    def _warmer(self, **kwargs):
+        return CacheWarmer(self.service, {'us_stock': ['AAPL', 'MSFT'], 'crypto': []}, intervals=['1d'],
+                           include_indices=False, lead=30, jitter=0, provider_rates={}, **kwargs)
+
+    def test_refreshes_missing_and_expiring_entries_only(self):
+        """만료 임박/없는 항목만 갱신하고 신선한 항목은 건너뜀."""
+        swr_cache.set(symbol_key('realtime_us_stock_', 'AAPL'), {'symbol': 'AAPL', 'price': 1.0}, soft_ttl=600)
+        swr_cache.set(HistoryRequest.from_params('AAPL', '1month', '1d').cache_key(), [{'close': 1.0}], soft_ttl=10)
+
+        def fetch_quote(symbol, market, key):
+            swr_cache.set(key, {'symbol': symbol, 'price': 2.0}, soft_ttl=60)
+            return {'symbol': symbol, 'price': 2.0}
+
+        def fetch_history(symbol, period, interval, market, key, use_cached_daily=True):
+            swr_cache.set(key, [{'close': 2.0}], soft_ttl=300)
+            return [{'close': 2.0}]
+
+        with patch.object(self.service, '_fetch_real_time_quote', side_effect=fetch_quote) as quote, \
+                patch.object(self.service, '_fetch_historical_data', side_effect=fetch_history) as history:
+            warmer = self._warmer()
+            result = warmer.run_once()
+
+        self.assertEqual([call.args[0] for call in quote.call_args_list], ['MSFT'])
+        self.assertEqual(sorted(call.args[0] for call in history.call_args_list), ['AAPL', 'MSFT'])
+        self.assertFalse(history.call_args_list[0].kwargs['use_cached_daily'])
+        self.assertEqual(result, {'checked': 4, 'refreshed': 3, 'cold': 2})
+        self.assertEqual(warmer.stats()['warm_hit_ratio'], 0.5)
+
+    def test_rate_limited_provider_is_skipped(self):
+        cache.set('rate_limit_finnhub', True, 300)
+
+        with patch.object(self.service, '_fetch_real_time_quote') as quote, \
+                patch.object(self.service, '_fetch_historical_data', return_value=None):
+            warmer = self._warmer()
+            warmer.run_once()
+
+        quote.assert_not_called()
+        self.assertEqual(warmer.stats()['rate_limited'], 2)
+
+
+class TokenBucketLimiterTests(TestCase):
+    """캐시 공유 프로바이더 요청 예산(창별 원자 카운터) 검증."""
+
+    def setUp(self):
+        cache.clear()
+        self.now = 1000.0
+        self.limiter = TokenBucketLimiter(default_limits={'finnhub': 60}, burst_seconds=2,
+                                          clock=lambda: self.now)
+
+    def test_bucket_drains_and_refills(self):
+        """창 용량만큼 소비 후 거부, 다음 창이 시작되면 다시 채워짐."""
+        self.assertTrue(self.limiter.try_acquire('finnhub'))
+        self.assertTrue(self.limiter.try_acquire('finnhub'))
+        self.assertFalse(self.limiter.try_acquire('finnhub'))
+        self.assertFalse(self.limiter.has_budget('finnhub'))
+
+        self.now += 2.0
+        self.assertTrue(self.limiter.try_acquire('finnhub'))
+        self.assertEqual(self.limiter.stats()['finnhub']['denied'], 1)
+
+    def test_concurrent_acquires_are_counted_atomically(self):
+        """동시 요청은 창 예산만큼 정확히 통과하고, 카운터 오류는 예산 없음이 아니라 허용으로 처리."""
+        limiter = TokenBucketLimiter(default_limits={'finnhub': 240}, burst_seconds=15, clock=lambda: self.now)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(limiter.try_acquire('finnhub'))) for _ in range(80)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count(True), 60)  # 창당 240 x 15 / 60
+        self.assertEqual(limiter.stats()['finnhub']['denied'], 20)
+        with patch('market_data.rate_limiter.cache') as shared:
+            shared.incr.side_effect = ConnectionError('cache unavailable')
+            self.assertTrue(limiter.try_acquire('finnhub'))
+        self.assertEqual(limiter.stats()['finnhub']['denied'], 20)
+
+    def test_limits_come_from_market_data_source_rows(self):
+        """MarketDataSource 행의 분당 제한/활성 상태가 기본값보다 우선."""
+        MarketDataSource.objects.create(name='Finnhub', code='finnhub', base_url='https://finnhub.io',
+                                        rate_limit_per_minute=30, is_active=True)
+        MarketDataSource.objects.create(name='Tiingo', code='tiingo', base_url='https://api.tiingo.com',
+                                        rate_limit_per_minute=50, is_active=False)
+        self.limiter.reload()
+
+        self.assertEqual(self.limiter.limits()['finnhub'].rate_per_minute, 30)
+        self.assertFalse(self.limiter.has_budget('tiingo'))
+        self.assertTrue(self.limiter.has_budget('polygon'))  # 설정 없는 프로바이더는 제한 없음
+
+    def test_exhausted_provider_is_not_called(self):
+        """예산이 없는 프로바이더는 HTTP 요청 없이 실패하고 시세 레이스에서 건너뜀."""
+        registry = ProviderClientRegistry(rate_limiter=self.limiter)
+        self.limiter.try_acquire('finnhub')
+        self.limiter.try_acquire('finnhub')
+
+        with patch.object(registry.session_for('https://finnhub.io'), 'get') as session_get:
+            with self.assertRaises(ProviderBudgetExhausted):
+                registry.get('https://finnhub.io/api/v1/quote', params={'symbol': 'AAPL'})
+        session_get.assert_not_called()
+
+        service = MarketDataService()
+        with patch('market_data.services.get_rate_limiter', return_value=self.limiter):
+            self.assertFalse(service._is_api_available('finnhub'))
+
+
+class ProviderHealthTests(APITestCase):
+    """프로바이더 상태 점수와 서킷 브레이커 검증."""
+
+    def setUp(self):
+        cache.clear()
+        provider_health.reset()
+        self.now = 0.0
+        self.health = ProviderHealthTracker(consecutive_failure_threshold=3, cooldown=30,
+                                            clock=lambda: self.now)
+
+    def test_circuit_opens_then_half_open_trial_closes_it(self):
+        """연속 실패 시 서킷이 열리고, 대기 후 시험 호출 1회가 성공하면 닫힘."""
+        for _ in range(3):
+            self.health.record('finnhub', 'quote', 0.1, False, TimeoutError('read timed out'))
+
+        self.assertFalse(self.health.allow('finnhub', 'quote'))
+        self.assertTrue(self.health.allow('finnhub', 'crypto'))  # 엔드포인트별로 독립
+        self.assertEqual(self.health.snapshot()['finnhub']['quote']['last_error'], 'timeout')
+
+        self.now += 31
+        self.assertTrue(self.health.allow('finnhub', 'quote'))
+        self.assertFalse(self.health.allow('finnhub', 'quote'))  # 시험 호출은 하나만
+        self.health.record('finnhub', 'quote', 0.1, True)
+        self.assertEqual(self.health.snapshot()['finnhub']['quote']['circuit'], 'closed')
+
+    def test_fastest_healthy_provider_goes_first(self):
+        """빠르고 성공률 높은 프로바이더가 앞으로, 서킷이 열린 프로바이더는 맨 뒤로."""
+        for _ in range(5):
+            self.health.record('alpha_vantage', 'quote', 2.0, True)
+            self.health.record('tiingo', 'quote', 0.1, True)
+            self.health.record('finnhub', 'quote', 0.05, False, ConnectionError('connection refused'))
+
+        order = self.health.order('quote', ['finnhub', 'alpha_vantage', 'tiingo', 'marketstack'])
+
+        self.assertEqual(order, ['tiingo', 'marketstack', 'alpha_vantage', 'finnhub'])
+
+    def test_chain_failures_are_classified_and_empty_answers_keep_circuit_closed(self):
+        """체인에서 던진 타임아웃은 'timeout'으로 집계돼 서킷을 열고, 빈 응답은 서킷 실패로 세지 않음."""
+        service = MarketDataService()
+        threshold = provider_health.consecutive_failure_threshold
+
+        def timed_out():
+            raise requests.exceptions.Timeout('read timed out')
+
+        for _ in range(threshold):
+            service._run_provider_chain('quote', [('finnhub', timed_out)], 'AAPL')
+            service._run_provider_chain('quote', [('tiingo', lambda: None)], 'ZZZQ')
+
+        snapshot = provider_health.snapshot()
+        self.assertEqual((snapshot['finnhub']['quote']['circuit'], snapshot['finnhub']['quote']['last_error']),
+                         ('open', 'timeout'))
+        self.assertEqual(snapshot['tiingo']['quote']['circuit'], 'closed')
+        self.assertEqual(snapshot['tiingo']['quote']['errors'], {'empty': threshold})
+        self.assertEqual(snapshot['tiingo']['quote']['consecutive_failures'], 0)
+
+    def test_health_endpoint_reports_scores_without_probing(self):
+        provider_health.record('coingecko', 'crypto', 0.2, True)
+
+        with patch('market_data.http_client.ProviderClientRegistry.get') as http_get:
+            response = self.client.get(reverse('market_data:api_health'))
+
+        http_get.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        details = response.data['api_details']
+        self.assertEqual(details['coingecko']['status'], 'online')
+        self.assertEqual(details['coingecko']['endpoints']['crypto']['circuit'], 'closed')
+        self.assertEqual(details['finnhub']['status'], 'unknown')
+
+
+class BarStoreHistoryTests(TestCase):
+    """PriceData 봉 저장소 기반 과거 데이터 조회 검증."""
+
+    def setUp(self):
+        cache.clear()
+        bar_store.reset()
+        provider_health.reset()
+        sync_listings(builtin_listings())
+        self.service = MarketDataService()
+        today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.days = [today - timedelta(days=n) for n in range(30, -1, -1)]
+
+    @staticmethod
+    def _bars(days, close=100.0):
+        return [{'timestamp': day.strftime('%Y-%m-%d'), 'open': close, 'high': close + 1,
+                 'low': close - 1, 'close': close, 'volume': 1000} for day in days]
+
+    def test_warm_series_is_served_from_database(self):
+        """첫 조회만 프로바이더를 호출하고, 이후에는 DB 범위 조회로 응답."""
+        with patch.object(self.service, '_get_alpha_vantage_historical',
+                          return_value=self._bars(self.days)) as alpha:
+            first = self.service.get_historical_data('AAPL', '1month', '1d')
+            cache.delete(HistoryRequest.from_params('AAPL', '1month', '1d').cache_key())
+            with self.assertNumQueries(1):  # 빠진 구간 판단도 같은 조회 결과로 처리
+                second = self.service.get_historical_data('AAPL', '1month', '1d')
+
+        self.assertEqual(alpha.call_count, 1)
+        self.assertEqual(len(first), 31)
+        self.assertEqual(second, first)
+        self.assertEqual(PriceData.objects.filter(stock__symbol='AAPL', interval='1d').count(), 31)
+
+    def test_only_missing_tail_is_fetched_and_upserted(self):
+        stock_id = bar_store.stock_for('MSFT', 'us_stock')
+        bar_store.upsert(stock_id, '1d', 'tiingo', self._bars(self.days[:-3]))
+
+        with patch.object(self.service, '_get_alpha_vantage_historical',
+                          return_value=self._bars(self.days[-4:], close=105.0)) as alpha:
+            data = self.service.get_historical_data('MSFT', '1month', '1d')
+
+        self.assertEqual(alpha.call_args.args[3], self.days[-4])  # 마지막 저장 봉부터 조회
+        self.assertEqual(len(data), 31)
+        self.assertEqual(data[-1]['close'], 105.0)
+        self.assertEqual(data[-4]['close'], 105.0)  # 같은 날짜는 최신 소스 값 사용
+        self.assertEqual(data[0]['close'], 100.0)
+
+
+class OHLCVSeriesTests(TestCase):
+    """컬럼형 OHLCV 시리즈 검증."""
+
+    def test_rows_are_sorted_deduplicated_and_round_trip(self):
+        """프로바이더 행을 정렬/중복 제거하고, 기존 JSON 형태로 되돌림."""
+        series = OHLCVSeries.from_rows([
+            {'timestamp': '2024-01-03', 'open': 3, 'high': 4, 'low': 2, 'close': 3.5, 'volume': 30},
+            {'date': '2024-01-02', 'open': 2, 'high': 3, 'low': 1, 'close': 2.5, 'volume': 20},
+            {'timestamp': 1704326400000, 'price': 4.5},  # CoinGecko 밀리초 epoch, 종가만
+            {'timestamp': '2024-01-03', 'open': 3, 'high': 5, 'low': 2, 'close': 3.6, 'volume': 31},
+        ])
+
+        self.assertEqual(len(series), 3)
+        rows = series.to_rows()
+        self.assertEqual([row['timestamp'] for row in rows], ['2024-01-02', '2024-01-03', '2024-01-04'])
+        self.assertEqual(rows[1], {'timestamp': '2024-01-03', 'open': 3.0, 'high': 5.0, 'low': 2.0,
+                                   'close': 3.6, 'volume': 31})
+        self.assertEqual(rows[2]['open'], 4.5)
+        self.assertEqual(series.between(1704240000, 1704240000).to_rows(), [rows[1]])
+
+    def test_pickles_as_compact_blob(self):
+        series = OHLCVSeries(range(0, 86400 * 500, 86400), [1.0] * 500, [2.0] * 500,
+                             [0.5] * 500, [1.5] * 500, [10] * 500)
+
+        restored = pickle.loads(pickle.dumps(series))
+
+        self.assertEqual(restored, series)
+        self.assertLess(len(pickle.dumps(series)), series.nbytes + 200)
+        self.assertTrue(swr_cache.mark_stale(series, 12).stale)
+        self.assertFalse(series.stale)
+
+
+class ResampleTests(TestCase):
+    """달력 기준 봉 리샘플링 검증."""
+
+    @staticmethod
+    def _daily(dates, closes):
+        timestamps = [int(datetime(*date, tzinfo=dt_timezone.utc).timestamp()) for date in dates]
+        return OHLCVSeries(timestamps, closes, [c + 1 for c in closes], [c - 1 for c in closes], closes,
+                           [10] * len(closes))
+
+    def test_calendar_buckets_span_year_boundary(self):
+        """연말/연초에 걸친 주는 하나의 주봉, 분기/연봉은 달력 경계로 구분."""
+        series = self._daily([(2024, 12, 27), (2024, 12, 30), (2024, 12, 31), (2025, 1, 2), (2025, 1, 3),
+                              (2025, 3, 31), (2025, 4, 1)], [1, 2, 3, 4, 5, 6, 7])
+
+        weekly = resample(series, '1w').to_rows()
+        self.assertEqual([row['timestamp'] for row in weekly], ['2024-12-23', '2024-12-30', '2025-03-31'])
+        self.assertEqual(weekly[1], {'timestamp': '2024-12-30', 'open': 2.0, 'high': 6.0, 'low': 1.0,
+                                     'close': 5.0, 'volume': 40})
+        quarterly = resample(series, '1Q').to_rows()
+        self.assertEqual([(row['timestamp'], row['close']) for row in quarterly],
+                         [('2024-10-01', 3.0), ('2025-01-01', 6.0), ('2025-04-01', 7.0)])
+        self.assertEqual(len(resample(series, '1Y')), 2)
+
+    def test_intraday_to_daily_uses_market_timezone(self):
+        # 2024-03-10 미국 서머타임 시작: 뉴욕 자정은 05:00Z -> 04:00Z로 바뀜
+        start = int(datetime(2024, 3, 9, 12, tzinfo=dt_timezone.utc).timestamp())
+        hourly = OHLCVSeries([start + hour * 3600 for hour in range(48)], [1.0] * 48, [2.0] * 48,
+                             [0.5] * 48, [1.5] * 48, [1] * 48)
+
+        daily = resample(hourly, '1d', 'America/New_York').to_rows()
+
+        self.assertEqual([(row['timestamp'], row['volume']) for row in daily],
+                         [('2024-03-09 05:00:00', 17), ('2024-03-10 05:00:00', 23), ('2024-03-11 04:00:00', 8)])
+
+
+class DownsampleTests(TestCase):
+    """차트 폭 다운샘플링(LTTB / OHLC 구간 집계) 검증."""
+
+    def setUp(self):
+        cache.clear()
+        closes = [100.0 + (i % 10) for i in range(1000)]
+        closes[537] = 500.0  # 급등 한 봉
+        self.series = OHLCVSeries([1704067200 + i * 60 for i in range(1000)], closes,
+                                  [c + 1 for c in closes], [c - 1 for c in closes], closes, [1] * 1000)
+
+    def test_ohlc_buckets_keep_extremes_and_lttb_keeps_spike(self):
+        candles = downsample(self.series, 100)
+        line = downsample(self.series, 100, 'lttb')
+
+        self.assertEqual(len(candles), 100)
+        self.assertEqual(max(candles.high), 501.0)
+        self.assertEqual(min(candles.low), 99.0)
+        self.assertEqual(sum(candles.volume), 1000)
+        self.assertEqual((candles.open[0], candles.close[-1]), (self.series.open[0], self.series.close[-1]))
+        self.assertEqual(len(line), 100)
+        self.assertIn(500.0, line.close)
+        self.assertEqual(line.timestamps[::len(line) - 1], self.series.timestamps[::len(self.series) - 1])
+        self.assertIs(downsample(self.series, 1000), self.series)
+
+    def test_rows_and_endpoint_honour_max_points(self):
+        rows = [{'date': str(i), 'open': 1, 'high': 2 + i, 'low': 0, 'close': i, 'price': i, 'volume': 1}
+                for i in range(50)]
+        buckets = downsample_rows(rows, 5)
+        self.assertEqual([row['close'] for row in buckets], [9, 19, 29, 39, 49])
+        self.assertEqual((buckets[0]['date'], buckets[0]['high'], buckets[0]['price']), ('0', 11, 9))
+
+        url = reverse('market_data:historical_data', args=['AAPL'])
+        with patch('market_data.views.get_market_service') as service:
+            service.return_value.get_historical_series.return_value = self.series
+            response = self.client.get(url, {'max_points': 50, 'format': 'columns'})
+            bad = self.client.get(url, {'max_points': 1})
+        self.assertEqual(len(response.json()['data']['t']), 50)
+        self.assertEqual(bad.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class HistoryRequestTests(TestCase):
+    """과거 데이터 요청 정규화 / 상위 구간 캐시 재사용 검증."""
+
+    def setUp(self):
+        cache.clear()
+        self.service = MarketDataService()
+
+    def test_period_and_interval_spellings_share_one_key(self):
+        keys = {HistoryRequest.from_params(symbol, period, interval).cache_key()
+                for symbol, period, interval in [('AAPL', '1month', '1day'), ('aapl', '30d', '1d'),
+                                                 ('AAPL', '30', 'D'), ('AAPL', '1mo', '1d')]}
+        self.assertEqual(len(keys), 1)
+        self.assertEqual(HistoryRequest.from_params('AAPL', '1year', '1week').period, '365d')
+        self.assertEqual(HistoryRequest.from_params('AAPL', 'bogus', '1d').days, 30)
+
+    def test_cached_year_answers_shorter_ranges_by_slicing(self):
+        now = int(time.time()) // 86400 * 86400
+        year = OHLCVSeries([now - day * 86400 for day in range(400, -1, -1)], [1.0] * 401, [2.0] * 401,
+                           [0.5] * 401, [float(day) for day in range(401)], [10] * 401)
+        swr_cache.set(HistoryRequest.from_params('AAPL', '1year', '1d').cache_key(), year, soft_ttl=300)
+
+        with patch.object(self.service, '_run_provider_chain') as chain:
+            month = self.service.get_historical_series('AAPL', '30d', '1day')
+            quarter = self.service.get_historical_series('AAPL', '3mo', '1d')
+            weekly = self.service.get_historical_series('AAPL', '1month', '1week')
+
+        chain.assert_not_called()
+        self.assertEqual(month.timestamps[0], now - 30 * 86400)  # period_start: 30일 전 UTC 자정
+        self.assertEqual(month.timestamps[-1], now)
+        self.assertEqual(len(quarter), 91)
+        self.assertEqual(weekly.close[-1], 400.0)
+        self.assertIsNotNone(swr_cache.get(HistoryRequest.from_params('AAPL', '1month', '1d').cache_key()))
+
+
+class SymbolIndexTests(TestCase):
+    """로컬 심볼 검색 인덱스 / 업스트림 미스 역기록 검증."""
+
+    def setUp(self):
+        cache.clear()
+        reset_symbol_index()
+        self.index = SymbolIndex([
+            SymbolEntry('AAPL', 'Apple Inc.', 'us_stock', 900),
+            SymbolEntry('AAPLX', 'Apple Leveraged ETF', 'us_stock', 5),
+            SymbolEntry('005930', '삼성전자', 'kr_stock', 800),
+            SymbolEntry('006400', '삼성SDI', 'kr_stock', 10),
+            SymbolEntry('035420', 'NAVER', 'kr_stock', 50),
+        ])
+
+    def test_prefix_chosung_and_fuzzy_ranking(self):
+        def symbols(query, **kwargs):
+            return [item['symbol'] for item in self.index.search(query, **kwargs)]
+
+        self.assertEqual(symbols('aapl'), ['AAPL', 'AAPLX'])
+        self.assertEqual(symbols('apple'), ['AAPL', 'AAPLX'])
+        self.assertEqual(symbols('leveraged'), ['AAPLX'])
+        self.assertEqual(symbols('ㅅㅅ'), ['005930', '006400'])
+        self.assertEqual(symbols('삼ㅅㅈ'), ['005930'])
+        self.assertEqual(symbols('apl'), ['AAPL', 'AAPLX'])  # 접두사 미스 -> bigram 유사 검색
+        self.assertEqual(symbols('삼성', market='us_stock'), [])
+        self.assertEqual(chosung('삼성전자'), 'ㅅㅅㅈㅈ')
+
+    def test_true_miss_goes_upstream_once_and_is_written_back_to_index(self):
+        service = MarketDataService()
+        upstream = [{'symbol': 'ZQXT', 'name': 'Zeta Quux Technologies', 'type': 'Common Stock'}]
+        with patch.object(service, '_search_finnhub_symbols', return_value=upstream) as finnhub:
+            first = service.search_symbols('zeta quux')
+            again = service.search_symbols('zeta quux')
+            prefix = service.search_symbols('zet')
+
+        finnhub.assert_called_once()
+        self.assertEqual(first[0]['symbol'], 'ZQXT')
+        self.assertEqual(again[0]['symbol'], 'ZQXT')
+        self.assertEqual(prefix[0]['match'], 'name')
+        self.assertFalse(Stock.objects.filter(symbol='ZQXT').exists())  # 종목 마스터는 sync_symbols만 기록
+
+
+class UniverseSyncTests(APITestCase):
+    """종목 마스터 일괄 동기화 / 요청 경로 읽기 전용 조회 검증."""
+
+    def setUp(self):
+        cache.clear()
+        stock_directory.invalidate()
+
+    def _fixture(self, text):
+        handle = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8')
+        handle.write(text)
+        handle.close()
+        self.addCleanup(os.remove, handle.name)
+        return handle.name
+
+    def test_fixture_sync_diffs_in_bulk_and_fills_provider_ids(self):
+        first = load_fixture(self._fixture('symbol,name,market,coingecko_id\n'
+                                           'AAPL,AAPL Stock,us_stock,\nPEPE,Pepe,crypto,pepe\nXYZ,Xyz Corp,us_stock,\n'))
+        self.assertEqual(sync_listings(first)['created'], 3)
+
+        second = load_fixture(self._fixture('symbol,name,market,exchange\n'
+                                            'AAPL,Apple Inc.,us_stock,XNAS\nPEPE,Pepe,crypto,\n'))
+        with self.assertNumQueries(2):  # 기존 행 조회 1 + bulk_update 1 (새 종목이 없으면 시장 조회 없음)
+            counts = sync_listings(second, prune=True)
+
+        self.assertEqual((counts['updated'], counts['unchanged'], counts['deactivated']), (1, 1, 1))
+        apple = Stock.objects.get(symbol='AAPL')
+        self.assertEqual((apple.name, apple.exchange), ('Apple Inc.', 'XNAS'))
+        self.assertFalse(Stock.objects.get(symbol='XYZ').is_active)
+        self.assertIsNone(stock_directory.stock_id('XYZ', 'us_stock'))
+        self.assertEqual(MarketDataService()._get_coingecko_id('PEPE'), 'pepe')
+
+    def test_request_paths_never_create_master_data(self):
+        response = self.client.post(reverse('create_ai_prediction_api'), {'symbol': 'NOPE', 'market': 'us_stock'})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIsNone(bar_store.stock_for('NOPE', 'us_stock'))
+        self.assertFalse(Stock.objects.exists())
+
+    def test_default_sync_covers_frontend_dropdown_symbols(self):
+        sync_listings(builtin_listings())  # 배포 스크립트의 인자 없는 sync_symbols와 같은 원본
+        dropdown = ['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA', 'META', 'NVDA', 'NFLX', 'JPM', 'V',
+                    '005930.KS', '000660.KS', '035420.KS', '207940.KS', '006400.KS', '051910.KS',
+                    '005380.KS', '012330.KS', 'BTC-USD', 'ETH-USD']
+
+        for symbol in dropdown:
+            response = self.client.post('/api/charts/predictions/', {
+                'stock_symbol': symbol, 'current_price': 100, 'predicted_price': 110,
+                'target_date': '2030-01-01', 'duration_days': 7,
+            }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED, f"{symbol}: {response.data}")
+
+        self.assertEqual(canonical_symbol('005930.KS', 'us_stock'), ('005930', 'kr_stock'))
+        self.assertEqual(ChartPrediction.objects.get(stock__symbol='BTC').stock.market.code, 'crypto')
+
+
+class DashboardFanOutTests(APITestCase):
+    """섹션 팬아웃 / 대시보드 엔드포인트 검증."""
+
+    def setUp(self):
+        cache.clear()
+        self.service = MarketDataService()
+
+    def test_sections_run_concurrently_under_deadline(self):
+        def slow(value, delay):
+            def fetch():
+                time.sleep(delay)
+                return value
+            return fetch
+
+        def broken():
+            raise RuntimeError('boom')
+
+        stale_quotes = [{'symbol': 'AAPL', 'price': 1.0, 'stale': True, 'age': 90}]
+        started = time.monotonic()
+        results = self.service.fan_out({
+            'a': slow([1], 0.2), 'b': slow(stale_quotes, 0.2), 'c': slow([3], 0.2),
+            'slow': slow([4], 2.0), 'broken': broken,
+        }, deadline=0.5)
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.9)  # 합계(2.6초)가 아니라 데드라인 수준
+        self.assertEqual([name for name in results], ['a', 'b', 'c', 'slow', 'broken'])
+        self.assertEqual({name: r['status'] for name, r in results.items()},
+                         {'a': 'ok', 'b': 'ok', 'c': 'ok', 'slow': 'timeout', 'broken': 'error'})
+        self.assertEqual((results['b']['stale'], results['b']['age']), (True, 90))
+        self.assertIsNone(results['slow']['data'])
+
+    def test_dashboard_endpoint_returns_partial_sections(self):
+        quotes = {'AAPL': {'symbol': 'AAPL', 'price': 1.0}}
+        with patch('market_data.views.get_market_service', return_value=self.service), \
+                patch.object(self.service, 'get_market_indices', return_value=[{'symbol': '^GSPC'}]), \
+                patch.object(self.service, 'get_real_time_quotes', return_value=quotes) as batch, \
+                patch.object(self.service, 'get_market_news', side_effect=RuntimeError('down')):
+            response = self.client.get(reverse('market_data:dashboard'),
+                                       {'sections': 'indices,stocks,news', 'stocks': 'aapl'})
+            bad = self.client.get(reverse('market_data:dashboard'), {'sections': 'bogus'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['stocks'], [quotes['AAPL']])
+        self.assertEqual(response.data['indices'], [{'symbol': '^GSPC'}])
+        self.assertIsNone(response.data['news'])
+        self.assertEqual(response.data['sections']['news']['status'], 'error')
+        self.assertTrue(response.data['partial'])
+        self.assertNotIn('cryptos', response.data)
+        batch.assert_called_once_with(['AAPL'], 'us_stock')
+        self.assertEqual(bad.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class RequestDeadlineTests(TestCase):
+    """요청 데드라인 / 재시도 예산 검증."""
+
+    def setUp(self):
+        cache.clear()
+        provider_health.reset()
+        deadline_stats.reset()
+        self.limiter = TokenBucketLimiter(default_limits={'finnhub': 60}, clock=lambda: 1000.0)
+
+    def test_http_calls_get_remaining_time_and_defer_retry_after(self):
+        """호출 타임아웃은 남은 시간으로 줄고, 시간이 없으면 토큰을 쓰지 않고 거절, 429는 대기 대신 비활성화."""
+        registry = ProviderClientRegistry(rate_limiter=self.limiter, default_timeout=10)
+        session = registry.session_for('https://finnhub.io')
+        limited = MagicMock(status_code=429, headers={'Retry-After': '120'})
+        budget = self.limiter.stats()['finnhub']['available']
+
+        with patch.object(session, 'get', return_value=limited) as session_get:
+            with request_deadline(0.5):
+                registry.get('https://finnhub.io/api/v1/quote')
+            with request_deadline(0.01):
+                with self.assertRaises(DeadlineExceeded):
+                    registry.get('https://finnhub.io/api/v1/quote')
+
+        self.assertEqual(session_get.call_count, 1)
+        self.assertLessEqual(session_get.call_args.kwargs['timeout'], 0.5)
+        self.assertEqual(self.limiter.stats()['finnhub']['available'], budget - 1)
+        self.assertTrue(cache.get('rate_limit_finnhub'))
+        stats = deadline_stats.snapshot()
+        self.assertEqual((stats['retry_after_deferred'], stats['cuts']['http']), (1, 1))
+
+    def test_chain_stops_at_deadline_and_hands_off_to_background(self):
+        """데드라인이 지나면 다음 프로바이더를 부르지 않고, 저장 못 한 조회는 백그라운드 갱신으로 넘김."""
+        service = MarketDataService()
+        calls = []
+
+        def slow_provider(name):
+            def fetch():
+                calls.append(name)
+                time.sleep(0.3)
+                return None
+            return fetch
+
+        chain = [('finnhub', slow_provider('finnhub')), ('tiingo', slow_provider('tiingo'))]
+        with patch.object(swr_cache, 'refresh_in_background', return_value=True) as refresh:
+            with request_deadline(0.2):
+                result = swr_cache.get_or_fetch(
+                    'deadline_test', lambda: service._run_provider_chain('quote', chain, 'AAPL')[1])
+
+        self.assertIsNone(result)
+        self.assertEqual(len(calls), 1)
+        self.assertIsNone(remaining())
+        refresh.assert_called_once()
+        stats = deadline_stats.snapshot()
+        self.assertEqual(stats['cuts'], {'chain:quote': 1})
+        self.assertEqual((stats['requests'], stats['cut_requests'], stats['background_handoffs']), (1, 1, 1))
+        # 잘린 호출은 프로바이더 실패로 집계하지 않음
+        self.assertEqual(provider_health.snapshot(), {})
+
+    def test_deadline_cut_half_open_trial_is_released(self):
+        """데드라인에 잘린 half-open 시험 호출은 상태에 기록하지 않고 시험 호출 자리만 반납."""
+        service = MarketDataService()
+        for _ in range(provider_health.consecutive_failure_threshold):
+            provider_health.record('finnhub', 'quote', 0.1, False, TimeoutError('read timed out'))
+
+        def cut_short():
+            time.sleep(0.15)
+            return None
+
+        after_cooldown = time.monotonic() + provider_health.base_cooldown + 1
+        with patch.object(provider_health, 'clock', return_value=after_cooldown):
+            with request_deadline(0.1):
+                service._run_provider_chain('quote', [('finnhub', cut_short)], 'AAPL')
+            snapshot = provider_health.snapshot()['finnhub']['quote']
+            self.assertEqual((snapshot['circuit'], snapshot['samples']),
+                             ('half_open', provider_health.consecutive_failure_threshold))
+            self.assertTrue(provider_health.allow('finnhub', 'quote'))  # 다음 요청이 다시 시험 호출
+
+
+class NegativeCacheTests(TestCase):
+    """네거티브 캐시 / 프로바이더 지원 시장 맵 검증."""
+
+    QUOTE_PROVIDERS = ('_get_finnhub_quote', '_get_alpha_vantage_quote', '_get_tiingo_quote',
+                       '_get_marketstack_quote', '_get_twelve_data_quote')
+
+    def setUp(self):
+        cache.clear()
+        provider_health.reset()
+        negative_cache.reset()
+        stock_directory.invalidate()
+        self.service = MarketDataService()
+        self.service.hedge_delay = 0.01
+
+    def tearDown(self):
+        negative_cache.reset()
+
+    def test_unknown_symbol_skips_every_provider_after_first_miss(self):
+        """아무도 모르는 심볼은 첫 미스 이후 프로바이더 호출 없이 바로 응답."""
+        calls = []
+
+        def empty(name):
+            def fetch(symbol):
+                calls.append(name)
+                return None
+            return fetch
+
+        patches = [patch.object(self.service, name, side_effect=empty(name)) for name in self.QUOTE_PROVIDERS]
+        for patcher in patches:
+            patcher.start()
+        self.addCleanup(lambda: [patcher.stop() for patcher in patches])
+
+        first = self.service.get_real_time_quote('ZZZQ')
+        first_calls = len(calls)
+        started = time.perf_counter()
+        second = self.service.get_real_time_quote('ZZZQ')
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(first_calls, len(self.QUOTE_PROVIDERS))
+        self.assertEqual(len(calls), first_calls)
+        self.assertTrue(first['is_sample'] and second['is_sample'])
+        self.assertLess(elapsed, 0.005)
+        self.assertTrue(negative_cache.is_unknown('zzzq', 'quote', local_only=True))
+        self.assertEqual(negative_cache.stats()['unknown_marked'], 1)
+
+    def test_capability_map_and_per_provider_misses_filter_chains(self):
+        """시장을 지원하지 않는 프로바이더는 제외, 빈 응답 프로바이더는 그 심볼에만 건너뜀 (알려진 심볼은 재시도)."""
+        sync_listings(builtin_listings())
+        chain = [('alpha_vantage', lambda: None), ('tiingo', lambda: [{'close': 1.0}])]
+
+        self.assertEqual(symbol_market('005930'), 'kr_stock')
+        self.assertIsNone(symbol_market('AAPL; DROP'))
+        self.assertEqual(negative_cache.filter('quote', '005930', 'us_stock', chain), [])
+        self.assertEqual(self.service._run_provider_chain('historical', chain, symbol='005930'), (None, None))
+
+        with patch('market_data.services.MarketDataService._order_providers', side_effect=lambda e, c: c):
+            self.assertEqual(self.service._run_provider_chain('historical', chain, symbol='ZZZQ')[0], 'tiingo')
+            remaining_chain = negative_cache.filter('historical', 'ZZZQ', 'us_stock', chain)
+            self.assertEqual([entry[0] for entry in remaining_chain], ['tiingo'])
+            self.assertEqual(len(negative_cache.filter('historical', 'ZZQQ', 'us_stock', chain)), 2)
+
+        for provider in ('alpha_vantage', 'tiingo'):
+            negative_cache.record_miss(provider, 'AAPL', 'historical')
+        self.assertEqual(len(negative_cache.filter('historical', 'AAPL', 'us_stock', chain)), 2)
+        self.assertFalse(negative_cache.mark_unknown('AAPL', 'historical'))
+
+
+    def test_transport_errors_are_not_recorded_as_misses(self):
+        """타임아웃/5xx는 호출 함수가 다시 던져 미스로 남지 않고, 404 응답만 이 심볼의 미스로 기록."""
+        self.service.tiingo_key = 'test'
+        chain = [('tiingo', lambda: self.service._get_tiingo_historical('AAPL', '1month'))]
+        miss_key = negative_cache.provider_key('tiingo', 'AAPL', 'historical')
+
+        def status_response(code):
+            response = MagicMock(status_code=code)
+            response.raise_for_status.side_effect = requests.exceptions.HTTPError(f"{code} Error", response=response)
+            return response
+
+        for failure in (requests.exceptions.Timeout('read timed out'), status_response(503)):
+            with patch.object(self.service.http, 'get', side_effect=[failure]):
+                self.assertEqual(self.service._run_provider_chain('historical', chain, symbol='AAPL'), (None, None))
+            self.assertIsNone(cache.get(miss_key))
+
+        with patch.object(self.service.http, 'get', return_value=status_response(404)):
+            self.service._run_provider_chain('historical', chain, symbol='AAPL')
+        self.assertTrue(cache.get(miss_key))
+
+
+class TimestampParsingTests(TestCase):
+    """프로바이더 timestamp 컬럼 형식 감지/변환 검증."""
+
+    def test_provider_formats_normalize_to_epoch_seconds(self):
+        """AV/TD 날짜, Tiingo/Marketstack ISO, CoinGecko 밀리초 epoch를 같은 epoch로 변환."""
+        expected = 1705276800  # 2024-01-15T00:00:00Z
+        for value in ('2024-01-15', '2024-01-15 00:00:00', '2024-01-15T00:00:00.000Z',
+                      '2024-01-15T00:00:00+0000', '2024-01-15T09:00:00+09:00', expected * 1000, expected):
+            self.assertEqual(timestamps.parse_timestamp(value), expected, value)
+
+    def test_format_is_detected_once_per_column(self):
+        values = ['2024-01-15', '2024-01-16', '2024-01-17']
+        with patch('market_data.timestamps.detect_parser', wraps=timestamps.detect_parser) as detect:
+            self.assertEqual(timestamps.parse_timestamps(values), [1705276800, 1705363200, 1705449600])
+        self.assertEqual(detect.call_count, 1)
+
+        # 형식이 섞인 컬럼은 행 단위로 되돌아가고, 변환 불가 값은 None
+        self.assertEqual(timestamps.parse_timestamps(['2024-01-15', 1705363200000, None, 'n/a']),
+                         [1705276800, 1705363200, None, None])
+
+
+class TieredCacheTests(TestCase):
+    """L1(프로세스 LRU) + L2(공유 캐시) 2단 캐시 검증."""
+
+    def setUp(self):
+        cache.clear()
+        self.shared = caches['shared']
+        self.tiered = TieredCache('tiered-test', {'OPTIONS': {'L2': 'shared', 'L1_MAX_ENTRIES': 2, 'L1_TIMEOUT': 60}})
+        self.tiered.clear_local()
+        self.tiered.reset_stats()
+
+    def test_l1_serves_hot_keys_and_evicts_least_recently_used(self):
+        for symbol in ('AAPL', 'MSFT', 'TSLA'):
+            self.tiered.set(f'realtime_us_stock_{symbol}', {'price': 1.0}, 60)
+        self.tiered.set('lease:realtime_us_stock_AAPL', 1, 60)  # L1 대상이 아닌 키
+
+        self.tiered.get('realtime_us_stock_AAPL')   # L1에서 밀려나 L2 적중 후 다시 L1로
+        self.shared.delete('realtime_us_stock_TSLA')
+        value = self.tiered.get('realtime_us_stock_TSLA')  # L2에서 지워졌어도 L1 TTL 동안은 L1 적중
+        value['price'] = 2.0
+        self.assertEqual(self.tiered.get('realtime_us_stock_TSLA'), {'price': 1.0})
+        self.assertIsNone(self.tiered.get('realtime_us_stock_NVDA'))
+
+        stats = self.tiered.stats()
+        self.assertEqual(stats['l1_entries'], 2)
+        self.assertEqual(stats['namespaces']['realtime_'],
+                         {'l1_hits': 2, 'l2_hits': 1, 'misses': 1, 'evictions': 2, 'hit_ratio': 0.75})
+
+    def test_purge_symbol_invalidates_only_that_symbol(self):
+        aapl = symbol_key('historical_us_stock_', 'AAPL', '1month', '1d')
+        msft = symbol_key('historical_us_stock_', 'MSFT', '1month', '1d')
+        cache.set(aapl, [1], 60)
+        cache.set(msft, [2], 60)
+        service = MarketDataService()
+        with patch.object(service, 'get_coingecko_historical_data', return_value=[{'close': 1.0}]) as coingecko:
+            service.get_coingecko_primary_data('BTC', '30', 'usd')
+            service.get_coingecko_primary_data('BTC', '30', 'usd')
+            self.assertEqual(coingecko.call_count, 1)
+
+            self.assertEqual(purge_symbol('btc'), 1)
+            service.get_coingecko_primary_data('BTC', '30', 'usd')
+            self.assertEqual(coingecko.call_count, 2)  # 퍼지 후 CoinGecko 차트도 다시 조회
+
+        self.assertEqual(purge_symbol('aapl'), 1)
+
+        self.assertNotEqual(symbol_key('historical_us_stock_', 'AAPL', '1month', '1d'), aapl)
+        self.assertIsNone(cache.get(symbol_key('historical_us_stock_', 'AAPL', '1month', '1d')))
+        self.assertEqual(cache.get(symbol_key('historical_us_stock_', 'MSFT', '1month', '1d')), [2])
+
+
+    def test_generation_keys_get_a_finite_ttl(self):
+        """세대 키는 만료 없이 저장하지 않음 - TTL은 데이터 최대 TTL 이상, 퍼지할 때마다 다시 셈."""
+        with patch('market_data.cache_keys.cache') as shared:
+            shared.get.return_value = None
+            shared.incr.return_value = 1
+            symbol_key('realtime_us_stock_', 'ZZZQ')
+            purge_symbol('ZZZQ')
+
+        timeouts = [call.kwargs['timeout'] for call in shared.add.call_args_list + [shared.touch.call_args]]
+        self.assertEqual(len(timeouts), 3)
+        self.assertTrue(all(timeout == generation_ttl() for timeout in timeouts))
+        self.assertGreaterEqual(generation_ttl(), settings.MARKET_DATA_SWR_MAX_HARD_TTL)
+
+
+class _FakeQuoteService:
+    def __init__(self):
+        self.calls = []
+        self.prices = {}
+
+    def get_real_time_quotes(self, symbols, market):
+        self.calls.append((market, sorted(symbols)))
+        return {symbol: {'symbol': symbol, 'price': self.prices.get(symbol, 1.0), 'age': len(self.calls)}
+                for symbol in symbols}
+
+
+class QuoteStreamTests(TestCase):
+    """SSE 시세 스트림: 심볼당 폴링 1회, 변경분만 전파."""
+
+    def setUp(self):
+        self.service = _FakeQuoteService()
+        self.hub = QuoteHub(poll_interval=3600, service=self.service)
+        # 백그라운드 폴러 대신 테스트에서 poll_once를 직접 호출
+        poller = patch.object(QuoteHub, '_ensure_poller')
+        poller.start()
+        self.addCleanup(poller.stop)
+
+    def test_poller_fans_out_deltas_and_conflates_slow_clients(self):
+        first = self.hub.subscribe([('AAPL', 'us_stock'), ('BTC', 'crypto')])
+        second = self.hub.subscribe([('AAPL', 'us_stock')])
+        self.hub.poll_once()
+
+        self.assertEqual(sorted(self.service.calls), [('crypto', ['BTC']), ('us_stock', ['AAPL'])])
+        self.assertEqual(second.wait(0), [{'symbol': 'AAPL', 'market': 'us_stock', 'price': 1.0, 'stale': False}])
+
+        # 변경 없음 -> 전파 없음, 변경된 필드만 전파, 읽지 않은 델타는 병합
+        self.hub.poll_once()
+        self.assertEqual(second.wait(0), [])
+        self.service.prices['AAPL'] = 2.0
+        self.hub.poll_once()
+        self.service.prices['AAPL'] = 3.0
+        self.hub.poll_once()
+        self.assertEqual(second.wait(0), [{'symbol': 'AAPL', 'market': 'us_stock', 'price': 3.0}])
+        self.assertEqual(len(first.wait(0)), 2)
+        self.assertEqual(first.conflated, 2)
+
+        self.hub.unsubscribe(first)
+        self.hub.unsubscribe(second)
+        self.assertEqual(self.hub.stats()['symbols'], 0)
+
+    def test_endpoint_streams_quotes_and_unsubscribes_on_close(self):
+        with patch('market_data.views.get_quote_hub', return_value=self.hub):
+            response = self.client.get(reverse('market_data:stream_quotes'), {'symbols': 'aapl,BTC'})
+            self.assertEqual(response['Content-Type'], 'text/event-stream')
+            self.hub.poll_once()
+            chunks = iter(response.streaming_content)
+            self.assertTrue(next(chunks).startswith(b'retry:'))
+            events = [next(chunks), next(chunks)]
+            response.close()
+
+        self.assertTrue(all(event.startswith(b'event: quote\ndata: ') for event in events))
+        self.assertIn(('crypto', ['BTC']), self.service.calls)
+        self.assertEqual(self.hub.stats()['clients'], 0)
+
+
+    def test_stream_cap_leaves_worker_threads_for_requests(self):
+        """스트림 연결 상한은 gthread 스레드 수의 절반을 넘지 않아 일반 요청과 503 응답용 스레드가 남음."""
+        self.assertLess(stream_client_cap(), settings.GUNICORN_THREADS)
+        with self.settings(GUNICORN_THREADS=32, MARKET_DATA_STREAM_MAX_CLIENTS=200):
+            self.assertEqual(stream_client_cap(), 16)
+        with self.settings(GUNICORN_THREADS=8, MARKET_DATA_STREAM_MAX_CLIENTS=2):
+            self.assertEqual(stream_client_cap(), 2)
+
+
+class TickIngestTests(TestCase):
+    """체결 웹소켓 -> 분봉 집계 -> 시세 캐시/bar store 검증."""
+
+    def setUp(self):
+        cache.clear()
+        bar_store.reset()
+        sync_listings(builtin_listings())
+        self.base = (int(time.time()) // 3600 - 1) * 3600  # 한 시간 전 정각
+
+    def _trades(self, *trades):
+        return json.dumps({'type': 'trade', 'data': [
+            {'s': symbol, 'p': price, 'v': volume, 't': (self.base + offset) * 1000}
+            for symbol, price, volume, offset in trades
+        ]})
+
+    def test_ticks_fold_into_candles_and_late_ticks_are_dropped(self):
+        aggregator = CandleAggregator()
+        for tick in parse_finnhub_message(self._trades(
+                ('AAPL', 10.0, 1, 0), ('AAPL', 12.0, 2, 30), ('AAPL', 9.0, 3, 59), ('AAPL', 11.0, 4, 61))):
+            aggregator.add(tick)
+        aggregator.add(Tick('AAPL', 50.0, 1, self.base + 5))  # 이미 닫힌 1분봉
+
+        completed = aggregator.drain()
+        self.assertEqual(completed[('AAPL', '1m')], [
+            {'timestamp': self.base, 'open': 10.0, 'high': 12.0, 'low': 9.0, 'close': 9.0, 'volume': 6}
+        ])
+        self.assertNotIn(('AAPL', '5m'), completed)
+        self.assertEqual(aggregator.forming('AAPL', '5m')['volume'], 11)
+        self.assertEqual(aggregator.late_ticks, 1)
+
+    def test_replayed_feed_serves_quotes_and_intraday_bars_without_api_calls(self):
+        swr_cache.set(symbol_key('realtime_us_stock_', 'AAPL'),
+                      {'symbol': 'AAPL', 'price': 100.0, 'previous_close': 100.0}, soft_ttl=60)
+        feed = ReplayFeed([
+            self._trades(('AAPL', 101.0, 5, 0), ('AAPL', 102.0, 5, 20)),
+            self._trades(('AAPL', 103.0, 5, 65), ('UNKNOWN', 1.0, 1, 65)),
+            '{"type": "ping"}',
+        ])
+        ingestor = TickIngestor(feed, build_symbol_map(['AAPL'], []), publish_interval=0, flush_interval=3600,
+                                clock=lambda: self.base + 30)
+        ingestor.run()
+
+        quote = swr_cache.get_value(symbol_key('realtime_us_stock_', 'AAPL'))
+        self.assertEqual((quote['price'], quote['change'], quote['source']), (103.0, 3.0, 'finnhub_ws'))
+        self.assertEqual(PriceData.objects.filter(stock__symbol='AAPL', interval='1m').count(), 1)
+        self.assertEqual(ingestor.stats()['unknown_ticks'], 1)
+
+        service = MarketDataService()
+        with patch.object(service, '_run_provider_chain', side_effect=AssertionError('no API calls')):
+            series = service.get_historical_series('AAPL', '1day', '1min')
+        self.assertEqual(list(series.timestamps), [self.base, self.base + 60])
+        self.assertEqual(list(series.close), [102.0, 103.0])
+
+
+class HistoryDeltaTests(APITestCase):
+    """과거 데이터 since 델타 / ETag 304 / 컬럼 형식 검증."""
+
+    def setUp(self):
+        cache.clear()
+        day = 86400
+        self.start = 1705276800  # 2024-01-15
+        self.series = OHLCVSeries(
+            [self.start + i * day for i in range(5)], [1.0] * 5, [2.0] * 5, [0.5] * 5,
+            [1.0, 1.1, 1.2, 1.3, 1.4], [10] * 5,
+        )
+        self.url = reverse('market_data:historical_data', args=['AAPL'])
+
+    def _get(self, **kwargs):
+        with patch('market_data.views.get_market_service') as service:
+            service.return_value.get_historical_series.return_value = self.series
+            return self.client.get(self.url, **kwargs)
+
+    def test_since_returns_replaced_last_bar_and_newer(self):
+        response = self._get(data={'since': self.start + 3 * 86400})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['timestamp'] for row in response.data['data']], ['2024-01-18', '2024-01-19'])
+        self.assertEqual(response.data['cursor'], self.start + 4 * 86400)
+        self.assertEqual(self._get(data={'since': 'yesterday'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unchanged_series_revalidates_with_304(self):
+        first = self._get()
+        etag = first['ETag']
+
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.series.close[-1] = 1.5  # 진행 중인 마지막 봉 갱신
+        changed = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(changed['ETag'], etag)
+
+    def test_columns_format_applies_precision_per_column(self):
+        self.series.close[-1] = 1.23456
+        rows = self._get()
+        response = self._get(data={'format': 'columns', 'since': self.start + 3 * 86400})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['format'], 'columns')
+        self.assertEqual(response.data['data']['t'], [self.start + 3 * 86400, self.start + 4 * 86400])
+        self.assertEqual(response.data['data']['c'], [1.3, 1.23])  # us_stock 2자리
+        self.assertEqual(response.data['data']['v'], [10, 10])
+        self.assertNotEqual(response['ETag'], rows['ETag'])
+
+    def test_binary_format_decodes_to_same_series(self):
+        self.series.stale, self.series.age = True, 42
+        response = self._get(data={'format': 'bin', 'since': self.start + 3 * 86400})
+        header, decoded = decode_series(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/octet-stream')
+        self.assertEqual(decoded, self.series.since(self.start + 3 * 86400))
+        self.assertEqual(header['cursor'], self.start + 4 * 86400)
+        self.assertEqual((header['since'], header['age']), (self.start + 3 * 86400, 42))
+        self.assertTrue(header['stale'] and header['daily'])
+        bad = self._get(data={'format': 'bin', 'since': 'yesterday'})
+        self.assertEqual(bad['Content-Type'], 'application/json')
+
+    def test_binary_columns_are_8_byte_aligned_little_endian(self):
+        blob = encode_series(self.series)
+
+        self.assertEqual(HEADER.size % 8, 0)
+        self.assertEqual(len(blob), HEADER.size + 6 * 8 * len(self.series))
+        first_close = HEADER.size + 4 * 8 * len(self.series)
+        self.assertEqual(blob[first_close:first_close + 8], struct.pack('<d', 1.0))
+
+
+class CompressionMiddlewareTests(TestCase):
+    """응답 압축 미들웨어 검증."""
+
+    def test_large_responses_compressed_but_streams_untouched(self):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        middleware = CompressionMiddleware(lambda request: None)
+
+        small = middleware.process_response(request, HttpResponse(b'{}', content_type='application/json'))
+        large = HttpResponse(json.dumps({'c': [100.25] * 2000}), content_type='application/json')
+        large['ETag'] = '"abc"'
+        large = middleware.process_response(request, large)
+        stream = middleware.process_response(
+            request, StreamingHttpResponse(iter([b'x' * 4096]), content_type='text/event-stream')
+        )
+
+        self.assertFalse(small.has_header('Content-Encoding'))
+        self.assertIn(large['Content-Encoding'], ('gzip', 'br'))
+        self.assertEqual(large['ETag'], 'W/"abc"')
+        self.assertFalse(stream.has_header('Content-Encoding'))
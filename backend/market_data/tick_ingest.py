@@ -0,0 +1,356 @@
+"""
+Trade Tick Ingestion for Market Data
+A worker subscribes to a provider trade websocket (Finnhub), folds every trade into
+1m/5m/1h candles in memory, publishes the live last price into the quote cache and the
+forming candles into the shared cache, and bulk-flushes completed candles to the bar
+store, so streamed symbols cost no per-request provider calls
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .bar_store import bar_store
+from .cache_keys import symbol_key
+from .swr_cache import swr_cache
+
+try:
+    import websocket  # websocket-client
+except ImportError:
+    websocket = None
+
+logger = logging.getLogger(__name__)
+
+FINNHUB_WS_URL = 'wss://ws.finnhub.io'
+
+# PriceData 간격 코드 -> 초
+CANDLE_SECONDS = {'1m': 60, '5m': 300, '1h': 3600}
+
+# 차트 간격(표준) -> 스트리밍으로 저장하는 PriceData 간격 (다르면 리샘플링)
+STREAMED_INTERVALS = {'1min': '1m', '5min': '5m', '15min': '5m', '30min': '5m', '1h': '1h', '4h': '1h'}
+
+
+class Tick(NamedTuple):
+    symbol: str       # 프로바이더 심볼 (예: AAPL, BINANCE:BTCUSDT)
+    price: float
+    volume: float
+    timestamp: float  # epoch 초
+
+
+def parse_finnhub_message(raw: Any) -> List[Tick]:
+    """Finnhub 웹소켓 메시지 -> 체결 목록 (trade 이외 메시지는 빈 목록)"""
+    try:
+        message = json.loads(raw) if isinstance(raw, (str, bytes)) else raw
+    except ValueError:
+        return []
+    if not isinstance(message, dict) or message.get('type') != 'trade':
+        return []
+    ticks = []
+    for trade in message.get('data') or ():
+        try:
+            ticks.append(Tick(trade['s'], float(trade['p']), float(trade.get('v') or 0), trade['t'] / 1000.0))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return ticks
+
+
+# ----------------------------------------------------------------------
+# 피드
+# ----------------------------------------------------------------------
+class FinnhubTradeFeed:
+    """
+    Finnhub 체결 웹소켓 피드. 체결은 Tick으로, 수신 대기 시간 초과 시 None을 내보내
+    소비자가 조용한 구간에도 게시/플러시할 수 있게 한다. 끊기면 지수 백오프로 재연결
+    """
+
+    def __init__(self, api_key: str, symbols: Iterable[str], url: str = FINNHUB_WS_URL,
+                 recv_timeout: float = 1.0, max_backoff: float = 60.0):
+        self.api_key = api_key
+        self.symbols = list(symbols)
+        self.url = url
+        self.recv_timeout = recv_timeout
+        self.max_backoff = max_backoff
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def __iter__(self) -> Iterator[Optional[Tick]]:
+        if websocket is None:
+            raise RuntimeError("websocket-client is not installed (pip install websocket-client)")
+        backoff = 1.0
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = websocket.create_connection(f"{self.url}?token={self.api_key}", timeout=10)
+                for symbol in self.symbols:
+                    connection.send(json.dumps({'type': 'subscribe', 'symbol': symbol}))
+                connection.settimeout(self.recv_timeout)
+                logger.info(f"📡 Finnhub trade feed connected ({len(self.symbols)} symbols)")
+                backoff = 1.0
+                while not self._stop.is_set():
+                    try:
+                        raw = connection.recv()
+                    except websocket.WebSocketTimeoutException:
+                        yield None
+                        continue
+                    ticks = parse_finnhub_message(raw)
+                    if not ticks:
+                        yield None  # ping 등
+                    for tick in ticks:
+                        yield tick
+            except Exception as e:
+                logger.error(f"Finnhub trade feed error, reconnecting in {backoff:.0f}s: {e}")
+                yield None
+                self._stop.wait(backoff)
+                backoff = min(self.max_backoff, backoff * 2)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+
+class ReplayFeed:
+    """녹화된 Finnhub 메시지(문자열/dict 또는 JSON Lines 파일)를 재생하는 로컬 피드 (테스트/개발용)"""
+
+    def __init__(self, messages: Iterable[Any]):
+        self.messages = messages
+
+    @classmethod
+    def from_file(cls, path: str) -> 'ReplayFeed':
+        with open(path, encoding='utf-8') as f:
+            return cls([line for line in f if line.strip()])
+
+    def stop(self) -> None:
+        pass
+
+    def __iter__(self) -> Iterator[Optional[Tick]]:
+        for message in self.messages:
+            yield from parse_finnhub_message(message)
+            yield None
+
+
+# ----------------------------------------------------------------------
+# 봉 집계
+# ----------------------------------------------------------------------
+class CandleAggregator:
+    """체결 -> 심볼/간격별 OHLCV 봉 (진행 중인 봉은 메모리, 완료된 봉은 drain()으로 회수)"""
+
+    def __init__(self, intervals: Iterable[str] = ('1m', '5m', '1h')):
+        self.widths = {interval: CANDLE_SECONDS[interval] for interval in intervals}
+        self._forming: Dict[Tuple[str, str], List[float]] = {}   # [start, open, high, low, close, volume]
+        self._completed: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._closed_until: Dict[Tuple[str, str], int] = {}  # 이 시각 이전 구간은 이미 완료
+        self.late_ticks = 0
+
+    @staticmethod
+    def _row(candle: List[float]) -> Dict[str, Any]:
+        start, open_price, high, low, close, volume = candle
+        return {'timestamp': int(start), 'open': open_price, 'high': high, 'low': low, 'close': close,
+                'volume': int(volume)}
+
+    def _close(self, key: Tuple[str, str], candle: List[float]) -> None:
+        self._completed.setdefault(key, []).append(self._row(candle))
+        self._closed_until[key] = int(candle[0]) + self.widths[key[1]]
+
+    def add(self, tick: Tick) -> None:
+        for interval, width in self.widths.items():
+            key = (tick.symbol, interval)
+            start = int(tick.timestamp) // width * width
+            if start < self._closed_until.get(key, start):
+                # 이미 완료(저장)한 봉에 속하는 지연 체결은 버림
+                self.late_ticks += 1
+                continue
+            candle = self._forming.get(key)
+            if candle is None or start > candle[0]:
+                if candle is not None:
+                    self._close(key, candle)
+                self._forming[key] = [start, tick.price, tick.price, tick.price, tick.price, tick.volume]
+            else:
+                candle[2] = max(candle[2], tick.price)
+                candle[3] = min(candle[3], tick.price)
+                candle[4] = tick.price
+                candle[5] += tick.volume
+
+    def roll(self, now: float, grace: float = 2.0) -> None:
+        """체결이 끊긴 심볼도 구간이 끝난 봉(grace초 경과)은 완료 처리"""
+        for key, candle in list(self._forming.items()):
+            if candle[0] + self.widths[key[1]] + grace <= now:
+                self._close(key, candle)
+                del self._forming[key]
+
+    def drain(self) -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+        completed, self._completed = self._completed, {}
+        return completed
+
+    def forming(self, symbol: str, interval: str) -> Optional[Dict[str, Any]]:
+        candle = self._forming.get((symbol, interval))
+        return self._row(candle) if candle is not None else None
+
+
+# ----------------------------------------------------------------------
+# 캐시 키 (웹 워커와 인제스트 워커가 공유)
+# ----------------------------------------------------------------------
+def feed_active_key(symbol: str) -> str:
+    return f"tickfeed:{symbol.upper()}"
+
+
+def live_candle_key(symbol: str, interval: str) -> str:
+    return f"livecandle:{symbol.upper()}:{interval}"
+
+
+def is_streamed(symbol: str) -> bool:
+    """인제스트 워커가 현재 이 심볼의 체결을 받고 있는지"""
+    return bool(cache.get(feed_active_key(symbol)))
+
+
+def live_candle(symbol: str, interval: str) -> Optional[Dict[str, Any]]:
+    return cache.get(live_candle_key(symbol, interval))
+
+
+# ----------------------------------------------------------------------
+# 인제스트 워커
+# ----------------------------------------------------------------------
+class TickIngestor:
+    """
+    피드 소비 루프
+
+    symbols: 프로바이더 심볼 -> (심볼, 시장). 예: {'AAPL': ('AAPL', 'us_stock'),
+    'BINANCE:BTCUSDT': ('BTC', 'crypto')}
+    """
+
+    def __init__(self, feed: Iterable[Optional[Tick]], symbols: Dict[str, Tuple[str, str]],
+                 aggregator: Optional[CandleAggregator] = None, publish_interval: float = 1.0,
+                 flush_interval: float = 30.0, quote_ttl: int = 60, feed_ttl: int = 30,
+                 clock: Callable[[], float] = time.time):
+        self.feed = feed
+        self.symbols = symbols
+        self.aggregator = aggregator or CandleAggregator()
+        self.publish_interval = publish_interval
+        self.flush_interval = flush_interval
+        self.quote_ttl = quote_ttl
+        self.feed_ttl = feed_ttl
+        self.clock = clock
+        self._last: Dict[str, Tick] = {}
+        self._dirty = set()
+        self._counters = {'ticks': 0, 'unknown_ticks': 0, 'quotes_published': 0, 'candles_flushed': 0}
+
+    def handle(self, tick: Tick) -> None:
+        if tick.symbol not in self.symbols:
+            self._counters['unknown_ticks'] += 1
+            return
+        self._counters['ticks'] += 1
+        self.aggregator.add(tick)
+        self._last[tick.symbol] = tick
+        self._dirty.add(tick.symbol)
+
+    @staticmethod
+    def quote_key(symbol: str, market: str) -> str:
+        if market == 'crypto':
+            return symbol_key("crypto_", symbol, "USD")
+        return symbol_key(f"realtime_{market}_", symbol)
+
+    def publish(self) -> int:
+        """변경된 심볼의 최신 체결가를 시세 캐시에, 진행 중인 봉을 공유 캐시에 게시"""
+        live = {}
+        for provider_symbol in self._dirty:
+            symbol, market = self.symbols[provider_symbol]
+            tick = self._last[provider_symbol]
+            key = self.quote_key(symbol, market)
+
+            # 전일 종가 등 REST 시세 필드는 유지하고 가격/변동만 갱신
+            quote = dict(swr_cache.get_value(key) or {'symbol': symbol})
+            price_fields = [field for field in ('price', 'current_price') if field in quote] or ['price']
+            for field in price_fields:
+                quote[field] = tick.price
+            previous_close = quote.get('previous_close')
+            if previous_close:
+                quote['change'] = round(tick.price - float(previous_close), 8)
+                quote['change_percent'] = round((tick.price / float(previous_close) - 1) * 100, 4)
+            quote['timestamp'] = datetime.fromtimestamp(tick.timestamp, tz=dt_timezone.utc).isoformat()
+            quote['source'] = 'finnhub_ws'
+            quote.pop('stale', None)
+            quote.pop('age', None)
+            swr_cache.set(key, quote, soft_ttl=self.quote_ttl)
+
+            for interval in self.aggregator.widths:
+                candle = self.aggregator.forming(provider_symbol, interval)
+                if candle is not None:
+                    live[live_candle_key(symbol, interval)] = candle
+            self._counters['quotes_published'] += 1
+
+        # 구독 중인 심볼은 체결이 없어도 활성 표시 유지
+        active = {feed_active_key(symbol): True for symbol, _ in self.symbols.values()}
+        cache.set_many(active, timeout=self.feed_ttl)
+        if live:
+            cache.set_many(live, timeout=self.feed_ttl)
+
+        published = len(self._dirty)
+        self._dirty.clear()
+        return published
+
+    def flush(self) -> int:
+        """완료된 봉을 심볼/간격별로 묶어 bar store에 bulk upsert. 저장한 봉 수 반환"""
+        saved = 0
+        for (provider_symbol, interval), rows in self.aggregator.drain().items():
+            symbol, market = self.symbols[provider_symbol]
+            stock_id = bar_store.stock_for(symbol, market)
+            if stock_id is None:
+                continue
+            try:
+                saved += bar_store.upsert(stock_id, interval, 'finnhub', rows)
+            except Exception as e:
+                logger.error(f"Candle flush failed for {symbol} {interval}: {e}")
+        self._counters['candles_flushed'] += saved
+        return saved
+
+    def run(self) -> None:
+        last_publish = last_flush = self.clock()
+        try:
+            for tick in self.feed:
+                if tick is not None:
+                    self.handle(tick)
+                now = self.clock()
+                if now - last_publish >= self.publish_interval:
+                    self.aggregator.roll(now)
+                    self.publish()
+                    last_publish = now
+                if now - last_flush >= self.flush_interval:
+                    self.flush()
+                    last_flush = now
+        finally:
+            self.publish()
+            self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._counters, 'late_ticks': self.aggregator.late_ticks, 'symbols': len(self.symbols)}
+
+
+def finnhub_symbol(symbol: str, market: str) -> str:
+    """Finnhub 체결 피드 심볼 (암호화폐는 Binance USDT 마켓)"""
+    if market == 'crypto':
+        return f"BINANCE:{symbol.upper()}USDT"
+    return symbol.upper()
+
+
+def build_symbol_map(stocks: Iterable[str], cryptos: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+    symbols = {finnhub_symbol(symbol, 'us_stock'): (symbol.upper(), 'us_stock') for symbol in stocks}
+    symbols.update({finnhub_symbol(symbol, 'crypto'): (symbol.upper(), 'crypto') for symbol in cryptos})
+    return symbols
+
+
+def ingestor_from_settings(feed: Iterable[Optional[Tick]], symbols: Dict[str, Tuple[str, str]]) -> TickIngestor:
+    return TickIngestor(
+        feed, symbols,
+        publish_interval=getattr(settings, 'MARKET_DATA_TICK_PUBLISH_INTERVAL', 1.0),
+        flush_interval=getattr(settings, 'MARKET_DATA_TICK_FLUSH_INTERVAL', 30.0),
+        feed_ttl=getattr(settings, 'MARKET_DATA_TICK_FEED_TTL', 30),
+    )
@@ -0,0 +1,289 @@
+"""
+Two-tier Cache Backend for Market Data
+A small size-bounded in-process LRU (L1, per-entry TTL) sits in front of the shared
+cache (L2, Redis in production) so hot quote/history keys are served without a network
+round trip while every gunicorn worker still shares one cache
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+logger = logging.getLogger(__name__)
+
+# 지표 집계 기준 네임스페이스 (키 접두사)
+DEFAULT_NAMESPACES = ('realtime_', 'historical_', 'crypto_', 'translation:', 'cachegen:')
+
+
+class _L1State:
+    """LOCATION별 L1 저장소 - Django는 스레드마다 백엔드 인스턴스를 만들므로 프로세스 단위로 공유"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: 'OrderedDict[str, Tuple[float, bytes]]' = OrderedDict()
+        self.nbytes = 0
+        self.metrics: Dict[str, Dict[str, int]] = {}
+
+
+_l1_states: Dict[str, _L1State] = {}
+_l1_states_lock = threading.Lock()
+
+
+def _l1_state(name: str) -> _L1State:
+    with _l1_states_lock:
+        state = _l1_states.get(name)
+        if state is None:
+            state = _L1State()
+            _l1_states[name] = state
+        return state
+
+
+class TieredCache(BaseCache):
+    """
+    L1(프로세스 내 LRU) + L2(공유 캐시) 2단 캐시 백엔드
+
+    LOCATION은 L1 저장소 이름 (같은 이름의 인스턴스는 한 프로세스에서 L1을 공유)
+    OPTIONS:
+        L2: 공유 캐시 alias (기본 'shared')
+        L1_PREFIXES: L1에 올릴 키 접두사 (그 외 키는 L2 직행 - 리스, 레이트 리밋 상태 등)
+        L1_MAX_ENTRIES / L1_MAX_BYTES: L1 크기 상한 (초과 시 LRU 제거)
+        L1_TIMEOUT: L1 항목 최대 수명(초). 다른 워커의 갱신/삭제가 늦게 보이는 최대 시간
+
+    add/incr/decr는 원자성이 필요하므로 항상 L2에서 처리하고 L1 항목은 버린다.
+    """
+
+    def __init__(self, location: str, params: Dict[str, Any]):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._l2_alias = options.get('L2', 'shared')
+        self.l1_prefixes = tuple(options.get('L1_PREFIXES', DEFAULT_NAMESPACES))
+        self.namespaces = tuple(options.get('NAMESPACES', DEFAULT_NAMESPACES))
+        self.l1_max_entries = int(options.get('L1_MAX_ENTRIES', 1024))
+        self.l1_max_bytes = int(options.get('L1_MAX_BYTES', 32 * 1024 * 1024))
+        self.l1_timeout = float(options.get('L1_TIMEOUT', 5))
+        self._state = _l1_state(location or 'default')
+        self._lock = self._state.lock
+        self._l1 = self._state.entries
+        self._metrics = self._state.metrics
+
+    @property
+    def l2(self) -> BaseCache:
+        return caches[self._l2_alias]
+
+    # ------------------------------------------------------------------
+    # 지표
+    # ------------------------------------------------------------------
+    def namespace_for(self, key: str) -> str:
+        for prefix in self.namespaces:
+            if key.startswith(prefix):
+                return prefix
+        return 'other'
+
+    def _count(self, key: str, name: str, amount: int = 1) -> None:
+        namespace = self.namespace_for(key)
+        with self._lock:
+            counters = self._metrics.get(namespace)
+            if counters is None:
+                counters = {'l1_hits': 0, 'l2_hits': 0, 'misses': 0, 'evictions': 0}
+                self._metrics[namespace] = counters
+            counters[name] += amount
+
+    def stats(self) -> Dict[str, Any]:
+        """네임스페이스별 L1/L2 적중, 미스, L1 제거 횟수 (프로세스 단위)"""
+        with self._lock:
+            namespaces = {}
+            for namespace, counters in sorted(self._metrics.items()):
+                lookups = counters['l1_hits'] + counters['l2_hits'] + counters['misses']
+                namespaces[namespace] = {
+                    **counters,
+                    'hit_ratio': round((counters['l1_hits'] + counters['l2_hits']) / lookups, 3) if lookups else None,
+                }
+            return {
+                'l2_backend': self.l2.__class__.__name__,
+                'l1_entries': len(self._l1),
+                'l1_bytes': self._state.nbytes,
+                'l1_max_entries': self.l1_max_entries,
+                'l1_max_bytes': self.l1_max_bytes,
+                'l1_timeout': self.l1_timeout,
+                'namespaces': namespaces,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+    # ------------------------------------------------------------------
+    # L1
+    # ------------------------------------------------------------------
+    def _l1_eligible(self, key: str) -> bool:
+        return key.startswith(self.l1_prefixes)
+
+    def _l1_get(self, l1_key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._l1.get(l1_key)
+            if entry is None:
+                return False, None
+            expires_at, blob = entry
+            if expires_at <= time.time():
+                self._l1_discard(l1_key)
+                return False, None
+            self._l1.move_to_end(l1_key)
+        # LocMemCache와 같이 pickle 사본을 반환 (호출부가 값을 수정해도 캐시 원본은 그대로)
+        return True, pickle.loads(blob)
+
+    def _l1_set(self, key: str, l1_key: str, value: Any, timeout: Optional[float]) -> None:
+        ttl = self.l1_timeout if timeout is None else min(timeout, self.l1_timeout)
+        if ttl <= 0:
+            self._l1_delete(l1_key)
+            return
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.l1_max_bytes:
+            self._l1_delete(l1_key)
+            return
+
+        evicted = 0
+        with self._lock:
+            self._l1_discard(l1_key)
+            self._l1[l1_key] = (time.time() + ttl, blob)
+            self._state.nbytes += len(blob)
+            while len(self._l1) > self.l1_max_entries or self._state.nbytes > self.l1_max_bytes:
+                _, (_, old_blob) = self._l1.popitem(last=False)
+                self._state.nbytes -= len(old_blob)
+                evicted += 1
+        if evicted:
+            self._count(key, 'evictions', evicted)
+
+    def _l1_discard(self, l1_key: str) -> None:
+        # self._lock을 잡은 상태에서 호출
+        entry = self._l1.pop(l1_key, None)
+        if entry is not None:
+            self._state.nbytes -= len(entry[1])
+
+    def _l1_delete(self, l1_key: str) -> None:
+        with self._lock:
+            self._l1_discard(l1_key)
+
+    def _l1_timeout(self, timeout: Any) -> Optional[float]:
+        """Django timeout 인자 -> 초 (None은 만료 없음)"""
+        if timeout is DEFAULT_TIMEOUT:
+            return self.default_timeout
+        return timeout
+
+    # ------------------------------------------------------------------
+    # Django cache API
+    # ------------------------------------------------------------------
+    def get(self, key: str, default: Any = None, version: Optional[int] = None) -> Any:
+        l1_key = self.make_key(key, version)
+        eligible = self._l1_eligible(key)
+        if eligible:
+            found, value = self._l1_get(l1_key)
+            if found:
+                self._count(key, 'l1_hits')
+                return value
+
+        missing = object()
+        value = self.l2.get(key, missing, version=version)
+        if value is missing:
+            self._count(key, 'misses')
+            return default
+        self._count(key, 'l2_hits')
+        if eligible:
+            self._l1_set(key, l1_key, value, None)
+        return value
+
+    def set(self, key: str, value: Any, timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None) -> None:
+        self.l2.set(key, value, timeout=timeout, version=version)
+        if self._l1_eligible(key):
+            self._l1_set(key, self.make_key(key, version), value, self._l1_timeout(timeout))
+
+    def add(self, key: str, value: Any, timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None) -> bool:
+        self._l1_delete(self.make_key(key, version))
+        return self.l2.add(key, value, timeout=timeout, version=version)
+
+    def touch(self, key: str, timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None) -> bool:
+        return self.l2.touch(key, timeout=timeout, version=version)
+
+    def delete(self, key: str, version: Optional[int] = None) -> bool:
+        self._l1_delete(self.make_key(key, version))
+        return self.l2.delete(key, version=version)
+
+    def has_key(self, key: str, version: Optional[int] = None) -> bool:
+        if self._l1_eligible(key) and self._l1_get(self.make_key(key, version))[0]:
+            return True
+        return self.l2.has_key(key, version=version)
+
+    def incr(self, key: str, delta: int = 1, version: Optional[int] = None) -> int:
+        self._l1_delete(self.make_key(key, version))
+        return self.l2.incr(key, delta, version=version)
+
+    def decr(self, key: str, delta: int = 1, version: Optional[int] = None) -> int:
+        self._l1_delete(self.make_key(key, version))
+        return self.l2.decr(key, delta, version=version)
+
+    def get_many(self, keys: Iterable[str], version: Optional[int] = None) -> Dict[str, Any]:
+        results: Dict[str, Any] = {}
+        remote: List[str] = []
+        for key in keys:
+            if self._l1_eligible(key):
+                found, value = self._l1_get(self.make_key(key, version))
+                if found:
+                    self._count(key, 'l1_hits')
+                    results[key] = value
+                    continue
+            remote.append(key)
+
+        if remote:
+            fetched = self.l2.get_many(remote, version=version)
+            for key in remote:
+                if key not in fetched:
+                    self._count(key, 'misses')
+                    continue
+                value = fetched[key]
+                self._count(key, 'l2_hits')
+                results[key] = value
+                if self._l1_eligible(key):
+                    self._l1_set(key, self.make_key(key, version), value, None)
+        return results
+
+    def set_many(self, data: Dict[str, Any], timeout: Any = DEFAULT_TIMEOUT,
+                 version: Optional[int] = None) -> List[str]:
+        failed = self.l2.set_many(data, timeout=timeout, version=version) or []
+        l1_timeout = self._l1_timeout(timeout)
+        for key, value in data.items():
+            if key not in failed and self._l1_eligible(key):
+                self._l1_set(key, self.make_key(key, version), value, l1_timeout)
+        return failed
+
+    def delete_many(self, keys: Iterable[str], version: Optional[int] = None) -> None:
+        keys = list(keys)
+        with self._lock:
+            for key in keys:
+                self._l1_discard(self.make_key(key, version))
+        self.l2.delete_many(keys, version=version)
+
+    def clear(self) -> None:
+        self.clear_local()
+        self.l2.clear()
+
+    def clear_local(self) -> None:
+        """이 프로세스의 L1만 비우기 (L2는 그대로)"""
+        with self._lock:
+            self._l1.clear()
+            self._state.nbytes = 0
+
+    def close(self, **kwargs: Any) -> None:
+        self.l2.close(**kwargs)
+
+
+def cache_stats() -> Optional[Dict[str, Any]]:
+    """기본 캐시가 TieredCache이면 지표 스냅샷, 아니면 None"""
+    backend = caches['default']
+    if isinstance(backend, TieredCache):
+        return backend.stats()
+    return None
@@ -0,0 +1,128 @@
+"""
+Timestamp Normalization for Market Data Ingestion
+A provider returns one timestamp format for a whole series, so the format is detected
+once from the first value and the whole column is parsed in one pass into UTC epoch
+seconds; downstream code never parses timestamp strings again
+"""
+
+import calendar
+import re
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_ISO_RE = re.compile(r'^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}')
+_OFFSET_RE = re.compile(r'(Z|[+-]\d{2}:?\d{2})$')
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_EPOCH_NAIVE = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+# ISO 형식이 아닌 날짜 문자열 후보 (감지 순서대로)
+_FALLBACK_FORMATS = ('%d/%m/%Y', '%m/%d/%Y', '%Y%m%d', '%Y/%m/%d')
+
+
+def days_from_civil(year: int, month: int, day: int) -> int:
+    """그레고리력 날짜 -> epoch 일수 (H. Hinnant 알고리즘)"""
+    year -= month <= 2
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def civil_from_days(days: int) -> Tuple[int, int]:
+    """epoch 일수 -> (연, 월)"""
+    days += 719468
+    era = days // 146097
+    doe = days - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    month = mp + (3 if mp < 10 else -9)
+    return yoe + era * 400 + (month <= 2), month
+
+
+def _parse_date(value: str) -> int:
+    # 'YYYY-MM-DD': C 구현 fromisoformat + 서수일 (strptime 대비 수십 배 빠름)
+    return (date.fromisoformat(value).toordinal() - _EPOCH_ORDINAL) * 86400
+
+
+def _parse_iso_naive(value: str) -> int:
+    # 시간대 없는 ISO 시각은 UTC로 간주
+    return (datetime.fromisoformat(value) - _EPOCH_NAIVE) // _SECOND
+
+
+def _parse_iso_aware(value: str) -> int:
+    return int(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp())
+
+
+def _parse_datetime(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt_timezone.utc)
+    return int(value.timestamp())
+
+
+def _strptime_parser(fmt: str) -> Callable[[str], int]:
+    return lambda value: calendar.timegm(time.strptime(value, fmt))
+
+
+def detect_parser(sample: Any) -> Optional[Callable[[Any], int]]:
+    """값 하나로 시리즈 전체의 timestamp 형식을 감지해 파서 반환 (알 수 없으면 None)"""
+    if isinstance(sample, bool):
+        return None
+    if isinstance(sample, (int, float)):
+        # 1e11초는 약 5138년 -> 그보다 크면 밀리초 epoch (CoinGecko)
+        if sample > 1e11:
+            return lambda value: int(value) // 1000
+        return int
+    if isinstance(sample, datetime):
+        return _parse_datetime
+    if not isinstance(sample, str):
+        return None
+
+    text = sample.strip()
+    if _DATE_RE.match(text):
+        return _parse_date
+    if _ISO_RE.match(text):
+        return _parse_iso_aware if _OFFSET_RE.search(text) else _parse_iso_naive
+    for fmt in _FALLBACK_FORMATS:
+        try:
+            time.strptime(text, fmt)
+        except ValueError:
+            continue
+        return _strptime_parser(fmt)
+    return None
+
+
+def parse_timestamp(value: Any) -> Optional[int]:
+    """단일 값 변환 (형식이 섞인 행 등 예외 경로용)"""
+    if value is None or value == '':
+        return None
+    parser = detect_parser(value)
+    if parser is None:
+        return None
+    try:
+        return parser(value)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def parse_timestamps(values: Iterable[Any]) -> List[Optional[int]]:
+    """
+    timestamp 컬럼 전체를 UTC epoch 초 목록으로 변환
+
+    첫 유효 값으로 형식을 한 번만 감지해 컬럼 전체에 적용하고, 중간에 형식이 다른 값이
+    섞여 있을 때만 행 단위 감지로 되돌아간다. 변환할 수 없는 값은 None.
+    """
+    values = list(values)
+    sample = next((value for value in values if value is not None and value != ''), None)
+    parser = detect_parser(sample) if sample is not None else None
+    if parser is None:
+        return [None] * len(values)
+    try:
+        return [parser(value) for value in values]
+    except (ValueError, TypeError, IndexError, OverflowError, AttributeError):
+        return [parse_timestamp(value) for value in values]
@@ -0,0 +1,331 @@
+"""
+Symbol Universe (Stock/Market Master Data) for Market Data
+Listings are pulled in bulk from providers or a local CSV/JSON fixture by
+`manage.py sync_symbols`, diffed against charts.Stock and applied with batched
+bulk_create/bulk_update; request paths only read the warm (symbol, market) -> Stock
+map below and never write master data
+"""
+
+import csv
+import json
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import logging
+
+from django.conf import settings
+
+from .hot_symbols import PREDICTION_SYMBOLS
+from .symbol_index import reset_symbol_index
+
+logger = logging.getLogger(__name__)
+
+# Finnhub 거래소 코드 -> 시장 코드 (/stock/symbol?exchange=)
+EXCHANGE_MARKETS = {
+    'US': 'us_stock',
+    'KS': 'kr_stock', 'KQ': 'kr_stock',
+    'T': 'jp_stock',
+    'NS': 'in_stock',
+    'L': 'uk_stock',
+    'TO': 'ca_stock',
+    'PA': 'fr_stock',
+    'DE': 'de_stock',
+    'TW': 'tw_stock',
+}
+
+COINGECKO_BASE = 'https://api.coingecko.com/api/v3'
+
+# 요청 심볼 접미사 -> 시장 (프론트엔드/야후 표기 '005930.KS', 'BTC-USD'를 종목 마스터 표기로 변환)
+SYMBOL_SUFFIX_MARKETS = {
+    '.KS': 'kr_stock', '.KQ': 'kr_stock',
+    '-USD': 'crypto', '/USD': 'crypto',
+}
+
+# 시장 행이 없을 때 생성하는 기본값 (이름, 시간대)
+MARKET_DEFAULTS = {
+    'crypto': ('Crypto Market', 'UTC'),
+    'us_stock': ('US Stock Market', 'America/New_York'),
+    'kr_stock': ('Korea Stock Market', 'Asia/Seoul'),
+    'jp_stock': ('Japan Stock Market', 'Asia/Tokyo'),
+    'in_stock': ('India Stock Market', 'Asia/Kolkata'),
+    'uk_stock': ('UK Stock Market', 'Europe/London'),
+    'ca_stock': ('Canada Stock Market', 'America/Toronto'),
+    'fr_stock': ('France Stock Market', 'Europe/Paris'),
+    'de_stock': ('Germany Stock Market', 'Europe/Berlin'),
+    'tw_stock': ('Taiwan Stock Market', 'Asia/Taipei'),
+}
+
+
+def canonical_symbol(symbol: str, market: Optional[str] = None) -> Tuple[str, Optional[str]]:
+    """
+    요청 심볼을 종목 마스터의 (심볼, 시장)으로 ('005930.KS' -> ('005930', 'kr_stock'), 'BTC-USD' -> ('BTC', 'crypto'))
+
+    접미사가 있으면 접미사의 시장이 전달된 market보다 우선한다 (뷰의 기본값 us_stock 대신).
+    """
+    symbol = symbol.strip().upper()
+    for suffix, suffix_market in SYMBOL_SUFFIX_MARKETS.items():
+        if symbol.endswith(suffix) and len(symbol) > len(suffix):
+            return symbol[:-len(suffix)], suffix_market
+    return symbol, market
+
+
+class Listing(NamedTuple):
+    """동기화 원본 한 행"""
+
+    symbol: str
+    name: str
+    market: str
+    exchange: str = ''
+    provider_ids: Dict[str, str] = {}
+
+
+# ----------------------------------------------------------------------
+# 원본 (fixture / 내장 / 프로바이더)
+# ----------------------------------------------------------------------
+def _listing(row: Dict[str, Any], default_market: str) -> Optional[Listing]:
+    symbol = str(row.get('symbol') or '').strip().upper()
+    if not symbol:
+        return None
+    provider_ids = row.get('provider_ids') or {}
+    if isinstance(provider_ids, str):
+        provider_ids = json.loads(provider_ids) if provider_ids.strip() else {}
+    # CSV는 coingecko_id 같은 평면 컬럼으로도 받음
+    for column, value in row.items():
+        if column and column.endswith('_id') and value:
+            provider_ids.setdefault(column[:-3], str(value).strip())
+    return Listing(
+        symbol, str(row.get('name') or '').strip() or symbol,
+        str(row.get('market') or '').strip() or default_market,
+        str(row.get('exchange') or '').strip(), provider_ids,
+    )
+
+
+def load_fixture(path: str, default_market: str = 'us_stock') -> List[Listing]:
+    """CSV(헤더: symbol,name[,market,exchange,coingecko_id...]) 또는 JSON(행 dict 배열) 파일"""
+    with open(path, newline='', encoding='utf-8-sig') as handle:
+        if path.lower().endswith('.json'):
+            rows = json.load(handle)
+        else:
+            rows = list(csv.DictReader(handle))
+    return [listing for listing in (_listing(row, default_market) for row in rows) if listing]
+
+
+def builtin_listings() -> List[Listing]:
+    """예측 가능 심볼 목록 (프로바이더 키 없이도 기본 종목이 있도록)"""
+    from .services import MarketDataService
+    listings = []
+    for market, items in PREDICTION_SYMBOLS.items():
+        for item in items:
+            coin_id = MarketDataService.COINGECKO_ID_MAPPING.get(item['symbol']) if market == 'crypto' else None
+            listings.append(Listing(item['symbol'], item['name'], market, '',
+                                    {'coingecko': coin_id} if coin_id else {}))
+    return listings
+
+
+def finnhub_listings(service, exchange: str = 'US') -> List[Listing]:
+    """Finnhub /stock/symbol 거래소 전체 상장 목록 (접미사가 붙은 해외 심볼은 접미사 제거)"""
+    market = EXCHANGE_MARKETS.get(exchange)
+    if market is None:
+        raise ValueError(f"Unsupported exchange: {exchange}")
+    response = service.http.get(f"{service.finnhub_base}/stock/symbol",
+                                params={'exchange': exchange, 'token': service.finnhub_key}, timeout=60)
+    response.raise_for_status()
+    listings = []
+    suffix = f".{exchange}"
+    for item in response.json() or []:
+        symbol = (item.get('symbol') or '').upper()
+        if not symbol:
+            continue
+        if exchange != 'US' and symbol.endswith(suffix):
+            symbol = symbol[:-len(suffix)]
+        provider_ids = {'finnhub': item['symbol']}
+        if item.get('figi'):
+            provider_ids['figi'] = item['figi']
+        listings.append(Listing(symbol, (item.get('description') or symbol).strip(), market,
+                                item.get('mic') or exchange, provider_ids))
+    return listings
+
+
+def coingecko_listings(service, pages: int = 4) -> List[Listing]:
+    """CoinGecko /coins/markets 시가총액 순 상위 (pages * 250개). 같은 심볼은 시가총액이 큰 코인만"""
+    listings: Dict[str, Listing] = {}
+    for page in range(1, pages + 1):
+        response = service.http.get(f"{COINGECKO_BASE}/coins/markets", params={
+            'vs_currency': 'usd', 'order': 'market_cap_desc', 'per_page': 250, 'page': page,
+        }, timeout=30)
+        response.raise_for_status()
+        coins = response.json() or []
+        for coin in coins:
+            symbol = (coin.get('symbol') or '').upper()
+            if symbol and symbol not in listings:
+                listings[symbol] = Listing(symbol, coin.get('name') or symbol, 'crypto', '',
+                                           {'coingecko': coin['id']})
+        if len(coins) < 250:
+            break
+    return list(listings.values())
+
+
+# ----------------------------------------------------------------------
+# 동기화 (diff -> bulk_create / bulk_update)
+# ----------------------------------------------------------------------
+def _markets(codes: Iterable[str]) -> Dict[str, Any]:
+    from charts.models import Market
+    markets = {market.code: market for market in Market.objects.filter(code__in=set(codes))}
+    for code in set(codes) - set(markets):
+        name, tz = MARKET_DEFAULTS.get(code, (f'{code.upper()} Market', 'UTC'))
+        markets[code] = Market.objects.create(code=code, name=name, market_type=code, timezone=tz)
+    return markets
+
+
+def sync_listings(listings: Iterable[Listing], batch_size: int = 500, prune: bool = False,
+                  dry_run: bool = False) -> Dict[str, int]:
+    """
+    상장 목록을 charts.Stock에 반영 - 시장별 기존 행을 한 번에 읽어 비교하고 배치로 쓰기
+
+    기존 provider_ids는 덮어쓰지 않고 병합. prune=True면 목록에 없는 같은 시장 종목을 비활성화
+    (삭제하지 않음 - 예측 이력이 FK로 참조). 반환: created/updated/reactivated/deactivated/unchanged 수
+    """
+    from charts.models import Stock
+
+    wanted: Dict[Tuple[str, str], Listing] = {}
+    for listing in listings:
+        wanted[(listing.symbol, listing.market)] = listing
+    counts = {'created': 0, 'updated': 0, 'reactivated': 0, 'deactivated': 0, 'unchanged': 0}
+    if not wanted:
+        return counts
+
+    codes = {market for _, market in wanted}
+    existing = {
+        (stock.symbol.upper(), stock.market.code): stock
+        for stock in Stock.objects.filter(market__code__in=codes).select_related('market')
+    }
+
+    new, to_update = [], []
+    for key, listing in wanted.items():
+        stock = existing.get(key)
+        if stock is None:
+            counts['created'] += 1
+            new.append(listing)
+            continue
+        provider_ids = {**(stock.provider_ids or {}), **listing.provider_ids}
+        changed = (stock.name != listing.name[:200] or (listing.exchange and stock.exchange != listing.exchange[:50])
+                   or provider_ids != (stock.provider_ids or {}))
+        if not stock.is_active:
+            counts['reactivated'] += 1
+        elif changed:
+            counts['updated'] += 1
+        else:
+            counts['unchanged'] += 1
+            continue
+        stock.name = listing.name[:200]
+        stock.exchange = listing.exchange[:50] or stock.exchange
+        stock.provider_ids = provider_ids
+        stock.is_active = True
+        to_update.append(stock)
+
+    if prune:
+        for key, stock in existing.items():
+            if key not in wanted and stock.is_active:
+                counts['deactivated'] += 1
+                stock.is_active = False
+                to_update.append(stock)
+
+    if not dry_run:
+        # 시장 행은 새 종목이 있을 때만 조회/생성
+        markets = _markets({listing.market for listing in new}) if new else {}
+        to_create = [
+            Stock(symbol=listing.symbol, name=listing.name[:200], market=markets[listing.market],
+                  exchange=listing.exchange[:50], provider_ids=dict(listing.provider_ids))
+            for listing in new
+        ]
+        Stock.objects.bulk_create(to_create, batch_size=batch_size, ignore_conflicts=True)
+        Stock.objects.bulk_update(to_update, ['name', 'exchange', 'provider_ids', 'is_active'],
+                                  batch_size=batch_size)
+        stock_directory.invalidate()
+        reset_symbol_index()
+    return counts
+
+
+# ----------------------------------------------------------------------
+# 요청 경로용 읽기 전용 종목 맵
+# ----------------------------------------------------------------------
+class StockDirectory:
+    """
+    (심볼, 시장) -> (Stock id, provider_ids) 메모리 맵
+
+    활성 종목 전체를 한 쿼리로 읽어 ttl초 동안 사용. 맵에 없는 심볼은 한 행만 조회하고
+    없으면 다음 재적재까지 없음으로 기억 (반복되는 미지 심볼이 매번 DB를 치지 않도록)
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._stocks: Dict[Tuple[str, str], Optional[Tuple[int, Dict[str, str]]]] = {}
+        self._by_symbol: Dict[str, str] = {}  # 심볼 -> 첫 번째 시장 (시장 없이 조회할 때)
+        self._loaded_at = 0.0
+
+    @property
+    def ttl(self) -> float:
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, 'MARKET_DATA_SYMBOL_INDEX_TTL', 600)
+
+    def _ensure_loaded(self) -> None:
+        if time.time() - self._loaded_at <= self.ttl:
+            return
+        from charts.models import Stock
+        stocks: Dict[Tuple[str, str], Optional[Tuple[int, Dict[str, str]]]] = {}
+        by_symbol: Dict[str, str] = {}
+        rows = Stock.objects.filter(is_active=True).values_list('id', 'symbol', 'market__code', 'provider_ids')
+        for stock_id, symbol, market, provider_ids in rows.order_by('id'):
+            symbol = symbol.upper()
+            stocks[(symbol, market)] = (stock_id, provider_ids or {})
+            by_symbol.setdefault(symbol, market)
+        with self._lock:
+            self._stocks, self._by_symbol = stocks, by_symbol
+            self._loaded_at = time.time()
+        logger.info(f"📇 Stock directory loaded: {len(stocks)} active symbols")
+
+    def _get(self, symbol: str, market: Optional[str]) -> Optional[Tuple[int, Dict[str, str]]]:
+        try:
+            self._ensure_loaded()
+        except Exception as e:
+            logger.error(f"Stock directory load failed: {e}")
+            return None
+        symbol, market = canonical_symbol(symbol, market)
+        market = market or self._by_symbol.get(symbol)
+        if market is None:
+            return None
+        key = (symbol, market)
+        if key in self._stocks:
+            return self._stocks[key]
+
+        from charts.models import Stock
+        row = (Stock.objects.filter(symbol__iexact=symbol, market__code=market, is_active=True)
+               .values_list('id', 'provider_ids').first())
+        found = (row[0], row[1] or {}) if row else None
+        with self._lock:
+            self._stocks[key] = found
+        return found
+
+    def stock_id(self, symbol: str, market: Optional[str] = None) -> Optional[int]:
+        """
+        활성 종목 id (시장을 생략하면 같은 심볼의 첫 번째 시장). 없으면 None - 생성하지 않음
+
+        '.KS'/'.KQ'/'-USD' 접미사는 canonical_symbol로 저장된 심볼/시장으로 바꿔 조회한다.
+        """
+        found = self._get(symbol, market)
+        return found[0] if found else None
+
+    def provider_id(self, symbol: str, market: str, provider: str) -> Optional[str]:
+        """동기화로 채워진 프로바이더별 ID (예: CoinGecko 코인 id)"""
+        found = self._get(symbol, market)
+        return found[1].get(provider) if found else None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = 0.0
+
+
+# 전역 종목 맵 - 프로세스 단위 (동기화 명령이 다른 프로세스면 TTL 이후 반영)
+stock_directory = StockDirectory()
@@ -7,6 +7,8 @@ app_name = 'market_data'
 urlpatterns = [
     # 실시간 데이터
     path('quote/<str:symbol>/', views.get_real_time_quote, name='real_time_quote'),
+    path('quotes/', views.get_batch_quotes, name='batch_quotes'),
+    path('stream/', views.stream_quotes, name='stream_quotes'),
     path('historical/<str:symbol>/', views.get_historical_data, name='historical_data'),
     
     # 암호화폐 & 외환
@@ -16,6 +18,7 @@ urlpatterns = [
     
     # 시장 정보
     path('indices/', views.get_market_indices, name='market_indices'),
+    path('dashboard/', views.get_dashboard, name='dashboard'),
     path('search/', views.search_symbols, name='search_symbols'),
     
     # 인기 종목
@@ -1,15 +1,26 @@
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.cache import cache_page
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import require_GET, require_http_methods
 from django.core.cache import cache
 from django.utils import timezone
-from rest_framework.decorators import api_view, permission_classes
+from django.utils.http import parse_etags
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.renderers import BaseRenderer, BrowsableAPIRenderer, JSONRenderer
 from rest_framework.response import Response
 from rest_framework import status
-from .services import get_market_service
+from .services import DASHBOARD_SECTIONS, get_market_service
+from .http_client import get_provider_clients
+from .deadline import with_deadline
+from .provider_health import provider_health
+from .rate_limiter import get_rate_limiter
+from .tiered_cache import cache_stats
+from .hot_symbols import CRYPTO_SYMBOLS, POPULAR_STOCKS, TOP_CRYPTOS, WATCHLIST_SYMBOLS
+from .streaming import get_quote_hub
+from .binary_series import MEDIA_TYPE as BINARY_MEDIA_TYPE, encode_series
+from .downsample import METHODS as DOWNSAMPLE_METHODS, downsample, downsample_rows, parse_max_points
 from .models import MarketData, PriceHistory, MarketAlert
 from .serializers import MarketDataSerializer, PriceHistorySerializer, MarketAlertSerializer
 from .precision_handler import PrecisionHandler
@@ -22,6 +33,69 @@ from decimal import Decimal, InvalidOperation
 
 logger = logging.getLogger(__name__)
 
+# 다중 시세 API 한 번에 허용하는 최대 심볼 수
+MAX_BATCH_SYMBOLS = 50
+
+
+def _etag_matches(if_none_match, etag):
+    """If-None-Match 헤더와 ETag 약한 비교 (GET 조건부 요청 규칙)"""
+    if not if_none_match:
+        return False
+    tags = parse_etags(if_none_match)
+    return tags == ['*'] or any(tag.removeprefix('W/') == etag.removeprefix('W/') for tag in tags)
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """?format=columns 요청을 DRF 포맷 협상에서 받아주기 위한 JSON 렌더러 (본문 형태는 뷰가 결정)"""
+    format = 'columns'
+
+
+class OHLCVBinaryRenderer(BaseRenderer):
+    """?format=bin 또는 Accept: application/octet-stream - 뷰가 인코딩한 바이트를 그대로 전송"""
+    media_type = BINARY_MEDIA_TYPE
+    format = 'bin'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, bytes):
+            return data
+        # 오류 응답(dict)은 JSON 본문으로
+        response = (renderer_context or {}).get('response')
+        if response is not None:
+            response['Content-Type'] = 'application/json'
+        return JSONRenderer().render(data)
+
+
+def _downsample_params(request):
+    """
+    ?max_points=<n>&downsample=ohlc|lttb 파싱 -> (max_points 또는 None, method)
+
+    잘못된 값이면 ValueError (호출부에서 400 응답)
+    """
+    method = request.GET.get('downsample', 'ohlc')
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"downsample은 {', '.join(DOWNSAMPLE_METHODS)} 중 하나여야 합니다")
+    try:
+        return parse_max_points(request.GET.get('max_points')), method
+    except ValueError:
+        raise ValueError('max_points는 3 이상의 정수여야 합니다 (예: ?max_points=500)')
+
+
+def _downsampled_rows(data, max_points, method):
+    """프로바이더 행 목록 다운샘플 (max_points가 없거나 목록이 아니면 그대로)"""
+    if max_points is None or not isinstance(data, list):
+        return data
+    return downsample_rows(data, max_points, method)
+
+
+def _freshness(data):
+    """soft TTL이 지난 리스트 응답의 stale/age 표시 (신선한 값이면 빈 dict)"""
+    if getattr(data, 'stale', False):
+        return {'stale': True, 'age': data.age}
+    return {}
+
+
 @csrf_exempt
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -71,6 +145,7 @@ def create_market_alert(request):
         return Response({'error': '알림 생성 중 오류가 발생했습니다', 'message': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
+@with_deadline('quote')
 def get_crypto_data(request, symbol):
     """암호화폐 데이터 조회 API - 실제 API 데이터만 사용"""
     try:
@@ -110,11 +185,16 @@ def get_crypto_data(request, symbol):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('history')
 def get_coingecko_data(request, symbol):
     """CoinGecko API를 우선 사용하는 데이터 조회"""
     try:
         period = request.GET.get('period', '30')
         vs_currency = request.GET.get('vs_currency', 'usd')
+        try:
+            max_points, method = _downsample_params(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         logger.info(f"CoinGecko data requested for {symbol} (period: {period}, currency: {vs_currency})")
         
@@ -123,13 +203,15 @@ def get_coingecko_data(request, symbol):
         
         if data and len(data) > 0:
             logger.info(f"Successfully retrieved {len(data)} CoinGecko data points for {symbol}")
+            points = _downsampled_rows(data, max_points, method)
             return Response({
-                'data': data,
+                'data': points,
                 'source': 'coingecko',
                 'symbol': symbol.upper(),
                 'period': period,
                 'vs_currency': vs_currency,
-                'count': len(data)
+                'count': len(points),
+                **_freshness(data)
             }, status=status.HTTP_200_OK)
         
         # CoinGecko 실패 시 에러 메시지
@@ -159,6 +241,7 @@ def get_coingecko_data(request, symbol):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])  # 인증 없이 접근 허용
+@with_deadline('quote')
 def get_real_time_quote(request, symbol):
     """실시간 시세 조회 API"""
     try:
@@ -182,17 +265,166 @@ def get_real_time_quote(request, symbol):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('quote')
+def get_batch_quotes(request):
+    """다중 심볼 실시간 시세 일괄 조회 API (?symbols=AAPL,MSFT&market=us_stock)"""
+    try:
+        symbols = [s.strip().upper() for s in request.GET.get('symbols', '').split(',') if s.strip()]
+        market = request.GET.get('market', 'us_stock')
+        
+        if not symbols:
+            return Response(
+                {'error': 'symbols 파라미터를 입력해주세요 (예: ?symbols=AAPL,MSFT)'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(symbols) > MAX_BATCH_SYMBOLS:
+            return Response(
+                {'error': f'한 번에 최대 {MAX_BATCH_SYMBOLS}개 심볼까지 조회할 수 있습니다'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        quotes = get_market_service().get_real_time_quotes(symbols, market)
+        
+        return Response({
+            'market': market,
+            'quotes': list(quotes.values()),
+            'missing': [symbol for symbol in symbols if symbol not in quotes],
+            'count': len(quotes)
+        }, status=status.HTTP_200_OK)
+        
+    except Exception as e:
+        logger.error(f"다중 시세 조회 오류: {e}")
+        return Response(
+            {'error': '시세 조회 중 오류가 발생했습니다'}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+def _sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@require_GET
+def stream_quotes(request):
+    """
+    실시간 시세 SSE 스트림 (?symbols=AAPL,BTC&market=us_stock)
+
+    연결 직후 알려진 시세 전체를 보내고, 이후에는 바뀐 필드만 'quote' 이벤트로 전송한다.
+    HEARTBEAT초마다 주석 줄을 보내 프록시가 연결을 끊지 않게 하고, MAX_SECONDS가 지나면
+    스트림을 닫아 EventSource가 재연결하도록 한다 (워커 스레드 장기 점유 방지).
+    """
+    symbols = [s.strip().upper() for s in request.GET.get('symbols', '').split(',') if s.strip()]
+    market = request.GET.get('market', 'us_stock')
+    max_symbols = getattr(settings, 'MARKET_DATA_STREAM_MAX_SYMBOLS', 20)
+
+    if not symbols:
+        return JsonResponse({'error': 'symbols 파라미터를 입력해주세요 (예: ?symbols=AAPL,BTC)'}, status=400)
+    if len(symbols) > max_symbols:
+        return JsonResponse({'error': f'한 번에 최대 {max_symbols}개 심볼까지 구독할 수 있습니다'}, status=400)
+
+    hub = get_quote_hub()
+    subscription = hub.subscribe(
+        (symbol, 'crypto' if symbol in CRYPTO_SYMBOLS else market) for symbol in symbols
+    )
+    if subscription is None:
+        return JsonResponse({'error': '스트림 연결이 너무 많습니다. 잠시 후 다시 시도해주세요'}, status=503)
+
+    heartbeat = getattr(settings, 'MARKET_DATA_STREAM_HEARTBEAT', 15)
+    max_seconds = getattr(settings, 'MARKET_DATA_STREAM_MAX_SECONDS', 300)
+
+    def events():
+        try:
+            yield f"retry: {int(hub.poll_interval * 1000)}\n\n"
+            deadline = time.monotonic() + max_seconds
+            while not subscription.closed and time.monotonic() < deadline:
+                updates = subscription.wait(heartbeat)
+                if not updates:
+                    yield ": heartbeat\n\n"
+                    continue
+                for delta in updates:
+                    yield _sse_event('quote', delta)
+        finally:
+            # 클라이언트 연결 종료 시 WSGI 서버가 close()를 호출 -> 구독 해제
+            hub.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx 프록시 버퍼링 비활성화
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@renderer_classes([JSONRenderer, BrowsableAPIRenderer, ColumnarJSONRenderer, OHLCVBinaryRenderer])
+@with_deadline('history')
 def get_historical_data(request, symbol):
-    """과거 데이터 조회 API"""
+    """
+    과거 데이터 조회 API
+
+    ?format=columns: 행 목록 대신 컬럼 배열 {t, o, h, l, c, v} (t는 epoch 초, 가격 정밀도는
+    컬럼 단위로 한 번 적용). 1년 일봉 기준 기본 행 형식보다 본문이 수 배 작다.
+    ?format=bin / Accept: application/octet-stream: 헤더 + little-endian 컬럼 버퍼
+    (binary_series 참고) - 브라우저가 파싱 없이 Float64Array 등으로 바로 사용.
+    ?max_points=<n>&downsample=ohlc|lttb: 차트 폭에 맞게 n개 이하로 축소 (기본 ohlc - 캔들용 구간
+    집계, lttb - 라인 차트용 점 선택). 모든 형식/since/ETag는 축소된 시리즈 기준.
+
+    ?since=<epoch초>: 해당 시각 이후 봉만 반환 (since 봉 자체도 포함 - 클라이언트의 마지막
+    진행 중 봉 교체용). 응답의 cursor를 다음 요청의 since로 사용.
+    ETag는 시리즈 내용 다이제스트 - If-None-Match가 일치하면 본문 없이 304.
+    """
     try:
         period = request.GET.get('period', '1month')
         interval = request.GET.get('interval', '1day')
         market = request.GET.get('market', 'us_stock')
+        since = request.GET.get('since')
+        try:
+            max_points, method = _downsample_params(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if since is not None:
+            try:
+                since = int(float(since))
+            except ValueError:
+                return Response(
+                    {'error': 'since는 epoch 초여야 합니다 (예: ?since=1705276800)'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
         
-        data = get_market_service().get_historical_data(symbol, period, interval, market)
+        series = get_market_service().get_historical_series(symbol, period, interval, market)
+        if series and max_points is not None:
+            series = downsample(series, max_points, method)
         
-        if data:
-            return Response({'data': data}, status=status.HTTP_200_OK)
+        if series:
+            representation = request.accepted_renderer.format
+            # 표현 형식별로 ETag 구분 / stale 응답은 age가 매번 달라 본문이 바뀌므로 약한 ETag
+            suffix = {'columns': '-c', 'bin': '-b'}.get(representation, '')
+            etag = f'"{series.fingerprint()}{suffix}"'
+            if series.stale:
+                etag = f'W/{etag}'
+            headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+            if _etag_matches(request.META.get('HTTP_IF_NONE_MATCH'), etag):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            
+            if representation == 'bin':
+                precision = PrecisionHandler.get_display_precision(symbol, market)['price_precision']
+                blob = encode_series(series, since, precision)
+                return Response(blob, status=status.HTTP_200_OK, headers=headers)
+            
+            body = {}
+            if representation == 'columns':
+                price_format = lambda column: PrecisionHandler.format_price_column(column, symbol, market)
+                window = series.since(since) if since is not None else series
+                body.update({'format': 'columns', 'data': window.to_columns(price_format)})
+                if since is not None:
+                    body['since'] = since
+            elif since is not None:
+                body.update({'data': series.since(since).to_rows(series.time_format), 'since': since})
+            else:
+                body['data'] = series.to_rows()
+            body['cursor'] = series.timestamps[-1]
+            if series.stale:
+                body.update({'stale': True, 'age': series.age})
+            return Response(body, status=status.HTTP_200_OK, headers=headers)
         else:
             logger.error(f"No data available for {symbol} from any API")
             return Response(
@@ -210,6 +442,7 @@ def get_historical_data(request, symbol):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('quote')
 def get_crypto_data(request, symbol):
     """암호화폐 데이터 조회 API"""
     try:
@@ -233,6 +466,7 @@ def get_crypto_data(request, symbol):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('quote')
 def get_forex_data(request, from_symbol, to_symbol):
     """외환 데이터 조회 API"""
     try:
@@ -255,13 +489,14 @@ def get_forex_data(request, from_symbol, to_symbol):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('quote')
 def get_market_indices(request):
     """시장 지수 조회 API"""
     try:
         data = get_market_service().get_market_indices()
         
         if data:
-            return Response({'indices': data}, status=status.HTTP_200_OK)
+            return Response({'indices': data, **_freshness(data)}, status=status.HTTP_200_OK)
         else:
             return Response(
                 {'error': '시장 지수 데이터를 찾을 수 없습니다'}, 
@@ -277,6 +512,54 @@ def get_market_indices(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('dashboard')
+def get_dashboard(request):
+    """
+    홈 화면 대시보드 API - 지수/인기 주식/상위 암호화폐/관심 종목/뉴스를 한 번에 동시 조회
+    (?sections=indices,news&stocks=AAPL,MSFT&cryptos=BTC,ETH&news_limit=5)
+    
+    섹션별 상태/소요 시간/신선도는 'sections'에, 데드라인 안에 못 끝난 섹션은 null + partial=true
+    """
+    try:
+        sections = [s.strip().lower() for s in request.GET.get('sections', '').split(',') if s.strip()]
+        unknown = [name for name in sections if name not in DASHBOARD_SECTIONS]
+        if unknown:
+            return Response(
+                {'error': f"알 수 없는 섹션입니다: {', '.join(unknown)} (가능: {', '.join(DASHBOARD_SECTIONS)})"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        stocks = [s.strip().upper() for s in request.GET.get('stocks', '').split(',') if s.strip()]
+        cryptos = [s.strip().upper() for s in request.GET.get('cryptos', '').split(',') if s.strip()]
+        if max(len(stocks), len(cryptos)) > MAX_BATCH_SYMBOLS:
+            return Response(
+                {'error': f'한 번에 최대 {MAX_BATCH_SYMBOLS}개 심볼까지 조회할 수 있습니다'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        news_limit = int(request.GET.get('news_limit', 5))
+        
+        results = get_market_service().get_dashboard(sections or None, stocks or None, cryptos or None, news_limit)
+        
+        payload = {name: section.pop('data') for name, section in results.items()}
+        payload['sections'] = results
+        payload['partial'] = any(section['status'] in ('error', 'timeout') for section in results.values())
+        return Response(payload, status=status.HTTP_200_OK)
+        
+    except ValueError as e:
+        return Response(
+            {'error': f'입력값 오류: {e}'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except Exception as e:
+        logger.error(f"대시보드 조회 오류: {e}")
+        return Response(
+            {'error': '대시보드 조회 중 오류가 발생했습니다'}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@with_deadline('search')
 def search_symbols(request):
     """심볼 검색 API"""
     try:
@@ -287,7 +570,7 @@ def search_symbols(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        data = get_market_service().search_symbols(query)
+        data = get_market_service().search_symbols(query, market=request.GET.get('market') or None)
         
         return Response({'results': data}, status=status.HTTP_200_OK)
         
@@ -301,17 +584,13 @@ def search_symbols(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('quote')
 def get_popular_stocks(request):
     """인기 주식 목록 API"""
     try:
-        # 인기 주식 목록 (실제로는 DB에서 조회하거나 별도 로직 구현)
-        popular_symbols = ['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA', 'NVDA', 'META', 'NFLX']
-        
-        results = []
-        for symbol in popular_symbols:
-            data = get_market_service().get_real_time_quote(symbol, 'us_stock')
-            if data:
-                results.append(data)
+        # 인기 주식 목록 (warm_market_cache가 미리 캐시를 채워 둠)
+        quotes = get_market_service().get_real_time_quotes(POPULAR_STOCKS, 'us_stock')
+        results = list(quotes.values())
         
         return Response({'stocks': results}, status=status.HTTP_200_OK)
         
@@ -325,17 +604,13 @@ def get_popular_stocks(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('quote')
 def get_top_cryptos(request):
     """상위 암호화폐 목록 API"""
     try:
         # 상위 암호화폐 목록
-        top_cryptos = ['BTC', 'ETH', 'BNB', 'XRP', 'ADA', 'SOL', 'DOT', 'AVAX']
-        
-        results = []
-        for symbol in top_cryptos:
-            data = get_market_service().get_crypto_data(symbol, 'USD')
-            if data:
-                results.append(data)
+        quotes = get_market_service().get_real_time_quotes(TOP_CRYPTOS, 'crypto')
+        results = list(quotes.values())
         
         return Response({'cryptos': results}, status=status.HTTP_200_OK)
         
@@ -371,6 +646,7 @@ def save_market_data(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('quote')
 def get_enhanced_data(request, symbol):
     """통합 강화 데이터 - 4개 API 활용"""
     try:
@@ -393,17 +669,22 @@ def get_enhanced_data(request, symbol):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('history')
 def get_polygon_historical(request, symbol):
     """Polygon API 과거 데이터"""
     try:
         period = request.GET.get('period', '1Y')
+        try:
+            max_points, method = _downsample_params(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         data = get_market_service().get_polygon_historical_data(symbol.upper(), period)
         
         if data:
             return Response({
                 'symbol': symbol,
                 'period': period,
-                'data': data,
+                'data': _downsampled_rows(data, max_points, method),
                 'source': 'polygon'
             }, status=status.HTTP_200_OK)
         else:
@@ -421,6 +702,7 @@ def get_polygon_historical(request, symbol):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('quote')
 def get_finnhub_crypto(request, symbol):
     """Finnhub 암호화폐 데이터"""
     try:
@@ -443,6 +725,7 @@ def get_finnhub_crypto(request, symbol):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('quote')
 def get_finnhub_forex(request, from_currency, to_currency):
     """Finnhub 외환 환율"""
     try:
@@ -465,6 +748,7 @@ def get_finnhub_forex(request, from_currency, to_currency):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('news')
 def get_market_news(request):
     """Finnhub 시장 뉴스"""
     try:
@@ -487,6 +771,7 @@ def get_market_news(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('profile')
 def get_company_profile(request, symbol):
     """Finnhub 회사 프로필"""
     try:
@@ -509,17 +794,13 @@ def get_company_profile(request, symbol):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('quote')
 def get_watchlist(request):
     """관심 종목 목록"""
     try:
         # 여기서는 간단한 더미 데이터 반환 (실제로는 사용자별 관심 종목)
-        watchlist_symbols = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA']
-        watchlist_data = []
-        
-        for symbol in watchlist_symbols:
-            quote = get_market_service().get_real_time_quote(symbol)
-            if quote:
-                watchlist_data.append(quote)
+        quotes = get_market_service().get_real_time_quotes(WATCHLIST_SYMBOLS, 'us_stock')
+        watchlist_data = list(quotes.values())
         
         return Response({
             'watchlist': watchlist_data
@@ -564,6 +845,7 @@ def add_to_watchlist(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('quote')
 def get_tiingo_quote(request, symbol):
     """Tiingo API를 사용한 실시간 시세 조회"""
     try:
@@ -576,6 +858,12 @@ def get_tiingo_quote(request, symbol):
                 {'error': f'Tiingo에서 {symbol} 데이터를 찾을 수 없습니다'}, 
                 status=status.HTTP_404_NOT_FOUND
             )
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Tiingo 시세 조회 실패 (프로바이더 응답 없음): {e}")
+        return Response(
+            {'error': 'Tiingo가 일시적으로 응답하지 않습니다'}, 
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
     except Exception as e:
         logger.error(f"Tiingo 시세 조회 오류: {e}")
         return Response(
@@ -585,15 +873,20 @@ def get_tiingo_quote(request, symbol):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('history')
 def get_tiingo_historical(request, symbol):
     """Tiingo API를 사용한 히스토리컬 데이터 조회"""
     try:
         period = request.GET.get('period', '1year')
+        try:
+            max_points, method = _downsample_params(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         data = get_market_service()._get_tiingo_historical(symbol, period)
         
         if data:
-            return Response(data, status=status.HTTP_200_OK)
+            return Response(_downsampled_rows(data, max_points, method), status=status.HTTP_200_OK)
         else:
             # Provide fallback sample data
             logger.info(f"Tiingo API failed for {symbol}, generating sample data")
@@ -608,6 +901,7 @@ def get_tiingo_historical(request, symbol):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('quote')
 def get_marketstack_quote(request, symbol):
     """Marketstack API를 사용한 실시간 시세 조회"""
     try:
@@ -620,6 +914,12 @@ def get_marketstack_quote(request, symbol):
                 {'error': f'Marketstack에서 {symbol} 데이터를 찾을 수 없습니다'}, 
                 status=status.HTTP_404_NOT_FOUND
             )
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Marketstack 시세 조회 실패 (프로바이더 응답 없음): {e}")
+        return Response(
+            {'error': 'Marketstack이 일시적으로 응답하지 않습니다'}, 
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
     except Exception as e:
         logger.error(f"Marketstack 시세 조회 오류: {e}")
         return Response(
@@ -629,15 +929,20 @@ def get_marketstack_quote(request, symbol):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@with_deadline('history')
 def get_marketstack_historical(request, symbol):
     """Marketstack API를 사용한 히스토리컬 데이터 조회"""
     try:
         period = request.GET.get('period', '1year')
+        try:
+            max_points, method = _downsample_params(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         data = get_market_service()._get_marketstack_historical(symbol, period)
         
         if data:
-            return Response(data, status=status.HTTP_200_OK)
+            return Response(_downsampled_rows(data, max_points, method), status=status.HTTP_200_OK)
         else:
             # Provide fallback sample data
             logger.info(f"Marketstack API failed for {symbol}, generating sample data")
@@ -701,122 +1006,75 @@ def generate_sample_historical_data(symbol):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_comprehensive_api_status(request):
-    """Comprehensive API health check with response times and detailed status"""
+    """
+    Provider health report from live traffic (no probe calls)
+    
+    Each provider is scored from the rolling success rate, latency percentiles, error classes
+    and circuit breaker state that the fallback chains record on every real request.
+    """
     try:
-        api_tests = {}
+        service = get_market_service()
+        health = provider_health.snapshot()
+        rate_limits = get_rate_limiter().stats()
+        api_keys = {
+            'finnhub': bool(service.finnhub_key),
+            'alpha_vantage': bool(service.alpha_vantage_key),
+            'twelve_data': bool(service.twelve_data_key),
+            'coingecko': True,  # API 키 불필요
+            'tiingo': bool(service.tiingo_key),
+            'marketstack': bool(service.marketstack_key),
+        }
         
-        # Test each API with real endpoints
-        api_configs = {
-            'finnhub': {
-                'url': 'https://finnhub.io/api/v1/quote?symbol=AAPL',
-                'headers': {'X-Finnhub-Token': getattr(settings, 'FINNHUB_API_KEY', '')},
-                'test_symbol': 'AAPL'
-            },
-            'alpha_vantage': {
-                'url': 'https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol=AAPL',
-                'params': {'apikey': getattr(settings, 'ALPHA_VANTAGE_API_KEY', '')},
-                'test_symbol': 'AAPL'
-            },
-            'twelve_data': {
-                'url': 'https://api.twelvedata.com/quote?symbol=AAPL',
-                'params': {'apikey': getattr(settings, 'TWELVE_DATA_API_KEY', '')},
-                'test_symbol': 'AAPL'
-            },
-            'coingecko': {
-                'url': 'https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd',
-                'headers': {},
-                'test_symbol': 'BTC'
-            },
-            'tiingo': {
-                'url': 'https://api.tiingo.com/tiingo/daily/AAPL/prices',
-                'headers': {'Authorization': f'Token {getattr(settings, "TIINGO_API_KEY", "")}'},
-                'test_symbol': 'AAPL'
-            },
-            'marketstack': {
-                'url': 'https://api.marketstack.com/v1/eod/latest?symbols=AAPL',
-                'params': {'access_key': getattr(settings, 'MARKETSTACK_API_KEY', '')},
-                'test_symbol': 'AAPL'
+        api_tests = {}
+        for api_name in list(api_keys) + [name for name in health if name not in api_keys]:
+            endpoints = health.get(api_name, {})
+            samples = sum(endpoint['samples'] for endpoint in endpoints.values())
+            successes = sum(endpoint['samples'] * (endpoint['success_rate'] or 0) for endpoint in endpoints.values())
+            p50s = [endpoint['p50_ms'] for endpoint in endpoints.values() if endpoint['p50_ms'] is not None]
+            p95s = [endpoint['p95_ms'] for endpoint in endpoints.values() if endpoint['p95_ms'] is not None]
+            success_rate = round(successes / samples, 4) if samples else None
+            circuits = [endpoint['circuit'] for endpoint in endpoints.values()]
+            
+            if not service._is_api_available(api_name):
+                api_status = 'api_limit'
+            elif not samples:
+                api_status = 'unknown'
+            elif circuits and all(circuit == 'open' for circuit in circuits):
+                api_status = 'circuit_open'
+            elif success_rate >= 0.8 and 'open' not in circuits:
+                api_status = 'online'
+            else:
+                api_status = 'degraded'
+            
+            api_tests[api_name] = {
+                'status': api_status,
+                'response_time_ms': round(sum(p50s) / len(p50s), 2) if p50s else None,
+                'p95_ms': max(p95s) if p95s else None,
+                'success_rate': success_rate,
+                'samples': samples,
+                'has_api_key': api_keys.get(api_name, True),
+                'endpoints': endpoints,
+                'rate_limit': rate_limits.get(api_name),
             }
-        }
         
-        for api_name, config in api_configs.items():
-            start_time = time.time()
-            try:
-                # Test API with timeout
-                response = requests.get(
-                    config['url'],
-                    headers=config.get('headers', {}),
-                    params=config.get('params', {}),
-                    timeout=10
-                )
-                response_time = round((time.time() - start_time) * 1000, 2)
-                
-                api_tests[api_name] = {
-                    'status': 'online' if response.status_code == 200 else 'error',
-                    'response_time_ms': response_time,
-                    'status_code': response.status_code,
-                    'has_api_key': bool(config.get('headers', {}).get('X-Finnhub-Token') or 
-                                       config.get('headers', {}).get('Authorization') or
-                                       config.get('params', {}).get('apikey') or
-                                       config.get('params', {}).get('access_key') or
-                                       api_name == 'coingecko'),
-                    'test_symbol': config['test_symbol'],
-                    'last_tested': timezone.now().isoformat()
-                }
-                
-                # Additional error checking for specific response content
-                if response.status_code == 200:
-                    try:
-                        data = response.json()
-                        if api_name == 'alpha_vantage' and 'Error Message' in str(data):
-                            api_tests[api_name]['status'] = 'api_limit'
-                        elif api_name == 'twelve_data' and 'status' in data and data['status'] == 'error':
-                            api_tests[api_name]['status'] = 'api_error'
-                        elif api_name == 'finnhub' and 'error' in data:
-                            api_tests[api_name]['status'] = 'api_error'
-                    except:
-                        pass
-                        
-            except requests.exceptions.Timeout:
-                api_tests[api_name] = {
-                    'status': 'timeout',
-                    'response_time_ms': 10000,
-                    'error': 'Request timed out after 10 seconds',
-                    'has_api_key': bool(config.get('headers', {}) or config.get('params', {})),
-                    'test_symbol': config['test_symbol'],
-                    'last_tested': timezone.now().isoformat()
-                }
-            except requests.exceptions.ConnectionError:
-                api_tests[api_name] = {
-                    'status': 'offline',
-                    'response_time_ms': round((time.time() - start_time) * 1000, 2),
-                    'error': 'Connection failed',
-                    'has_api_key': bool(config.get('headers', {}) or config.get('params', {})),
-                    'test_symbol': config['test_symbol'],
-                    'last_tested': timezone.now().isoformat()
-                }
-            except Exception as e:
-                api_tests[api_name] = {
-                    'status': 'error',
-                    'response_time_ms': round((time.time() - start_time) * 1000, 2),
-                    'error': str(e),
-                    'has_api_key': bool(config.get('headers', {}) or config.get('params', {})),
-                    'test_symbol': config['test_symbol'],
-                    'last_tested': timezone.now().isoformat()
-                }
-        
-        # Calculate overall health
-        online_apis = sum(1 for api in api_tests.values() if api['status'] == 'online')
-        total_apis = len(api_tests)
-        health_percentage = round((online_apis / total_apis) * 100, 1)
+        # Calculate overall health from providers that have seen traffic
+        observed = [api for api in api_tests.values() if api['status'] != 'unknown']
+        online_apis = sum(1 for api in observed if api['status'] == 'online')
+        total_apis = len(observed)
+        health_percentage = round((online_apis / total_apis) * 100, 1) if total_apis else None
         
         # Average response time for online APIs
-        online_response_times = [api['response_time_ms'] for api in api_tests.values() 
-                               if api['status'] == 'online']
+        online_response_times = [api['response_time_ms'] for api in observed
+                                 if api['status'] == 'online' and api['response_time_ms'] is not None]
         avg_response_time = round(sum(online_response_times) / len(online_response_times), 2) if online_response_times else 0
         
+        if health_percentage is None:
+            overall_status = 'unknown'
+        else:
+            overall_status = 'healthy' if health_percentage >= 66 else 'degraded' if health_percentage >= 33 else 'critical'
+        
         return Response({
-            'overall_status': 'healthy' if health_percentage >= 66 else 'degraded' if health_percentage >= 33 else 'critical',
+            'overall_status': overall_status,
             'health_percentage': health_percentage,
             'online_apis': f"{online_apis}/{total_apis}",
             'average_response_time_ms': avg_response_time,
@@ -836,20 +1094,21 @@ def get_comprehensive_api_status(request):
 
 
 def _get_api_recommendations(api_tests):
-    """Generate recommendations based on API test results"""
+    """Generate recommendations based on provider health scores"""
     recommendations = []
     
     for api_name, result in api_tests.items():
-        if result['status'] == 'offline':
-            recommendations.append(f"{api_name}: Check internet connectivity or service status")
-        elif result['status'] == 'timeout':
-            recommendations.append(f"{api_name}: Experiencing slow response times, consider increasing timeout")
+        last_errors = {endpoint.get('last_error') for endpoint in result.get('endpoints', {}).values()}
+        if result['status'] == 'circuit_open':
+            recommendations.append(f"{api_name}: Circuit open after repeated failures ({', '.join(sorted(filter(None, last_errors)))}), skipped until retry")
         elif result['status'] == 'api_limit':
             recommendations.append(f"{api_name}: API rate limit reached, implement caching or upgrade plan")
-        elif result['status'] == 'error' and not result.get('has_api_key'):
+        elif 'auth' in last_errors or not result.get('has_api_key'):
             recommendations.append(f"{api_name}: API key missing or invalid")
-        elif result['status'] == 'online' and result.get('response_time_ms', 0) > 5000:
-            recommendations.append(f"{api_name}: Slow response time ({result['response_time_ms']}ms)")
+        elif result['status'] == 'degraded':
+            recommendations.append(f"{api_name}: Degraded (success rate {result['success_rate']:.0%}), moved down the fallback order")
+        elif result['status'] == 'online' and (result.get('p95_ms') or 0) > 5000:
+            recommendations.append(f"{api_name}: Slow response time (p95 {result['p95_ms']}ms)")
     
     if not recommendations:
         recommendations.append("All APIs are functioning normally")
@@ -875,6 +1134,9 @@ def get_api_performance_metrics(request):
             'performance_tests': performance_tests,
             'optimization_suggestions': _get_optimization_suggestions(performance_tests),
             'cache_status': _get_cache_status(),
+            'provider_stats': service.get_provider_stats(),
+            'http_pool': get_provider_clients().stats(),
+            'quote_stream': get_quote_hub().stats(),
             'last_updated': timezone.now().isoformat()
         }, status=status.HTTP_200_OK)
         
@@ -1000,7 +1262,8 @@ def _get_cache_status():
         return {
             'cache_working': cached_value == 'test_value',
             'cache_response_time_ms': cache_time,
-            'cache_backend': str(cache.__class__.__name__)
+            'cache_backend': str(cache.__class__.__name__),
+            'tiers': cache_stats(),
         }
     except Exception as e:
         return {
@@ -0,0 +1,179 @@
+"""
+Background Cache Warming for Hot Market Data Symbols
+Refreshes quotes, daily/weekly/monthly history and indices for a known symbol set
+shortly before their soft TTL expires, so user requests for them are served from cache
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import logging
+
+from django.conf import settings
+
+from .cache_keys import symbol_key
+from .history_request import HistoryRequest
+from .coalescing import single_flight
+from .swr_cache import swr_cache
+
+logger = logging.getLogger(__name__)
+
+# 워머가 프로바이더별로 분당 사용할 최대 호출 수 (무료 한도의 절반 - 나머지는 사용자 요청 몫)
+DEFAULT_WARM_PROVIDER_RATES = {
+    'finnhub': 30,
+    'alpha_vantage': 2,
+    'twelve_data': 4,
+    'tiingo': 25,
+    'marketstack': 2,
+    'coingecko': 15,
+    'yahoo': 20,
+}
+
+
+class WarmTarget:
+    """워밍 대상 캐시 키와 갱신 함수"""
+
+    __slots__ = ('key', 'provider', 'refresh')
+
+    def __init__(self, key: str, provider: Optional[str], refresh: Callable[[], Any]):
+        self.key = key
+        self.provider = provider  # None이면 업스트림 호출 없음 (캐시된 일봉 집계)
+        self.refresh = refresh
+
+
+class ProviderPacer:
+    """프로바이더별 최소 호출 간격 유지 (분당 호출 수 기준)"""
+
+    def __init__(self, rates_per_minute: Dict[str, float], sleep: Callable[[float], None] = time.sleep):
+        self.intervals = {name: 60.0 / rate for name, rate in rates_per_minute.items() if rate}
+        self._next_allowed: Dict[str, float] = {}
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def wait(self, provider: Optional[str]) -> float:
+        """다음 호출 슬롯까지 대기하고 대기한 시간(초) 반환"""
+        interval = self.intervals.get(provider)
+        if not interval:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(provider, now))
+            self._next_allowed[provider] = slot + interval
+        delay = slot - now
+        if delay > 0:
+            self._sleep(delay)
+        return delay
+
+
+class CacheWarmer:
+    """핫 심볼 캐시를 soft TTL 만료 직전에 갱신하는 워머"""
+
+    def __init__(self, service, symbols: Dict[str, List[str]], period: str = '1month',
+                 intervals: Sequence[str] = ('1d', '1w', '1M'), include_indices: bool = True,
+                 lead: float = 30, jitter: float = 10, provider_rates: Optional[Dict[str, float]] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.service = service
+        self.symbols = symbols
+        self.period = period
+        self.intervals = list(intervals)
+        self.include_indices = include_indices
+        self.lead = lead
+        self.jitter = jitter
+        self.pacer = ProviderPacer(
+            provider_rates if provider_rates is not None
+            else getattr(settings, 'MARKET_DATA_WARM_PROVIDER_RATES', DEFAULT_WARM_PROVIDER_RATES),
+            sleep=sleep
+        )
+        self.targets = self.build_targets()
+        self._counters = {
+            'checks': 0,
+            'warm': 0,          # 확인 시점에 아직 신선했던 항목
+            'cold': 0,          # 확인 시점에 이미 만료(또는 없음) - 사용자 요청이 업스트림을 탔을 수 있음
+            'refreshed': 0,
+            'failed': 0,
+            'rate_limited': 0,  # 프로바이더가 레이트 리밋 상태라 건너뜀
+        }
+
+    def build_targets(self) -> List[WarmTarget]:
+        service = self.service
+        targets = []
+
+        for symbol in self.symbols.get('us_stock', []):
+            key = symbol_key("realtime_us_stock_", symbol)
+            targets.append(WarmTarget(
+                key, 'finnhub', lambda s=symbol, k=key: service._fetch_real_time_quote(s, 'us_stock', k)
+            ))
+
+        for symbol in self.symbols.get('crypto', []):
+            key = symbol_key("crypto_", symbol, "USD")
+            targets.append(WarmTarget(
+                key, 'coingecko', lambda s=symbol, k=key: service._fetch_crypto_data(s, 'USD', k)
+            ))
+
+        for market, provider in (('us_stock', 'alpha_vantage'), ('crypto', 'twelve_data')):
+            for symbol in self.symbols.get(market, []):
+                # 일봉을 먼저 업스트림에서 갱신하고, 나머지 간격은 신선한 일봉에서 집계
+                for interval in self.intervals:
+                    request = HistoryRequest.from_params(symbol, self.period, interval, market)
+                    key = request.cache_key()
+                    if request.interval == '1d':
+                        targets.append(WarmTarget(key, provider, lambda r=request, k=key: (
+                            service._fetch_historical_data(r.symbol, r.period, r.interval, r.market, k,
+                                                           use_cached_daily=False)
+                        )))
+                    else:
+                        targets.append(WarmTarget(key, None, lambda r=request, k=key: (
+                            service._fetch_historical_data(r.symbol, r.period, r.interval, r.market, k)
+                        )))
+
+        if self.include_indices:
+            targets.append(WarmTarget('market_indices', 'yahoo', lambda: service._fetch_market_indices('market_indices')))
+
+        return targets
+
+    def run_once(self) -> Dict[str, int]:
+        """전체 대상을 한 번 점검하고 만료 임박/만료 항목을 갱신"""
+        result = {'checked': 0, 'refreshed': 0, 'cold': 0}
+        for target in self.targets:
+            lookup = swr_cache.get(target.key)
+            cold = lookup is None or lookup.stale
+            self._incr('cold' if cold else 'warm')
+            self._incr('checks')
+            result['checked'] += 1
+            if cold:
+                result['cold'] += 1
+
+            # 만료 시점을 대상마다 흩어 동시에 몰리지 않도록 지터 적용
+            threshold = self.lead + random.uniform(0, self.jitter)
+            if not cold and lookup.remaining > threshold:
+                continue
+
+            if target.provider and not self.service._is_api_available(target.provider):
+                self._incr('rate_limited')
+                continue
+
+            self.pacer.wait(target.provider)
+            if self._refresh(target):
+                result['refreshed'] += 1
+        return result
+
+    def _refresh(self, target: WarmTarget) -> bool:
+        try:
+            value = single_flight.do(target.key, target.refresh, read=lambda: swr_cache.get_value(target.key))
+        except Exception as e:
+            logger.error(f"Cache warm failed for {target.key}: {e}")
+            value = None
+        self._incr('refreshed' if value else 'failed')
+        return bool(value)
+
+    def _incr(self, name: str) -> None:
+        self._counters[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._counters)
+        checks = stats['checks'] or 1
+        stats['targets'] = len(self.targets)
+        stats['warm_hit_ratio'] = round(stats['warm'] / checks, 4)
+        stats['cold_ratio'] = round(stats['cold'] / checks, 4)
+        return stats
@@ -1,3 +1,9 @@
 from django.contrib import admin
+from .models import MarketDataSource
 
-# Register your models here.
+
+@admin.register(MarketDataSource)
+class MarketDataSourceAdmin(admin.ModelAdmin):
+	list_display = ('code', 'name', 'rate_limit_per_minute', 'is_active', 'priority')
+	list_editable = ('rate_limit_per_minute', 'is_active', 'priority')
+	list_filter = ('is_active',)
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketdata', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='marketdatasource',
+            name='code',
+            field=models.CharField(choices=[('yahoo', 'Yahoo Finance'), ('alpha_vantage', 'Alpha Vantage'), ('twelve_data', 'Twelve Data'), ('finnhub', 'Finnhub'), ('polygon', 'Polygon.io'), ('tiingo', 'Tiingo'), ('marketstack', 'Marketstack'), ('coingecko', 'CoinGecko')], max_length=20, unique=True, verbose_name='소스 코드'),
+        ),
+    ]
@@ -10,6 +10,9 @@ class MarketDataSource(models.Model):
         ('twelve_data', 'Twelve Data'),
         ('finnhub', 'Finnhub'),
         ('polygon', 'Polygon.io'),
+        ('tiingo', 'Tiingo'),
+        ('marketstack', 'Marketstack'),
+        ('coingecko', 'CoinGecko'),
     ]
     
     name = models.CharField('소스명', max_length=100)
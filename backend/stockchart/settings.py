@@ -94,6 +94,7 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Add WhiteNoise for static files
+    'market_data.middleware.CompressionMiddleware',  # br/gzip for large API responses (static files short-circuit above)
     'oauth2_provider.middleware.OAuth2TokenMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
@@ -305,6 +306,33 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 CELERY_BROKER_URL = config('REDIS_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = config('REDIS_URL', default='redis://localhost:6379/0')
 
+# 캐시 설정: 프로세스 내 L1(LRU, 항목별 TTL) + 워커 간 공유 L2
+# CACHE_REDIS_URL(미설정 시 REDIS_URL)이 있으면 L2는 Redis, 없으면 로컬 LocMemCache (개발/테스트용)
+CACHE_REDIS_URL = config('CACHE_REDIS_URL', default=config('REDIS_URL', default=''))
+CACHES = {
+    'default': {
+        'BACKEND': 'market_data.tiered_cache.TieredCache',
+        'LOCATION': 'stockchart-l1',
+        'OPTIONS': {
+            'L2': 'shared',
+            # L1에 올릴 키 접두사 (리스/레이트 리밋 등 원자성이 필요한 키는 항상 L2)
+            'L1_PREFIXES': ('realtime_', 'historical_', 'crypto_', 'translation:', 'cachegen:'),
+            'L1_MAX_ENTRIES': config('CACHE_L1_MAX_ENTRIES', default=1024, cast=int),
+            'L1_MAX_BYTES': config('CACHE_L1_MAX_BYTES', default=32 * 1024 * 1024, cast=int),
+            # 다른 워커의 갱신/퍼지가 이 워커에 늦게 보이는 최대 시간(초)
+            'L1_TIMEOUT': config('CACHE_L1_TIMEOUT', default=5, cast=float),
+        },
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_REDIS_URL,
+        'KEY_PREFIX': 'stockchart',
+    } if CACHE_REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'stockchart-shared',
+    },
+}
+
 # API 키 설정
 # Google OAuth
 # Use environment variables in production; fall back to a safe default client_id
@@ -327,6 +355,99 @@ POLYGON_API_KEY = config('POLYGON_API_KEY', default='')
 TIINGO_API_KEY = config('TIINGO_API_KEY', default='')
 MARKETSTACK_API_KEY = config('MARKETSTACK_API_KEY', default='')
 
+# 마켓 데이터 성능 설정
+# 헤지 레이스: 상위 프로바이더가 HEDGE_DELAY(미설정 시 해당 프로바이더 p95) 안에 응답하지 않으면
+# 다음 프로바이더를 병렬로 호출하고 가장 먼저 도착한 유효 응답을 사용
+MARKET_DATA_HEDGED_QUOTES = config('MARKET_DATA_HEDGED_QUOTES', default=True, cast=bool)
+MARKET_DATA_HEDGE_DELAY = config('MARKET_DATA_HEDGE_DELAY', default=None, cast=lambda v: float(v) if v else None)
+MARKET_DATA_HEDGE_MIN_DELAY = config('MARKET_DATA_HEDGE_MIN_DELAY', default=0.2, cast=float)
+MARKET_DATA_HEDGE_MAX_DELAY = config('MARKET_DATA_HEDGE_MAX_DELAY', default=2.0, cast=float)
+MARKET_DATA_QUOTE_DEADLINE = config('MARKET_DATA_QUOTE_DEADLINE', default=8.0, cast=float)
+MARKET_DATA_PROVIDER_WORKERS = config('MARKET_DATA_PROVIDER_WORKERS', default=16, cast=int)
+
+# 섹션 팬아웃 (대시보드/지수): 섹션을 별도 풀에서 동시에 조회하고 DEADLINE초 안에 끝난 섹션만 응답 (나머지는 timeout 표시)
+MARKET_DATA_FANOUT_WORKERS = config('MARKET_DATA_FANOUT_WORKERS', default=8, cast=int)
+MARKET_DATA_FANOUT_DEADLINE = config('MARKET_DATA_FANOUT_DEADLINE', default=3.0, cast=float)
+
+# 요청 데드라인: 뷰가 요청 종류별 예산을 정하고 모든 프로바이더 호출은 남은 시간만 타임아웃으로 사용
+# (예산이 다하면 폴백 체인을 멈추고 백그라운드 갱신에 넘김). 0이면 해당 종류 데드라인 없음
+MARKET_DATA_QUOTE_REQUEST_DEADLINE = config('MARKET_DATA_QUOTE_REQUEST_DEADLINE', default=2.0, cast=float)
+MARKET_DATA_HISTORY_REQUEST_DEADLINE = config('MARKET_DATA_HISTORY_REQUEST_DEADLINE', default=5.0, cast=float)
+MARKET_DATA_REQUEST_DEADLINE = config('MARKET_DATA_REQUEST_DEADLINE', default=5.0, cast=float)
+
+# 캐시 미스 병합(single-flight): 한 워커만 LEASE_TIMEOUT 동안 조회 리스를 잡고,
+# 나머지 워커는 최대 WAIT_TIMEOUT 동안 결과가 캐시에 채워지기를 기다림
+MARKET_DATA_COALESCE_LEASE_TIMEOUT = config('MARKET_DATA_COALESCE_LEASE_TIMEOUT', default=15, cast=int)
+MARKET_DATA_COALESCE_WAIT_TIMEOUT = config('MARKET_DATA_COALESCE_WAIT_TIMEOUT', default=3.0, cast=float)
+
+# stale-while-revalidate: hard TTL = soft TTL x 배수 (최대 MAX_HARD_TTL초), 그 사이에는 stale 값 + 백그라운드 갱신
+MARKET_DATA_SWR_HARD_TTL_MULTIPLIER = config('MARKET_DATA_SWR_HARD_TTL_MULTIPLIER', default=6, cast=float)
+MARKET_DATA_SWR_MAX_HARD_TTL = config('MARKET_DATA_SWR_MAX_HARD_TTL', default=21600, cast=int)
+MARKET_DATA_SWR_REFRESH_WORKERS = config('MARKET_DATA_SWR_REFRESH_WORKERS', default=4, cast=int)
+# 심볼별 캐시 세대 키 TTL (purge_symbol 이후 다시 셈). MAX_HARD_TTL보다 짧게 설정해도 MAX_HARD_TTL 사용
+MARKET_DATA_CACHE_GENERATION_TTL = config('MARKET_DATA_CACHE_GENERATION_TTL', default=86400, cast=int)
+
+# warm_market_cache 대상 심볼 (콤마 구분, 비우면 인기/상위/관심/예측 심볼 합집합)
+MARKET_DATA_WARM_STOCKS = config('MARKET_DATA_WARM_STOCKS', default='', cast=lambda v: [s.strip().upper() for s in v.split(',') if s.strip()])
+MARKET_DATA_WARM_CRYPTOS = config('MARKET_DATA_WARM_CRYPTOS', default='', cast=lambda v: [s.strip().upper() for s in v.split(',') if s.strip()])
+
+# 프로바이더 요청 예산: BURST_SECONDS초 창마다 분당 제한 x BURST_SECONDS / 60개를 원자적 카운터로 소비.
+# 분당 제한은 marketdata.MarketDataSource 행 우선, 없으면 기본값 (워커 간 공유하려면 CACHES가 Redis 등 공유 백엔드여야 함)
+MARKET_DATA_RATE_LIMIT_BURST_SECONDS = config('MARKET_DATA_RATE_LIMIT_BURST_SECONDS', default=15, cast=float)
+MARKET_DATA_RATE_LIMIT_CONFIG_TTL = config('MARKET_DATA_RATE_LIMIT_CONFIG_TTL', default=60, cast=float)
+
+# 프로바이더 상태 기반 폴백 순서 + 서킷 브레이커 (연속 실패 N회 시 COOLDOWN초 차단, 반복 시 최대 MAX_COOLDOWN까지 2배)
+MARKET_DATA_ADAPTIVE_PROVIDER_ORDER = config('MARKET_DATA_ADAPTIVE_PROVIDER_ORDER', default=True, cast=bool)
+MARKET_DATA_CIRCUIT_FAILURE_THRESHOLD = config('MARKET_DATA_CIRCUIT_FAILURE_THRESHOLD', default=5, cast=int)
+MARKET_DATA_CIRCUIT_COOLDOWN = config('MARKET_DATA_CIRCUIT_COOLDOWN', default=30, cast=float)
+MARKET_DATA_CIRCUIT_MAX_COOLDOWN = config('MARKET_DATA_CIRCUIT_MAX_COOLDOWN', default=300, cast=float)
+
+# 일/주/월봉 이력은 marketdata.PriceData에 저장하고 빠진 구간만 프로바이더에서 조회
+# (최신 봉 꼬리는 SYNC_INTERVAL초에 한 번만 재조회)
+MARKET_DATA_BAR_STORE = config('MARKET_DATA_BAR_STORE', default=True, cast=bool)
+MARKET_DATA_BAR_STORE_SYNC_INTERVAL = config('MARKET_DATA_BAR_STORE_SYNC_INTERVAL', default=300, cast=int)
+
+# 실시간 시세 SSE 스트림: 프로세스당 폴러 1개가 구독 심볼을 POLL_INTERVAL초마다 시장별 배치로 조회해
+# 모든 연결에 변경분만 전파. 연결은 MAX_SECONDS 뒤 닫혀 EventSource가 재연결 (gthread 워커 필요)
+MARKET_DATA_STREAM_POLL_INTERVAL = config('MARKET_DATA_STREAM_POLL_INTERVAL', default=5.0, cast=float)
+MARKET_DATA_STREAM_HEARTBEAT = config('MARKET_DATA_STREAM_HEARTBEAT', default=15.0, cast=float)
+MARKET_DATA_STREAM_MAX_SECONDS = config('MARKET_DATA_STREAM_MAX_SECONDS', default=300, cast=int)
+# SSE 연결은 gthread 워커 스레드를 하나씩 점유하므로 프로세스당 연결 수는 GUNICORN_THREADS // 2를 넘지 않음
+# (나머지 스레드는 일반 API 요청용). MAX_CLIENTS를 0으로 두면 이 상한을 그대로 사용
+GUNICORN_THREADS = config('GUNICORN_THREADS', default=32, cast=int)
+MARKET_DATA_STREAM_MAX_CLIENTS = config('MARKET_DATA_STREAM_MAX_CLIENTS', default=0, cast=int)
+MARKET_DATA_STREAM_MAX_SYMBOLS = config('MARKET_DATA_STREAM_MAX_SYMBOLS', default=20, cast=int)
+
+# 체결 웹소켓 인제스트 (manage.py ingest_trades): PUBLISH_INTERVAL초마다 최신 체결가/진행 중인 봉 게시,
+# FLUSH_INTERVAL초마다 완료된 1m/5m/1h 봉을 bar store에 저장. FEED_TTL초 동안 게시가 없으면 REST 체인으로 복귀
+MARKET_DATA_TICK_PUBLISH_INTERVAL = config('MARKET_DATA_TICK_PUBLISH_INTERVAL', default=1.0, cast=float)
+MARKET_DATA_TICK_FLUSH_INTERVAL = config('MARKET_DATA_TICK_FLUSH_INTERVAL', default=30.0, cast=float)
+MARKET_DATA_TICK_FEED_TTL = config('MARKET_DATA_TICK_FEED_TTL', default=30, cast=int)
+
+# 응답 압축 (brotli 패키지가 있으면 br, 없으면 gzip). 이보다 작은 응답은 압축하지 않음
+MARKET_DATA_COMPRESS_MIN_BYTES = config('MARKET_DATA_COMPRESS_MIN_BYTES', default=1024, cast=int)
+MARKET_DATA_BROTLI_QUALITY = config('MARKET_DATA_BROTLI_QUALITY', default=5, cast=int)
+
+# 로컬 심볼 검색 인덱스: charts.Stock + 내장 심볼을 메모리에 올려 검색어를 로컬에서 응답 (INDEX_TTL초마다 DB에서 재구축).
+# 인덱스에 없는 검색어만 업스트림 검색 API에 묻고 결과는 SEARCH_CACHE_TTL초 캐시 + 인덱스에 역기록 (DB 종목 마스터는 sync_symbols만 기록)
+MARKET_DATA_SYMBOL_INDEX_TTL = config('MARKET_DATA_SYMBOL_INDEX_TTL', default=600, cast=int)
+MARKET_DATA_SYMBOL_SEARCH_CACHE_TTL = config('MARKET_DATA_SYMBOL_SEARCH_CACHE_TTL', default=3600, cast=int)
+
+# 네거티브 캐시: 프로바이더가 빈 응답을 준 (프로바이더, 심볼, 데이터 종류)는 NEGATIVE_CACHE_TTL초 동안 체인에서 제외.
+# 종목 마스터에 없는 심볼을 서비스 가능한 프로바이더가 모두 모르면 UNKNOWN_SYMBOL_TTL초 동안 체인 없이 바로 응답
+MARKET_DATA_NEGATIVE_CACHE_TTL = config('MARKET_DATA_NEGATIVE_CACHE_TTL', default=300, cast=int)
+MARKET_DATA_UNKNOWN_SYMBOL_TTL = config('MARKET_DATA_UNKNOWN_SYMBOL_TTL', default=600, cast=int)
+
+# 프로바이더 HTTP 커넥션 풀: 호스트별 keep-alive 세션 1개, 세션당 최대 POOL_SIZE 커넥션
+MARKET_DATA_HTTP_POOL_SIZE = config('MARKET_DATA_HTTP_POOL_SIZE', default=10, cast=int)
+MARKET_DATA_HTTP_POOL_BLOCK = config('MARKET_DATA_HTTP_POOL_BLOCK', default=False, cast=bool)
+MARKET_DATA_HTTP_DEFAULT_TIMEOUT = config('MARKET_DATA_HTTP_DEFAULT_TIMEOUT', default=10, cast=float)
+# 호스트별 타임아웃 재정의 (초) - 설정된 호스트는 호출부 타임아웃보다 우선
+MARKET_DATA_HTTP_TIMEOUTS = {
+    # 'finnhub.io': 5,
+    # 'api.coingecko.com': 15,
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Optional: Auth cookies (HttpOnly) instead of localStorage
@@ -29,4 +29,8 @@ python manage.py collectstatic --no-input
 echo "Running migrations..."
 python manage.py migrate --no-input
 
+# Seed the symbol universe (built-in prediction symbols)
+echo "Syncing symbols..."
+python manage.py sync_symbols
+
 echo "Build completed successfully!"
\ No newline at end of file
@@ -1674,49 +1674,97 @@ function updateChartTitle(symbol, latestData) {
     }
 }
 
-// Load market data
+// Load market data - 대시보드 API 한 번으로 인기 주식/암호화폐/지수를 서버에서 동시에 조회
 async function loadMarketData() {
     console.log('Loading market data...');
     try {
-        console.log('Loading popular stocks...');
-        await loadPopularStocks();
-
-        console.log('Loading crypto data...');
-        await loadCryptoData();
+        const params = new URLSearchParams({
+            sections: 'stocks,cryptos,indices',
+            stocks: POPULAR_STOCK_SYMBOLS.join(','),
+            cryptos: POPULAR_CRYPTO_SYMBOLS.join(',')
+        });
+        const response = await fetch(`${API_BASE_URL}/api/market-data/dashboard/?${params}`);
+        if (!response.ok) {
+            throw new Error(`Dashboard request failed: ${response.status}`);
+        }
+        const data = await response.json();
+        const sections = data.sections || {};
 
-        console.log('Loading market indices...');
-        await loadMarketIndices();
+        // 데드라인 안에 받지 못한 섹션만 개별 API로 다시 로드
+        const retries = [];
+        if (sections.stocks && sections.stocks.status === 'ok') {
+            showPopularStockQuotes(data.stocks);
+        } else {
+            retries.push(loadPopularStocks());
+        }
+        if (sections.cryptos && sections.cryptos.status === 'ok') {
+            displayCryptoData(cryptoQuotesToItems(data.cryptos));
+        } else {
+            retries.push(loadCryptoData());
+        }
+        if (sections.indices && sections.indices.status === 'ok') {
+            displayMarketIndices(indicesToItems(data.indices));
+        } else {
+            retries.push(loadMarketIndices());
+        }
+        await Promise.all(retries);
     } catch (error) {
-        console.error('Error in loadMarketData:', error);
+        console.error('Dashboard load failed, loading sections individually:', error);
+        await Promise.all([loadPopularStocks(), loadCryptoData(), loadMarketIndices()]);
     }
     console.log('Market data loading completed');
 }
 
 // Load popular stocks
+const POPULAR_STOCK_SYMBOLS = ['AAPL', 'GOOGL', 'MSFT', 'AMZN'];
+const POPULAR_CRYPTO_SYMBOLS = ['BTC', 'ETH', 'ADA', 'BNB'];
+let popularStockData = [];
+
+// 시세 목록을 인기 주식 카드 데이터로 변환해 표시 (없는 심볼은 오류 카드)
+function showPopularStockQuotes(quotes) {
+    const bySymbol = Object.fromEntries((quotes || []).map(quote => [quote.symbol, quote]));
+    popularStockData = POPULAR_STOCK_SYMBOLS.map(symbol => bySymbol[symbol]
+        ? { symbol, ...bySymbol[symbol] }
+        : { symbol, error: true });
+    displayPopularStocks(popularStockData);
+}
+
+function cryptoQuotesToItems(quotes) {
+    const bySymbol = Object.fromEntries((quotes || []).map(quote => [quote.symbol, quote]));
+    return POPULAR_CRYPTO_SYMBOLS.map(symbol => bySymbol[symbol]
+        ? { symbol, ...bySymbol[symbol], success: true }
+        : { symbol, error: true, errorMessage: `Failed to load ${symbol} data` });
+}
+
+function indicesToItems(indices) {
+    return (indices || []).map(index => ({
+        name: index.name,
+        value: Number(index.price).toLocaleString('en-US', { minimumFractionDigits: 2, maximumFractionDigits: 2 }),
+        change: index.change_24h
+    }));
+}
+
 async function loadPopularStocks() {
     try {
         console.log('Loading popular stocks...');
-        const symbols = ['AAPL', 'GOOGL', 'MSFT', 'AMZN'];
-        const stockData = [];
+        const symbols = POPULAR_STOCK_SYMBOLS;
+        let quotes = [];
 
-        for (const symbol of symbols) {
-            try {
-                const response = await fetch(`${API_BASE_URL}/api/market-data/quote/${symbol}/`);
-                if (response.ok) {
-                    const data = await response.json();
-                    stockData.push({ symbol, ...data });
-                } else {
-                    console.error(`Failed to fetch ${symbol} data`);
-                    stockData.push({ symbol, error: true });
-                }
-            } catch (error) {
-                console.error(`Error loading ${symbol}:`, error);
-                stockData.push({ symbol, error: true });
+        // 한 번의 배치 요청으로 모든 심볼 시세 조회
+        try {
+            const response = await fetch(`${API_BASE_URL}/api/market-data/quotes/?symbols=${symbols.join(',')}&market=us_stock`);
+            if (response.ok) {
+                const data = await response.json();
+                quotes = data.quotes || [];
+            } else {
+                console.error('Failed to fetch batch stock quotes');
             }
+        } catch (error) {
+            console.error('Error loading batch stock quotes:', error);
         }
 
-        console.log('Stock data loaded:', stockData);
-        displayPopularStocks(stockData);
+        showPopularStockQuotes(quotes);
+        console.log('Stock data loaded:', popularStockData);
     } catch (error) {
         console.error('Popular stocks load error:', error);
     }
@@ -1778,37 +1826,35 @@ async function loadCryptoData() {
     console.log('📊 Loading state set');
 
     try {
-        const symbols = ['BTC', 'ETH', 'ADA', 'BNB'];
-        const cryptoData = [];
+        const symbols = POPULAR_CRYPTO_SYMBOLS;
+        let cryptoData = [];
 
-        for (const symbol of symbols) {
-            try {
-                console.log(`Loading crypto data for ${symbol}...`);
-                const response = await fetch(`${API_BASE_URL}/market-data/crypto/${symbol}/`);
+        // 한 번의 배치 요청으로 모든 암호화폐 시세 조회
+        try {
+            console.log(`Loading crypto data for ${symbols.join(', ')}...`);
+            const response = await fetch(`${API_BASE_URL}/api/market-data/quotes/?symbols=${symbols.join(',')}&market=crypto`);
 
-                if (response.ok) {
-                    const data = await response.json();
-                    console.log(`Successfully loaded ${symbol}:`, data);
-                    cryptoData.push({ symbol, ...data, success: true });
-                } else {
-                    const errorData = await response.json().catch(() => ({}));
-                    console.warn(`Failed to load ${symbol}:`, response.status, errorData);
-                    cryptoData.push({
-                        symbol,
-                        error: true,
-                        errorMessage: errorData.error || `Failed to load ${symbol} data`,
-                        status: response.status
-                    });
-                }
-            } catch (error) {
-                console.error(`${symbol} crypto data error:`, error);
-                cryptoData.push({
+            if (response.ok) {
+                const data = await response.json();
+                cryptoData = cryptoQuotesToItems(data.quotes);
+            } else {
+                const errorData = await response.json().catch(() => ({}));
+                console.warn('Failed to load crypto batch:', response.status, errorData);
+                cryptoData = symbols.map(symbol => ({
                     symbol,
                     error: true,
-                    errorMessage: `Network error loading ${symbol}`,
-                    networkError: true
-                });
+                    errorMessage: errorData.error || `Failed to load ${symbol} data`,
+                    status: response.status
+                }));
             }
+        } catch (error) {
+            console.error('Crypto batch data error:', error);
+            cryptoData = symbols.map(symbol => ({
+                symbol,
+                error: true,
+                errorMessage: `Network error loading ${symbol}`,
+                networkError: true
+            }));
         }
 
         displayCryptoData(cryptoData);
@@ -1903,10 +1949,10 @@ function displayCryptoData(cryptoData) {
 // Load market indices
 async function loadMarketIndices() {
     try {
-        const response = await fetch(`${API_BASE_URL}/market-data/indices/`);
+        const response = await fetch(`${API_BASE_URL}/api/market-data/indices/`);
         if (response.ok) {
             const data = await response.json();
-            displayMarketIndices(data);
+            displayMarketIndices(indicesToItems(data.indices));
         }
     } catch (error) {
         console.error('Market indices load error:', error);
@@ -2345,9 +2391,39 @@ function debounce(func, wait) {
 }
 
 // Real-time updates
+// 인기 주식 시세는 SSE 스트림으로 변경분만 받고, 스트림이 없을 때만 30초 폴링으로 대체
+let popularStockStream = null;
+
+function startPopularStockStream() {
+    if (typeof EventSource === 'undefined' || popularStockStream) {
+        return;
+    }
+    const url = `${API_BASE_URL}/api/market-data/stream/?symbols=${POPULAR_STOCK_SYMBOLS.join(',')}&market=us_stock`;
+    popularStockStream = new EventSource(url);
+    popularStockStream.addEventListener('quote', (event) => {
+        const delta = JSON.parse(event.data);
+        popularStockData = popularStockData.map(stock => stock.symbol === delta.symbol
+            ? { ...stock, ...delta, error: false }
+            : stock);
+        displayPopularStocks(popularStockData);
+    });
+    popularStockStream.onerror = () => {
+        // 서버가 스트림을 닫으면 EventSource가 자동 재연결, 완전히 닫힌 경우만 폴링으로 전환
+        if (popularStockStream && popularStockStream.readyState === EventSource.CLOSED) {
+            popularStockStream = null;
+        }
+    };
+}
+
 function startRealTimeUpdates() {
+    startPopularStockStream();
     setInterval(() => {
-        loadMarketData();
+        if (popularStockStream) {
+            loadCryptoData();
+            loadMarketIndices();
+        } else {
+            loadMarketData();
+        }
     }, 30000); // Update every 30 seconds
 }
 
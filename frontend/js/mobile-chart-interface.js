@@ -1116,6 +1116,16 @@ class MobileChartInterface {
         this.updateStockInfo(symbol, data);
         this.showChart();
         
+        // Replace sample data with real history (binary typed-array transport)
+        const chart = this.chart;
+        chart.loadSeries(symbol, { period: '1year', interval: '1day' })
+            .then(series => {
+                if (this.chart === chart && series.length > 1) {
+                    this.updateStockInfo(symbol, series);
+                }
+            })
+            .catch(error => console.warn(`Binary history unavailable for ${symbol}:`, error.message));
+        
         // Hide instructions
         const instructions = this.container.querySelector('.touch-instructions');
         instructions.style.display = 'none';
@@ -493,5 +493,62 @@ class TradingViewChart {
     }
 }
 
+/**
+ * Binary OHLCV transport (/api/market-data/historical/<symbol>/?format=bin)
+ * 32-byte little-endian header + contiguous column buffers: t:int64, o/h/l/c:float64, v:int64.
+ * Price columns are wrapped as Float64Array views directly - no JSON parsing.
+ */
+TradingViewChart.decodeBinarySeries = function(buffer) {
+    const header = new DataView(buffer, 0, 32);
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== 'OHLC' || header.getUint8(4) !== 1) {
+        throw new Error('Unsupported OHLCV binary payload');
+    }
+    const flags = header.getUint8(5);
+    const length = header.getUint32(8, true);
+    const since = Number(header.getBigInt64(24, true));
+    const column = (index, ArrayType) => new ArrayType(buffer, 32 + index * length * 8, length);
+
+    return {
+        stale: (flags & 1) !== 0,
+        daily: (flags & 2) !== 0,
+        precision: header.getUint8(7),
+        age: header.getInt32(12, true),
+        cursor: Number(header.getBigInt64(16, true)),
+        since: since < 0 ? null : since,
+        length,
+        t: column(0, BigInt64Array),
+        o: column(1, Float64Array),
+        h: column(2, Float64Array),
+        l: column(3, Float64Array),
+        c: column(4, Float64Array),
+        v: column(5, BigInt64Array)
+    };
+};
+
+TradingViewChart.prototype.loadSeries = async function(symbol, params = {}) {
+    const query = new URLSearchParams({ ...params, format: 'bin' });
+    const response = await fetch(`/api/market-data/historical/${encodeURIComponent(symbol)}/?${query}`, {
+        headers: { Accept: 'application/octet-stream' }
+    });
+    if (!response.ok) {
+        throw new Error(`History request failed: ${response.status}`);
+    }
+    const series = TradingViewChart.decodeBinarySeries(await response.arrayBuffer());
+    const data = new Array(series.length);
+    for (let i = 0; i < series.length; i++) {
+        data[i] = {
+            timestamp: Number(series.t[i]) * 1000,
+            open: series.o[i],
+            high: series.h[i],
+            low: series.l[i],
+            close: series.c[i],
+            volume: Number(series.v[i])
+        };
+    }
+    this.setData(data);
+    return data;
+};
+
 // Export for use
 window.TradingViewChart = TradingViewChart;
\ No newline at end of file
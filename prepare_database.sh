@@ -16,6 +16,9 @@ python manage.py makemigrations market_data
 echo "Applying all migrations..."
 python manage.py migrate
 
+echo "Syncing symbol universe..."
+python manage.py sync_symbols
+
 echo "Checking system status..."
 python manage.py check
 